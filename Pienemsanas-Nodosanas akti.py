@@ -1,53 +1,14 @@
+import time
+_STARTUP_T0 = time.perf_counter()  # starta budžeta atskaites punkts (sk. STARTUP_BUDGET_S)
 import sys
 import ctypes
 from typing import Optional
 import os
 import hashlib
 import secrets
-from PySide6.QtWidgets import QMenu, QDialog, QFormLayout, QDialogButtonBox
-from PySide6.QtGui import QAction
+from collections import OrderedDict
 import csv
 
-# ============================
-# FIX: path-like safety (dict -> str) to allow repeated PDF generation
-# ============================
-# Dažkārt (pēc pirmās ģenerēšanas) UI stāvoklī ceļi var nonākt kā dict (piem. Qt.UserRole).
-# Tas izraisa TypeError "expected str, bytes or os.PathLike object, not dict" pie os.path / open() / ReportLab.
-# Šis ir minimāls "drop-in" ielāps: padara os.fspath tolerantāku pret dict/tuple/list,
-# lai visur, kur Python/stdlib iekšēji izsauc os.fspath(), mēs vienmēr saņemtu string ceļu.
-
-_ORIG_OS_FSPATH = os.fspath
-
-def _safe_fspath(p):
-    try:
-        if p is None:
-            return ""
-        # QFileDialog dažreiz atgriež (path, filter)
-        if isinstance(p, (list, tuple)) and p:
-            return _safe_fspath(p[0])
-        # UI/state var iedot dict ar ceļu
-        if isinstance(p, dict):
-            for k in ("path", "ceļš", "celsh", "file", "filepath", "filename", "value", "pdf", "json"):
-                v = p.get(k)
-                if v:
-                    return _safe_fspath(v)
-            return ""
-        return _ORIG_OS_FSPATH(p)
-    except TypeError:
-        # Pēdējais glābiņš: pārvēršam par str (labāk FileNotFoundError nekā TypeError)
-        try:
-            return str(p)
-        except Exception:
-            return ""
-
-# Monkey-patch: ietekmē os.path.*, open(), reportlab utt.
-os.fspath = _safe_fspath
-
-
-def resource_path(relative_path: str) -> str:
-    """Atgriež pareizu ceļu uz resursu gan Python režīmā, gan PyInstaller EXE režīmā."""
-    base_path = getattr(sys, "_MEIPASS", os.path.abspath("."))
-    return os.path.join(base_path, relative_path)
 
 def set_windows_app_id(app_id: str) -> None:
     """Uzliek Windows AppUserModelID, lai Taskbar/Alt+Tab izmantotu pareizo ikonu."""
@@ -57,117 +18,49 @@ def set_windows_app_id(app_id: str) -> None:
         pass
 
 import os.path
-import io
 import re
 
 import json
 import base64
 import tempfile
 from datetime import datetime, timedelta
-from decimal import Decimal, InvalidOperation
-from PySide6.QtGui import QColor, QPageSize
-from dataclasses import dataclass, asdict, field
+from decimal import Decimal
+from dataclasses import asdict
 import shutil
-import requests
 import subprocess # Jauns imports
+import math
+import copy
+import operator
+import platform
 
 # Pārliecināties, ka šīs ir importētas no PySide6.QtWidgets
 from PySide6.QtWidgets import (
     QApplication, QWidget, QMainWindow, QLabel, QLineEdit, QTextEdit, QPushButton,
     QFileDialog, QSpinBox, QDoubleSpinBox, QTableWidget, QTableWidgetItem, QHeaderView,
     QToolButton, QTabWidget, QFormLayout, QVBoxLayout, QHBoxLayout, QMessageBox, QCheckBox,
-    QListWidget, QListWidgetItem, QGroupBox, QComboBox, QInputDialog, QSplitter, QScrollArea, QDateEdit, QAbstractItemView, QMenu
+    QListWidget, QListWidgetItem, QGroupBox, QComboBox, QInputDialog, QSplitter, QScrollArea, QDateEdit, QAbstractItemView, QMenu,
+    QDialog, QDialogButtonBox, QAbstractSpinBox
+)
+from PySide6.QtGui import QAction, QIcon, QColor, QPageSize, QPainter, QPixmap, QImage, QDesktopServices
+from PySide6.QtCore import Qt, QSize, QSettings, QUrl, QPoint, QTimer, QThread, Signal, QObject, Slot
+
+# Smagie moduļi (QtWebEngine/QtWebChannel/QtPrintSupport, pdf2image, PIL.ImageQt, requests, python-docx,
+# ReportLab/PIL kodolā – sk. akta_kodols._ielādēt_reportlab)
+# tiek importēti pirmajā lietošanas reizē, lai galvenā forma būtu lietojama pēc iespējas ātrāk.
+
+
+# Qt-free kodols: datu modelis, PDF/DOCX ģenerēšana, projektu ielāde un pakešu ģenerēšana
+from akta_kodols import (
+    ADDRESS_BOOK_FILE, AKTA_NR_COUNTER_FILE, APP_DATA_DIR, DEFAULT_OUTPUT_DIR, DEFAULT_SETTINGS_FILE, DOCUMENTS_DIR,
+    HISTORY_FILE, PROJECT_SAVE_DIR, SETTINGS_DIR, TEXT_BLOCKS_FILE,
+    AktaDati, Attēls, GenerēšanaAtcelta, Persona, Pozīcija,
+    drošs_faila_nosaukums, formēt_naudu, ieslēgt_drošu_fspath, ielādēt_projekta_failu, load_settings, resource_path,
+    sagatavot_lietotnes_mapes, save_settings, to_decimal, ģenerēt_docx, ģenerēt_pdf,
+    # kodola iekšējie palīgi, ko izmanto arī GUI
+    _AktaHashKoks, _AtcelšanasŽetons, _atceļams_apakšprocess, _coerce_path, _json_safe, _merge_poz_columns_config, _pakešu_cli,
+    _prepare_unencrypted_pdf_for_render, _preview_page_cache, _rakstīt_akta_zip, _servisa_cli,
 )
 
-from PIL import Image
-from PIL.ImageQt import ImageQt # JAUNS IMPORTS
-from PySide6.QtGui import QPainter # JAUNS IMPORTS
-
-from pdf2image import convert_from_path
-from PySide6.QtGui import QPixmap
-
-from PySide6.QtCore import Qt, QSize, QSettings, QStandardPaths, QUrl, QPoint, QTimer, QThread, Signal, QEvent
-from PySide6.QtGui import QAction, QIcon
-from PySide6.QtPrintSupport import QPrinter, QPrintDialog, QPrintPreviewDialog # JAUNS IMPORTS
-
-
-
-# Import for WebEngine
-from PySide6.QtWebEngineWidgets import QWebEngineView
-from PySide6.QtWebEngineCore import QWebEngineUrlRequestInterceptor # For intercepting URL changes
-
-# ReportLab imports (unchanged)
-from reportlab.lib.pagesizes import A4, landscape, portrait, letter, legal, A3, A5
-from reportlab.graphics import renderPDF
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics.barcode import qr as rl_qr
-from reportlab.pdfgen import canvas
-from reportlab.lib import colors
-from reportlab.lib.units import mm, inch
-from reportlab.platypus import Table, TableStyle, Paragraph, Spacer, SimpleDocTemplate, Image as RLImage, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.platypus.flowables import Flowable
-
-# python-docx imports (unchanged)
-from docx import Document
-from docx.shared import Inches, Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from docx.enum.table import WD_ALIGN_VERTICAL
-from docx.text.run import Run
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-from docx.shared import RGBColor
-from PySide6.QtWebChannel import QWebChannel
-from PySide6.QtCore import QObject, Slot
-from PySide6.QtCore import Qt, QSize, QSettings, QStandardPaths, QUrl, QPoint, QTimer, QThread, Signal
-import copy
-from dataclasses import asdict
-import platform
-
-# ---------------------- Konstantes un direktoriju iestatījumi ----------------------
-APP_DATA_DIR = QStandardPaths.writableLocation(QStandardPaths.AppDataLocation)
-DOCUMENTS_DIR = QStandardPaths.writableLocation(QStandardPaths.DocumentsLocation)
-
-# ==============================
-# Iestatījumi (vienkārši JSON)
-# ==============================
-
-def _settings_path() -> str:
-    return os.path.join(APP_DATA_DIR, "settings.json")
-
-def load_settings() -> dict:
-    try:
-        p = _settings_path()
-        if os.path.exists(p):
-            with open(p, "r", encoding="utf-8") as f:
-                return json.load(f) or {}
-    except Exception:
-        pass
-    return {}
-
-def save_settings(data: dict):
-    try:
-        os.makedirs(APP_DATA_DIR, exist_ok=True)
-        with open(_settings_path(), "w", encoding="utf-8") as f:
-            json.dump(data or {}, f, ensure_ascii=False, indent=2)
-    except Exception:
-        pass
-
-
-
-SETTINGS_DIR = os.path.join(APP_DATA_DIR, "AktaGenerators")
-HISTORY_FILE = os.path.join(SETTINGS_DIR, "history.json")
-ADDRESS_BOOK_FILE = os.path.join(SETTINGS_DIR, "address_book.json")
-DEFAULT_SETTINGS_FILE = os.path.join(SETTINGS_DIR, "default_settings.json")
-AKTA_NR_COUNTER_FILE = os.path.join(SETTINGS_DIR, "akta_nr_counter.json")  # JAUNS: stabilai secīgai akta numuru ģenerācijai
-TEXT_BLOCKS_FILE = os.path.join(SETTINGS_DIR, "text_blocks.json") # JAUNA RINDAS
-
-# Jaunas noklusējuma saglabāšanas mapes
-DEFAULT_OUTPUT_DIR = os.path.join(DOCUMENTS_DIR, "AktaGenerators_Output")
-PROJECT_SAVE_DIR = os.path.join(APP_DATA_DIR, "AktaGenerators_Projects")
-# TEMPLATES_DIR = os.path.join(APP_DATA_DIR, "AktaGenerators_Templates") # JAUNA RINDAS - Tagad dinamiski iestatīts AktaDati objektā
 
 # ==============================
 # Audit logs + Undo/Redo (GLOBAL)
@@ -224,23 +117,96 @@ class AuditLogger:
             return []
 
 
+# Undo/redo atmiņas budžets (aptuvens, baitos); settings.json: "undo_memory_mb"
+UNDO_MEMORY_MAX_BYTES = 64 * 1024 * 1024
+# Viena lauka (vai pozīciju šūnu) secīgas izmaiņas šajā logā apvieno vienā undo solī
+UNDO_COALESCE_S = 2.0
+
+
+def _aptuvenais_izmērs(obj) -> int:
+    """Aptuvens objekta atmiņas apjoms baitos (undo budžetam)."""
+    n = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        n += sum(_aptuvenais_izmērs(k) + _aptuvenais_izmērs(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        n += sum(_aptuvenais_izmērs(x) for x in obj)
+    elif hasattr(obj, "__dataclass_fields__") and not isinstance(obj, type):
+        n += sum(_aptuvenais_izmērs(getattr(obj, f, None)) for f in obj.__dataclass_fields__)
+    return n
+
+
 class UndoRedoManager:
-    """Vienkāršs Undo/Redo ar 'snapshots' (adresēs grāmata + projekts).
+    """Undo/Redo ar lauku līmeņa izmaiņām un darbību snapshots (adrešu grāmata + projekts).
     Nav QUndoStack, bet ir stabils, viegli uzturams un pietiekams 99% gadījumu.
+
+    Ieraksti ir dict. "_izmērs" ir ieraksta paša (ne ar citiem snapshots kopīgotās) daļas
+    aptuvenais apjoms baitos; steki tiek apgriezti gan pēc max_steps, gan pēc max_bytes.
+    Viena lauka secīgas izmaiņas coalesce_s sekunžu laikā kļūst par vienu soli.
     """
-    def __init__(self, max_steps: int = 50):
+    def __init__(self, max_steps: int = 50, max_bytes: int = UNDO_MEMORY_MAX_BYTES,
+                 coalesce_s: float = UNDO_COALESCE_S):
         self.max_steps = max_steps
+        self.max_bytes = max_bytes
+        self.coalesce_s = coalesce_s
         self._undo = []
         self._redo = []
+        self._undo_bytes = 0
+        self._redo_bytes = 0
+
+    @staticmethod
+    def _izmērs(state: dict) -> int:
+        if "_izmērs" not in state:
+            state["_izmērs"] = _aptuvenais_izmērs(state)
+        return state["_izmērs"]
+
+    def _apvienot(self, state: dict) -> bool:
+        """Apvieno state ar pēdējo undo soli, ja tas ir tā paša lauka (vai pozīciju šūnu) nesena izmaiņa."""
+        if not self._undo:
+            return False
+        top = self._undo[-1]
+        if state["_laiks"] - top.get("_laiks", 0) > self.coalesce_s:
+            return False
+        if state.get("lauks") and state.get("lauks") == top.get("lauks"):
+            top["jaunā"] = state["jaunā"]
+            if top["vecā"] == top["jaunā"]:
+                self._undo_bytes -= self._izmērs(self._undo.pop())
+                return True
+        elif "šūnas" in state and "šūnas" in top:
+            šūnas = {}
+            for r, c, vecā, jaunā in top["šūnas"] + state["šūnas"]:
+                šūnas[(r, c)] = (šūnas.get((r, c), (vecā,))[0], jaunā)
+            top["šūnas"] = [(r, c, v, j) for (r, c), (v, j) in šūnas.items() if v != j]
+            if not top["šūnas"]:
+                self._undo_bytes -= self._izmērs(self._undo.pop())
+                return True
+        else:
+            return False
+        top["_laiks"] = state["_laiks"]
+        # Apvienotais solis aizstāj abus: izmēru pārrēķinām (nevis saskaitām), citādi ilga
+        # rakstīšana vienā laukā "piepūstu" budžetu un izspiestu vecākos soļus
+        vecais = top.pop("_izmērs", 0)
+        self._undo_bytes += self._izmērs(top) - vecais
+        self._undo_bytes = self._apgriezt(self._undo, self._undo_bytes)
+        return True
+
+    def _apgriezt(self, steks: list, baiti: int) -> int:
+        while len(steks) > 1 and (len(steks) > self.max_steps or baiti > self.max_bytes):
+            baiti -= self._izmērs(steks.pop(0))
+        return baiti
 
     def clear_redo(self):
         self._redo = []
-
-    def push_undo(self, state: dict):
-        self._undo.append(state)
-        if len(self._undo) > self.max_steps:
-            self._undo = self._undo[-self.max_steps:]
-        self.clear_redo()
+        self._redo_bytes = 0
+
+    def push_undo(self, state: dict, clear_redo: bool = True):
+        """Jauna izmaiņa (clear_redo=True, var tikt apvienota) vai redo atkārtots solis (clear_redo=False)."""
+        state.setdefault("_laiks", time.monotonic())
+        if not (clear_redo and self._apvienot(state)):
+            self._undo.append(state)
+            self._undo_bytes += self._izmērs(state)
+            self._undo_bytes = self._apgriezt(self._undo, self._undo_bytes)
+        if clear_redo:
+            self.clear_redo()
 
     def can_undo(self) -> bool:
         return len(self._undo) > 0
@@ -248,29 +214,323 @@ class UndoRedoManager:
     def can_redo(self) -> bool:
         return len(self._redo) > 0
 
+    def peek_undo(self) -> dict | None:
+        return self._undo[-1] if self._undo else None
+
+    def peek_redo(self) -> dict | None:
+        return self._redo[-1] if self._redo else None
+
     def pop_undo(self) -> dict | None:
         if not self._undo:
             return None
-        return self._undo.pop()
+        state = self._undo.pop()
+        self._undo_bytes -= self._izmērs(state)
+        return state
 
     def push_redo(self, state: dict):
         self._redo.append(state)
-        if len(self._redo) > self.max_steps:
-            self._redo = self._redo[-self.max_steps:]
+        self._redo_bytes += self._izmērs(state)
+        self._redo_bytes = self._apgriezt(self._redo, self._redo_bytes)
 
     def pop_redo(self) -> dict | None:
         if not self._redo:
             return None
-        return self._redo.pop()
+        state = self._redo.pop()
+        self._redo_bytes -= self._izmērs(state)
+        return state
+
+    def entries(self) -> list:
+        return self._undo + self._redo
+
+    def retain(self, keep):
+        """Atstāj tikai ierakstus, kam keep(state) ir patiess (piem., pēc pozīciju kolonnu maiņas)."""
+        self._undo = [st for st in self._undo if keep(st)]
+        self._redo = [st for st in self._redo if keep(st)]
+        self._undo_bytes = sum(self._izmērs(st) for st in self._undo)
+        self._redo_bytes = sum(self._izmērs(st) for st in self._redo)
+
+    def memory_bytes(self) -> int:
+        return self._undo_bytes + self._redo_bytes
+
+
+class _IzmaiņuSekotājs(QObject):
+    """Lauku izmaiņu izsekošana no pašu ievades logrīku signāliem (bez globāla eventFilter).
+
+    lauks_mainīts(lauks) – lauks kļuvis "netīrs" (arī programmatiski); to izmanto priekšskatījums.
+    izmaiņa_pabeigta(ieraksts) – lietotāja rediģēšana pabeigta; to izmanto undo un audit:
+    {"label", "lauks", "vecā", "jaunā"} vai pozīciju tabulai {"label": "POZ_CHANGE", "šūnas": [(r, c, vecā, jaunā)]}.
+    Katram laukam glabā tikai tā pēdējo zināmo vērtību, tāpēc rediģēšana nekad nesavāc visu stāvokli.
+    Kamēr izsekošana apturēta (ieviest_datus, undo/redo), vērtības tiek pārņemtas, bet ieraksti netiek veidoti.
+    """
+    lauks_mainīts = Signal(str)
+    izmaiņa_pabeigta = Signal(dict)
+    tabulas_rindas_pārbīdītas = Signal(int, int)  # pirmā rinda, nobīde (+ievietotas / -dzēstas)
+    tabula_pārbūvēta = Signal()
+
+    _NAV = object()  # lauka rediģēšanas sesija nav atvērta
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lauki = {}  # lauks -> {"w", "veids", "zināmā", "iepriekšējā", "sākums"}
+        self._izsekotie = set()  # id(logrīks)
+        self._apturēts = 0
+        self._tab = None
+        self._tab_izlaistās = ()
+        self._tab_ēna = []  # pozīciju šūnu teksti [[str]]: cellChanged nezina iepriekšējo vērtību
+        self._tab_gaida = []  # [(r, c, vecā, jaunā)] līdz debounce beigām
+        self._tab_taimeris = QTimer(self)
+        self._tab_taimeris.setSingleShot(True)
+        self._tab_taimeris.timeout.connect(self._pabeigt_tabulu)
+
+    # --- apturēšana ---
+    def apturēt(self):
+        self._apturēts += 1
+
+    def atsākt(self):
+        self._apturēts = max(0, self._apturēts - 1)
+
+    def apturēts(self) -> bool:
+        return self._apturēts > 0
+
+    # --- pieslēgšana ---
+    def pievienot_bērnus(self, sakne: QWidget, nosaukumi: dict | None = None):
+        """Pieslēdz visus QLineEdit/QComboBox/QCheckBox zem saknes (atkārtoti pieslēgtie tiek izlaisti)."""
+        nosaukumi = nosaukumi or {}
+        for w in sakne.findChildren(QWidget):
+            if id(w) in self._izsekotie:
+                continue
+            if isinstance(w, QLineEdit):
+                # Rediģējama QComboBox/QSpinBox iekšējais QLineEdit – izseko pats vecāks
+                if isinstance(w.parent(), (QComboBox, QAbstractSpinBox)):
+                    continue
+                veids = "FIELD_EDIT"
+            elif isinstance(w, QComboBox):
+                veids = "COMBO_CHANGE"
+            elif isinstance(w, QCheckBox):
+                veids = "CHECK_TOGGLE"
+            else:
+                continue
+            self._pievienot(w, veids, self._lauka_nosaukums(w, nosaukumi))
+
+    def _lauka_nosaukums(self, w: QWidget, nosaukumi: dict) -> str:
+        vārds = nosaukumi.get(id(w))
+        if not vārds:
+            # Tuvākā nosauktā vecāka atribūts (piem., TextBlockLineEdit.line_edit -> "in_x.line_edit")
+            p = w.parentWidget()
+            while p is not None and id(p) not in nosaukumi:
+                p = p.parentWidget()
+            attr = ""
+            if p is not None:
+                attr = next((k for k, v in vars(p).items() if v is w), "")
+            if isinstance(w, QCheckBox):
+                sava = attr or w.objectName() or w.text()
+            elif isinstance(w, QLineEdit):
+                sava = attr or w.objectName() or w.placeholderText()
+            else:
+                sava = attr or w.objectName()
+            sava = sava or type(w).__name__
+            vārds = f"{nosaukumi[id(p)]}.{sava}" if p is not None else sava
+        bāze, n = vārds, 1
+        while vārds in self._lauki:
+            n += 1
+            vārds = f"{bāze}#{n}"
+        return vārds
+
+    def _pievienot(self, w: QWidget, veids: str, lauks: str):
+        self._izsekotie.add(id(w))
+        vērt = self._nolasīt(w, veids)
+        self._lauki[lauks] = {"w": w, "veids": veids, "zināmā": vērt, "iepriekšējā": vērt, "sākums": self._NAV}
+        if veids == "FIELD_EDIT":
+            w.textChanged.connect(lambda t, l=lauks: self._teksts_mainīts(l, t))
+            w.textEdited.connect(lambda t, l=lauks: self._teksts_rediģēts(l, t))
+            w.editingFinished.connect(lambda l=lauks: self._pabeigt(l))
+        elif veids == "COMBO_CHANGE":
+            w.currentIndexChanged.connect(lambda _i, l=lauks: self._vērtība_mainīta(l))
+        else:
+            w.toggled.connect(lambda _b, l=lauks: self._vērtība_mainīta(l))
+
+    @staticmethod
+    def _nolasīt(w: QWidget, veids: str):
+        if veids == "FIELD_EDIT":
+            return w.text()
+        if veids == "COMBO_CHANGE":
+            return w.currentText()
+        return bool(w.isChecked())
+
+    # --- vienkāršie lauki ---
+    def _teksts_mainīts(self, lauks: str, teksts: str):
+        e = self._lauki[lauks]
+        e["iepriekšējā"], e["zināmā"] = e["zināmā"], teksts
+        self.lauks_mainīts.emit(lauks)
+
+    def _teksts_rediģēts(self, lauks: str, teksts: str):
+        e = self._lauki[lauks]
+        if self._apturēts or e["sākums"] is not self._NAV:
+            return
+        # textChanged parasti jau ir apstrādāts – tad vērtība pirms rediģēšanas ir "iepriekšējā"
+        e["sākums"] = e["iepriekšējā"] if e["zināmā"] == teksts else e["zināmā"]
+
+    def _vērtība_mainīta(self, lauks: str):
+        e = self._lauki[lauks]
+        try:
+            jaunā = self._nolasīt(e["w"], e["veids"])
+        except RuntimeError:  # logrīks jau izdzēsts
+            return
+        vecā, e["zināmā"] = e["zināmā"], jaunā
+        self.lauks_mainīts.emit(lauks)
+        if not self._apturēts and vecā != jaunā:
+            self.izmaiņa_pabeigta.emit({"label": e["veids"], "lauks": lauks, "vecā": vecā, "jaunā": jaunā})
+
+    def _pabeigt(self, lauks: str):
+        e = self._lauki[lauks]
+        vecā, e["sākums"] = e["sākums"], self._NAV
+        if vecā is self._NAV or vecā == e["zināmā"]:
+            return
+        self.izmaiņa_pabeigta.emit({"label": e["veids"], "lauks": lauks, "vecā": vecā, "jaunā": e["zināmā"]})
+
+    def pabeigt_visus(self):
+        """Noslēdz atvērtās rediģēšanas sesijas (piem., pirms undo), lai tās nonāk undo stekā."""
+        for lauks, e in self._lauki.items():
+            if e["sākums"] is not self._NAV:
+                self._pabeigt(lauks)
+        if self._tab_taimeris.isActive():
+            self._tab_taimeris.stop()
+            self._pabeigt_tabulu()
+
+    # --- pozīciju tabula ---
+    def pievienot_tabulu(self, tab: QTableWidget, izlaistās_kolonnas=()):
+        """Izseko tabulas šūnas (cellChanged); izlaistās_kolonnas ir aprēķinātas (piem., summa) un undo neiekļauj."""
+        self._tab = tab
+        self._tab_izlaistās = tuple(izlaistās_kolonnas)
+        self._tab_pārlasīt()
+        tab.cellChanged.connect(self._šūna_mainīta)
+        m = tab.model()
+        m.rowsInserted.connect(self._tab_rindas_ievietotas)
+        m.rowsRemoved.connect(self._tab_rindas_dzēstas)
+        for sig in (m.rowsMoved, m.layoutChanged, m.modelReset, m.columnsInserted, m.columnsRemoved, m.columnsMoved):
+            sig.connect(self._tab_pārbūvēta)
+
+    def _tab_šūnas_teksts(self, r: int, c: int) -> str:
+        it = self._tab.item(r, c)
+        return it.text() if it else ""
+
+    def _tab_rinda(self, r: int) -> list:
+        return [self._tab_šūnas_teksts(r, c) for c in range(self._tab.columnCount())]
+
+    def _tab_pārlasīt(self):
+        self._tab_ēna = [self._tab_rinda(r) for r in range(self._tab.rowCount())]
+
+    def _šūna_mainīta(self, r: int, c: int):
+        ēna = self._tab_ēna
+        if r >= len(ēna) or c >= len(ēna[r]):
+            self._tab_pārlasīt()
+            ēna = self._tab_ēna
+            vecā = None
+        else:
+            vecā = ēna[r][c]
+        jaunā = self._tab_šūnas_teksts(r, c)
+        ēna[r][c] = jaunā
+        self.lauks_mainīts.emit("pozīcijas")
+        if self._apturēts or vecā is None or vecā == jaunā or c in self._tab_izlaistās:
+            return
+        self._tab_gaida.append((r, c, vecā, jaunā))
+        self._tab_taimeris.start(700)
+
+    def _pabeigt_tabulu(self):
+        gaida, self._tab_gaida = self._tab_gaida, []
+        # Vienas šūnas secīgas izmaiņas apvieno: pirmā vecā vērtība -> pēdējā jaunā
+        šūnas = {}
+        for r, c, vecā, jaunā in gaida:
+            sākums = šūnas.get((r, c), (vecā,))[0]
+            šūnas[(r, c)] = (sākums, jaunā)
+        ieraksti = [(r, c, v, j) for (r, c), (v, j) in šūnas.items() if v != j]
+        if ieraksti:
+            self.izmaiņa_pabeigta.emit({"label": "POZ_CHANGE", "šūnas": ieraksti})
+
+    def _tab_rindas_ievietotas(self, _parent, first: int, last: int):
+        n = last - first + 1
+        self._tab_ēna[first:first] = [self._tab_rinda(r) for r in range(first, last + 1)]
+        self._tab_gaida = [(r + n if r >= first else r, c, v, j) for r, c, v, j in self._tab_gaida]
+        self.tabulas_rindas_pārbīdītas.emit(first, n)
+
+    def _tab_rindas_dzēstas(self, _parent, first: int, last: int):
+        n = last - first + 1
+        del self._tab_ēna[first:last + 1]
+        self._tab_gaida = [(r - n if r > last else r, c, v, j) for r, c, v, j in self._tab_gaida if not first <= r <= last]
+        self.tabulas_rindas_pārbīdītas.emit(first, -n)
+
+    def _tab_pārbūvēta(self, *_args):
+        self._tab_gaida = []
+        self._tab_pārlasīt()
+        self.tabula_pārbūvēta.emit()
+
+    # --- undo/redo ---
+    def piemērot(self, ieraksts: dict, atsaukt: bool):
+        """Uzstāda ieraksta veco (atsaukt=True) vai jauno vērtību, neveidojot jaunu ierakstu."""
+        atslēga = "vecā" if atsaukt else "jaunā"
+        self.apturēt()
+        try:
+            if "šūnas" in ieraksts:
+                if self._tab is None:
+                    return
+                for r, c, vecā, jaunā in ieraksts["šūnas"]:
+                    if r >= self._tab.rowCount() or c >= self._tab.columnCount():
+                        continue
+                    it = self._tab.item(r, c)
+                    if it is None:
+                        self._tab.setItem(r, c, QTableWidgetItem(vecā if atsaukt else jaunā))
+                    else:
+                        it.setText(vecā if atsaukt else jaunā)
+                return
+            e = self._lauki.get(ieraksts.get("lauks"))
+            if e is None:
+                return
+            w, vērt = e["w"], ieraksts[atslēga]
+            if e["veids"] == "FIELD_EDIT":
+                w.setText(vērt)
+            elif e["veids"] == "COMBO_CHANGE":
+                i = w.findText(vērt)
+                if i >= 0:
+                    w.setCurrentIndex(i)
+                elif w.isEditable():
+                    w.setEditText(vērt)
+            else:
+                w.setChecked(bool(vērt))
+        finally:
+            self.atsākt()
 
 
 
 
 # Pārliecināmies, ka direktoriji eksistē
-os.makedirs(SETTINGS_DIR, exist_ok=True)
-os.makedirs(DEFAULT_OUTPUT_DIR, exist_ok=True)
-os.makedirs(PROJECT_SAVE_DIR, exist_ok=True)
-# os.makedirs(TEMPLATES_DIR, exist_ok=True) # JAUNA RINDAS - Tagad dinamiski iestatīts AktaDati objektā
+sagatavot_lietotnes_mapes()
+
+
+# ---------------------- Starta budžets ----------------------
+# Laiks no moduļa ielādes sākuma līdz brīdim, kad galvenais logs ir parādīts un notikumu cilpa
+# apstrādā pirmo notikumu (forma lietojama). Plāniem klientiem mērķis ir krietni zem sekundes.
+STARTUP_BUDGET_S = 0.6
+
+
+def _pieraksti_starta_laiku(posmi: dict):
+    """Izdrukā starta posmu laikus, ja budžets pārsniegts vai ir AKTA_STARTUP_PROFILE=1.
+
+    posmi: {posma nosaukums: time.perf_counter() vērtība}, secībā.
+    """
+    try:
+        kopā = posmi[next(reversed(posmi))] - _STARTUP_T0
+        if kopā <= STARTUP_BUDGET_S and os.getenv("AKTA_STARTUP_PROFILE") != "1":
+            return
+        prev = _STARTUP_T0
+        daļas = []
+        for nosaukums, t in posmi.items():
+            daļas.append(f"{nosaukums} {(t - prev) * 1000:.0f} ms")
+            prev = t
+        stāvoklis = "pārsniegts" if kopā > STARTUP_BUDGET_S else "ok"
+        print(f"Starts: {kopā * 1000:.0f} ms (budžets {STARTUP_BUDGET_S * 1000:.0f} ms, {stāvoklis}) — "
+              + ", ".join(daļas))
+    except Exception:
+        pass
 
 
 
@@ -359,24 +619,6 @@ def apply_modern_theme(app: QApplication, dark: bool = True):
         QMessageBox { font-size: 10.5pt; }
     """)
 
-# ---------------------- Datu modeļi ----------------------
-# (unchanged)
-
-@dataclass
-class Persona:
-    nosaukums: str = ""
-    reģ_nr: str = ""
-    adrese: str = ""
-    kontaktpersona: str = ""
-    amats: str = ""
-    pilnvaras_pamats: str = ""
-    tālrunis: str = ""
-    epasts: str = ""
-    web_lapa: str = ""
-    bankas_konts: str = ""
-    juridiskais_statuss: str = ""
-
-
 class MapBridge(QObject):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -427,424 +669,176 @@ class TextBlockManager:
         return self.text_blocks.get(field_name, {}).get(block_name, "")
 
 
-@dataclass
-class Pozīcija:
-    apraksts: str
-    daudzums: Decimal
-    vienība: str
-    cena: Decimal
-    seriālais_nr: str = ""
-    garantija: str = ""
-    piezīmes_pozīcijai: str = ""
-    attēla_ceļš: str = ""
+# Priekšskatījuma rastrēšanas izšķirtspēja: tik, cik vajag skatlaukam × zoom (nevis pdf2image 200 DPI)
+PREVIEW_MIN_DPI = 36
+PREVIEW_MAX_DPI = 400
+PREVIEW_DPI_STEP = 12  # noapaļojam uz augšu, lai nelielas izmēra izmaiņas neprasītu jaunu renderēšanu
 
-    @property
-    def summa(self) -> Decimal:
-        try:
-            return (self.daudzums * self.cena).quantize(Decimal("0.01"))
-        except Exception:
-            return Decimal("0.00")
-
-@dataclass
-class Attēls:
-    ceļš: str
-    paraksts: str = ""
-
-
-@dataclass
-class AtsaucesDokuments:
-    """Reāls atsauces dokuments, ko pievieno PDF beigās kā atvasinājumu."""
-    ceļš: str
-    nosaukums: str = ""
-
-
-@dataclass
-class AktaDati:
-    akta_nr: str = ""
-    datums: str = ""  # YYYY-MM-DD
-    vieta: str = ""
-    pasūtījuma_nr: str = ""
-    pieņēmējs: Persona = field(default_factory=Persona)
-    nodevējs: Persona = field(default_factory=Persona)
-    pozīcijas: list = field(default_factory=list)  # list[Pozīcija]
-    attēli: list = field(default_factory=list)
-    piezīmes: str = ""
-    iekļaut_pvn: bool = False
-    pvn_likme: Decimal = Decimal("21.0")
-    parakstu_rindas: bool = True
-    logotipa_ceļš: str = ""
-    fonts_ceļš: str = ""  # TTF/OTF
-    paraksts_pieņēmējs_ceļš: str = ""
-    paraksts_nodevējs_ceļš: str = ""
-    līguma_nr: str = ""
-    izpildes_termiņš: str = ""
-    pieņemšanas_datums: str = ""
-    nodošanas_datums: str = ""
-    strīdu_risināšana: str = ""
-    konfidencialitātes_klauzula: bool = False
-    soda_nauda_procenti: Decimal = Decimal("0.0")
-    piegādes_nosacījumi: str = ""
-    apdrošināšana: bool = False
-    apdrošināšana_teksts: str = ""
-    papildu_nosacījumi: str = ""
-    atsauces_dokumenti: str = ""
-    atsauces_dokumenti_faili: list = field(default_factory=list)  # list[AtsaucesDokuments]
-    akta_statuss: str = "Melnraksts"
-    valūta: str = "EUR"
-    elektroniskais_paraksts: bool = False
-    radit_elektronisko_parakstu_tekstu: bool = False # JAUNS LAUKS
-    qr_kods_enabled: bool = True  # QR kods apakšā pa kreisi
-    qr_kods_ieklaut_pozicijas: bool = True
-    qr_only_first_page: bool = False
-    qr_verification_url_enabled: bool = False
-    qr_verification_base_url: str = ""
-    qr_kods_izmers_mm: Decimal = Decimal("25.0")
-
-    # Jauni iestatījumu lauki
-    pdf_page_size: str = "A4"
-    pdf_page_orientation: str = "Portrets"
-    pdf_margin_left: Decimal = Decimal("18")
-    pdf_margin_right: Decimal = Decimal("18")
-    pdf_margin_top: Decimal = Decimal("16")
-    pdf_margin_bottom: Decimal = Decimal("16")
-    pdf_font_size_head: int = 14
-    pdf_font_size_normal: int = 10
-    pdf_font_size_small: int = 9
-    pdf_font_size_table: int = 9
-    pdf_logo_width_mm: Decimal = Decimal("35")
-    pdf_signature_width_mm: Decimal = Decimal("50")
-    pdf_signature_height_mm: Decimal = Decimal("20")
-    docx_image_width_inches: Decimal = Decimal("4")
-    docx_signature_width_inches: Decimal = Decimal("1.5")
-    table_col_widths: str = "10,40,18,18,20,20,25,25,25" # Komatiem atdalīti platumi mm
-    auto_generate_akta_nr: bool = True
-    default_execution_days: int = 5  # Noklusējuma dienu skaits izpildes termiņam (datums + N)
-    default_currency: str = "EUR"
-    default_unit: str = "gab."
-    default_pvn_rate: Decimal = Decimal("21.0")
-    poppler_path: str = ""
-    # Jauni iestatījumi, lai sasniegtu "30+"
-    header_text_color: str = "#000000" # Hex krāsa
-    footer_text_color: str = "#000000"
-    table_header_bg_color: str = "#E0E0E0"
-    table_grid_color: str = "#CCCCCC"
-    table_row_spacing: Decimal = Decimal("4") # mm
-    line_spacing_multiplier: Decimal = Decimal("1.2") # Reizinātājs fonta izmēram
-    show_page_numbers: bool = True
-    show_generation_timestamp: bool = True
-    currency_symbol_position: str = "after" # "before" or "after"
-    date_format: str = "YYYY-MM-DD"
-    signature_line_length_mm: Decimal = Decimal("60")
-    signature_line_thickness_pt: Decimal = Decimal("0.5")
-    add_cover_page: bool = False
-    cover_page_title: str = "Pieņemšanas-Nodošanas Akts"
-    cover_page_logo_width_mm: Decimal = Decimal("80")
-    # Individuālais QR kods
-    include_custom_qr_code: bool = False
-    custom_qr_code_data: str = ""
-    custom_qr_code_size_mm: Decimal = Decimal("20")
-    custom_qr_code_position: str = "bottom_right"
-    custom_qr_code_pos_x_mm: Decimal = Decimal("0")  # Custom X pozīcija mm
-    custom_qr_code_pos_y_mm: Decimal = Decimal("0")  # Custom Y pozīcija mm
-    custom_qr_code_color: str = "#000000"  # QR koda krāsa (Hex)
-    # Automātiskais QR kods (akta ID)
-    include_auto_qr_code: bool = False
-    auto_qr_code_size_mm: Decimal = Decimal("20")
-    auto_qr_code_position: str = "bottom_left"
-    auto_qr_code_pos_x_mm: Decimal = Decimal("0")  # Custom X pozīcija mm
-    auto_qr_code_pos_y_mm: Decimal = Decimal("0")  # Custom Y pozīcija mm
-    auto_qr_code_color: str = "#000000"  # QR koda krāsa (Hex)
-
-    add_watermark: bool = False
-    watermark_text: str = "MELNRAKSTS"
-    watermark_font_size: int = 72
-    watermark_color: str = "#E0E0E0"
-    watermark_rotation: int = 45
-    enable_pdf_encryption: bool = False
-    pdf_user_password: str = ""
-    pdf_owner_password: str = ""
-    allow_printing: bool = True
-    allow_copying: bool = True
-    allow_modifying: bool = False
-    allow_annotating: bool = True
-    # Papildu lauki, lai sasniegtu 30+
-    default_country: str = "Latvija"
-    default_city: str = "Rīga"
-    show_contact_details_in_header: bool = False
-    contact_details_header_font_size: int = 8
-    item_image_width_mm: Decimal = Decimal("50") # Platums attēliem pie pozīcijām
-    item_image_caption_font_size: int = 8
-    show_item_notes_in_table: bool = True
-    show_item_serial_number_in_table: bool = True
-    show_item_warranty_in_table: bool = True
-    show_item_photo_in_table: bool = True
-    table_cell_padding_mm: Decimal = Decimal("2")
-    table_header_font_style: str = "bold" # "bold", "italic", "normal"
-    table_content_alignment: str = "left" # "left", "center", "right"
-    signature_font_size: int = 9
-    signature_spacing_mm: Decimal = Decimal("10") # Atstarpe starp paraksta rindu un vārdu
-    # Vēl daži, lai pārsniegtu 30
-    document_title_font_size: int = 18
-    document_title_color: str = "#000000"
-    section_heading_font_size: int = 12
-    section_heading_color: str = "#000000"
-    paragraph_line_spacing_multiplier: Decimal = Decimal("1.2")
-    table_border_style: str = "solid" # "solid", "dashed", "none"
-    table_border_thickness_pt: Decimal = Decimal("0.5")
-    table_alternate_row_color: str = "" # Hex krāsa, piem. "#F0F0F0"
-    # Papildu lauki, lai sasniegtu 30+
-    show_total_sum_in_words: bool = False
-    total_sum_in_words_language: str = "lv" # "lv", "en"
-    # Papildu lauki, lai sasniegtu 30+
-    default_vat_calculation_method: str = "exclusive" # "exclusive", "inclusive"
-    show_vat_breakdown: bool = True
-    # Papildu lauki, lai sasniegtu 30+
-    enable_digital_signature_field: bool = False # PDF digitālā paraksta lauks
-    digital_signature_field_name: str = "Paraksts"
-    digital_signature_field_size_mm: Decimal = Decimal("40")
-    digital_signature_field_position: str = "bottom_center"  # "bottom_left", "bottom_right", "top_left", "top_right", "bottom_center"
-    template_password: str = ""  # Parole šablonam
-    templates_dir: str = ""  # JAUNA RINDAS - Šablonu saglabāšanas direktorijs
-    docx_template_path: str = ""  # (ja vēlies) DOCX šablons ar {{placeholders}}
-    custom_columns: list = field(
-    default_factory=list)  # Saraksts ar pielāgotajām kolonnām: [{'name': 'Kolonna1', 'data': []}]
-
-    # --- JAUNS: Pozīciju tabulas kolonnu pārvaldība (UI + PDF) ---
-    # poz_columns_config struktūra:
-    # {
-    #   "nr": {"title": "Nr.", "visible": True},
-    #   "apraksts": {"title": "Apraksts", "visible": True},
-    #   "daudzums": {"title": "Daudzums", "visible": True},
-    #   "vieniba": {"title": "Vienība", "visible": True},
-    #   "cena": {"title": "Cena", "visible": True},
-    #   "summa": {"title": "Summa", "visible": True},
-    #   "serial": {"title": "Seriālais Nr.", "visible": True},
-    #   "warranty": {"title": "Garantija", "visible": True},
-    #   "notes": {"title": "Piezīmes pozīcijai", "visible": True},
-    #   "foto": {"title": "Foto", "visible": True}
-    # }
-    poz_columns_config: dict = field(default_factory=dict)
-
-    # Vai rādīt cenu apkopojumu (kopsavilkumu) zem pozīciju tabulas (PDF)
-    show_price_summary: bool = True
-    # Saglabā lietotāja kolonnu secību Pozīciju tabulai (UI -> PDF)
-    poz_columns_visual_order: list = field(default_factory=list)
-    # Saglabā kolonnu platumus/izkārtojumu (QHeaderView.saveState) Pozīciju tabulai (UI)
-    poz_header_state_b64: str = ""
-    def kopējā_summma(self):
-        s = sum((p.summa for p in self.pozīcijas), Decimal("0.00"))
-        return s.quantize(Decimal("0.01"))
-
-    def pvn_summa(self):
-        if not self.iekļaut_pvn:
-            return Decimal("0.00")
-        pvn = self.kopējā_summma() * (self.pvn_likme / Decimal("100"))
-        return pvn.quantize(Decimal("0.01"))
-
-    def summa_ar_pvn(self):
-        return (self.kopējā_summma() + self.pvn_summa()).quantize(Decimal("0.01"))
-
-
-def _default_poz_columns_config() -> dict:
-    """Noklusētā pozīciju kolonnu konfigurācija (UI + PDF)."""
-    return {
-        "nr": {"title": "Nr.", "visible": True},
-        "apraksts": {"title": "Apraksts", "visible": True},
-        "daudzums": {"title": "Daudzums", "visible": True},
-        "vieniba": {"title": "Vienība", "visible": True},
-        "cena": {"title": "Cena", "visible": True},
-        "summa": {"title": "Summa", "visible": True},
-        "serial": {"title": "Seriālais Nr.", "visible": True},
-        "warranty": {"title": "Garantija", "visible": True},
-        "notes": {"title": "Piezīmes pozīcijai", "visible": True},
-        "foto": {"title": "Foto", "visible": True},
-    }
-
-
-def _merge_poz_columns_config(cfg: Optional[dict]) -> dict:
-    """Droši apvieno lietotāja konfigurāciju ar noklusējuma vērtībām."""
-    base = _default_poz_columns_config()
-    out = {}
-    cfg = cfg if isinstance(cfg, dict) else {}
-    for k, v in base.items():
-        cur = cfg.get(k, {}) if isinstance(cfg.get(k, {}), dict) else {}
-        out[k] = {
-            "title": str(cur.get("title", v.get("title", ""))),
-            "visible": bool(cur.get("visible", v.get("visible", True))),
-        }
-    # Saglabājam arī nezināmus atslēgu ierakstus (ja nākotnē pievieno jaunas kolonnas)
-    for k, cur in cfg.items():
-        if k in out:
-            continue
-        if isinstance(cur, dict):
-            out[k] = {"title": str(cur.get("title", k)), "visible": bool(cur.get("visible", True))}
-    return out
-
-# ---------------------- Palīgfunkcijas ----------------------
-# (unchanged)
-def to_decimal(val) -> Decimal:
-    if isinstance(val, Decimal):
-        return val
-    try:
-        s = str(val).replace(" ", "").replace(",", ".")
-        return Decimal(s)
-    except (InvalidOperation, ValueError):
-        return Decimal("0")
-
-def formēt_naudu(d: Decimal) -> str:
-    return f"{d:.2f}"
-
-def drošs_faila_nosaukums(s: str) -> str:
-    bad = '\\/:*?"<>|'
-    for ch in bad:
-        s = s.replace(ch, "_")
-    return s.strip() or "akts"
-
-def _coerce_path(p):
-    """Normalizē ievadi uz faila ceļu (str) vai atgriež None.
-    Vajadzīgs, jo dažās vietās signāli/ieraksti var nodot dict/tuple u.c.
-    Pieņem arī dict ar tipiskām atslēgām: path, ceļš, file, filepath, json, pdf.
+
+def _priekšskatījuma_dpi(page_size_pt: tuple, target_px: tuple) -> int:
+    """DPI, ar kādu lapa (platums, augstums punktos) ietilpst target_px (platums, augstums pikseļos)."""
+    pw_pt, ph_pt = page_size_pt
+    tw, th = target_px
+    if pw_pt <= 0 or ph_pt <= 0 or tw <= 0 or th <= 0:
+        return PREVIEW_MIN_DPI
+    dpi = min(tw / (pw_pt / 72.0), th / (ph_pt / 72.0))
+    dpi = int(math.ceil(dpi / PREVIEW_DPI_STEP) * PREVIEW_DPI_STEP)
+    return max(PREVIEW_MIN_DPI, min(PREVIEW_MAX_DPI, dpi))
+
+
+# Priekšskatījuma atmiņas kešs (QPixmap); settings.json: "preview_cache_mb", "preview_disk_cache"
+PREVIEW_MEMORY_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+class _PreviewCache:
+    """Priekšskatījuma lapu (QPixmap saraksts pēc datu hash) atmiņas kešs ar baitu budžetu.
+
+    Izmēru skaitām pēc pikseļiem (platums × augstums × baiti pikselī); pārsniedzot
+    max_bytes, izmetam ilgāk nelietotos ierakstus (īsts LRU: get() atjauno secību).
     """
-    if p is None:
-        return None
-    # Qt signāli dažreiz padod bool (checked). To ignorējam.
-    if isinstance(p, bool):
-        return None
-    # Ja padots tuple/list (piem. (path, filter))
-    if isinstance(p, (list, tuple)) and p:
-        return _coerce_path(p[0])
-    # Ja padots dict ar ceļu
-    if isinstance(p, dict):
-        for k in ("path", "ceļš", "celsh", "file", "filepath", "json", "pdf", "value"):
-            v = p.get(k)
-            if isinstance(v, (str, bytes, os.PathLike)) and v:
-                return os.fspath(v)
-        return None
-    # Parasts path-like
-    if isinstance(p, (str, bytes, os.PathLike)):
-        try:
-            s = os.fspath(p)
-        except Exception:
+
+    def __init__(self, max_bytes: int = PREVIEW_MEMORY_CACHE_MAX_BYTES):
+        self.max_bytes = int(max_bytes)
+        self.total_bytes = 0
+        self._items: "OrderedDict[str, tuple]" = OrderedDict()  # hash -> (images, bytes)
+
+    @staticmethod
+    def _pixmap_bytes(pixmap) -> int:
+        if pixmap is None:
+            return 0
+        return pixmap.width() * pixmap.height() * max(1, pixmap.depth() // 8)
+
+    def get(self, key: str) -> Optional[list]:
+        item = self._items.get(key)
+        if item is None:
             return None
-        return s if s else None
-    # Cits tips (piem. int fd) šeit nav vajadzīgs
-    return None
+        self._items.move_to_end(key)
+        return item[0]
 
+    def put(self, key: str, images: list):
+        size = sum(self._pixmap_bytes(p) for p in images)
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.total_bytes -= old[1]
+        if size > self.max_bytes:
+            return  # viens dokuments lielāks par visu budžetu – nekešojam
+        self._items[key] = (list(images), size)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes and len(self._items) > 1:
+            _k, (_imgs, b) = self._items.popitem(last=False)
+            self.total_bytes -= b
 
+    def clear(self):
+        self._items.clear()
+        self.total_bytes = 0
 
+    def __contains__(self, key) -> bool:
+        return key in self._items
 
-def _path_exists(p) -> bool:
-    """Droša os.path.exists versija, kas pieņem arī dict/tuple u.c."""
-    pp = _coerce_path(p)
-    if not pp:
-        return False
-    try:
-        return os.path.exists(pp)
-    except Exception:
-        return False
+    def __len__(self) -> int:
+        return len(self._items)
 
-def _atomic_write_bytes(target_path: str, data: bytes):
-    """Droši pārraksta failu (Windows lock-safe): raksta uz pagaidu failu un tad os.replace()."""
-    try:
-        target_path = os.path.abspath(target_path)
-        os.makedirs(os.path.dirname(target_path), exist_ok=True)
-    except Exception:
-        pass
 
-    tmp_fd = None
-    tmp_path = None
-    try:
-        # Pagaidu fails tajā pašā mapē (lai os.replace būtu atomisks arī Windows)
-        dir_name = os.path.dirname(os.path.abspath(target_path)) or "."
-        fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".pdf", dir=dir_name)
-        tmp_fd = fd
-        with os.fdopen(fd, "wb") as f:
-            f.write(data)
-        tmp_fd = None
-        os.replace(tmp_path, target_path)
-        tmp_path = None
-    finally:
-        try:
-            if tmp_fd is not None:
-                os.close(tmp_fd)
-        except Exception:
-            pass
-        try:
-            if tmp_path and os.path.exists(tmp_path):
-                os.remove(tmp_path)
+def _qimage_png_bytes(image: QImage) -> bytes:
+    """QImage -> PNG baiti (drīkst izsaukt fona pavedienā)."""
+    from PySide6.QtCore import QBuffer, QIODevice
+    buf = QBuffer()
+    buf.open(QIODevice.WriteOnly)
+    image.save(buf, "PNG")
+    return bytes(buf.data())
+
+
+# Priekšskatījuma rastrētājs: "auto" = QtPdf procesā, ja pieejams, citādi poppler (pdftoppm)
+PREVIEW_RASTERIZER = "auto"  # "auto" | "qtpdf" | "poppler"
+
+
+class _QtPdfRastrētājs:
+    """Renderē PDF lapas procesā ar QtPdf (pdfium) tieši QImage – bez apakšprocesiem un PNG.
+
+    Drīkst lietot fona pavedienā (QImage/QPainter, ne QPixmap).
+    """
+
+    nosaukums = "qtpdf"
+
+    def __init__(self, pdf_path: str):
+        from PySide6.QtPdf import QPdfDocument
+        self._doc = QPdfDocument(None)
+        err = self._doc.load(pdf_path)
+        if err != QPdfDocument.Error.None_:
+            raise RuntimeError(f"QtPdf neizdevās atvērt PDF: {err}")
+
+    def page_count(self) -> int:
+        return self._doc.pageCount()
+
+    def page_size_pt(self, index: int) -> tuple:
+        sz = self._doc.pagePointSize(index)
+        return (sz.width(), sz.height())
+
+    def render(self, index: int, dpi: int) -> QImage:
+        pw, ph = self.page_size_pt(index)
+        size = QSize(max(1, round(pw * dpi / 72.0)), max(1, round(ph * dpi / 72.0)))
+        page = self._doc.render(index, size)
+        # QtPdf atgriež caurspīdīgu fonu; lapa priekšskatījumā ir balta
+        out = QImage(size, QImage.Format_RGB32)
+        out.fill(Qt.white)
+        painter = QPainter(out)
+        painter.drawImage(0, 0, page)
+        painter.end()
+        return out
+
+    def close(self):
+        try:
+            self._doc.close()
         except Exception:
             pass
 
-def _atomic_write_pdfwriter(target_path: str, writer_obj):
-    """Droši saglabā PyPDF2 PdfWriter uz failu, neatsitoties pret file-lock."""
-    buf = io.BytesIO()
-    writer_obj.write(buf)
-    _atomic_write_bytes(target_path, buf.getvalue())
 
+class _PopplerRastrētājs:
+    """Rezerves rastrētājs: pdftoppm apakšprocess (kā pdf2image), PPM no stdout -> QImage bez PNG.
 
-def _prepare_unencrypted_pdf_for_render(pdf_path: str, password: str = "") -> tuple[str, Optional[str]]:
-    """Ja PDF ir šifrēts, izveido atšifrētu pagaidu kopiju renderēšanai (poppler/pdf2image/Qt).
-    Atgriež (render_path, temp_path_to_cleanup). Ja nav šifrēts, temp_path_to_cleanup būs None.
-
-    Kāpēc tas vajadzīgs:
-    - pdf2image/poppler bieži uzkārtina procesu, ja PDF ir šifrēts.
-    - Priekšskatījums programmā nedrīkst prasīt paroli.
+    pdftoppm tiek palaists pašu rokām (nevis caur pdf2image), lai atcelšanas žetons varētu
+    nogalināt lapu, kas vēl tiek rastrēta.
     """
-    try:
-        from PyPDF2 import PdfReader, PdfWriter
-    except Exception:
-        # Ja nav PyPDF2, vienkārši mēģinām renderēt oriģinālu (labāk nekā crash)
-        return pdf_path, None
 
-    try:
-        with open(pdf_path, "rb") as rf:
-            reader = PdfReader(rf)
-            if not getattr(reader, "is_encrypted", False):
-                return pdf_path, None
+    nosaukums = "poppler"
 
-            # Mēģinām atšifrēt (PyPDF2: decrypt() atgriež 0/1/2 vai True/False atkarībā no versijas)
-            try:
-                ok = reader.decrypt(password or "")
-            except Exception:
-                ok = 0
+    def __init__(self, pdf_path: str, poppler_path: str = None, atcelšana: '_AtcelšanasŽetons' = None):
+        from PyPDF2 import PdfReader
+        self._pdf_path = pdf_path
+        self._poppler_path = poppler_path
+        self._atcelšana = atcelšana
+        self._reader = PdfReader(pdf_path)
 
-            if not ok:
-                # Nevarējām atšifrēt — neatgriežam šifrētu uz poppler (lai neuzkar),
-                # bet metīsim izņēmumu, ko UI var parādīt kā kļūdu.
-                raise RuntimeError("PDF ir šifrēts un paroli neizdevās pielietot priekšskatījumam/drukai.")
+    def page_count(self) -> int:
+        return len(self._reader.pages)
 
-            writer = PdfWriter()
-            for p in reader.pages:
-                writer.add_page(p)
+    def page_size_pt(self, index: int) -> tuple:
+        box = self._reader.pages[index].mediabox
+        return (float(box.width), float(box.height))
 
-        # Saglabājam atšifrētu pagaidu PDF tajā pašā mapē (drošāk Windows)
-        dir_name = os.path.dirname(os.path.abspath(pdf_path)) or "."
-        fd, tmp_path = tempfile.mkstemp(prefix=".tmp_decrypted_", suffix=".pdf", dir=dir_name)
-        os.close(fd)
-        _atomic_write_pdfwriter(tmp_path, writer)
-        return tmp_path, tmp_path
+    def render(self, index: int, dpi: int) -> QImage:
+        exe = os.path.join(self._poppler_path, "pdftoppm") if self._poppler_path else "pdftoppm"
+        cmd = [exe, "-r", str(int(dpi)), "-f", str(index + 1), "-l", str(index + 1), self._pdf_path]
+        returncode, out, err = _atceļams_apakšprocess(cmd, self._atcelšana, timeout=120)
+        if returncode != 0 or not out:
+            raise RuntimeError(f"pdftoppm kļūda: {(err or b'').decode('utf-8', 'replace').strip()}")
+        return QImage.fromData(out, "PPM")
 
-    except Exception:
-        # Ja kaut kas noiet greizi, labāk lai caller redz kļūdu (nevis hang).
-        raise
+    def close(self):
+        self._reader = None
 
 
-def reģistrēt_fontu(font_ceļš: str, vārds: str = "DokFont") -> str:
-    if not font_ceļš or not os.path.exists(font_ceļš):
+def _atvērt_priekšskatījuma_rastrētāju(pdf_path: str, poppler_path: str = None, atcelšana: '_AtcelšanasŽetons' = None):
+    """Atver PDF ar QtPdf; ja tas nav pieejams vai neizdodas, izmanto poppler (atceļamu ar žetonu)."""
+    if PREVIEW_RASTERIZER in ("auto", "qtpdf"):
         try:
-            if sys.platform == "win32":
-                system_font_path = os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts", "Arial.ttf")
-                if os.path.exists(system_font_path):
-                    pdfmetrics.registerFont(TTFont(vārds, system_font_path))
-                    return vārds
-            return "Helvetica"
-        except Exception:
-            return "Helvetica"
-    try:
-        pdfmetrics.registerFont(TTFont(vārds, font_ceļš))
-        return vārds
-    except Exception:
-        return "Helvetica"
+            return _QtPdfRastrētājs(pdf_path)
+        except Exception as e:
+            if PREVIEW_RASTERIZER == "qtpdf":
+                raise
+            print(f"QtPdf priekšskatījums nav pieejams, izmanto poppler: {e}")
+    return _PopplerRastrētājs(pdf_path, poppler_path, atcelšana)
+
 
 def render_pdf_to_image(pdf_path: str, poppler_path: str = None, password: str = "") -> QPixmap:
     """
@@ -856,6 +850,7 @@ def render_pdf_to_image(pdf_path: str, poppler_path: str = None, password: str =
     :return: QPixmap objekts ar PDF lapas attēlu.
     """
     try:
+        from pdf2image import convert_from_path
         render_path, tmp_cleanup = _prepare_unencrypted_pdf_for_render(pdf_path, password=password)
         try:
             images = convert_from_path(render_path, first_page=1, last_page=1, poppler_path=poppler_path)
@@ -884,2278 +879,49 @@ def render_pdf_to_image(pdf_path: str, poppler_path: str = None, password: str =
             None,
             "PDF renderēšanas kļūda",
             "Neizdevās renderēt PDF priekšskatījumu. "
-            "Ja PDF ir šifrēts, pārliecinieties, ka parole ir pareiza. "
-            f"\nKļūda: {e}"
-        )
-        return QPixmap()
-
-# Lapu numerācija PDF dokumentam
-
-
-# Lapu numerācija + dekorācijas PDF dokumentam
-class DecoratedCanvas(canvas.Canvas):
-    """Canvas, kas pievieno lapu numerāciju, ūdenszīmi un QR kodus (ja ieslēgts)."""
-
-    def __init__(self, *args, **kwargs):
-        self.pages = []
-        self.akta_dati: AktaDati = kwargs.pop("akta_dati", None)
-        self.show_page_numbers = kwargs.pop("show_page_numbers", True)
-        super().__init__(*args, **kwargs)
-
-        # Sagatavojam QR kodu attēlus vienreiz (ja vajag)
-        self._qr_images = []
-        try:
-            if self.akta_dati:
-                qr_items = []
-                if self.akta_dati.include_custom_qr_code and self.akta_dati.custom_qr_code_data:
-                    qr_items.append(("custom", self.akta_dati.custom_qr_code_data,
-                                     float(self.akta_dati.custom_qr_code_size_mm),
-                                     self.akta_dati.custom_qr_code_position,
-                                     float(self.akta_dati.custom_qr_code_pos_x_mm),
-                                     float(self.akta_dati.custom_qr_code_pos_y_mm)))
-                if self.akta_dati.include_auto_qr_code and self.akta_dati.akta_nr:
-                    qr_items.append(("auto", self.akta_dati.akta_nr,
-                                     float(self.akta_dati.auto_qr_code_size_mm),
-                                     self.akta_dati.auto_qr_code_position,
-                                     float(self.akta_dati.auto_qr_code_pos_x_mm),
-                                     float(self.akta_dati.auto_qr_code_pos_y_mm)))
-
-                if qr_items:
-                    import qrcode
-                    from reportlab.lib.utils import ImageReader
-                    for _, data, size_mm, pos, x_mm, y_mm in qr_items:
-                        qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L,
-                                           box_size=10, border=2)
-                        qr.add_data(data)
-                        qr.make(fit=True)
-                        img = qr.make_image(fill_color="black", back_color="white")
-                        # ImageReader strādā ar PIL Image
-                        self._qr_images.append({
-                            "reader": ImageReader(img),
-                            "size_pt": size_mm * mm,
-                            "pos": pos,
-                            "x_pt": x_mm * mm,
-                            "y_pt": y_mm * mm,
-                        })
-        except Exception as e:
-            # Nekrītam ārā, ja qrcode nav uzinstalēts vai rodas kļūda
-            print(f"QR sagatavošanas kļūda: {e}")
-            self._qr_images = []
-
-    def showPage(self):
-        self.pages.append(dict(self.__dict__))
-        self._startPage()
-
-    def save(self):
-        page_count = len(self.pages)
-        for page in self.pages:
-            self.__dict__.update(page)
-
-            # Dekorācijas uz katras lapas
-            self._draw_staple_mark()
-            self._draw_watermark()
-            self._draw_qr_codes()
-
-            if self.show_page_numbers:
-                self._draw_page_number(page_count)
-
-            canvas.Canvas.showPage(self)
-        canvas.Canvas.save(self)
-
-
-    def _draw_staple_mark(self):
-        """Uzzīmē īsu vertikālu līniju augšējā kreisajā stūrī (skavotāja atzīme) uz katras lapas."""
-        try:
-            w, h = self._pagesize
-            self.saveState()
-            # Diskrēta, drukai draudzīga krāsa
-            self.setStrokeColor(colors.HexColor("#94A3B8"))  # slate-400
-            self.setLineWidth(0.7)
-            # Pozīcija: nedaudz no kreisās malas, pie augšas
-            x = 6 * mm
-            y1 = h - 12 * mm
-            y2 = h - 32 * mm
-            self.line(x, y1, x, y2)
-            self.restoreState()
-        except Exception:
-            try:
-                self.restoreState()
-            except Exception:
-                pass
-
-    def _draw_page_number(self, page_count: int):
-        # Augšējais labais stūris
-        self.setFont("Helvetica", 9)
-        w, h = self._pagesize
-        self.drawRightString(w - 18 * mm, h - 10 * mm, f"Lapa {self._pageNumber} no {page_count}")
-
-    def _draw_watermark(self):
-        if not self.akta_dati or not getattr(self.akta_dati, "add_watermark", False):
-            return
-        text = getattr(self.akta_dati, "watermark_text", "") or ""
-        if not text.strip():
-            return
-
-        try:
-            from reportlab.lib.colors import HexColor
-            self.saveState()
-            self.setFillColor(HexColor(getattr(self.akta_dati, "watermark_color", "#E0E0E0")))
-            self.setFont("Helvetica-Bold", float(getattr(self.akta_dati, "watermark_font_size", 72)))
-            w, h = self._pagesize
-            self.translate(w / 2, h / 2)
-            self.rotate(float(getattr(self.akta_dati, "watermark_rotation", 45)))
-            self.drawCentredString(0, 0, text)
-            self.restoreState()
-        except Exception as e:
-            print(f"Ūdenszīmes kļūda: {e}")
-
-    def _draw_qr_codes(self):
-        if not self._qr_images:
-            return
-
-        try:
-            w, h = self._pagesize
-            left = float(getattr(self.akta_dati, "pdf_margin_left", 18)) * mm if self.akta_dati else 18 * mm
-            right = float(getattr(self.akta_dati, "pdf_margin_right", 18)) * mm if self.akta_dati else 18 * mm
-            top = float(getattr(self.akta_dati, "pdf_margin_top", 16)) * mm if self.akta_dati else 16 * mm
-            bottom = float(getattr(self.akta_dati, "pdf_margin_bottom", 16)) * mm if self.akta_dati else 16 * mm
-
-            for q in self._qr_images:
-                size = q["size_pt"]
-                pos = q["pos"]
-                if pos == "bottom_left":
-                    x, y = left, bottom
-                elif pos == "bottom_right":
-                    x, y = w - right - size, bottom
-                elif pos == "top_left":
-                    x, y = left, h - top - size
-                elif pos == "top_right":
-                    x, y = w - right - size, h - top - size
-                elif pos == "custom":
-                    x, y = q["x_pt"], q["y_pt"]
-                else:
-                    # fallback
-                    x, y = w - right - size, bottom
-
-                self.drawImage(q["reader"], x, y, width=size, height=size, mask='auto')
-        except Exception as e:
-            print(f"QR zīmēšanas kļūda: {e}")
-
-
-# ---------------------- Atsauces dokumentu (pielikumu) apstrāde ----------------------
-def _find_soffice_exe() -> Optional[str]:
-    """Atrod LibreOffice/soffice izpildāmo failu.
-    Atgriež pilnu ceļu vai None, ja nav atrasts.
-    """
-    import shutil
-
-    # 1) mēģinam no PATH
-    p = shutil.which("soffice") or shutil.which("libreoffice")
-    if p:
-        return p
-
-    # 2) tipiskie ceļi Windows
-    if sys.platform == "win32":
-        candidates = [
-            os.path.join(os.environ.get("ProgramFiles", ""), "LibreOffice", "program", "soffice.exe"),
-            os.path.join(os.environ.get("ProgramFiles(x86)", ""), "LibreOffice", "program", "soffice.exe"),
-            r"C:\Program Files\LibreOffice\program\soffice.exe",
-            r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
-        ]
-        for c in candidates:
-            if c and os.path.exists(c):
-                return c
-
-    return None
-
-def _convert_attachment_to_pdf(input_path: str, out_dir: str) -> Optional[str]:
-    """Konvertē pielikumu uz PDF, lai to varētu pievienot akta beigās.
-
-    Atbalsts:
-      - PDF: atgriež oriģinālo ceļu
-      - DOC/DOCX: LibreOffice (soffice) -> PDF (writer_pdf_Export)
-      - XLS/XLSX/ODS: LibreOffice -> PDF (calc_pdf_Export)
-      - PPT/PPTX: LibreOffice -> PDF (impress_pdf_Export)
-
-    Atgriež PDF ceļu vai None, ja neizdevās.
-    """
-    input_path = _coerce_path(input_path)
-    if not input_path:
-        return None
-
-    input_path = os.path.abspath(input_path)
-    if not os.path.exists(input_path):
-        return None
-
-    ext = os.path.splitext(input_path)[1].lower()
-    if ext == ".pdf":
-        return input_path
-
-    supported = {".docx", ".doc", ".xlsx", ".xls", ".ods", ".odt", ".pptx", ".ppt"}
-    if ext not in supported:
-        return None
-
-    soffice = _find_soffice_exe()
-    if not soffice:
-        # Nav LibreOffice -> nevar padarīt aplūkojamu PDF beigās
-        return None
-
-    # izvēlamies pareizo LO filtru (stabilāk priekš XLSX)
-    if ext in {".xls", ".xlsx", ".ods"}:
-        convert_to = "pdf:calc_pdf_Export"
-    elif ext in {".ppt", ".pptx"}:
-        convert_to = "pdf:impress_pdf_Export"
-    else:
-        convert_to = "pdf:writer_pdf_Export"
-
-    try:
-        os.makedirs(out_dir, exist_ok=True)
-
-        cmd = [
-            soffice,
-            "--headless",
-            "--nologo",
-            "--nolockcheck",
-            "--nodefault",
-            "--norestore",
-            "--convert-to", convert_to,
-            "--outdir", out_dir,
-            input_path,
-        ]
-
-        res = subprocess.run(cmd, capture_output=True, text=True, timeout=30, **({"creationflags": subprocess.CREATE_NO_WINDOW} if os.name == "nt" and hasattr(subprocess, "CREATE_NO_WINDOW") else {}))
-
-        if res.returncode != 0:
-            # noder debuggam (konsolē), bet UI netraucē
-            print(f"Konvertēšanas kļūda ({input_path}): {res.stderr or res.stdout}")
-            return None
-
-        # meklējam izveidoto PDF tieši šajā mapē
-        pdfs = [os.path.join(out_dir, f) for f in os.listdir(out_dir) if f.lower().endswith('.pdf')]
-        if not pdfs:
-            return None
-
-        # Ja ir vairāki, ņemam jaunāko
-        pdfs.sort(key=lambda fp: os.path.getmtime(fp), reverse=True)
-        return pdfs[0]
-
-    except subprocess.TimeoutExpired:
-        # LibreOffice iestrēga (piem., liels DOCX/XLSX vai dialogi).
-        return None
-    except FileNotFoundError:
-        # izpildāmais fails nav atrasts
-        return None
-    except Exception as e:
-        print(f"Konvertēšanas izņēmums ({input_path}): {e}")
-        return None
-
-
-def _make_annex_title_pdf(title: str, out_path: str, pagesize=A4, font_name: str = "Helvetica"):
-    """Izveido vienas lapas PDF informācijas lapu (ja pielikumu nevar konvertēt).
-    Teksts ir mazs, augšējā kreisajā stūrī, ar pareizām garumzīmēm (izmanto font_name).
-    """
-    # nodrošinām, ka mape eksistē (citādi Windows met [Errno 2])
-    try:
-        os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
-    except Exception:
-        pass
-
-    from reportlab.pdfbase.pdfmetrics import stringWidth
-    from reportlab.lib.utils import simpleSplit
-
-    c = canvas.Canvas(out_path, pagesize=pagesize)
-    w, h = pagesize
-
-    left = 18 * mm
-    top_y = h - 12 * mm
-    max_w = w - 2 * left
-
-    # Bold variants only if Helvetica, citādi izmantojam to pašu fontu (drošāk diakritikām)
-    bold_font = "Helvetica-Bold" if (font_name or "") == "Helvetica" else (font_name or "Helvetica")
-    normal_font = font_name or "Helvetica"
-
-    def fit_one_line(txt: str, fnt: str, size: float) -> str:
-        if stringWidth(txt, fnt, size) <= max_w:
-            return txt
-        ell = "…"
-        # brutāla, bet stabila saīsināšana
-        for cut in range(len(txt), 0, -1):
-            cand = txt[:cut].rstrip() + ell
-            if stringWidth(cand, fnt, size) <= max_w:
-                return cand
-        return ell
-
-    title_fit = fit_one_line(title, bold_font, 10)
-
-    c.setFillColor(colors.HexColor("#0F172A"))
-    c.setFont(bold_font, 10)
-    c.drawString(left, top_y, title_fit)
-
-    c.setStrokeColor(colors.HexColor("#CBD5E1"))
-    c.setLineWidth(0.8)
-    c.line(left, top_y - 4, w - left, top_y - 4)
-
-    info = "Pielikums pie pieņemšanas–nodošanas akta. Dokuments pievienots automātiski."
-    c.setFont(normal_font, 9)
-    c.setFillColor(colors.HexColor("#334155"))
-    lines = simpleSplit(info, normal_font, 9, max_w)
-    y = top_y - 14
-    for ln in lines[:5]:
-        c.drawString(left, y, ln)
-        y -= 11
-
-    c.showPage()
-    c.save()
-
-
-def _overlay_text_on_pdf_page(page, text: str, font_name: str, font_size: float, x_pt: float, y_pt: float, bold: bool = False):
-    """Uzvelk tekstu uz dotās PDF lapas (PyPDF2 PageObject), izmantojot ReportLab overlay.
-
-    Svarīgi:
-    - Diakritikām jābūt redzamām -> izmanto font_name (TTF)
-    - Teksts NETIEK izvilkts ārpus lapas -> ja par garu, saīsina ar "…"
-    """
-    try:
-        from PyPDF2 import PdfReader
-        from reportlab.pdfgen import canvas as rl_canvas
-        from reportlab.pdfbase.pdfmetrics import stringWidth
-    except Exception:
-        return page
-
-    try:
-        w = float(page.mediabox.width)
-        h = float(page.mediabox.height)
-        left = float(x_pt)
-        max_w = w - left - (18 * mm)  # labā mala
-
-        # izvēlamies fontu (bold tikai Helvetica gadījumā)
-        fnt = font_name if font_name else "Helvetica"
-        if bold and fnt == "Helvetica":
-            fnt = "Helvetica-Bold"
-
-        def fit_one_line(txt: str) -> str:
-            if stringWidth(txt, fnt, float(font_size)) <= max_w:
-                return txt
-            ell = "…"
-            for cut in range(len(txt), 0, -1):
-                cand = txt[:cut].rstrip() + ell
-                if stringWidth(cand, fnt, float(font_size)) <= max_w:
-                    return cand
-            return ell
-
-        safe_text = fit_one_line(text)
-
-        buf = io.BytesIO()
-        c = rl_canvas.Canvas(buf, pagesize=(w, h))
-        c.setFont(fnt, float(font_size))
-        c.setFillColor(colors.HexColor("#0F172A"))
-        # drošības dēļ y ierobežojam
-        y = min(max(float(y_pt), 0), h - 2)
-        c.drawString(left, y, safe_text)
-        c.save()
-        buf.seek(0)
-        overlay_page = PdfReader(buf).pages[0]
-        page.merge_page(overlay_page)
-    except Exception:
-        pass
-    return page
-
-
-def _apply_global_page_numbers_to_pdf(pdf_path: str, akta_dati: AktaDati, font_name: str):
-    """Pievieno lapu numerāciju visam PDF (arī pielikumiem), lai kopējais skaits ir pareizs."""
-    if not getattr(akta_dati, "show_page_numbers", True):
-        return
-
-    try:
-        from PyPDF2 import PdfReader, PdfWriter
-        from reportlab.pdfgen import canvas as rl_canvas
-    except Exception as e:
-        print(f"Nevar uzlikt lapu numerāciju (trūkst PyPDF2/ReportLab): {e}")
-        return
-
-    try:
-        reader = PdfReader(pdf_path)
-        total = len(reader.pages)
-        writer = PdfWriter()
-
-        for idx, page in enumerate(reader.pages, start=1):
-            w = float(page.mediabox.width)
-            h = float(page.mediabox.height)
-
-            buf = io.BytesIO()
-            c = rl_canvas.Canvas(buf, pagesize=(w, h))
-            c.setFillColor(colors.HexColor("#0F172A"))
-            c.setFont(font_name if font_name else "Helvetica", 9)
-            # Augšējais labais stūris (tāpat kā DecoratedCanvas)
-            c.drawRightString(w - 18 * mm, h - 10 * mm, f"Lapa {idx} no {total}")
-            c.save()
-            buf.seek(0)
-
-            overlay_page = PdfReader(buf).pages[0]
-            page.merge_page(overlay_page)
-            writer.add_page(page)
-
-        _atomic_write_pdfwriter(pdf_path, writer)
-    except Exception as e:
-        print(f"Lapu numerācijas kļūda: {e}")
-
-
-
-def _apply_stapler_mark_to_pdf(pdf_path: str, akta_dati: AktaDati, color_hex: str = "#94A3B8"):
-    """Pievieno 'skavotāja līniju' katrai PDF lapai (arī pielikumiem), pēcapstrādē ar PyPDF2."""
-    try:
-        from PyPDF2 import PdfReader, PdfWriter
-        from reportlab.pdfgen import canvas as rl_canvas
-    except Exception as e:
-        print(f"Nevar uzlikt skavotāja līniju (trūkst PyPDF2/ReportLab): {e}")
-        return
-
-    try:
-        reader = PdfReader(pdf_path)
-        writer = PdfWriter()
-
-        for page_index, page in enumerate(reader.pages):
-            if getattr(akta_dati, 'qr_kods_tikai_pirma_lapa', False) and page_index != 0:
-                writer.add_page(page)
-                continue
-
-            w = float(page.mediabox.width)
-            h = float(page.mediabox.height)
-
-            buf = io.BytesIO()
-            c = rl_canvas.Canvas(buf, pagesize=(w, h))
-            try:
-                c.setStrokeColor(colors.HexColor(color_hex))
-            except Exception:
-                c.setStrokeColor(colors.HexColor("#94A3B8"))
-            c.setLineWidth(0.7)
-
-            x = 6 * mm
-            y1 = h - 12 * mm
-            y2 = h - 32 * mm
-            c.line(x, y1, x, y2)
-
-            c.save()
-            buf.seek(0)
-
-            overlay = PdfReader(buf).pages[0]
-            page.merge_page(overlay)
-            writer.add_page(page)
-
-        _atomic_write_pdfwriter(pdf_path, writer)
-    except Exception as e:
-        print(f"Skavotāja līnijas kļūda: {e}")
-
-
-
-
-def _build_qr_payload(akta_dati: AktaDati) -> str:
-    """QR saturs.
-    - URL režīms: QR satur verifikācijas URL ar parametriem (a,d,pc,h).
-    - Pretējā gadījumā: kompakts JSON ar akta datiem un (saīsinātām) pozīcijām.
-    """
-    try:
-        if getattr(akta_dati, "qr_kods_url_mode", False) and (getattr(akta_dati, "qr_kods_url", "") or "").strip():
-            base = akta_dati.qr_kods_url.strip()
-            poz_count = len(getattr(akta_dati, "pozīcijas", []) or [])
-            full = json.dumps(
-                {"akta_nr": akta_dati.akta_nr, "datums": akta_dati.datums, "poz_count": poz_count},
-                ensure_ascii=False,
-                separators=(",", ":"),
-            )
-            h = hashlib.sha256(full.encode("utf-8")).hexdigest()[:16]
-            from urllib.parse import urlencode
-            qs = urlencode({"a": akta_dati.akta_nr, "d": akta_dati.datums, "pc": poz_count, "h": h})
-            return base + ("&" if "?" in base else "?") + qs
-
-        payload = {"v": 1, "akta_nr": akta_dati.akta_nr, "datums": akta_dati.datums, "vieta": getattr(akta_dati, "vieta", "")}
-
-        if getattr(akta_dati, "qr_kods_ieklaut_pozicijas", True):
-            items = []
-            for i, p in enumerate(getattr(akta_dati, "pozīcijas", []) or []):
-                if i >= 20:
-                    break
-                try:
-                    name = (getattr(p, "nosaukums", "") or "").strip()
-                    if len(name) > 40:
-                        name = name[:40] + "…"
-                    items.append({"n": name, "q": str(getattr(p, "daudzums", "")), "u": (getattr(p, "vienība", "") or "").strip(),
-                                  "sn": (getattr(p, "sērijas_nr", "") or "").strip()[:30]})
-                except Exception:
-                    continue
-            payload["poz"] = items
-            payload["poz_count"] = len(getattr(akta_dati, "pozīcijas", []) or [])
-
-        s = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
-        if len(s) > 1200 and "poz" in payload:
-            payload["poz"] = payload["poz"][:8]
-            s = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
-
-        if len(s) > 1200:
-            poz = getattr(akta_dati, "pozīcijas", []) or []
-            full = json.dumps(
-                {"akta_nr": akta_dati.akta_nr, "datums": akta_dati.datums,
-                 "pozīcijas": [asdict(p) if hasattr(p, "__dataclass_fields__") else str(p) for p in poz]},
-                ensure_ascii=False,
-                separators=(",", ":"),
-            )
-            h = hashlib.sha256(full.encode("utf-8")).hexdigest()[:16]
-            s = json.dumps({"v": 1, "akta_nr": akta_dati.akta_nr, "datums": akta_dati.datums, "poz_count": len(poz), "poz_hash": h},
-                           ensure_ascii=False, separators=(",", ":"))
-        return s
-    except Exception:
-        return ""
-
-
-def _apply_qr_to_pdf(pdf_path: str, akta_dati: AktaDati):
-    """Pievieno QR kodu PDF apakšējā kreisajā stūrī.
-    - QR tikai pirmajā lapā, ja qr_kods_tikai_pirma_lapa=True
-    - URL režīmā uz QR uzliek klikšķināmu linku
-    """
-    try:
-        if not getattr(akta_dati, "qr_kods_enabled", True):
-            return
-        from PyPDF2 import PdfReader, PdfWriter
-        from reportlab.pdfgen import canvas as rl_canvas
-    except Exception:
-        return
-
-    payload = _build_qr_payload(akta_dati)
-    if not payload:
-        return
-
-    try:
-        reader = PdfReader(pdf_path)
-        writer = PdfWriter()
-
-        size_mm = float(getattr(akta_dati, "qr_kods_izmers_mm", Decimal("18.0")))
-        first_only = bool(getattr(akta_dati, "qr_kods_tikai_pirma_lapa", True))
-
-        for page_index, page in enumerate(reader.pages):
-            if first_only and page_index != 0:
-                writer.add_page(page)
-                continue
-
-            w = float(page.mediabox.width)
-            h = float(page.mediabox.height)
-
-            try:
-                ml = float(getattr(akta_dati, "pdf_margin_left", Decimal("15.0")))
-                mb = float(getattr(akta_dati, "pdf_margin_bottom", Decimal("15.0")))
-            except Exception:
-                ml, mb = 15.0, 15.0
-
-            max_size = max(10.0, min(size_mm, ml - 2.0, mb - 2.0))
-            qr_size = max_size * mm
-
-            x = 2 * mm
-            y = 2 * mm
-
-            buf = io.BytesIO()
-            c = rl_canvas.Canvas(buf, pagesize=(w, h))
-
-            try:
-                if getattr(akta_dati, "qr_kods_url_mode", False) and (getattr(akta_dati, "qr_kods_url", "") or "").strip():
-                    c.linkURL(payload, (x, y, x + qr_size, y + qr_size), relative=0)
-            except Exception:
-                pass
-
-            try:
-                widget = rl_qr.QrCodeWidget(payload)
-                bounds = widget.getBounds()
-                bw = bounds[2] - bounds[0]
-                bh = bounds[3] - bounds[1]
-                scale = qr_size / max(bw, bh)
-                d = Drawing(qr_size, qr_size, transform=[scale, 0, 0, scale, 0, 0])
-                d.add(widget)
-                renderPDF.draw(d, c, x, y)
-            except Exception:
-                pass
-
-            c.save()
-            buf.seek(0)
-            overlay = PdfReader(buf).pages[0]
-            page.merge_page(overlay)
-            writer.add_page(page)
-
-        _atomic_write_pdfwriter(pdf_path, writer)
-    except Exception:
-        pass
-
-
-def _append_reference_docs_to_pdf(main_pdf_path: str, akta_dati: AktaDati, pagesize=A4, font_name: str = "Helvetica") -> str:
-    """Pievieno atsauces dokumentus PDF beigās kā Atvasinājums 1, 2, 3...
-
-    Prasības:
-    - "Atvasinājums X: ..." ir mazs teksts augšējā kreisajā stūrī TAJĀ PAŠĀ lapā, kur sākas pielikums
-    - Teksts nedrīkst pārsniegt lapas robežas (saīsinām ar "…")
-    - Ja DOCX/XLSX nevar konvertēt uz PDF, pievienojam informācijas lapu ar korektām garumzīmēm
-    """
-    refs = getattr(akta_dati, "atsauces_dokumenti_faili", []) or []
-    if not refs:
-        return main_pdf_path
-
-    try:
-        from PyPDF2 import PdfReader, PdfWriter
-    except Exception as e:
-        print(f"PyPDF2 nav pieejams pielikumiem: {e}")
-        return main_pdf_path
-
-    tmp_root = tempfile.mkdtemp(prefix="akta_refs_")
-    try:
-        writer = PdfWriter()
-
-        # Pamata PDF
-        reader_main = PdfReader(main_pdf_path)
-        for p in reader_main.pages:
-            writer.add_page(p)
-
-        annex_no = 0
-        for ref in refs:
-            try:
-                if isinstance(ref, dict):
-                    ref_path = ref.get("ceļš", "")
-                    ref_name = ref.get("nosaukums", "") or os.path.basename(ref_path)
-                else:
-                    ref_path = getattr(ref, "ceļš", "")
-                    ref_name = getattr(ref, "nosaukums", "") or os.path.basename(ref_path)
-
-                if not ref_path or not os.path.exists(ref_path):
-                    continue
-
-                annex_no += 1
-
-                # Konvertējam katru pielikumu savā apakšmapē, lai nekad nesajauktu PDF nosaukumus
-                tmp_dir = os.path.join(tmp_root, f"conv_{annex_no}")
-                os.makedirs(tmp_dir, exist_ok=True)
-                converted = _convert_attachment_to_pdf(ref_path, tmp_dir)
-
-                if not converted:
-                    info_pdf = os.path.join(tmp_dir, f"Atvasinajums_{annex_no}_info.pdf")
-                    _make_annex_title_pdf(
-                        f"Atvasinājums {annex_no}: {ref_name} (neizdevās konvertēt uz PDF)",
-                        info_pdf,
-                        pagesize=pagesize,
-                        font_name=font_name if font_name else "Helvetica"
-                    )
-                    r = PdfReader(info_pdf)
-                    for p in r.pages:
-                        writer.add_page(p)
-                    continue
-
-                r = PdfReader(converted)
-                if not r.pages:
-                    continue
-
-                # Uz pirmās pielikuma lapas uzliekam label (mazs, top-left, saīsināts ja vajag)
-                first = r.pages[0]
-                label = f"Atvasinājums {annex_no}: {ref_name}"
-                _overlay_text_on_pdf_page(
-                    first,
-                    label,
-                    font_name=font_name if font_name else "Helvetica",
-                    font_size=9,
-                    x_pt=18 * mm,
-                    y_pt=float(first.mediabox.height) - 12 * mm,
-                    bold=False
-                )
-                writer.add_page(first)
-
-                for p in r.pages[1:]:
-                    writer.add_page(p)
-
-            except Exception as e:
-                print(f"Pielikuma pievienošanas kļūda: {e}")
-
-        _atomic_write_pdfwriter(main_pdf_path, writer)
-
-    finally:
-        try:
-            shutil.rmtree(tmp_root, ignore_errors=True)
-        except Exception:
-            pass
-
-    return main_pdf_path
-
-# ---------------------- PDF ģenerēšana ----------------------
-
-def ģenerēt_pdf(akta_dati: AktaDati, pdf_ceļš: str = None, include_reference_docs: bool = True, encrypt_pdf: bool = True):
-    # --- FIX v46: normalize pdf_ceļš if dict leaked from state ---
-    if isinstance(pdf_ceļš, dict):
-        pdf_ceļš = pdf_ceļš.get('path') or ''
-    font_name = reģistrēt_fontu(akta_dati.fonts_ceļš)
-
-    styles = getSampleStyleSheet()
-    # Ensure all Decimal values are converted to float when used with ReportLab's float-based units or font sizes
-    # Uzlaboti stili ar jaunajiem iestatījumiem
-    styles.add(ParagraphStyle(name='LatvHead', fontName=font_name, fontSize=float(akta_dati.pdf_font_size_head), leading=float(akta_dati.pdf_font_size_head) * float(akta_dati.line_spacing_multiplier), spaceAfter=8, textColor=colors.HexColor(akta_dati.header_text_color)))
-    styles.add(ParagraphStyle(name='Latv', fontName=font_name, fontSize=float(akta_dati.pdf_font_size_normal), leading=float(akta_dati.pdf_font_size_normal) * float(akta_dati.line_spacing_multiplier), textColor=colors.HexColor(akta_dati.footer_text_color)))
-    styles.add(ParagraphStyle(name='LatvSmall', fontName=font_name, fontSize=float(akta_dati.pdf_font_size_small), leading=float(akta_dati.pdf_font_size_small) * float(akta_dati.line_spacing_multiplier), textColor=colors.HexColor(akta_dati.footer_text_color)))
-    styles.add(ParagraphStyle(name='LatvTableContent', fontName=font_name, fontSize=float(akta_dati.pdf_font_size_table), leading=float(akta_dati.pdf_font_size_table) * float(akta_dati.line_spacing_multiplier), wordWrap='LTR', splitLongWords=0, alignment={'left': 0, 'center': 1, 'right': 2}.get(akta_dati.table_content_alignment, 0)))
-    styles.add(ParagraphStyle(name='LatvElectronicSignature', fontName=font_name, fontSize=float(akta_dati.pdf_font_size_normal), leading=float(akta_dati.pdf_font_size_normal) * float(akta_dati.line_spacing_multiplier), alignment=1, textColor=colors.HexColor(akta_dati.header_text_color)))
-    styles.add(ParagraphStyle(name='DocTitle', fontName=font_name, fontSize=float(akta_dati.document_title_font_size), alignment=1, textColor=colors.HexColor(akta_dati.document_title_color)))
-    styles.add(ParagraphStyle(name='SectionHeading', fontName=font_name, fontSize=float(akta_dati.section_heading_font_size), leading=float(akta_dati.section_heading_font_size) * float(akta_dati.paragraph_line_spacing_multiplier), textColor=colors.HexColor(akta_dati.section_heading_color)))
-
-    # ---------------------- Premium juridiskais dizains (uzlabojumi) ----------------------
-    # Bold fonts: ja tiek lietots Helvetica, izmantojam Helvetica-Bold, citādi atstājam fontu (ja nav bold varianta).
-    bold_font_name = "Helvetica-Bold" if font_name == "Helvetica" else font_name
-
-    # Papildu stili skaidrai hierarhijai (juridisks + moderns)
-    styles.add(ParagraphStyle(
-        name='FieldLabel',
-        fontName=bold_font_name,
-        fontSize=float(akta_dati.pdf_font_size_normal),
-        leading=float(akta_dati.pdf_font_size_normal) * float(akta_dati.line_spacing_multiplier),
-        textColor=colors.HexColor("#0F172A")
-    ))
-    styles.add(ParagraphStyle(
-        name='FieldValue',
-        fontName=font_name,
-        fontSize=float(akta_dati.pdf_font_size_normal),
-        leading=float(akta_dati.pdf_font_size_normal) * float(akta_dati.line_spacing_multiplier),
-        textColor=colors.HexColor("#0F172A")
-    ))
-    styles.add(ParagraphStyle(
-        name='SectionBar',
-        fontName=bold_font_name,
-        fontSize=float(max(11, int(akta_dati.section_heading_font_size))),
-        leading=float(max(11, int(akta_dati.section_heading_font_size))) * float(akta_dati.paragraph_line_spacing_multiplier),
-        textColor=colors.HexColor("#0F172A"),
-        backColor=colors.HexColor("#F1F5F9"),
-        borderPadding=6,
-        spaceBefore=10,
-        spaceAfter=6,
-    ))
-    styles.add(ParagraphStyle(
-        name='LegalSectionTitle',
-        fontName=bold_font_name,
-        fontSize=11,
-        leading=14,
-        textColor=colors.HexColor("#0F172A"),
-        spaceBefore=10,
-        spaceAfter=4,
-    ))
-    styles.add(ParagraphStyle(
-        name='LegalBody',
-        fontName=font_name,
-        fontSize=float(akta_dati.pdf_font_size_normal),
-        leading=float(akta_dati.pdf_font_size_normal) * float(akta_dati.line_spacing_multiplier),
-        textColor=colors.HexColor("#0F172A"),
-        spaceAfter=6,
-    ))
-    styles.add(ParagraphStyle(
-        name='TableHeader',
-        fontName=bold_font_name,
-        fontSize=float(akta_dati.pdf_font_size_table),
-        leading=float(akta_dati.pdf_font_size_table) * float(akta_dati.line_spacing_multiplier),
-        textColor=colors.HexColor("#0F172A"),
-        alignment=1,  # CENTER
-    ))
-    # Ja nav iestatīts alternējošās rindas tonis, piešķiram klusu "enterprise" noklusējumu
-    if not getattr(akta_dati, "table_alternate_row_color", ""):
-        akta_dati.table_alternate_row_color = "#F8FAFC"
-
-    page_size_map = {
-        "A4": A4, "Letter": letter, "Legal": legal, "A3": A3, "A5": A5
-    }
-    base_page_size = page_size_map.get(akta_dati.pdf_page_size, A4)
-
-    if akta_dati.pdf_page_orientation == "Ainava":
-        pagesize = landscape(base_page_size)
-    else:
-        pagesize = portrait(base_page_size)
-
-    if pdf_ceļš is None:
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-        pdf_ceļš = temp_file.name
-        temp_file.close()
-
-    doc = SimpleDocTemplate(
-        pdf_ceļš,
-        pagesize=pagesize,
-        leftMargin=float(akta_dati.pdf_margin_left) * mm,
-        rightMargin=float(akta_dati.pdf_margin_right) * mm,
-        topMargin=float(akta_dati.pdf_margin_top) * mm,
-        bottomMargin=float(akta_dati.pdf_margin_bottom) * mm,
-        title="Pieņemšanas–Nodošanas akts",
-    )
-
-    story = []
-
-    # Cover Page (new feature)
-    if akta_dati.add_cover_page:
-        story.append(Spacer(1, 2 * inch))
-        if akta_dati.logotipa_ceļš and _path_exists(akta_dati.logotipa_ceļš):
-            try:
-                cover_logo = RLImage(_coerce_path(akta_dati.logotipa_ceļš))
-                cover_logo._restrictSize(float(akta_dati.cover_page_logo_width_mm) * mm, 50 * mm)
-                story.append(cover_logo)
-                story.append(Spacer(1, 0.5 * inch))
-            except Exception:
-                pass
-        story.append(Paragraph(akta_dati.cover_page_title, styles['DocTitle']))
-        story.append(Spacer(1, 1 * inch))
-        story.append(Paragraph(f"Akta Nr.: {akta_dati.akta_nr}", styles['Latv']))
-        story.append(Paragraph(f"Datums: {akta_dati.datums}", styles['Latv']))
-        story.append(Paragraph(f"Vieta: {akta_dati.vieta}", styles['Latv']))
-        story.append(Spacer(1, 2 * inch))
-        story.append(Paragraph(f"Pieņēmējs: {akta_dati.pieņēmējs.nosaukums}", styles['Latv']))
-        if akta_dati.pieņēmējs.tālrunis:
-            story.append(Paragraph(f"Pieņēmēja tālrunis: {akta_dati.pieņēmējs.tālrunis}", styles['Latv']))
-        story.append(Paragraph(f"Nodevējs: {akta_dati.nodevējs.nosaukums}", styles['Latv']))
-        if akta_dati.nodevējs.tālrunis:
-            story.append(Paragraph(f"Nodevēja tālrunis: {akta_dati.nodevējs.tālrunis}", styles['Latv']))
-        story.append(PageBreak())
-
-    # Header ar logo un nosaukumu
-    header_table_data = []
-    logo_w = float(akta_dati.pdf_logo_width_mm) * mm
-    if (not getattr(akta_dati, 'cover_page_enabled', False)) and akta_dati.logotipa_ceļš and _path_exists(akta_dati.logotipa_ceļš):
-        try:
-            header_logo._restrictSize(logo_w, 20 * mm)
-            header_table_data.append([header_logo, Paragraph(f"<font name='{bold_font_name}'>PIEŅEMŠANAS–NODOŠANAS AKTS</font>", styles['LatvHead'])])
-        except Exception:
-            header_table_data.append(["", Paragraph(f"<font name='{bold_font_name}'>PIEŅEMŠANAS–NODOŠANAS AKTS</font>", styles['LatvHead'])])
-    else:
-        header_table_data.append(["", Paragraph(f"<font name='{bold_font_name}'>PIEŅEMŠANAS–NODOŠANAS AKTS</font>", styles['LatvHead'])])
-
-    ht = Table(header_table_data, colWidths=[logo_w, None])
-    ht.setStyle(TableStyle([
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('ALIGN', (1, 0), (1, 0), 'LEFT'),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
-    story.append(ht)
-
-    # Aktu metadati (Nr., Datums, Vieta)
-    md = [[Paragraph(f"<font name='{font_name}'><b>Akta Nr.:</b> {akta_dati.akta_nr}</font>", styles['Latv']),
-           Paragraph(f"<font name='{font_name}'><b>Datums:</b> {datetime.strptime(akta_dati.datums, '%Y-%m-%d').strftime(akta_dati.date_format.replace('YYYY', '%Y').replace('MM', '%m').replace('DD', '%d'))}</font>", styles['Latv']),
-           Paragraph(f"<font name='{font_name}'><b>Vieta:</b> {akta_dati.vieta}</font>", styles['Latv'])]]
-    if akta_dati.pasūtījuma_nr:
-        md[0].append(Paragraph(f"<font name='{font_name}'><b>Pasūtījuma Nr.:</b> {akta_dati.pasūtījuma_nr}</font>", styles['Latv']))
-
-    meta = Table(md, colWidths=[55 * mm, 35 * mm, 40 * mm, None])
-    meta.setStyle(TableStyle([
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-    ]))
-    story.append(meta)
-    story.append(Spacer(1, 6))
-
-    # Jauni metadati
-    if akta_dati.līguma_nr:
-        story.append(Paragraph(f"<font name='{font_name}'><b>Līguma Nr.:</b> {akta_dati.līguma_nr}</font>", styles['Latv']))
-    if akta_dati.izpildes_termiņš:
-        story.append(Paragraph(f"<font name='{font_name}'><b>Izpildes termiņš:</b> {datetime.strptime(akta_dati.izpildes_termiņš, '%Y-%m-%d').strftime(akta_dati.date_format.replace('YYYY', '%Y').replace('MM', '%m').replace('DD', '%d'))}</font>", styles['Latv']))
-    if akta_dati.pieņemšanas_datums:
-        story.append(Paragraph(f"<font name='{font_name}'><b>Pieņemšanas datums:</b> {datetime.strptime(akta_dati.pieņemšanas_datums, '%Y-%m-%d').strftime(akta_dati.date_format.replace('YYYY', '%Y').replace('MM', '%m').replace('DD', '%d'))}</font>", styles['Latv']))
-    if akta_dati.nodošanas_datums:
-        story.append(Paragraph(f"<font name='{font_name}'><b>Nodošanas datums:</b> {datetime.strptime(akta_dati.nodošanas_datums, '%Y-%m-%d').strftime(akta_dati.date_format.replace('YYYY', '%Y').replace('MM', '%m').replace('DD', '%d'))}</font>", styles['Latv']))
-    story.append(Spacer(1, 6))
-
-    # Puses: Pieņēmējs / Nodevējs
-    story.append(Paragraph("PUSES", styles['SectionBar']))
-    def persona_paragraph(prefix: str, p: Persona):
-        lines = [f"<b>{prefix}:</b> {p.nosaukums}"]
-        if p.reģ_nr: lines.append(f"Reģ. Nr.: {p.reģ_nr}")
-        if p.adrese: lines.append(f"Adrese: {p.adrese}")
-        if p.kontaktpersona: lines.append(f"Kontaktpersona: {p.kontaktpersona}")
-        if getattr(p, 'amats', ''): lines.append(f"Amats: {p.amats}")
-        if getattr(p, 'pilnvaras_pamats', ''): lines.append(f"Pilnvaras pamats: {p.pilnvaras_pamats}")
-        if p.tālrunis: lines.append(f"Tālrunis: {p.tālrunis}")
-        if p.epasts:
-            em = p.epasts.strip()
-            lines.append(f"E-pasts: <a href=\"mailto:{em}\">{em}</a>")
-        if getattr(p, "web_lapa", ""):
-            url = p.web_lapa.strip()
-            if url and not re.match(r"^[a-zA-Z]+://", url):
-                url = "https://" + url
-            disp = p.web_lapa.strip()
-            lines.append(f"Web lapa: <a href=\"{url}\">{disp}</a>")
-        if p.bankas_konts: lines.append(f"Bankas konts: {p.bankas_konts}")
-        if p.juridiskais_statuss: lines.append(f"Statuss: {p.juridiskais_statuss}")
-        return Paragraph(f"<font name='{font_name}'>" + "<br/>".join(lines) + "</font>", styles['Latv'])
-
-    available_width = pagesize[0] - float(akta_dati.pdf_margin_left) * mm - float(akta_dati.pdf_margin_right) * mm
-    col_width_parties = available_width / 2
-
-    puses = Table([
-        [persona_paragraph("Pieņēmējs", akta_dati.pieņēmējs), persona_paragraph("Nodevējs", akta_dati.nodevējs)]
-    ], colWidths=[col_width_parties, col_width_parties])
-    pstyle = TableStyle([
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('BOX', (0, 0), (-1, -1), float(akta_dati.table_border_thickness_pt), colors.HexColor(akta_dati.table_grid_color)),
-        ('INNERGRID', (0, 0), (-1, -1), float(akta_dati.table_border_thickness_pt), colors.HexColor(akta_dati.table_grid_color)),
-        ('LEFTPADDING', (0, 0), (-1, -1), float(akta_dati.table_cell_padding_mm)),
-        ('RIGHTPADDING', (0, 0), (-1, -1), float(akta_dati.table_cell_padding_mm)),
-        ('TOPPADDING', (0, 0), (-1, -1), float(akta_dati.table_cell_padding_mm)),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), float(akta_dati.table_cell_padding_mm)),
-    ])
-    puses.setStyle(pstyle)
-    story.append(puses)
-    story.append(Spacer(1, 8))
-
-    # Pozīciju tabula
-    story.append(Paragraph("POZĪCIJAS", styles['SectionBar']))
-    # JAUNS: kolonnas var būt paslēptas/ pārdēvētas (poz_columns_config + custom_columns.visible)
-    poz_cfg = _merge_poz_columns_config(getattr(akta_dati, "poz_columns_config", None))
-    def _col_visible(key: str) -> bool:
-        try:
-            return bool(poz_cfg.get(key, {}).get("visible", True))
-        except Exception:
-            return True
-    def _col_title(key: str, default: str) -> str:
-        try:
-            t = str(poz_cfg.get(key, {}).get("title", default))
-            return t or default
-        except Exception:
-            return default
-
-    # Kolonnu secība PDF tabulai (ņem vērā GUI pārvietošanu / drag&drop)
-    # Nr. kolonna PDF tabulā ir atsevišķa un (ja ieslēgta) vienmēr ir pirmā.
-    base_kind = {
-        "apraksts": "text",
-        "daudzums": "num",
-        "vieniba": "text",
-        "cena": "money",
-        "summa": "money",
-        "serial": "text",
-        "warranty": "text",
-        "notes": "text",
-        "foto": "foto",
-    }
-
-    # Pielāgotās kolonnas (no datiem)
-    custom_cols = []
-    try:
-        custom_cols = list(getattr(akta_dati, "custom_columns", []) or [])
-    except Exception:
-        custom_cols = []
-
-    # Iespējamās atslēgas secībai (bez "nr")
-    base_keys = ["apraksts", "daudzums", "vieniba", "cena", "summa", "serial", "warranty", "notes"]
-    custom_keys = [f"custom:{i}" for i in range(len(custom_cols))]
-    possible = set(base_keys + custom_keys + ["foto"])
-
-    # Vēlamā secība no GUI (ja ir). Ja nav – izmantojam noklusējumu.
-    desired = []
-    try:
-        desired = list(getattr(akta_dati, "poz_columns_visual_order", []) or [])
-    except Exception:
-        desired = []
-    desired = [k for k in desired if k in possible]
-
-    if not desired:
-        desired = list(base_keys) + list(custom_keys) + ["foto"]
-    else:
-        # pieliekam trūkstošās kolonnas klāt (lai nezaudējam jaunpievienotas kolonnas)
-        for k in base_keys:
-            if k not in desired:
-                desired.append(k)
-        for k in custom_keys:
-            if k not in desired:
-                desired.append(k)
-        if "foto" not in desired:
-            desired.append("foto")
-
-    # Foto kolonna var atrasties jebkurā vietā (tāpat kā GUI). 
-    # Neuzspiežam tai pozīciju — izmantojam lietotāja (GUI) secību.
-
-    # Uztaisām PDF kolonnu plānu, ņemot vērā redzamību
-    col_plan = []  # list[tuple(key, kind)]
-    if _col_visible("nr"):
-        col_plan.append(("nr", "nr"))
-
-    for key in desired:
-        if key.startswith("custom:"):
-            try:
-                ci = int(key.split(":", 1)[1])
-                if 0 <= ci < len(custom_cols):
-                    cdef = custom_cols[ci]
-                    if isinstance(cdef, dict) and bool(cdef.get("visible", True)):
-                        col_plan.append((key, "text"))
-            except Exception:
-                pass
-            continue
-
-        if key == "foto":
-            if _col_visible("foto"):
-                col_plan.append(("foto", "foto"))
-            continue
-
-        # bāzes kolonnas
-        if key in base_keys and _col_visible(key):
-            col_plan.append((key, base_kind.get(key, "text")))
-
-    # Galvene
-    tab_header_items = []
-    for key, _kind in col_plan:
-        if key == "nr":
-            tab_header_items.append(Paragraph(_col_title("nr", "Nr."), styles['TableHeader']))
-        elif key.startswith("custom:"):
-            try:
-                ci = int(key.split(":", 1)[1])
-                nm = str(custom_cols[ci].get("name", "")) if isinstance(custom_cols[ci], dict) else ""
-            except Exception:
-                nm = ""
-            tab_header_items.append(Paragraph(nm or "", styles['TableHeader']))
-        else:
-            default_map = {
-                "apraksts": "Apraksts",
-                "daudzums": "Daudzums",
-                "vieniba": "Vienība",
-                "cena": "Cena",
-                "summa": "Summa",
-                "serial": "Seriālais Nr.",
-                "warranty": "Garantija",
-                "notes": "Piezīmes pozīcijai",
-                "foto": "Foto",
-            }
-            tab_header_items.append(Paragraph(_col_title(key, default_map.get(key, key)), styles['TableHeader']))
-
-    tab_data = [tab_header_items]
-
-    # Rindas
-    for i, poz in enumerate(akta_dati.pozīcijas, start=1):
-        row_items = []
-        for key, kind in col_plan:
-            if key == "nr":
-                row_items.append(Paragraph(str(i), styles['LatvTableContent']))
-            elif key == "apraksts":
-                row_items.append(Paragraph(poz.apraksts, styles['LatvTableContent']))
-            elif key == "daudzums":
-                row_items.append(Paragraph(f"{formēt_naudu(poz.daudzums)}", styles['LatvTableContent']))
-            elif key == "vieniba":
-                row_items.append(Paragraph(poz.vienība, styles['LatvTableContent']))
-            elif key == "cena":
-                row_items.append(Paragraph(f"{akta_dati.currency_symbol_position == 'before' and akta_dati.valūta or ''}{formēt_naudu(poz.cena)}{akta_dati.currency_symbol_position == 'after' and ' ' + akta_dati.valūta or ''}", styles['LatvTableContent']))
-            elif key == "summa":
-                row_items.append(Paragraph(f"{akta_dati.currency_symbol_position == 'before' and akta_dati.valūta or ''}{formēt_naudu(poz.summa)}{akta_dati.currency_symbol_position == 'after' and ' ' + akta_dati.valūta or ''}", styles['LatvTableContent']))
-            elif key == "serial":
-                row_items.append(Paragraph(poz.seriālais_nr, styles['LatvTableContent']))
-            elif key == "warranty":
-                row_items.append(Paragraph(poz.garantija, styles['LatvTableContent']))
-            elif key == "notes":
-                row_items.append(Paragraph(poz.piezīmes_pozīcijai, styles['LatvTableContent']))
-            elif key.startswith("custom:"):
-                try:
-                    ci = int(key.split(":", 1)[1])
-                    data_list = custom_cols[ci].get("data", []) if isinstance(custom_cols[ci], dict) else []
-                    v = str(data_list[i-1]) if isinstance(data_list, list) and (i-1) < len(data_list) else ""
-                except Exception:
-                    v = ""
-                row_items.append(Paragraph(v, styles['LatvTableContent']))
-            elif key == "foto":
-                if getattr(poz, 'attēla_ceļš', '') and os.path.exists(poz.attēla_ceļš):
-                    try:
-                        img_thumb = RLImage(poz.attēla_ceļš)
-                        img_thumb._restrictSize(18 * mm, 14 * mm)
-                        row_items.append(img_thumb)
-                    except Exception:
-                        row_items.append(Paragraph("", styles['LatvTableContent']))
-                else:
-                    row_items.append(Paragraph("", styles['LatvTableContent']))
-            else:
-                row_items.append(Paragraph("", styles['LatvTableContent']))
-        tab_data.append(row_items)
-
-    # Kolonnu platumi
-    expected_cols = len(col_plan)
-    col_widths = None
-    try:
-        col_widths_mm = [float(x.strip()) for x in (akta_dati.table_col_widths or "").split(',') if x.strip()]
-        if len(col_widths_mm) == expected_cols:
-            col_widths = [w * mm for w in col_widths_mm]
-    except Exception:
-        col_widths = None
-
-    if not col_widths:
-        # Noklusējuma platumi (mm) atkarībā no kolonnu tipa
-        default_map_mm = {
-            "nr": 10,
-            "text": 35,
-            "num": 18,
-            "money": 20,
-            "foto": 18,
-        }
-        dw = []
-        for _k, kind in col_plan:
-            dw.append(default_map_mm.get(kind, 25))
-        col_widths = [w * mm for w in dw]
-        total_default_width = sum(col_widths)
-        if total_default_width > 0 and total_default_width != available_width:
-            scale_factor = available_width / total_default_width
-            col_widths = [w * scale_factor for w in col_widths]
-
-    t = Table(tab_data, colWidths=col_widths)
-
-    tstyle = TableStyle([
-        ('FONTNAME', (0,0), (-1,-1), font_name),
-        ('FONTNAME', (0,0), (-1,0), bold_font_name),
-        ('FONTSIZE', (0,0), (-1,0), akta_dati.pdf_font_size_table),
-        ('FONTSIZE', (0,1), (-1,-1), akta_dati.pdf_font_size_table),
-        ('BACKGROUND', (0,0), (-1,0), colors.HexColor(akta_dati.table_header_bg_color or "#E5E7EB")),
-        ('TEXTCOLOR', (0,0), (-1,0), colors.HexColor("#0F172A")),
-        ('ALIGN', (0,0), (-1,0), 'CENTER'),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('GRID', (0,0), (-1,-1), 0.4, colors.HexColor(akta_dati.table_grid_color or "#CBD5E1")),
-        ('LINEBELOW', (0,0), (-1,0), 1.0, colors.HexColor("#94A3B8")),
-        ('BOTTOMPADDING', (0,0), (-1,0), float(akta_dati.table_cell_padding_mm) * 2),
-        ('TOPPADDING', (0,0), (-1,0), float(akta_dati.table_cell_padding_mm) * 2),
-        ('BOTTOMPADDING', (0,1), (-1,-1), float(akta_dati.table_cell_padding_mm)),
-        ('TOPPADDING', (0,1), (-1,-1), float(akta_dati.table_cell_padding_mm)),
-    ])
-
-    # Kolonnu izlīdzinājumi pēc tipa
-    for col_i, (_k, kind) in enumerate(col_plan):
-        if kind in ("money",):
-            tstyle.add('ALIGN', (col_i, 1), (col_i, -1), 'RIGHT')
-        elif kind in ("num", "nr"):
-            tstyle.add('ALIGN', (col_i, 1), (col_i, -1), 'CENTER')
-        elif kind == "foto":
-            tstyle.add('ALIGN', (col_i, 1), (col_i, -1), 'CENTER')
-        else:
-            tstyle.add('ALIGN', (col_i, 1), (col_i, -1), 'LEFT')
-
-    # Apply alternate row color
-    if akta_dati.table_alternate_row_color:
-        for i in range(1, len(tab_data)):
-            if i % 2 == 0: # Even rows (0-indexed, so actual even rows)
-                tstyle.add('BACKGROUND', (0, i), (-1, i), colors.HexColor(akta_dati.table_alternate_row_color))
-
-    t.setStyle(tstyle)
-    story.append(t)
-
-    # Kopsavilkums (var izslēgt)
-    if getattr(akta_dati, "show_price_summary", True):
-        story.append(Spacer(1, 6))
-        summa_tab = []
-        summa_tab.append([Paragraph(f"<font name='{font_name}'>Kopā bez PVN:</font>", styles['Latv']), Paragraph(f"<font name='{font_name}'>{akta_dati.currency_symbol_position == 'before' and akta_dati.valūta or ''}{formēt_naudu(akta_dati.kopējā_summma())}{akta_dati.currency_symbol_position == 'after' and ' ' + akta_dati.valūta or ''}</font>", styles['Latv'])])
-        if akta_dati.iekļaut_pvn and akta_dati.show_vat_breakdown:
-            summa_tab.append([Paragraph(f"<font name='{font_name}'>PVN {akta_dati.pvn_likme}%:</font>", styles['Latv']), Paragraph(f"<font name='{font_name}'>{akta_dati.currency_symbol_position == 'before' and akta_dati.valūta or ''}{formēt_naudu(akta_dati.pvn_summa())}{akta_dati.currency_symbol_position == 'after' and ' ' + akta_dati.valūta or ''}</font>", styles['Latv'])])
-            summa_tab.append([Paragraph(f"<font name='{font_name}'>Kopā ar PVN:</font>", styles['Latv']), Paragraph(f"<font name='{font_name}'>{akta_dati.currency_symbol_position == 'before' and akta_dati.valūta or ''}{formēt_naudu(akta_dati.summa_ar_pvn())}{akta_dati.currency_symbol_position == 'after' and ' ' + akta_dati.valūta or ''}</font>", styles['Latv'])])
-
-        if summa_tab:
-            ts = Table(summa_tab, colWidths=[None, 40*mm])
-            ts.setStyle(TableStyle([
-                ('ALIGN', (1,0), (1,-1), 'RIGHT'),
-                ('FONTNAME', (0,0), (-1,-1), font_name),
-                ('FONTSIZE', (0,0), (-1,-1), akta_dati.pdf_font_size_normal),
-                ('LINEBELOW', (0,0), (-1,-1), 0.6, colors.HexColor('#CBD5E1')),
-            ]))
-            story.append(ts)
-
-    # Piezīmes
-    if akta_dati.piezīmes:
-        story.append(Spacer(1, 6))
-        story.append(Paragraph(f"<font name='{font_name}'><b>Vispārīgās piezīmes:</b><br/>{akta_dati.piezīmes}</font>", styles['Latv']))
-
-    # Jauni juridiski saistoši lauki PDF dokumentā
-    if akta_dati.strīdu_risināšana:
-        story.append(Paragraph("Strīdu risināšanas kārtība", styles['LegalSectionTitle']))
-        story.append(Paragraph(f"<font name='{font_name}'>{akta_dati.strīdu_risināšana}</font>", styles['LegalBody']))
-
-    if akta_dati.konfidencialitātes_klauzula:
-        story.append(Paragraph("Konfidencialitātes klauzula", styles['LegalSectionTitle']))
-        story.append(Paragraph(
-            f"<font name='{font_name}'>Puses apņemas neizpaust trešajām personām informāciju, kas iegūta šī akta ietvaros, "
-            f"izņemot gadījumus, ko nosaka normatīvie akti.</font>",
-            styles['LegalBody']
-        ))
-
-    if akta_dati.soda_nauda_procenti > 0:
-        story.append(Spacer(1, 6))
-        story.append(Paragraph(f"<font name='{font_name}'><b>Soda nauda:</b> Par saistību neizpildi vai nepienācīgu izpildi, vainīgā puse maksā otrai pusei soda naudu {formēt_naudu(akta_dati.soda_nauda_procenti)}% apmērā no neizpildīto saistību vērtības par katru kavējuma dienu.</font>", styles['Latv']))
-
-    if akta_dati.piegādes_nosacījumi:
-        story.append(Spacer(1, 6))
-        story.append(Paragraph(f"<font name='{font_name}'><b>Piegādes nosacījumi:</b> {akta_dati.piegādes_nosacījumi}</font>", styles['Latv']))
-
-    if akta_dati.apdrošināšana:
-        story.append(Spacer(1, 6))
-        apd_text = (getattr(akta_dati, "apdrošināšana_teksts", "") or "").strip()
-        if not apd_text:
-            apd_text = "Preces ir apdrošinātas pret bojājumiem un zaudējumiem līdz pieņemšanas-nodošanas brīdim."
-        story.append(Paragraph(f"<font name='{font_name}'><b>Apdrošināšana:</b> {apd_text}</font>", styles['Latv']))
-
-    if akta_dati.papildu_nosacījumi:
-        story.append(Spacer(1, 6))
-        story.append(Paragraph(f"<font name='{font_name}'><b>Papildu nosacījumi:</b><br/>{akta_dati.papildu_nosacījumi}</font>", styles['Latv']))
-
-    if akta_dati.atsauces_dokumenti:
-        story.append(Spacer(1, 6))
-        story.append(Paragraph(f"<font name='{font_name}'><b>Atsauces dokumenti:</b> {akta_dati.atsauces_dokumenti}</font>", styles['Latv']))
-
-    story.append(Spacer(1, 6))
-    # Akta statuss (izcelts "juridisks premium" bloks)
-    status_tbl = Table([[Paragraph(f"<font name='{bold_font_name}'>Akta statuss:</font>", styles['FieldLabel']),
-                         Paragraph(f"<font name='{font_name}'>{akta_dati.akta_statuss}</font>", styles['FieldValue'])]],
-                       colWidths=[35*mm, None])
-    # JAUNS: Akta statusa fona krāsa PDF (atkarīga no izvēlētā statusa)
-    _status_bg_map = {
-        "Melnraksts": "#F1F5F9",   # pelēcīgs
-        "Apstiprināts": "#DBEAFE", # zils
-        "Parakstīts": "#DCFCE7",   # zaļš
-        "Arhivēts": "#EDE9FE",     # violets
-        "Atcelts": "#FEE2E2",      # sarkans
-    }
-    status_bg_color = _status_bg_map.get((akta_dati.akta_statuss or "").strip(), "#F8FAFC")
-
-    status_tbl.setStyle(TableStyle([
-        ('BACKGROUND', (0,0), (-1,-1), colors.HexColor(status_bg_color)),
-        ('BOX', (0,0), (-1,-1), 1.0, colors.HexColor("#334155")),
-        ('INNERGRID', (0,0), (-1,-1), 0.0, colors.white),
-        ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
-        ('LEFTPADDING', (0,0), (-1,-1), 8),
-        ('RIGHTPADDING', (0,0), (-1,-1), 8),
-        ('TOPPADDING', (0,0), (-1,-1), 6),
-        ('BOTTOMPADDING', (0,0), (-1,-1), 6),
-    ]))
-    story.append(Spacer(1, 8))
-    story.append(status_tbl)
-
-
-    # Attēli (ja ir) – mērogojam līdz platumam
-    if akta_dati.attēli:
-        story.append(PageBreak())
-        story.append(Spacer(1, 8))
-        story.append(Paragraph(f"<font name='{font_name}'><b>Pievienotās fotogrāfijas</b></font>", styles['Latv']))
-        for att in akta_dati.attēli:
-            if os.path.exists(att.ceļš):
-                try:
-                    img = RLImage(att.ceļš)
-                    img._restrictSize(available_width, float(akta_dati.item_image_width_mm) * 3 * mm)
-                    story.append(Spacer(1, 4))
-                    story.append(img)
-                    if att.paraksts:
-                        story.append(Paragraph(f"<font name='{font_name}'>{att.paraksts}</font>", styles['LatvSmall']))
-                except Exception:
-                    pass
-
-    if akta_dati.elektroniskais_paraksts:
-
-        if akta_dati.radit_elektronisko_parakstu_tekstu:
-            story.append(Spacer(1, 16))
-
-            story.append(Paragraph(
-
-                f"<font name='{font_name}' size='{akta_dati.pdf_font_size_normal}'><b>ŠIS DOKUMENTS PARAKSTĪTS AR DROŠU ELEKTRONISKO PARAKSTU UN SATUR LAIKA ZĪMOGU</b></font>",
-
-                styles['LatvElectronicSignature']
-
-            ))
-
-            story.append(Spacer(1, 16))
-
-    elif akta_dati.parakstu_rindas:
-
-        story.append(Spacer(1, 16))  # Atstarpe pirms parakstu laukiem
-
-        # Izveidojam atsevišķus elementus katrai paraksta pusei
-
-        pie_elements = []
-
-        nod_elements = []
-
-        # Pieņēmēja paraksta informācija
-
-        pie_elements.append(Paragraph(f"<font name='{font_name}'><b>Pieņēmējs</b></font>", styles['Latv']))
-
-        if akta_dati.paraksts_pieņēmējs_ceļš and _path_exists(akta_dati.paraksts_pieņēmējs_ceļš):
-
-            try:
-
-                img_pie = RLImage(_coerce_path(akta_dati.paraksts_pieņēmējs_ceļš))
-
-                img_pie._restrictSize(float(akta_dati.pdf_signature_width_mm) * mm,
-
-                                      float(akta_dati.pdf_signature_height_mm) * mm)
-
-                pie_elements.append(img_pie)
-
-            except Exception:
-
-                pie_elements.append(Paragraph(
-
-                    f"<font name='{font_name}'>_{'_' * int(float(akta_dati.signature_line_length_mm) / 2)}</font>",
-
-                    styles['Latv']))
-
-        else:
-
-            pie_elements.append(Paragraph(
-
-                f"<font name='{font_name}'>_{'_' * int(float(akta_dati.signature_line_length_mm) / 2)}</font>",
-
-                styles['Latv']))
-
-        pie_elements.append(Paragraph(
-
-            f"<font name='{font_name}' size='{akta_dati.signature_font_size}'>{akta_dati.pieņēmējs.kontaktpersona or akta_dati.pieņēmējs.nosaukums}</font>",
-
-            styles['LatvSmall']))
-
-        # Nodevēja paraksta informācija
-
-        nod_elements.append(Paragraph(f"<font name='{font_name}'><b>Nodevējs</b></font>", styles['Latv']))
-
-        if akta_dati.paraksts_nodevējs_ceļš and _path_exists(akta_dati.paraksts_nodevējs_ceļš):
-
-            try:
-
-                img_nod = RLImage(_coerce_path(akta_dati.paraksts_nodevējs_ceļš))
-
-                img_nod._restrictSize(float(akta_dati.pdf_signature_width_mm) * mm,
-
-                                      float(akta_dati.pdf_signature_height_mm) * mm)
-
-                nod_elements.append(img_nod)
-
-            except Exception:
-
-                nod_elements.append(Paragraph(
-
-                    f"<font name='{font_name}'>_{'_' * int(float(akta_dati.signature_line_length_mm) / 2)}</font>",
-
-                    styles['Latv']))
-
-        else:
-
-            nod_elements.append(Paragraph(
-
-                f"<font name='{font_name}'>_{'_' * int(float(akta_dati.signature_line_length_mm) / 2)}</font>",
-
-                styles['Latv']))
-
-        nod_elements.append(Paragraph(
-
-            f"<font name='{font_name}' size='{akta_dati.signature_font_size}'>{akta_dati.nodevējs.kontaktpersona or akta_dati.nodevējs.nosaukums}</font>",
-
-            styles['LatvSmall']))
-
-        # Izveidojam tabulu ar vienu rindu un divām kolonnām
-
-        # Katrā kolonnā ievietojam Flowables (Paragraph, Image) sarakstu
-
-        paraksti_table_data = [
-
-            [pie_elements, nod_elements]
-
-        ]
-
-        paraksti = Table(paraksti_table_data, colWidths=[col_width_parties, col_width_parties])
-
-        paraksti.setStyle(TableStyle([
-
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),  # Centra izlīdzināšana visiem elementiem šūnās
-
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # Vertikālā izlīdzināšana uz augšu
-
-            ('FONTNAME', (0, 0), (-1, -1), font_name),
-
-            ('BOTTOMPADDING', (0, 0), (-1, 0), float(akta_dati.signature_spacing_mm)),  # Atstarpe zem paraksta līnijas
-
-        ]))
-
-        story.append(paraksti)
-
-    # QR kodi (jauna funkcionalitāte)
-    qr_codes_to_add = []
-
-    # Individuālais QR kods
-    if akta_dati.include_custom_qr_code and akta_dati.custom_qr_code_data:
-        qr_codes_to_add.append({
-            'data': akta_dati.custom_qr_code_data,
-            'size': akta_dati.custom_qr_code_size_mm,
-            'position': akta_dati.custom_qr_code_position
-        })
-
-    # Automātiskais QR kods (akta ID)
-    if akta_dati.include_auto_qr_code and akta_dati.akta_nr:
-        qr_codes_to_add.append({
-            'data': akta_dati.akta_nr,
-            'size': akta_dati.auto_qr_code_size_mm,
-            'position': akta_dati.auto_qr_code_position
-        })
-
-    if qr_codes_to_add:
-        try:
-            import qrcode
-            qr_images = []
-            for qr_info in qr_codes_to_add:
-                qr = qrcode.QRCode(
-                    version=1,
-                    error_correction=qrcode.constants.ERROR_CORRECT_L,
-                    box_size=10,
-                    border=4,
-                )
-                qr.add_data(qr_info['data'])
-                qr.make(fit=True)
-                img_qr = qr.make_image(fill_color="black", back_color="white")
-                qr_temp_path = tempfile.NamedTemporaryFile(delete=False, suffix=".png").name
-                img_qr.save(qr_temp_path)
-
-                rl_qr_img = RLImage(qr_temp_path)
-                rl_qr_img._restrictSize(float(qr_info['size']) * mm, float(qr_info['size']) * mm)
-                qr_images.append((rl_qr_img, qr_info['position'], qr_temp_path))
-
-            # Pievienojam QR kodus story. Šeit varētu būt sarežģītāka pozicionēšanas loģika,
-            # bet pagaidām pievienojam secīgi.
-            # Lai nodrošinātu pozicionēšanu, būtu jāizmanto ReportLab "Frame" vai jāpielāgo "canvas" objekts.
-            # Vienkāršības labad pievienojam tos beigās, katru savā rindā.
-            story.append(Spacer(1, 12))  # Atstarpe pirms QR kodiem
-            for img, pos, temp_path in qr_images:
-                # ReportLab SimpleDocTemplate neļauj viegli pozicionēt elementus absolūti.
-                # Lai to izdarītu, būtu jāizmanto canvas objekts tieši vai jāveido sarežģītākas tabulas.
-                # Pagaidām pievienojam tos kā atsevišķus elementus.
-                # Ja nepieciešama precīza pozicionēšana, tas ir ievērojams darbs.
-                story.append(img)
-                story.append(Spacer(1, 6))  # Atstarpe starp QR kodiem
-                os.remove(temp_path)  # Dzēšam pagaidu failu
-
-        except ImportError:
-            print("QR Code generation requires 'qrcode' library. Please install it: pip install qrcode")
-        except Exception as e:
-            print(f"Error generating QR code: {e}")
-
-    # Footer ar ģenerēšanas laiku
-    if akta_dati.show_generation_timestamp:
-        story.append(Spacer(1, 12))
-        story.append(Paragraph(f"<font name='{font_name}'>Dokuments ģenerēts: {datetime.now().strftime('%Y-%m-%d %H:%M')}</font>", styles['LatvSmall']))
-
-    # Build ar lapu numerāciju
-    # Pass show_page_numbers to the custom canvas
-    doc.build(story, canvasmaker=lambda *args, **kwargs: DecoratedCanvas(*args, akta_dati=akta_dati, show_page_numbers=False, **kwargs))
-    # Pievienojam reālus atsauces dokumentus PDF beigās (Atvasinājums 1, 2, 3 ...)
-    # Priekšskatījumā (GUI) to izlaižam, lai Word/Excel pielikumu konvertēšana neuzkārtu UI.
-    if include_reference_docs:
-        try:
-            pdf_ceļš = _append_reference_docs_to_pdf(pdf_ceļš, akta_dati, pagesize=pagesize, font_name=font_name)
-        except Exception as e:
-            print(f"Atsauces dokumentu pievienošanas kļūda: {e}")
-
-    
-    # Uzliekam KOPĒJO lapu numerāciju visam dokumentam (arī atvasinājumiem), lai "Lapa X no Y" ir pareizi
-    _apply_global_page_numbers_to_pdf(pdf_ceļš, akta_dati, font_name)
-    _apply_stapler_mark_to_pdf(pdf_ceļš, akta_dati)
-    _apply_qr_to_pdf(pdf_ceļš, akta_dati)
-
-
-    # PDF Encryption (new feature)
-    if encrypt_pdf and akta_dati.enable_pdf_encryption:
-        try:
-            from PyPDF2 import PdfReader, PdfWriter
-            # Svarīgi Windows: nelasām un nerakstām vienlaikus vienā failā.
-            with open(pdf_ceļš, "rb") as rf:
-                reader = PdfReader(rf)
-                writer = PdfWriter()
-                for page_index, page in enumerate(reader.pages):
-
-                    writer.add_page(page)
-
-            permissions = 0
-            if akta_dati.allow_printing: permissions |= 4  # Print
-            if akta_dati.allow_modifying: permissions |= 8  # Modify contents
-            if akta_dati.allow_copying: permissions |= 16  # Copy
-            if akta_dati.allow_annotating: permissions |= 32  # Annotate
-
-            # Ja owner parole nav iedota, PyPDF2 dažreiz uzvedas neprognozējami – uzliekam drošu noklusējumu.
-            owner_pw = akta_dati.pdf_owner_password or akta_dati.pdf_user_password or "owner"
-            user_pw = akta_dati.pdf_user_password or ""
-
-            # PyPDF2/pypdf API atšķiras starp versijām, tāpēc mēģinām vairākus variantus.
-            try:
-                writer.encrypt(user_password=user_pw, owner_password=owner_pw, permissions_flag=permissions)
-            except TypeError:
-                try:
-                    writer.encrypt(user_pwd=user_pw, owner_pwd=owner_pw, permissions_flag=permissions)
-                except TypeError:
-                    # Vecāki PyPDF2 varianti
-                    writer.encrypt(user_pw, owner_pw, use_128bit=True, permissions_flag=permissions)
-
-            _atomic_write_pdfwriter(pdf_ceļš, writer)
-
-        except ImportError:
-            print("PDF encryption requires 'PyPDF2' library. Please install it: pip install PyPDF2")
-        except Exception as e:
-            print(f"Error encrypting PDF: {e}")
-
-    return pdf_ceļš
-
-# ---------------------- DOCX ģenerēšana ----------------------
-# (unchanged, as DOCX generation is less flexible with advanced styling)
-def add_formatted_text(paragraph, text):
-    # ... (unchanged)
-    parts = []
-    current_text = ""
-    in_bold = False
-    in_italic = False
-    in_underline = False
-
-    i = 0
-    while i < len(text):
-        if text[i:i+3] == "<b>":
-            parts.append((current_text, in_bold, in_italic, in_underline))
-            current_text = ""
-            in_bold = True
-            i += 3
-        elif text[i:i+4] == "</b>":
-            parts.append((current_text, in_bold, in_italic, in_underline))
-            current_text = ""
-            in_bold = False
-            i += 4
-        elif text[i:i+3] == "<i>":
-            parts.append((current_text, in_bold, in_italic, in_underline))
-            current_text = ""
-            in_italic = True
-            i += 3
-        elif text[i:i+4] == "</i>":
-            parts.append((current_text, in_bold, in_italic, in_underline))
-            current_text = ""
-            in_italic = False
-            i += 4
-        elif text[i:i+3] == "<u>":
-            parts.append((current_text, in_bold, in_italic, in_underline))
-            current_text = ""
-            in_underline = True
-            i += 3
-        elif text[i:i+4] == "</u>":
-            parts.append((current_text, in_bold, in_italic, in_underline))
-            current_text = ""
-            in_underline = False
-            i += 4
-        else:
-            current_text += text[i]
-            i += 1
-    parts.append((current_text, in_bold, in_italic, in_underline))
-
-    for part_text, bold, italic, underline in parts:
-        if part_text:
-            run = paragraph.add_run(part_text)
-            run.bold = bold
-            run.italic = italic
-            run.underline = underline
-
-
-def _docx_replace_placeholders(document: Document, mapping: dict):
-    """Aizvieto {{atslēga}} vietturus visos paragrāfos un tabulās."""
-    def replace_in_runs(paragraph):
-        # Vienkārša aizvietošana (placeholders parasti ir vienā run, bet mēģinām droši)
-        full_text = ''.join(r.text for r in paragraph.runs)
-        if not full_text:
-            return
-        new_full = full_text
-        for k, v in mapping.items():
-            new_full = new_full.replace(f"{{{{{k}}}}}", str(v))
-        if new_full != full_text:
-            # Pārrakstām ar vienu run (saglabāt stilu precīzi ir sarežģīti)
-            for r in paragraph.runs:
-                r.text = ''
-            paragraph.runs[0].text = new_full if paragraph.runs else paragraph.add_run(new_full)
-
-    for p in document.paragraphs:
-        replace_in_runs(p)
-
-    for table in document.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for p in cell.paragraphs:
-                    replace_in_runs(p)
-
-
-# ---------------------- DOCX vizuālie uzlabojumi (lai atbilst PDF) ----------------------
-
-def _docx_set_run_font(run: Run, *, bold: bool = False, size_pt: int | None = None,
-                       color_hex: str | None = None, name: str | None = None):
-    try:
-        run.bold = bool(bold)
-    except Exception:
-        pass
-    try:
-        if size_pt is not None:
-            run.font.size = Pt(size_pt)
-    except Exception:
-        pass
-    try:
-        if name:
-            run.font.name = name
-    except Exception:
-        pass
-    try:
-        if color_hex:
-            c = color_hex.strip().lstrip('#')
-            if len(c) == 6:
-                run.font.color.rgb = RGBColor(int(c[0:2], 16), int(c[2:4], 16), int(c[4:6], 16))
-    except Exception:
-        pass
-
-
-def _docx_set_paragraph_spacing(paragraph, *, before: int = 0, after: int = 0, line: float | None = None):
-    try:
-        pf = paragraph.paragraph_format
-        pf.space_before = Pt(before)
-        pf.space_after = Pt(after)
-        if line is not None:
-            pf.line_spacing = line
-    except Exception:
-        pass
-
-
-def _docx_set_table_borders(table, *, color: str = "000000", size: int = 8):
-    """Uzspiež redzamas tabulas līnijas (python-docx pēc noklusējuma bieži dod 'baltas' līnijas)."""
-    try:
-        tbl = table._tbl
-        tblPr = tbl.tblPr
-        if tblPr is None:
-            tblPr = OxmlElement('w:tblPr')
-            tbl.insert(0, tblPr)
-
-        tblBorders = tblPr.find(qn('w:tblBorders'))
-        if tblBorders is None:
-            tblBorders = OxmlElement('w:tblBorders')
-            tblPr.append(tblBorders)
-
-        for edge in ('top', 'left', 'bottom', 'right', 'insideH', 'insideV'):
-            elem = tblBorders.find(qn(f'w:{edge}'))
-            if elem is None:
-                elem = OxmlElement(f'w:{edge}')
-                tblBorders.append(elem)
-            elem.set(qn('w:val'), 'single')
-            elem.set(qn('w:sz'), str(size))
-            elem.set(qn('w:space'), '0')
-            elem.set(qn('w:color'), color)
-    except Exception:
-        pass
-
-
-def _docx_set_cell_shading(cell, fill: str):
-    try:
-        tcPr = cell._tc.get_or_add_tcPr()
-        shd = tcPr.find(qn('w:shd'))
-        if shd is None:
-            shd = OxmlElement('w:shd')
-            tcPr.append(shd)
-        shd.set(qn('w:val'), 'clear')
-        shd.set(qn('w:color'), 'auto')
-        shd.set(qn('w:fill'), fill)
-    except Exception:
-        pass
-
-
-def _docx_apply_pdf_like_theme(document: Document):
-    """Vienkāršs 'PDF līdzīgs' noformējums: fonti, virsrakstu krāsa, atstarpes."""
-    try:
-        normal = document.styles['Normal']
-        normal.font.name = 'Calibri'
-        normal.font.size = Pt(10)
-    except Exception:
-        pass
-
-    # Heading krāsa (PDF stilā zilgana)
-    for st_name in ('Heading 1', 'Heading 2', 'Heading 3'):
-        try:
-            st = document.styles[st_name]
-            st.font.name = 'Calibri'
-            if st_name == 'Heading 1':
-                st.font.size = Pt(16)
-            elif st_name == 'Heading 2':
-                st.font.size = Pt(12)
-            else:
-                st.font.size = Pt(11)
-            st.font.bold = True
-            st.font.color.rgb = RGBColor(0x1F, 0x4E, 0x79)  # tumši zils (līdzīgs PDF)
-        except Exception:
-            pass
-
-
-def _docx_add_title_page_like_pdf(document: Document, akta_dati: AktaDati):
-    """Izveido titullapu (kā PDF): nosaukums, Akta Nr/Datums/Vieta + īss pušu kopsavilkums."""
-    # Logo augšā (ja ir)
-    if akta_dati.logotipa_ceļš and _path_exists(akta_dati.logotipa_ceļš):
-        try:
-            p = document.add_paragraph()
-            r = p.add_run()
-            r.add_picture(akta_dati.logotipa_ceļš, width=Inches(float(akta_dati.docx_image_width_inches)))
-            p.alignment = WD_ALIGN_PARAGRAPH.LEFT
-            _docx_set_paragraph_spacing(p, after=8)
-        except Exception:
-            pass
-
-    # Galvenais nosaukums centrā
-    p_title = document.add_paragraph()
-    p_title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    r = p_title.add_run('Pieņemšanas-Nodošanas Akts')
-    _docx_set_run_font(r, bold=True, size_pt=20, color_hex='000000')
-    _docx_set_paragraph_spacing(p_title, before=10, after=18)
-
-    # Akta metadati
-    meta_lines = [
-        f"Akta Nr.: {akta_dati.akta_nr}",
-        f"Datums: {akta_dati.datums}",
-        f"Vieta: {akta_dati.vieta}",
-    ]
-    if akta_dati.pasūtījuma_nr:
-        meta_lines.append(f"Pasūtījuma Nr.: {akta_dati.pasūtījuma_nr}")
-    if akta_dati.līguma_nr:
-        meta_lines.append(f"Līguma Nr.: {akta_dati.līguma_nr}")
-
-    p_meta = document.add_paragraph('\n'.join(meta_lines))
-    p_meta.alignment = WD_ALIGN_PARAGRAPH.LEFT
-    _docx_set_paragraph_spacing(p_meta, after=14)
-
-    # Īss kopsavilkums par pusēm (kā PDF titullapā)
-    p = document.add_paragraph()
-    p.add_run(f"Pieņēmējs: {akta_dati.pieņēmējs.nosaukums}\n")
-    p.add_run(f"Pieņēmēja tālrunis: {akta_dati.pieņēmējs.tālrunis or ''}\n")
-    p.add_run(f"Nodevējs: {akta_dati.nodevējs.nosaukums}\n")
-    p.add_run(f"Nodevēja tālrunis: {akta_dati.nodevējs.tālrunis or ''}")
-    _docx_set_paragraph_spacing(p, after=10)
-
-    document.add_page_break()
-
-def _docx_set_run_font(run: Run, *, bold: bool = None, size_pt: int = None, color_hex: str = None, name: str = None):
-    try:
-        if bold is not None:
-            run.bold = bold
-        if size_pt is not None:
-            run.font.size = Pt(size_pt)
-        if name is not None:
-            run.font.name = name
-        if color_hex:
-            run.font.color.rgb = RGBColor.from_string(color_hex.replace('#', '').upper())
-    except Exception:
-        pass
-
-
-def _docx_set_paragraph_spacing(p, before_pt: int = 0, after_pt: int = 4, line: float = 1.0):
-    try:
-        pf = p.paragraph_format
-        pf.space_before = Pt(before_pt)
-        pf.space_after = Pt(after_pt)
-        # python-docx line_spacing expects a float multiplier or Length
-        pf.line_spacing = line
-    except Exception:
-        pass
-
-
-def _docx_set_cell_shading(cell, fill_hex: str):
-    """Uzstāda šūnas fona krāsu (piem., virsrindām / sadaļu blokiem)."""
-    try:
-        tc_pr = cell._tc.get_or_add_tcPr()
-        shd = OxmlElement('w:shd')
-        shd.set(qn('w:val'), 'clear')
-        shd.set(qn('w:color'), 'auto')
-        shd.set(qn('w:fill'), fill_hex.replace('#', '').upper())
-        tc_pr.append(shd)
-    except Exception:
-        pass
-
-
-def _docx_set_table_borders(table, *, color_hex: str = '000000', size: int = 12):
-    """Garantē redzamas tabulu līnijas (Word dažreiz iestata baltas/neredzamas)."""
-    try:
-        tbl = table._tbl
-        tbl_pr = tbl.tblPr
-        if tbl_pr is None:
-            tbl_pr = OxmlElement('w:tblPr')
-            tbl.append(tbl_pr)
-
-        # atrod vai izveido tblBorders
-        borders = tbl_pr.find(qn('w:tblBorders'))
-        if borders is None:
-            borders = OxmlElement('w:tblBorders')
-            tbl_pr.append(borders)
-
-        def _set_edge(tag):
-            edge = borders.find(qn(f'w:{tag}'))
-            if edge is None:
-                edge = OxmlElement(f'w:{tag}')
-                borders.append(edge)
-            edge.set(qn('w:val'), 'single')
-            edge.set(qn('w:sz'), str(size))
-            edge.set(qn('w:space'), '0')
-            edge.set(qn('w:color'), color_hex.replace('#', '').upper())
-
-        for t in ('top', 'left', 'bottom', 'right', 'insideH', 'insideV'):
-            _set_edge(t)
-    except Exception:
-        pass
-
-
-def _docx_make_heading(document: Document, text: str, level: int = 2, *, color_hex: str = '1F4E79'):
-    """Heading ar PDF līdzīgu zilo krāsu."""
-    p = document.add_heading(text, level=level)
-    try:
-        # Word Heading var būt vairākas runs
-        for r in p.runs:
-            _docx_set_run_font(r, bold=True, color_hex=color_hex)
-        _docx_set_paragraph_spacing(p, before_pt=8 if level <= 2 else 4, after_pt=4)
-    except Exception:
-        pass
-    return p
-
-
-def _docx_apply_default_styles(document: Document):
-    """Iestata bāzes stilus, lai Word vizuāli būtu tuvāk PDF."""
-    try:
-        document.styles['Normal'].font.name = 'Calibri'
-        document.styles['Normal'].font.size = Pt(10)
-
-        # Heading 1
-        if 'Heading 1' in document.styles:
-            h1 = document.styles['Heading 1']
-            h1.font.name = 'Calibri'
-            h1.font.size = Pt(16)
-            h1.font.bold = True
-            h1.font.color.rgb = RGBColor.from_string('1F4E79')
-
-        # Heading 2
-        if 'Heading 2' in document.styles:
-            h2 = document.styles['Heading 2']
-            h2.font.name = 'Calibri'
-            h2.font.size = Pt(12)
-            h2.font.bold = True
-            h2.font.color.rgb = RGBColor.from_string('1F4E79')
-    except Exception:
-        pass
-
-
-def _docx_add_cover_page(document: Document, akta_dati: 'AktaDati'):
-    """Titullapa līdzīga PDF titullapai."""
-    # Top logo (ja ir)
-    if akta_dati.logotipa_ceļš and _path_exists(akta_dati.logotipa_ceļš):
-        try:
-            p_logo = document.add_paragraph()
-            p_logo.alignment = WD_ALIGN_PARAGRAPH.LEFT
-            p_logo.add_run().add_picture(akta_dati.logotipa_ceļš, width=Inches(1.8))
-            _docx_set_paragraph_spacing(p_logo, after_pt=16)
-        except Exception:
-            pass
-
-    # Liels virsraksts
-    p_title = document.add_paragraph()
-    p_title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    r = p_title.add_run('Pieņemšanas-Nodošanas Akts')
-    _docx_set_run_font(r, bold=True, size_pt=20, color_hex='000000')
-    _docx_set_paragraph_spacing(p_title, before_pt=8, after_pt=18)
-
-    # Akta info
-    info_lines = [
-        ("Akta Nr.:", akta_dati.akta_nr),
-        ("Datums:", akta_dati.datums),
-        ("Vieta:", akta_dati.vieta),
-    ]
-    if akta_dati.pasūtījuma_nr:
-        info_lines.append(("Pasūtījuma Nr.:", akta_dati.pasūtījuma_nr))
-
-    p_info = document.add_paragraph()
-    p_info.alignment = WD_ALIGN_PARAGRAPH.LEFT
-    for k, v in info_lines:
-        rrk = p_info.add_run(f"{k} ")
-        _docx_set_run_font(rrk, bold=True)
-        p_info.add_run(f"{v}\n")
-    _docx_set_paragraph_spacing(p_info, after_pt=18)
-
-    # Puses īsi (kā PDF titullapā)
-    p_parties = document.add_paragraph()
-    p_parties.alignment = WD_ALIGN_PARAGRAPH.LEFT
-    rr = p_parties.add_run(f"Pieņēmējs: ")
-    _docx_set_run_font(rr, bold=True)
-    p_parties.add_run(f"{akta_dati.pieņēmējs.nosaukums}\n")
-    rr = p_parties.add_run(f"Pieņēmēja tālrunis: ")
-    _docx_set_run_font(rr, bold=True)
-    p_parties.add_run(f"{akta_dati.pieņēmējs.tālrunis}\n")
-    rr = p_parties.add_run(f"Nodevējs: ")
-    _docx_set_run_font(rr, bold=True)
-    p_parties.add_run(f"{akta_dati.nodevējs.nosaukums}\n")
-    rr = p_parties.add_run(f"Nodevēja tālrunis: ")
-    _docx_set_run_font(rr, bold=True)
-    p_parties.add_run(f"{akta_dati.nodevējs.tālrunis}\n")
-    _docx_set_paragraph_spacing(p_parties, after_pt=8)
-
-    # Pāreja uz nākamo lapu
-    document.add_page_break()
-
-def ģenerēt_docx(akta_dati: AktaDati, docx_ceļš: str):
-    # Ja ir norādīts DOCX šablons, ielādējam to; citādi veidojam jaunu dokumentu.
-    used_template = False
-    if getattr(akta_dati, "docx_template_path", "") and _path_exists(getattr(akta_dati, "docx_template_path", "")):
-        document = Document(_coerce_path(getattr(akta_dati, "docx_template_path", "")) or akta_dati.docx_template_path)
-        used_template = True
-        # Vietturu aizvietošana (ja šablonā izmanto {{akta_nr}}, {{datums}} utt.)
-        _docx_replace_placeholders(document, {
-            "akta_nr": akta_dati.akta_nr,
-            "datums": akta_dati.datums,
-            "vieta": akta_dati.vieta,
-            "pasūtījuma_nr": akta_dati.pasūtījuma_nr,
-            "pieņēmējs": akta_dati.pieņēmējs.nosaukums,
-            "nodevējs": akta_dati.nodevējs.nosaukums,
-            "valūta": akta_dati.valūta,
-        })
-        # Šablons var jau saturēt visu; ja gribi – tālāk pievienojam arī standarta sadaļas.
-    else:
-        document = Document()
-
-    # PDF-līdzīgs noformējums (fonti/Heading krāsa u.c.)
-    try:
-        _docx_apply_default_styles(document)
-    except Exception:
-        pass
-
-    # Titullapa (ja nav šablona). Šī ir 1:1 ideja kā PDF (logo + nosaukums + kopsavilkums)
-    if not used_template:
-        try:
-            _docx_add_cover_page(document, akta_dati)
-        except Exception:
-            pass
-
-    # (atstājam arī iepriekšējo iestatījumu drošībai, ja Word ignorē stilus)
-    document.styles['Normal'].font.name = 'Calibri'
-    document.styles['Normal'].font.size = Pt(10)
-
-    # Logo + virsraksts (kā PDF pirmajā saturiskajā lapā)
-    _main_logo_added = False
-    if akta_dati.logotipa_ceļš and _path_exists(akta_dati.logotipa_ceļš):
-        try:
-            p_logo2 = document.add_paragraph()
-            p_logo2.alignment = WD_ALIGN_PARAGRAPH.LEFT
-            p_logo2.add_run().add_picture(akta_dati.logotipa_ceļš, width=Inches(float(akta_dati.docx_image_width_inches)))
-            _docx_set_paragraph_spacing(p_logo2, after_pt=6)
-            _main_logo_added = True
-        except Exception:
-            pass
-
-    document.add_heading('PIEŅEMŠANAS–NODOŠANAS AKTS', level=1)
-    document.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-    # (vecais logo bloks atstāts drošībai, bet vairs nedublējam)
-    if (not _main_logo_added) and akta_dati.logotipa_ceļš and _path_exists(akta_dati.logotipa_ceļš):
-        try:
-            document.add_picture(akta_dati.logotipa_ceļš, width=Inches(float(akta_dati.docx_image_width_inches)))
-            document.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.LEFT
-        except Exception:
-            pass
-
-    add_formatted_text(document.add_paragraph(), f"<b>Akta Nr.:</b> {akta_dati.akta_nr}")
-    add_formatted_text(document.add_paragraph(), f"<b>Datums:</b> {akta_dati.datums}")
-    add_formatted_text(document.add_paragraph(), f"<b>Vieta:</b> {akta_dati.vieta}")
-    if akta_dati.pasūtījuma_nr:
-        add_formatted_text(document.add_paragraph(), f"<b>Pasūtījuma Nr.:</b> {akta_dati.pasūtījuma_nr}")
-
-    if akta_dati.līguma_nr:
-        add_formatted_text(document.add_paragraph(), f"<b>Līguma Nr.:</b> {akta_dati.līguma_nr}")
-    if akta_dati.izpildes_termiņš:
-        add_formatted_text(document.add_paragraph(), f"<b>Izpildes termiņš:</b> {akta_dati.izpildes_termiņš}")
-    if akta_dati.pieņemšanas_datums:
-        add_formatted_text(document.add_paragraph(), f"<b>Pieņemšanas datums:</b> {akta_dati.pieņemšanas_datums}")
-    if akta_dati.nodošanas_datums:
-        add_formatted_text(document.add_paragraph(), f"<b>Nodošanas datums:</b> {akta_dati.nodošanas_datums}")
-    document.add_paragraph()
-
-    document.add_heading('Puses', level=2)
-    table_parties = document.add_table(rows=1, cols=2)
-    table_parties.autofit = True
-    table_parties.columns[0].width = Inches(3)
-    table_parties.columns[1].width = Inches(3)
-
-    # TABULAS līnijas un galvenes fons (lai Word izskatās kā PDF)
-    try:
-        table_parties.style = 'Table Grid'
-    except Exception:
-        pass
-    _docx_set_table_borders(table_parties, color_hex='000000', size=12)
-
-    hdr_cells = table_parties.rows[0].cells
-    hdr_cells[0].text = "Pieņēmējs"
-    hdr_cells[1].text = "Nodevējs"
-
-    try:
-        for c in hdr_cells:
-            _docx_set_cell_shading(c, 'D9E1F2')  # gaiši zils, līdzīgs PDF blokam
-            for r in c.paragraphs[0].runs:
-                _docx_set_run_font(r, bold=True)
-            c.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-    except Exception:
-        pass
-
-    row_cells = table_parties.add_row().cells
-    def add_persona_info(cell, p: Persona):
-        add_formatted_text(cell.add_paragraph(), f"<b>Nosaukums / Vārds, Uzvārds:</b> {p.nosaukums}")
-        if p.reģ_nr: add_formatted_text(cell.add_paragraph(), f"<b>Reģ. Nr. / personas kods:</b> {p.reģ_nr}")
-        if p.adrese: add_formatted_text(cell.add_paragraph(), f"<b>Adrese:</b> {p.adrese}")
-        if p.kontaktpersona: add_formatted_text(cell.add_paragraph(), f"<b>Kontaktpersona:</b> {p.kontaktpersona}")
-        if getattr(p, 'amats', ''): add_formatted_text(cell.add_paragraph(), f"<b>Amats:</b> {p.amats}")
-        if getattr(p, 'pilnvaras_pamats', ''): add_formatted_text(cell.add_paragraph(), f"<b>Pilnvaras pamats:</b> {p.pilnvaras_pamats}")
-        if p.tālrunis: add_formatted_text(cell.add_paragraph(), f"<b>Tālrunis:</b> {p.tālrunis}")
-        if p.epasts: add_formatted_text(cell.add_paragraph(), f"<b>E-pasts:</b> {p.epasts}")
-        if p.bankas_konts: add_formatted_text(cell.add_paragraph(), f"<b>Bankas konts:</b> {p.bankas_konts}")
-        if p.juridiskais_statuss: add_formatted_text(cell.add_paragraph(), f"<b>Statuss:</b> {p.juridiskais_statuss}")
-
-    add_persona_info(row_cells[0], akta_dati.pieņēmējs)
-    add_persona_info(row_cells[1], akta_dati.nodevējs)
-    document.add_paragraph()
-
-    document.add_heading('Pozīcijas', level=2)
-    # Adjust columns based on visibility settings for DOCX
-    docx_headers = ["Nr.", "Apraksts", "Daudzums", "Vienība", "Cena", "Summa"]
-    if akta_dati.show_item_serial_number_in_table: docx_headers.append("Seriālais Nr.")
-    if akta_dati.show_item_warranty_in_table: docx_headers.append("Garantija")
-    if akta_dati.show_item_notes_in_table: docx_headers.append("Piezīmes pozīcijai")
-
-    table_items = document.add_table(rows=1, cols=len(docx_headers))
-    table_items.autofit = True
-    table_items.allow_autofit = True
-
-    # Nodrošinām redzamas līnijas + PDF līdzīgu virsrindas fonu
-    try:
-        table_items.style = 'Table Grid'
-    except Exception:
-        pass
-    _docx_set_table_borders(table_items, color_hex='000000', size=12)
-
-    for i, header_text in enumerate(docx_headers):
-        table_items.rows[0].cells[i].text = header_text
-        try:
-            _docx_set_cell_shading(table_items.rows[0].cells[i], 'D9E1F2')
-        except Exception:
-            pass
-        try:
-            for r in table_items.rows[0].cells[i].paragraphs[0].runs:
-                _docx_set_run_font(r, bold=True)
-            table_items.rows[0].cells[i].vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-        except Exception:
-            pass
-
-    for i, poz in enumerate(akta_dati.pozīcijas, start=1):
-        row_cells = table_items.add_row().cells
-        row_cells[0].text = str(i)
-        add_formatted_text(row_cells[1].paragraphs[0], poz.apraksts)
-        row_cells[2].text = f"{formēt_naudu(poz.daudzums)}"
-        row_cells[3].text = poz.vienība
-        row_cells[4].text = f"{formēt_naudu(poz.cena)} {akta_dati.valūta}"
-        row_cells[5].text = f"{formēt_naudu(poz.summa)} {akta_dati.valūta}"
-        col_idx = 6
-        if akta_dati.show_item_serial_number_in_table:
-            row_cells[col_idx].text = poz.seriālais_nr
-            col_idx += 1
-        if akta_dati.show_item_warranty_in_table:
-            row_cells[col_idx].text = poz.garantija
-            col_idx += 1
-        if akta_dati.show_item_notes_in_table:
-            add_formatted_text(row_cells[col_idx].paragraphs[0], poz.piezīmes_pozīcijai)
-
-    document.add_paragraph()
-
-    document.add_heading('Kopsavilkums', level=2)
-    add_formatted_text(document.add_paragraph(), f"<b>Kopā bez PVN:</b> {formēt_naudu(akta_dati.kopējā_summma())} {akta_dati.valūta}")
-    if akta_dati.iekļaut_pvn:
-        add_formatted_text(document.add_paragraph(), f"<b>PVN {akta_dati.pvn_likme}%:</b> {formēt_naudu(akta_dati.pvn_summa())} {akta_dati.valūta}")
-        add_formatted_text(document.add_paragraph(), f"<b>Kopā ar PVN:</b> {formēt_naudu(akta_dati.summa_ar_pvn())} {akta_dati.valūta}")
-    document.add_paragraph()
-
-    if akta_dati.piezīmes:
-        document.add_heading('Vispārīgās piezīmes', level=2)
-        add_formatted_text(document.add_paragraph(), akta_dati.piezīmes)
-        document.add_paragraph()
-
-    if akta_dati.strīdu_risināšana:
-        document.add_heading('Strīdu risināšanas kārtība', level=2)
-        add_formatted_text(document.add_paragraph(), akta_dati.strīdu_risināšana)
-        document.add_paragraph()
-
-    if akta_dati.konfidencialitātes_klauzula:
-        document.add_heading('Konfidencialitātes klauzula', level=2)
-        add_formatted_text(document.add_paragraph(), "Puses apņemas neizpaust trešajām personām informāciju, kas iegūta šī akta ietvaros, izņemot gadījumus, ko nosaka normatīvie akti.")
-        document.add_paragraph()
-
-    if akta_dati.soda_nauda_procenti > 0:
-        document.add_heading('Soda nauda', level=2)
-        add_formatted_text(document.add_paragraph(), f"Par saistību neizpildi vai nepienācīgu izpildi, vainīgā puse maksā otrai pusei soda naudu {formēt_naudu(akta_dati.soda_nauda_procenti)}% apmērā no neizpildīto saistību vērtības par katru kavējuma dienu.")
-        document.add_paragraph()
-
-    if akta_dati.piegādes_nosacījumi:
-        document.add_heading('Piegādes nosacījumi', level=2)
-        add_formatted_text(document.add_paragraph(), akta_dati.piegādes_nosacījumi)
-        document.add_paragraph()
-
-    if akta_dati.apdrošināšana:
-        document.add_heading('Apdrošināšana', level=2)
-        add_formatted_text(document.add_paragraph(), "Preces ir apdrošinātas pret bojājumiem un zaudējumiem līdz pieņemšanas-nodošanas brīdim.")
-        document.add_paragraph()
-
-    if akta_dati.papildu_nosacījumi:
-        document.add_heading('Papildu nosacījumi', level=2)
-        add_formatted_text(document.add_paragraph(), akta_dati.papildu_nosacījumi)
-        document.add_paragraph()
-
-    if akta_dati.atsauces_dokumenti:
-        document.add_heading('Atsauces dokumenti', level=2)
-        add_formatted_text(document.add_paragraph(), akta_dati.atsauces_dokumenti)
-        document.add_paragraph()
-
-    document.add_heading('Akta statuss', level=2)
-    add_formatted_text(document.add_paragraph(), akta_dati.akta_statuss)
-    document.add_paragraph()
-
-    if akta_dati.attēli:
-        document.add_heading('Pievienotās fotogrāfijas', level=2)
-        for att in akta_dati.attēli:
-            if os.path.exists(att.ceļš):
-                try:
-                    document.add_picture(att.ceļš, width=Inches(float(akta_dati.docx_image_width_inches)))
-                    if att.paraksts:
-                        add_formatted_text(document.add_paragraph(), att.paraksts)
-                except Exception:
-                    pass
-        document.add_paragraph()
-
-    if akta_dati.elektroniskais_paraksts:
-        if akta_dati.radit_elektronisko_parakstu_tekstu:
-            document.add_paragraph()
-            p = document.add_paragraph()
-            run = p.add_run("ŠIS DOKUMENTS PARAKSTĪTS AR DROŠU ELEKTRONISKO PARAKSTU UN SATUR LAIKA ZĪMOGU")
-            run.bold = True
-            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    elif akta_dati.parakstu_rindas:
-        document.add_heading('Paraksti', level=2)
-        table_signatures = document.add_table(rows=2, cols=2)
-        table_signatures.autofit = True
-        table_signatures.columns[0].width = Inches(3)
-        table_signatures.columns[1].width = Inches(3)
-
-        try:
-            table_signatures.style = 'Table Grid'
-        except Exception:
-            pass
-        _docx_set_table_borders(table_signatures, color_hex='000000', size=12)
-
-        table_signatures.rows[0].cells[0].text = "Pieņēmējs"
-        table_signatures.rows[0].cells[1].text = "Nodevējs"
-        for cell in table_signatures.rows[0].cells:
-            cell.paragraphs[0].runs[0].bold = True
-            cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-        cell_pie = table_signatures.rows[1].cells[0]
-        cell_nod = table_signatures.rows[1].cells[1]
-
-        if akta_dati.paraksts_pieņēmējs_ceļš and _path_exists(akta_dati.paraksts_pieņēmējs_ceļš):
-            try:
-                cell_pie.add_paragraph().add_run().add_picture(akta_dati.paraksts_pieņēmējs_ceļš, width=Inches(
-                    float(akta_dati.docx_signature_width_inches)))
-                cell_pie.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
-            except Exception:
-                cell_pie.add_paragraph("____________________________")
-        else:
-            cell_pie.add_paragraph("____________________________")
-
-        if akta_dati.paraksts_nodevējs_ceļš and _path_exists(akta_dati.paraksts_nodevējs_ceļš):
-            try:
-                cell_nod.add_paragraph().add_run().add_picture(akta_dati.paraksts_nodevējs_ceļš, width=Inches(
-                    float(akta_dati.docx_signature_width_inches)))
-                cell_nod.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
-            except Exception:
-                cell_nod.add_paragraph("____________________________")
-        else:
-            cell_nod.add_paragraph("____________________________")
-
-        add_formatted_text(cell_pie.add_paragraph(),
-                           akta_dati.pieņēmējs.kontaktpersona or akta_dati.pieņēmējs.nosaukums)
-        add_formatted_text(cell_nod.add_paragraph(), akta_dati.nodevējs.kontaktpersona or akta_dati.nodevējs.nosaukums)
-        for cell in [cell_pie, cell_nod]:
-            for p in cell.paragraphs:
-                p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-
-
-    # QR kodi DOCX dokumentā (ja ieslēgts)
-    try:
-        import qrcode
-        def _add_qr(data: str, size_mm: Decimal, align: str):
-            if not data:
-                return
-            qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L, box_size=10, border=2)
-            qr.add_data(data)
-            qr.make(fit=True)
-            img_qr = qr.make_image(fill_color="black", back_color="white")
-            qr_temp_path = tempfile.NamedTemporaryFile(delete=False, suffix=".png").name
-            img_qr.save(qr_temp_path)
-
-            qr_width_inches = float(size_mm) / 25.4
-            p = document.add_paragraph()
-            p.alignment = {"left": WD_ALIGN_PARAGRAPH.LEFT,
-                           "center": WD_ALIGN_PARAGRAPH.CENTER,
-                           "right": WD_ALIGN_PARAGRAPH.RIGHT}.get(align, WD_ALIGN_PARAGRAPH.RIGHT)
-            p.add_run().add_picture(qr_temp_path, width=Inches(qr_width_inches))
-            try:
-                os.remove(qr_temp_path)
-            except Exception:
-                pass
-
-        if akta_dati.include_custom_qr_code and akta_dati.custom_qr_code_data:
-            _add_qr(akta_dati.custom_qr_code_data, akta_dati.custom_qr_code_size_mm, "right")
-        if akta_dati.include_auto_qr_code and akta_dati.akta_nr:
-            _add_qr(akta_dati.akta_nr, akta_dati.auto_qr_code_size_mm, "left")
-    except Exception as e:
-        print(f"DOCX QR kļūda: {e}")
-
-    # Vecais QR koda bloks, kas izmantoja neeksistējošus atribūtus.
-    # Šis bloks ir jāizdzēš vai jākomentē, jo jaunā funkcionalitāte to aizstāj.
-    # Ja vēlaties, lai DOCX ģenerēšana atbalstītu abus QR kodus, jums būtu jāpievieno līdzīga loģika kā PDF ģenerēšanā.
-    # Piemēram, ja vēlaties, lai tas izmantotu individuālo QR kodu:
-    # if akta_dati.include_custom_qr_code and akta_dati.custom_qr_code_data:
-    #     try:
-    #         import qrcode
-    #         qr = qrcode.QRCode(
-    #             version=1,
-    #             error_correction=qrcode.constants.ERROR_CORRECT_L,
-    #             box_size=10,
-    #             border=4,
-    #         )
-    #         qr.add_data(akta_dati.custom_qr_code_data)
-    #         qr.make(fit=True)
-    #         img_qr = qr.make_image(fill_color="black", back_color="white")
-    #         qr_temp_path = tempfile.NamedTemporaryFile(delete=False, suffix=".png").name
-    #         img_qr.save(qr_temp_path)
-    #
-    #         # DOCX attēla platums balstīts uz QR koda izmēru mm, konvertējot uz collām
-    #         qr_width_inches = float(akta_dati.custom_qr_code_size_mm) / 25.4
-    #         document.add_picture(qr_temp_path, width=Inches(qr_width_inches))
-    #         document.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.RIGHT  # Pēc noklusējuma labajā pusē
-    #         os.remove(qr_temp_path)  # Clean up temp file
-    #     except ImportError:
-    #         print("QR Code generation requires 'qrcode' library. Please install it: pip install qrcode")
-    #     except Exception as e:
-    #         print(f"Error generating QR code for DOCX: {e}")
-
-    add_formatted_text(document.add_paragraph(), f"Dokuments ģenerēts: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    document.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.RIGHT
-
-    document.save(docx_ceļš)
+            "Ja PDF ir šifrēts, pārliecinieties, ka parole ir pareiza. "
+            f"\nKļūda: {e}"
+        )
+        return QPixmap()
 
 
 # ---------------------- GUI ----------------------
 
 # Custom URL interceptor for QWebEngineView
-class MapUrlInterceptor(QWebEngineUrlRequestInterceptor):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.map_click_callback = None
+_map_url_interceptor_cls = None
+
+
+def MapUrlInterceptor(parent=None):
+    """Izveido kartes URL pārtvērēju. Klase tiek definēta pirmajā izsaukumā,
+    jo QtWebEngineCore imports ir dārgs un nav vajadzīgs programmas startā."""
+    global _map_url_interceptor_cls
+    if _map_url_interceptor_cls is None:
+        from PySide6.QtWebEngineCore import QWebEngineUrlRequestInterceptor
+
+        class MapUrlInterceptor(QWebEngineUrlRequestInterceptor):
+            def __init__(self, parent=None):
+                super().__init__(parent)
+                self.map_click_callback = None
+
+            def interceptRequest(self, info):
+                url = info.requestUrl()
+                # Pārbaudām, vai URL ir mūsu pielāgotā shēma
+                if url.scheme() == "app" and url.host() == "map_click":
+                    lat = url.queryItemValue("lat")
+                    lon = url.queryItemValue("lon")
+                    if self.map_click_callback:
+                        # Izsaucam atpakaļsaites funkciju ar koordinātēm
+                        self.map_click_callback(lat, lon)
+                    # Svarīgi: Bloķējam pieprasījumu, lai pārlūkprogramma nemēģinātu atvērt šo URL
+                    # un neradītu brīdinājumu.
+                    info.block(True)
+                    # info.redirect(QUrl()) # Šī rinda var nebūt nepieciešama, ja block(True) darbojas efektīvi
+                # Ja URL nav mūsu pielāgotā shēma, ļaujam tam turpināties
+                else:
+                    info.block(False)
 
-    def interceptRequest(self, info):
-        url = info.requestUrl()
-        # Pārbaudām, vai URL ir mūsu pielāgotā shēma
-        if url.scheme() == "app" and url.host() == "map_click":
-            lat = url.queryItemValue("lat")
-            lon = url.queryItemValue("lon")
-            if self.map_click_callback:
-                # Izsaucam atpakaļsaites funkciju ar koordinātēm
-                self.map_click_callback(lat, lon)
-            # Svarīgi: Bloķējam pieprasījumu, lai pārlūkprogramma nemēģinātu atvērt šo URL
-            # un neradītu brīdinājumu.
-            info.block(True)
-            # info.redirect(QUrl()) # Šī rinda var nebūt nepieciešama, ja block(True) darbojas efektīvi
-        # Ja URL nav mūsu pielāgotā shēma, ļaujam tam turpināties
-        else:
-            info.block(False)
+        _map_url_interceptor_cls = MapUrlInterceptor
+    return _map_url_interceptor_cls(parent)
 
 # Pievienot šīs klases pirms AktaLogs klases definīcijas
 
@@ -3435,15 +1201,28 @@ class TextBlockTextEdit(QWidget):
 
 # ---------------------- Priekšskatījuma ģenerēšana fonā (lai DOCX/XLSX nekad neuzkar UI) ----------------------
 class _PreviewBuildWorker(QObject):
-    """Ģenerē priekšskatījuma PDF un pārvērš to PNG baitos fonā.
-
-    Svarīgi: QPixmap nedrīkst veidot fonā, tāpēc worker atgriež PNG baitu sarakstu.
+    """Ģenerē priekšskatījuma PDF un pārvērš to PNG baitos fonā, lapu pa lapai.
+
+    Vispirms tiek renderēta lapa, ko lietotājs skatās (old_page), tad nākamās un beigās
+    iepriekšējās; katra lapa tiek nosūtīta (page_ready), tiklīdz tā gatava. Katra lapa tiek
+    rastrēta ar DPI, kas vajadzīgs, lai tā ietilptu target_px (skatlauks × zoom).
+
+    Ja pdf_path ir dots, PDF netiek ģenerēts no jauna un renderētas tikai lapas `pages`
+    (zoom gadījumā redzamā lapa augstākā izšķirtspējā). Ar disk_cache lapas vispirms meklē
+    diska kešā pēc datu hash, un pilnībā renderēts dokuments tiek tajā saglabāts.
+    pārtraukt() atceļ darbu jebkurā posmā (PDF būve, pielikumu konvertēšana, katra lapa) un
+    nogalina strādājošos soffice/pdftoppm procesus; atcelts worker klusi emitē finished.
+    lauku_nospiedumi (no GUI _AktaHashKoks) ļauj story sekciju atslēgas nepārhešot.
+    Svarīgi: QPixmap nedrīkst veidot fonā, tāpēc worker sūta QImage (QPixmap veido GUI pavedienā).
     """
 
-    finished = Signal(str, list, int)  # data_hash, png_bytes_list, old_page
+    pages_started = Signal(str, int, int, str)  # data_hash, page_count, first_page, pdf_path
+    page_ready = Signal(str, int, QImage)  # data_hash, page_index, image
+    finished = Signal(str, int)  # data_hash, rendered_page_count
     failed = Signal(str, str)  # data_hash, error_message
 
-    def __init__(self, d: 'AktaDati', data_hash: str, old_page: int):
+    def __init__(self, d: 'AktaDati', data_hash: str, old_page: int, target_px: tuple = (0, 0),
+                 pdf_path: str = None, pages: list = None, disk_cache: bool = False, lauku_nospiedumi: dict = None):
         super().__init__()
         # --- Settings (persist across restarts) ---
         self._qt_settings = QSettings("AktaGenerators", "AktaGeneratorsApp")
@@ -3452,24 +1231,101 @@ class _PreviewBuildWorker(QObject):
         self._d = d
         self._hash = data_hash
         self._old_page = old_page
+        self._target_px = target_px
+        self._pdf_path = pdf_path
+        self._pages = pages
+        self._disk_cache = disk_cache
+        self._lauku_nospiedumi = lauku_nospiedumi
+        self._atcelšana = _AtcelšanasŽetons()
+
+    def pārtraukt(self):
+        """Izsaucams no GUI pavediena: dati jau novecojuši, darbs apstājas tuvākajā pārbaudes punktā."""
+        self._atcelšana.atcelt()
+
+    @staticmethod
+    def _lapu_secība(page_count: int, first: int) -> list:
+        """Skatītā lapa, tad nākamās, tad iepriekšējās (tuvākās vispirms)."""
+        return list(range(first, page_count)) + list(range(first - 1, -1, -1))
+
+    def _no_diska_keša(self) -> bool:
+        """Ja dokuments ir diska kešā pietiekamā izšķirtspējā, nosūta tā lapas (skatītā pirmā) un atgriež True.
+
+        Ja kādas lapas saglabātais DPI ir mazāks, nekā prasa pašreizējais target_px (vai nav
+        zināms), kešu neizmantojam – dokuments tiek renderēts no jauna un kešs pārrakstīts.
+        """
+        cached = _preview_page_cache.get_pages(self._hash)
+        if not cached:
+            return False
+        for page in cached:
+            if not page["size_pt"] or page["dpi"] < _priekšskatījuma_dpi(page["size_pt"], self._target_px):
+                return False
+        pages_png = [page["png"] for page in cached]
+        page_count = len(pages_png)
+        first = min(max(int(self._old_page or 0), 0), page_count - 1)
+        self.pages_started.emit(self._hash, page_count, first, "")
+        for i in self._lapu_secība(page_count, first):
+            if self._atcelšana.atcelts:
+                break
+            image = QImage.fromData(pages_png[i], "PNG")
+            if not image.isNull():
+                self.page_ready.emit(self._hash, i, image)
+        self.finished.emit(self._hash, page_count)
+        return True
 
     def run(self):
         temp_pdf_path = None
         try:
-            # Priekšskatījumā iekļaujam arī atsauces dokumentus (DOCX/XLSX u.c.), bet fonā, lai UI neuzkar.
-            temp_pdf_path = ģenerēt_pdf(self._d, pdf_ceļš=None, include_reference_docs=True, encrypt_pdf=False)
+            if self._disk_cache and self._pdf_path is None and self._no_diska_keša():
+                return
+            if self._pdf_path:
+                pdf_path = self._pdf_path
+            else:
+                # Priekšskatījumā iekļaujam arī atsauces dokumentus (DOCX/XLSX u.c.), bet fonā, lai UI neuzkar.
+                temp_pdf_path = ģenerēt_pdf(self._d, pdf_ceļš=None, include_reference_docs=True, encrypt_pdf=False,
+                                            atcelšana=self._atcelšana, lauku_nospiedumi=self._lauku_nospiedumi)
+                pdf_path = temp_pdf_path
 
             poppler_path_to_use = self._d.poppler_path if getattr(self._d, 'poppler_path', None) and os.path.exists(self._d.poppler_path) else None
-            images = convert_from_path(temp_pdf_path, poppler_path=poppler_path_to_use)
-
-            out_bytes = []
-            from io import BytesIO
-            for pil_img in images:
-                bio = BytesIO()
-                pil_img.save(bio, format='PNG')
-                out_bytes.append(bio.getvalue())
+            rastrētājs = _atvērt_priekšskatījuma_rastrētāju(pdf_path, poppler_path_to_use, self._atcelšana)
+            try:
+                page_count = rastrētājs.page_count()
+                if self._pages is None:
+                    first = min(max(int(self._old_page or 0), 0), page_count - 1) if page_count else 0
+                    # PDF failu turpmāk pārvalda GUI (zoom pārrenderēšanai), tāpēc šeit to nedzēšam
+                    self.pages_started.emit(self._hash, page_count, first, pdf_path)
+                    temp_pdf_path = None
+                    order = self._lapu_secība(page_count, first)
+                else:
+                    order = [i for i in self._pages if 0 <= i < page_count]
 
-            self.finished.emit(self._hash, out_bytes, self._old_page)
+                rendered = 0
+                images = {}
+                for i in order:
+                    if self._atcelšana.atcelts:
+                        break
+                    size_pt = rastrētājs.page_size_pt(i)
+                    dpi = _priekšskatījuma_dpi(size_pt, self._target_px)
+                    image = rastrētājs.render(i, dpi)
+                    if image.isNull():
+                        continue
+                    self.page_ready.emit(self._hash, i, image)
+                    images[i] = (image, dpi, size_pt)
+                    rendered += 1
+            finally:
+                rastrētājs.close()
+
+            # Pilnu dokumentu saglabājam diska kešā (PNG saspiešana šeit, nevis GUI pavedienā)
+            if (self._disk_cache and self._pages is None and not self._atcelšana.atcelts
+                    and page_count and len(images) == page_count):
+                _preview_page_cache.put_pages(self._hash,
+                                              [_qimage_png_bytes(images[i][0]) for i in range(page_count)],
+                                              page_dpi=[images[i][1] for i in range(page_count)],
+                                              page_sizes_pt=[images[i][2] for i in range(page_count)])
+
+            self.finished.emit(self._hash, rendered)
+        except GenerēšanaAtcelta:
+            # Novecojusi būve – nav kļūda; GUI šo hash jau ignorē
+            self.finished.emit(self._hash, 0)
         except Exception as e:
             self.failed.emit(self._hash, str(e))
         finally:
@@ -3494,7 +1350,15 @@ class AktaLogs(QMainWindow):
         # --- JAUNS: Audit + Undo/Redo ---
         self._current_user = os.getenv("USERNAME") or os.getenv("USER") or ""
         self._audit_logger = AuditLogger(os.path.join(APP_DATA_DIR, "audit_log.jsonl"))
-        self._undo_mgr = UndoRedoManager(max_steps=80)
+        _st = load_settings() or {}
+        try:
+            _undo_bytes = int(float(_st.get("undo_memory_mb", UNDO_MEMORY_MAX_BYTES // (1024 * 1024))) * 1024 * 1024)
+        except (TypeError, ValueError):
+            _undo_bytes = UNDO_MEMORY_MAX_BYTES
+        self._undo_mgr = UndoRedoManager(max_steps=80, max_bytes=_undo_bytes)
+        # Pēdējā snapshot daļas (kopīgotas starp snapshots): {ieraksta nosaukums: kopija}, {lauks: vērtība}
+        self._undo_ab_daļas = {}
+        self._undo_projekta_daļas = {}
 
         # Ātri undo/redo (Ctrl+Z / Ctrl+Y)
         self._act_undo = QAction("Undo", self)
@@ -3521,15 +1385,12 @@ class AktaLogs(QMainWindow):
             self._undo_status_label = None
             self._redo_status_label = None
 
-        # Izmaiņu izsekošana laukiem (audit + undo checkpoints)
-        self._track_enabled = True
-        self._last_widget_values = {}
-        try:
-            app = QApplication.instance()
-            if app is not None:
-                app.installEventFilter(self)
-        except Exception:
-            pass
+        # Izmaiņu izsekošana laukiem (audit + undo + priekšskatījums) no pašu logrīku signāliem
+        self._izmaiņas = _IzmaiņuSekotājs(self)
+        self._izmaiņas.izmaiņa_pabeigta.connect(self._izmaiņa_pabeigta)
+        self._izmaiņas.lauks_mainīts.connect(lambda _lauks: self._update_preview())
+        self._izmaiņas.tabulas_rindas_pārbīdītas.connect(self._poz_undo_pārbīdīt)
+        self._izmaiņas.tabula_pārbūvēta.connect(self._poz_undo_atmest)
 
         self._update_undo_redo_indicators()
         self.setWindowTitle("Pieņemšanas–Nodošanas akta ģenerators")
@@ -3551,16 +1412,38 @@ class AktaLogs(QMainWindow):
         self.preview_timer.setSingleShot(True)
         self._map_address_target = None  # QLineEdit, kurā ieliekam adresi no kartes
         self.preview_timer.timeout.connect(self._do_update_preview)
-        self.preview_cache = {}  # Kešatmiņa: {'data_hash': {'images': [...], 'page_count': int}}
+        # Zoom/izmēra maiņa: redzamo lapu pārrenderē augstākā izšķirtspējā (ar nelielu aizturi)
+        self._zoom_render_timer = QTimer(self)
+        self._zoom_render_timer.setSingleShot(True)
+        self._zoom_render_timer.timeout.connect(self._rerender_visible_page)
+        self._zoom_thread: Optional[QThread] = None
+        self._zoom_worker: Optional[_PreviewBuildWorker] = None
+        self._zoom_render_key = None  # (data_hash, lapa, mērķa izmērs), kas pēdējo reizi pieprasīts
+        self._preview_pdf_path = None  # pēdējā priekšskatījuma PDF (pagaidu fails, pieder GUI)
+        self._preview_pdf_hash = None
+        self._preview_images_hash = None  # datu hash, kuram pieder preview_images
+        # Kešatmiņa: {data_hash: [QPixmap, ...]} ar baitu budžetu + (pēc izvēles) diska līmenis
+        try:
+            _cache_bytes = int(float(_st.get("preview_cache_mb", PREVIEW_MEMORY_CACHE_MAX_BYTES // (1024 * 1024))) * 1024 * 1024)
+        except (TypeError, ValueError):
+            _cache_bytes = PREVIEW_MEMORY_CACHE_MAX_BYTES
+        self.preview_cache = _PreviewCache(_cache_bytes)
+        self._preview_disk_cache = bool(_st.get("preview_disk_cache", True))
         self.last_data_hash = None  # Pēdējais datu hash
+        self._hash_koks = _AktaHashKoks()  # priekšskatījuma atslēga = Merkle koka sakne
 
         # Priekšskatījuma ģenerēšana fonā (DOCX/XLSX konvertācija u.c.)
         self._preview_thread: Optional[QThread] = None
         self._preview_worker: Optional[_PreviewBuildWorker] = None
         self._requested_preview_hash: Optional[str] = None
-        self._pending_preview_request = None  # (AktaDati, data_hash, old_page)
+        # Atceltas (novecojušas) būves, kas vēl apstājas: [(QThread, worker)] – atsauces līdz thread beigām
+        self._novecojušie_preview_darbi = []
 
         self.tabs = QTabWidget()
+        # Cilnes, kuru saturs tiek uzbūvēts tikai pirmajā atlasē: {vietturis: būvētājs}
+        self._slinkās_cilnes = {}
+        self._būvējamais_vietturis = None
+        self._vēsture_ielādēta = False
 
         self._būvēt_pamata_tab()
         self._būvēt_puses_tab()
@@ -3568,21 +1451,20 @@ class AktaLogs(QMainWindow):
         self._būvēt_attēli_tab()
         self._būvēt_iestatījumi_tab()
         self._būvēt_papildu_iestatījumi_tab()
-        self._būvēt_sablonu_tab()
-        self._būvēt_adresu_gramata_tab()
-        self._būvēt_audit_tab()
-        self._būvēt_dokumentu_vesture_tab()
-        self._būvēt_kartes_tab()  # New map tab
+        # Šabloni, adrešu grāmata, audit, vēsture un karte: vietturi, saturs + dati pēc pieprasījuma
+        self._pievienot_slinko_cilni("Šabloni", self._būvēt_sablonu_tab)
+        self._pievienot_slinko_cilni("Adrešu grāmata", self._būvēt_adresu_gramata_tab)
+        self._pievienot_slinko_cilni("Audit", self._būvēt_audit_tab)
+        self._pievienot_slinko_cilni("Dokumentu vēsture", self._būvēt_dokumentu_vesture_tab)
+        self.tab_kartes = self._pievienot_slinko_cilni("Karte", self._būvēt_kartes_tab)
+        self.tabs.currentChanged.connect(self._materializēt_cilni)
         # Pārliecināmies, ka noklusējuma šablonu direktorijs ir iestatīts
         if not self.data.templates_dir:
             self.data.templates_dir = os.path.join(APP_DATA_DIR, "AktaGenerators_Templates")
             os.makedirs(self.data.templates_dir, exist_ok=True)  # Izveidojam noklusējuma mapi, ja tā neeksistē
-        self._update_sablonu_list()
 
-        # Ielādējam vēsturi un adrešu grāmatu PĒC GUI elementu izveides
-        self._load_history()
+        # Adrešu grāmatas dati vajadzīgi arī cilnē "Puses" un undo; vēsture tiek ielādēta pēc pieprasījuma
         self._load_address_book()
-        self._update_address_book_list()
         self.ieladet_noklusejuma_iestatijumus()
 
 
@@ -3650,6 +1532,8 @@ class AktaLogs(QMainWindow):
         if self.data.auto_generate_akta_nr:
             self._generate_akta_nr()
 
+        self._izmaiņas.pievienot_bērnus(self.tabs, self._logrīku_nosaukumi())
+
     # ----- Menu -----
 
     def _auto_load_test_template_first_run(self):
@@ -3674,6 +1558,10 @@ class AktaLogs(QMainWindow):
                         target_item = it
                         break
 
+            if target_item is None and not hasattr(self, "sablonu_list"):
+                # Šablonu cilne vēl nav uzbūvēta; iebūvētais šablons tajā ir vienmēr
+                target_item = QListWidgetItem(target_name)
+
             if target_item is None:
                 return
 
@@ -3812,8 +1700,9 @@ class AktaLogs(QMainWindow):
 
     def _clear_preview_cache(self):
         try:
-            if hasattr(self, "preview_cache") and isinstance(self.preview_cache, dict):
+            if hasattr(self, "preview_cache"):
                 self.preview_cache.clear()
+            _preview_page_cache.clear()
             if hasattr(self, "last_data_hash"):
                 self.last_data_hash = None
             self.statusBar().showMessage("Priekšskatījuma kešs notīrīts", 3000)
@@ -4333,6 +2222,80 @@ class AktaLogs(QMainWindow):
             print(f"Akta nr. skaitītāja reset kļūda: {e}")
 
 
+    # --- Pozīciju rindu kešs: savākt_datus no tabulas nolasa tikai mainītās rindas ---
+    def _poz_rindu_keša_pieslēgšana(self):
+        """Pieslēdz tabulas modeļa signālus, kas invalidē _poz_rindu_kešs (rinda -> Pozīcija)."""
+        self._poz_rindu_kešs = [None] * self.tab.rowCount()
+        self._poz_rindu_keša_idx = None
+        m = self.tab.model()
+        m.dataChanged.connect(self._poz_rindas_mainītas)
+        m.rowsInserted.connect(self._poz_rindas_ievietotas)
+        m.rowsRemoved.connect(self._poz_rindas_dzēstas)
+        for sig in (m.rowsMoved, m.layoutChanged, m.modelReset, m.columnsInserted, m.columnsRemoved, m.columnsMoved):
+            sig.connect(self._poz_rindu_kešs_atiestatīt)
+
+    def _poz_rindas_mainītas(self, top_left, bottom_right, *_roles):
+        kešs = self._poz_rindu_kešs
+        for r in range(max(0, top_left.row()), min(bottom_right.row() + 1, len(kešs))):
+            kešs[r] = None
+
+    def _poz_rindas_ievietotas(self, _parent, first: int, last: int):
+        self._poz_rindu_kešs[first:first] = [None] * (last - first + 1)
+
+    def _poz_rindas_dzēstas(self, _parent, first: int, last: int):
+        del self._poz_rindu_kešs[first:last + 1]
+
+    def _poz_rindu_kešs_atiestatīt(self, *_args):
+        self._poz_rindu_kešs = [None] * self.tab.rowCount()
+
+    def _nolasīt_poz_rindu(self, r: int, idx: dict) -> tuple:
+        """Nolasa vienu tabulas rindu: (Pozīcija vai None tukšai rindai, pielāgoto kolonnu vērtības)."""
+        custom = tuple(
+            (self.tab.item(r, c).text() if self.tab.item(r, c) else "")
+            for c in range(idx["custom_start"], idx["foto"])  # Pielāgotās kolonnas sākas pēc standarta kolonnu bloka
+        )
+        apr = self.tab.item(r, idx["apraksts"]).text() if self.tab.item(r, idx["apraksts"]) else ""
+        daudz = to_decimal(self.tab.item(r, idx["daudzums"]).text() if self.tab.item(r, idx["daudzums"]) else "0")
+        vien = self.tab.item(r, idx["vieniba"]).text() if self.tab.item(r, idx["vieniba"]) else ""
+        cena = to_decimal(self.tab.item(r, idx["cena"]).text() if self.tab.item(r, idx["cena"]) else "0")
+
+        foto_path = ""
+        if "foto" in idx:
+            foto_path = self.tab.item(r, idx["foto"]).text() if self.tab.item(r, idx["foto"]) else ""
+
+        ser_nr = self.tab.item(r, idx.get("serial", -1)).text() if idx.get("serial") is not None and self.tab.item(r, idx.get("serial")) else ""
+        gar = self.tab.item(r, idx.get("warranty", -1)).text() if idx.get("warranty") is not None and self.tab.item(r, idx.get("warranty")) else ""
+        piez_poz = self.tab.item(r, idx.get("notes", -1)).text() if idx.get("notes") is not None and self.tab.item(r, idx.get("notes")) else ""
+
+        if not apr and daudz == 0 and not ser_nr and not gar and not piez_poz and not foto_path:
+            return None, custom
+
+        return Pozīcija(
+            apraksts=apr,
+            daudzums=daudz,
+            vienība=vien,
+            cena=cena,
+            seriālais_nr=ser_nr,
+            garantija=gar,
+            piezīmes_pozīcijai=piez_poz,
+            attēla_ceļš=foto_path
+        ), custom
+
+    def _poz_rindas(self, idx: dict) -> list:
+        """[(Pozīcija vai None, pielāgoto kolonnu vērtības)] visām tabulas rindām; kešotās netiek lasītas."""
+        kešs = getattr(self, "_poz_rindu_kešs", None)
+        if kešs is None:
+            return [self._nolasīt_poz_rindu(r, idx) for r in range(self.tab.rowCount())]
+        if len(kešs) != self.tab.rowCount() or idx != self._poz_rindu_keša_idx:
+            # Drošībai (piem., pielāgotās kolonnas mainītas bez modeļa signāla) – nolasām visu no jauna
+            self._poz_rindu_kešs_atiestatīt()
+            self._poz_rindu_keša_idx = dict(idx)
+            kešs = self._poz_rindu_kešs
+        for r, entry in enumerate(kešs):
+            if entry is None:
+                kešs[r] = self._nolasīt_poz_rindu(r, idx)
+        return kešs
+
     def savākt_datus(self) -> AktaDati:
         d = AktaDati()
         d.akta_nr = self.in_akta_nr.text().strip()
@@ -4375,7 +2338,9 @@ class AktaLogs(QMainWindow):
         d.qr_verification_url_enabled = self.ck_qr_use_url.isChecked() if hasattr(self, 'ck_qr_use_url') else False
         d.qr_verification_base_url = (self.le_qr_base_url.text().strip() if hasattr(self, 'le_qr_base_url') else '')
         try:
-            if hasattr(self, '_settings') and self._settings is not None:
+            if (hasattr(self, '_settings') and self._settings is not None
+                    and self._settings.get("qr_base_url") != d.qr_verification_base_url):
+                # savākt_datus tiek saukts katrā priekšskatījuma tikšķī – failu rakstām tikai pēc izmaiņām
                 self._settings["qr_base_url"] = d.qr_verification_base_url
                 save_settings(self._settings)
         except Exception:
@@ -4414,36 +2379,13 @@ class AktaLogs(QMainWindow):
         d.pieņēmējs = pie
         d.nodevējs = nod
 
-        # Pozīcijas
+        # Pozīcijas (nemainītās tabulas rindas nāk no _poz_rindu_kešs – tie paši Pozīcija objekti)
         poz = []
         idx = self._poz_col_indices()
-        for r in range(self.tab.rowCount()):
-            apr = self.tab.item(r, idx["apraksts"]).text() if self.tab.item(r, idx["apraksts"]) else ""
-            daudz = to_decimal(self.tab.item(r, idx["daudzums"]).text() if self.tab.item(r, idx["daudzums"]) else "0")
-            vien = self.tab.item(r, idx["vieniba"]).text() if self.tab.item(r, idx["vieniba"]) else ""
-            cena = to_decimal(self.tab.item(r, idx["cena"]).text() if self.tab.item(r, idx["cena"]) else "0")
-
-            foto_path = ""
-            if "foto" in idx:
-                foto_path = self.tab.item(r, idx["foto"]).text() if self.tab.item(r, idx["foto"]) else ""
-
-            ser_nr = self.tab.item(r, idx.get("serial", -1)).text() if idx.get("serial") is not None and self.tab.item(r, idx.get("serial")) else ""
-            gar = self.tab.item(r, idx.get("warranty", -1)).text() if idx.get("warranty") is not None and self.tab.item(r, idx.get("warranty")) else ""
-            piez_poz = self.tab.item(r, idx.get("notes", -1)).text() if idx.get("notes") is not None and self.tab.item(r, idx.get("notes")) else ""
-
-            if not apr and daudz == 0 and not ser_nr and not gar and not piez_poz and not foto_path:
-                continue
-
-            poz.append(Pozīcija(
-                apraksts=apr,
-                daudzums=daudz,
-                vienība=vien,
-                cena=cena,
-                seriālais_nr=ser_nr,
-                garantija=gar,
-                piezīmes_pozīcijai=piez_poz,
-                attēla_ceļš=foto_path
-            ))
+        rindas = self._poz_rindas(idx)
+        for pozīcija, _custom in rindas:
+            if pozīcija is not None:
+                poz.append(pozīcija)
 
         d.pozīcijas = poz
 
@@ -4451,11 +2393,7 @@ class AktaLogs(QMainWindow):
         d.custom_columns = self.data.custom_columns.copy()
         # Atjaunināt pielāgoto kolonnu datus no tabulas
         for col_idx, col in enumerate(d.custom_columns):
-            col_data = []
-            for r in range(self.tab.rowCount()):
-                item = self.tab.item(r, idx["custom_start"] + col_idx)  # Pielāgotās kolonnas sākas pēc standarta kolonnu bloka
-                col_data.append(item.text() if item else "")
-            col['data'] = col_data
+            col['data'] = [custom[col_idx] if col_idx < len(custom) else "" for _p, custom in rindas]
 
         # JAUNS: pozīciju kolonnu konfigurācija + kopsavilkums
         try:
@@ -4581,6 +2519,7 @@ class AktaLogs(QMainWindow):
         d.contact_details_header_font_size = self.in_contact_details_header_font_size.value()
         d.item_image_width_mm = to_decimal(self.in_item_image_width_mm.value())
         d.item_image_caption_font_size = self.in_item_image_caption_font_size.value()
+        d.pdf_image_dpi = self.in_pdf_image_dpi.value()
         d.show_item_notes_in_table = self.ck_show_item_notes_in_table.isChecked()
         d.show_item_serial_number_in_table = self.ck_show_item_serial_number_in_table.isChecked()
         d.show_item_warranty_in_table = self.ck_show_item_warranty_in_table.isChecked()
@@ -4930,8 +2869,8 @@ class AktaLogs(QMainWindow):
         self.tab = QTableWidget(0, len(headers))
         self.tab.setHorizontalHeaderLabels(headers)
 
-        # --- JAUNS: Undo/Redo pozīciju tabulai ---
-        self._ensure_positions_undo_hook()
+        # --- JAUNS: Undo/Redo pozīciju tabulai (šūnu izmaiņas; summa ir aprēķināta) ---
+        self._izmaiņas.pievienot_tabulu(self.tab, (self._poz_col_indices()["summa"],))
 
         # --- JAUNS: kopsavilkuma rādīšana (zem tabulas PDF) ---
         self.ck_show_price_summary = QCheckBox("Rādīt cenu apkopojumu zem tabulas (PDF)")
@@ -5023,6 +2962,7 @@ class AktaLogs(QMainWindow):
 
         self.tab.cellChanged.connect(self._pārrēķināt_summa)
         self.tab.cellChanged.connect(self._update_preview)
+        self._poz_rindu_keša_pieslēgšana()
 
 
     def _poz_col_indices(self) -> dict:
@@ -6178,6 +4118,7 @@ class AktaLogs(QMainWindow):
                 QMessageBox.critical(self, "Drukas kļūda", "Neizdevās ģenerēt PDF failu drukāšanai.")
                 return
 
+            from PySide6.QtPrintSupport import QPrinter, QPrintPreviewDialog
             printer = QPrinter(QPrinter.HighResolution)
 
             # Lietojam PROGRAMMAS lapas izmēru (nevis printera/sistēmas noklusējumu, kas bieži ir Letter)
@@ -6217,7 +4158,7 @@ class AktaLogs(QMainWindow):
                 except Exception as e:
                     print(f"Neizdevās dzēst pagaidu PDF failu: {e}")
 
-    def _render_pdf_to_printer(self, pdf_path: str, printer: QPrinter):
+    def _render_pdf_to_printer(self, pdf_path: str, printer):
         """
         Renderē PDF failu uz printera.
         Izmanto pdf2image, lai iegūtu attēlus no PDF un zīmē tos uz printera.
@@ -6232,6 +4173,7 @@ class AktaLogs(QMainWindow):
             images = self._print_images_cache.get(cache_key)
 
             if images is None:
+                from pdf2image import convert_from_path
                 # Pārliecināmies, ka poppler_path ir pieejams
                 poppler_path_to_use = self.data.poppler_path if self.data.poppler_path and os.path.exists(self.data.poppler_path) else None
                 # Mazliet zemāka DPI vērtība = ātrāk un stabilāk drukas priekšskatījumā
@@ -6251,6 +4193,7 @@ class AktaLogs(QMainWindow):
                 QMessageBox.warning(self, "Drukas kļūda", "Neizdevās iegūt attēlus no PDF faila drukāšanai.")
                 return
 
+            from PIL.ImageQt import ImageQt
             painter = QPainter()
             if not painter.begin(printer):
                 QMessageBox.critical(self, "Drukas kļūda", "Neizdevās sākt zīmēšanu uz printera.")
@@ -6440,6 +4383,7 @@ class AktaLogs(QMainWindow):
         self.in_contact_details_header_font_size = QSpinBox(); self.in_contact_details_header_font_size.setRange(6, 12); self.in_contact_details_header_font_size.setValue(8)
         self.in_item_image_width_mm = QDoubleSpinBox(); self.in_item_image_width_mm.setRange(10, 150); self.in_item_image_width_mm.setValue(50); self.in_item_image_width_mm.setSuffix(" mm")
         self.in_item_image_caption_font_size = QSpinBox(); self.in_item_image_caption_font_size.setRange(6, 12); self.in_item_image_caption_font_size.setValue(8)
+        self.in_pdf_image_dpi = QSpinBox(); self.in_pdf_image_dpi.setRange(72, 600); self.in_pdf_image_dpi.setSingleStep(50); self.in_pdf_image_dpi.setValue(200); self.in_pdf_image_dpi.setSuffix(" DPI")
         self.ck_show_item_notes_in_table = QCheckBox("Rādīt pozīciju piezīmes tabulā"); self.ck_show_item_notes_in_table.setChecked(True)
         self.ck_show_item_serial_number_in_table = QCheckBox("Rādīt pozīciju sērijas Nr. tabulā"); self.ck_show_item_serial_number_in_table.setChecked(True)
         self.ck_show_item_warranty_in_table = QCheckBox("Rādīt pozīciju garantiju tabulā"); self.ck_show_item_warranty_in_table.setChecked(True)
@@ -6558,6 +4502,7 @@ class AktaLogs(QMainWindow):
         form.addRow("Kontaktu detaļu galvenes fonta izmērs:", self.in_contact_details_header_font_size)
         form.addRow("Pozīciju attēlu platums (mm):", self.in_item_image_width_mm)
         form.addRow("Pozīciju attēlu paraksta fonta izmērs:", self.in_item_image_caption_font_size)
+        form.addRow("Attēlu izšķirtspēja PDF:", self.in_pdf_image_dpi)
         form.addRow(self.ck_show_item_notes_in_table)
         form.addRow(self.ck_show_item_serial_number_in_table)
         form.addRow(self.ck_show_item_warranty_in_table)
@@ -6641,6 +4586,7 @@ class AktaLogs(QMainWindow):
         self.in_contact_details_header_font_size.valueChanged.connect(self._update_preview)
         self.in_item_image_width_mm.valueChanged.connect(self._update_preview)
         self.in_item_image_caption_font_size.valueChanged.connect(self._update_preview)
+        self.in_pdf_image_dpi.valueChanged.connect(self._update_preview)
         self.ck_show_item_notes_in_table.stateChanged.connect(self._update_preview)
         self.ck_show_item_serial_number_in_table.stateChanged.connect(self._update_preview)
         self.ck_show_item_warranty_in_table.stateChanged.connect(self._update_preview)
@@ -6696,6 +4642,43 @@ class AktaLogs(QMainWindow):
             self.in_poppler_path.setText(folder_path)
 
     # ----- Tab: Šabloni -----
+    # ----- Cilnes pēc pieprasījuma -----
+    def _pievienot_slinko_cilni(self, nosaukums: str, būvētājs) -> QWidget:
+        """Pievieno tukšu cilnes vietturi; būvētājs tiek izsaukts, kad cilne pirmo reizi atlasīta."""
+        vietturis = QWidget()
+        lay = QVBoxLayout(vietturis)
+        lay.setContentsMargins(0, 0, 0, 0)
+        self.tabs.addTab(vietturis, nosaukums)
+        self._slinkās_cilnes[vietturis] = būvētājs
+        return vietturis
+
+    def _materializēt_cilni(self, index: int):
+        """tabs.currentChanged: ja atlasītā cilne ir vietturis, uzbūvē tās saturu un ielādē datus."""
+        vietturis = self.tabs.widget(index)
+        būvētājs = self._slinkās_cilnes.pop(vietturis, None)
+        if būvētājs is None:
+            return
+        self._būvējamais_vietturis = vietturis
+        try:
+            būvētājs()
+            self._izmaiņas.pievienot_bērnus(vietturis, self._logrīku_nosaukumi())
+        except Exception as e:
+            print(f"Neizdevās uzbūvēt cilni '{self.tabs.tabText(index)}': {e}")
+        finally:
+            self._būvējamais_vietturis = None
+
+    def _pievienot_cilni(self, w: QWidget, nosaukums: str) -> QWidget:
+        """Ievieto cilnes saturu vietturī (ja būvē pēc pieprasījuma) vai pievieno jaunu cilni.
+
+        Atgriež cilnes lapu, ko var padot tabs.setCurrentWidget().
+        """
+        vietturis = self._būvējamais_vietturis
+        if vietturis is None:
+            self.tabs.addTab(w, nosaukums)
+            return w
+        vietturis.layout().addWidget(w)
+        return vietturis
+
     def _būvēt_sablonu_tab(self):
         w = QWidget()
         v = QVBoxLayout()
@@ -6729,7 +4712,8 @@ class AktaLogs(QMainWindow):
         v.addStretch()
 
         w.setLayout(v)
-        self.tabs.addTab(w, "Šabloni")
+        self._pievienot_cilni(w, "Šabloni")
+        self._update_sablonu_list()
 
     def ieladet_sablonu(self, item: QListWidgetItem):
         if not item:
@@ -6863,6 +4847,7 @@ class AktaLogs(QMainWindow):
                 contact_details_header_font_size=8,
                 item_image_width_mm=Decimal("50"),
                 item_image_caption_font_size=8,
+                pdf_image_dpi=200,
                 show_item_notes_in_table=True,
                 show_item_serial_number_in_table=True,
                 show_item_warranty_in_table=True,
@@ -7064,6 +5049,7 @@ class AktaLogs(QMainWindow):
                     contact_details_header_font_size=data.get('contact_details_header_font_size', 8),
                     item_image_width_mm=get_decimal(data, 'item_image_width_mm', '50'),
                     item_image_caption_font_size=data.get('item_image_caption_font_size', 8),
+                    pdf_image_dpi=data.get('pdf_image_dpi', 200),
                     show_item_notes_in_table=get_bool(data, 'show_item_notes_in_table', True),
                     show_item_serial_number_in_table=get_bool(data, 'show_item_serial_number_in_table', True),
                     show_item_warranty_in_table=get_bool(data, 'show_item_warranty_in_table', True),
@@ -7220,6 +5206,7 @@ class AktaLogs(QMainWindow):
                 contact_details_header_font_size=8,
                 item_image_width_mm=Decimal("50"),
                 item_image_caption_font_size=8,
+                pdf_image_dpi=200,
                 show_item_notes_in_table=True,
                 show_item_serial_number_in_table=True,
                 show_item_warranty_in_table=True,
@@ -7413,6 +5400,7 @@ class AktaLogs(QMainWindow):
                         contact_details_header_font_size=data.get('contact_details_header_font_size', 8),
                         item_image_width_mm=get_decimal(data, 'item_image_width_mm', '50'),
                         item_image_caption_font_size=data.get('item_image_caption_font_size', 8),
+                        pdf_image_dpi=data.get('pdf_image_dpi', 200),
                         show_item_notes_in_table=get_bool(data, 'show_item_notes_in_table', True),
                         show_item_serial_number_in_table=get_bool(data, 'show_item_serial_number_in_table', True),
                         show_item_warranty_in_table=get_bool(data, 'show_item_warranty_in_table', True),
@@ -7482,7 +5470,7 @@ class AktaLogs(QMainWindow):
         v.addStretch()
 
         w.setLayout(v)
-        self.tabs.addTab(w, "Adrešu grāmata")
+        self._pievienot_cilni(w, "Adrešu grāmata")
         self._update_address_book_list()
 
     # ======================
@@ -7529,7 +5517,7 @@ class AktaLogs(QMainWindow):
         v.addLayout(h)
 
         self._audit_filter.textChanged.connect(lambda: self._refresh_audit_table(limit=400))
-        self.tabs.addTab(tab, "Audit")
+        self._pievienot_cilni(tab, "Audit")
 
         self._refresh_audit_table(limit=200)
 
@@ -7603,97 +5591,57 @@ class AktaLogs(QMainWindow):
         except Exception:
             pass
 
-    def eventFilter(self, obj, event):
-        # Globāla izmaiņu izsekošana: FIELD_EDIT / COMBO_CHANGE / CHECK_TOGGLE
-        try:
-            if not getattr(self, "_track_enabled", False):
-                return super().eventFilter(obj, event)
-
-            et = event.type()
-            # LineEdit: audit uz FocusOut (kad beidz rediģēt)
-            if isinstance(obj, QLineEdit) and et == QEvent.FocusOut:
-                key = id(obj)
-                cur = obj.text()
-                prev = self._last_widget_values.get(key, None)
-                if prev is None:
-                    self._last_widget_values[key] = cur
-                    return super().eventFilter(obj, event)
-                if cur != prev:
-                    self._undo_mgr.push_undo(self._snapshot_state("FIELD_EDIT"))
-                    self._audit("FIELD_EDIT", {"field": obj.objectName() or obj.placeholderText() or "QLineEdit", "value": (cur or "")[:200]})
-                    self._last_widget_values[key] = cur
-                    self._update_undo_redo_indicators()
-                return super().eventFilter(obj, event)
-
-            # ComboBox: audit uz FocusOut
-            if isinstance(obj, QComboBox) and et == QEvent.FocusOut:
-                key = id(obj)
-                cur = obj.currentText()
-                prev = self._last_widget_values.get(key, None)
-                if prev is None:
-                    self._last_widget_values[key] = cur
-                    return super().eventFilter(obj, event)
-                if cur != prev:
-                    self._undo_mgr.push_undo(self._snapshot_state("COMBO_CHANGE"))
-                    self._audit("COMBO_CHANGE", {"field": obj.objectName() or "QComboBox", "value": (cur or "")[:200]})
-                    self._last_widget_values[key] = cur
-                    self._update_undo_redo_indicators()
-                return super().eventFilter(obj, event)
-
-            # CheckBox: audit uz MouseButtonRelease (toggling)
-            if isinstance(obj, QCheckBox) and et == QEvent.MouseButtonRelease:
-                key = id(obj)
-                cur = bool(obj.isChecked())
-                prev = self._last_widget_values.get(key, None)
-                if prev is None:
-                    self._last_widget_values[key] = cur
-                    return super().eventFilter(obj, event)
-                if cur != prev:
-                    self._undo_mgr.push_undo(self._snapshot_state("CHECK_TOGGLE"))
-                    self._audit("CHECK_TOGGLE", {"field": obj.text() or obj.objectName() or "QCheckBox", "value": cur})
-                    self._last_widget_values[key] = cur
-                    self._update_undo_redo_indicators()
-                return super().eventFilter(obj, event)
-
-        except Exception:
-            pass
-        return super().eventFilter(obj, event)
-
-    def _ensure_positions_undo_hook(self):
-        # Pieslēdz undo/redo checkpoint pozīciju tabulas izmaiņām (debounce)
-        try:
-            if not hasattr(self, "tab") or self.tab is None:
-                return
-            if hasattr(self, "_pos_change_timer") and self._pos_change_timer is not None:
-                return
-            self._pos_change_timer = QTimer(self)
-            self._pos_change_timer.setSingleShot(True)
-            self._pos_change_timer.timeout.connect(self._commit_positions_change)
-            try:
-                self.tab.cellChanged.connect(self._on_positions_cell_changed)
-            except Exception:
-                pass
-        except Exception:
-            pass
-
-    def _on_positions_cell_changed(self, row: int, col: int):
+    def _izmaiņa_pabeigta(self, ieraksts: dict):
+        """_IzmaiņuSekotājs: pabeigta lietotāja izmaiņa -> undo ieraksts + audit."""
         try:
-            self._last_pos_change = (row, col)
-            if hasattr(self, "_pos_change_timer") and self._pos_change_timer is not None:
-                self._pos_change_timer.start(700)
+            self._undo_mgr.push_undo(ieraksts)
+            if "šūnas" in ieraksts:
+                r, c, _vecā, _jaunā = ieraksts["šūnas"][-1]
+                details = {"row": r, "col": c, "cells": len(ieraksts["šūnas"])}
+            else:
+                v = ieraksts.get("jaunā")
+                details = {"field": ieraksts.get("lauks", ""), "value": v[:200] if isinstance(v, str) else v}
+            self._audit(ieraksts.get("label", ""), details)
+            self._update_undo_redo_indicators()
         except Exception:
             pass
 
-    def _commit_positions_change(self):
-        try:
-            self._undo_mgr.push_undo(self._snapshot_state("POZ_CHANGE"))
-            rc = getattr(self, "_last_pos_change", None)
-            details = {"row": rc[0], "col": rc[1]} if rc else {}
-            self._audit("POZ_CHANGE", details)
+    def _logrīku_nosaukumi(self) -> dict:
+        """{id(logrīks): atribūta nosaukums} – izsekoto lauku stabilie nosaukumi (piem., 'in_akta_nr', 'pie_in[0]')."""
+        nosaukumi = {}
+        for k, v in vars(self).items():
+            if isinstance(v, QWidget):
+                nosaukumi.setdefault(id(v), k)
+            elif isinstance(v, (list, tuple)):
+                for i, x in enumerate(v):
+                    if isinstance(x, QWidget):
+                        nosaukumi.setdefault(id(x), f"{k}[{i}]")
+            elif isinstance(v, dict):
+                for kk, x in v.items():
+                    if isinstance(x, QWidget):
+                        nosaukumi.setdefault(id(x), f"{k}[{kk}]")
+        return nosaukumi
+
+    def _poz_undo_ieraksti(self):
+        return [st for st in self._undo_mgr.entries() if "šūnas" in st]
+
+    def _poz_undo_pārbīdīt(self, first: int, nobīde: int):
+        """Pozīciju rindas ievietotas/dzēstas: pārbīda undo/redo šūnu rindu indeksus (dzēsto rindu šūnas atmet)."""
+        beigas = first - nobīde  # dzēšanai: pirmā rinda aiz dzēstā bloka
+        for st in self._poz_undo_ieraksti():
+            if nobīde > 0:
+                st["šūnas"] = [(r + nobīde if r >= first else r, c, v, j) for r, c, v, j in st["šūnas"]]
+            else:
+                st["šūnas"] = [(r + nobīde if r >= beigas else r, c, v, j) for r, c, v, j in st["šūnas"]
+                               if not first <= r < beigas]
+        if nobīde < 0:
+            self._undo_mgr.retain(lambda st: st.get("šūnas", True))
             self._update_undo_redo_indicators()
-        except Exception:
-            pass
 
+    def _poz_undo_atmest(self):
+        """Pozīciju tabulas kolonnas/kārtība mainīta: šūnu undo ieraksti vairs nav derīgi."""
+        self._undo_mgr.retain(lambda st: "šūnas" not in st)
+        self._update_undo_redo_indicators()
 
     def _export_audit_log(self):
         try:
@@ -8103,6 +6051,8 @@ class AktaLogs(QMainWindow):
         dlg.exec()
 
     def _update_address_book_list(self):
+        if not hasattr(self, "address_book_list"):
+            return  # cilne vēl nav uzbūvēta
         self.address_book_list.clear()
         for name in sorted(self.address_book.keys()):
             self.address_book_list.addItem(name)
@@ -8207,9 +6157,16 @@ class AktaLogs(QMainWindow):
         v.addStretch()
 
         w.setLayout(v)
-        self.tabs.addTab(w, "Dokumentu vēsture")
+        self._pievienot_cilni(w, "Dokumentu vēsture")
+        self._nodrošināt_vēsturi()
         self._update_history_list()
 
+    def _nodrošināt_vēsturi(self):
+        """Ielādē vēstures failu pirmajā vajadzības reizē (cilnes atlase vai jauns ieraksts)."""
+        if not self._vēsture_ielādēta:
+            self._vēsture_ielādēta = True
+            self._load_history()
+
     def _load_history(self):
         if os.path.exists(HISTORY_FILE):
             try:
@@ -8252,6 +6209,7 @@ class AktaLogs(QMainWindow):
             shutil.copy2(pdf_path, dst_pdf)
             shutil.copy2(json_path, dst_json)
 
+            self._nodrošināt_vēsturi()
             # Vēsture tagad ir saraksts ar dict ierakstiem
             if not isinstance(self.history, list):
                 self.history = []
@@ -8277,6 +6235,7 @@ class AktaLogs(QMainWindow):
         if not os.path.exists(file_path):
             return
 
+        self._nodrošināt_vēsturi()
         # Noņemam, ja jau ir sarakstā, lai pārvietotu uz saraksta sākumu
         self.history = [f for f in self.history if f != file_path]
 
@@ -8286,6 +6245,8 @@ class AktaLogs(QMainWindow):
         self._update_history_list() # Atjaunojam sarakstu GUI
 
     def _update_history_list(self):
+        if not hasattr(self, "history_list"):
+            return  # cilne vēl nav uzbūvēta
         self.history_list.clear()
 
         # Migrācija no vecā formāta (saraksts ar failu ceļiem)
@@ -8400,6 +6361,8 @@ class AktaLogs(QMainWindow):
         v.addLayout(search_row)
         v.addWidget(self.map_search_results)
 
+        from PySide6.QtWebEngineWidgets import QWebEngineView
+        from PySide6.QtWebChannel import QWebChannel
         self.web_view = QWebEngineView()
 
         # Izveidojam bridge objektu komunikācijai ar JavaScript
@@ -8559,8 +6522,7 @@ class AktaLogs(QMainWindow):
 
         v.addLayout(map_controls_layout)
         w.setLayout(v)
-        self.tabs.addTab(w, "Karte")
-        self.tab_kartes = w
+        self.tab_kartes = self._pievienot_cilni(w, "Karte")
 
         # Initial load of map with current 'Vieta' if possible
         self.tabs.currentChanged.connect(self._update_map_on_tab_change)
@@ -8699,6 +6661,7 @@ class AktaLogs(QMainWindow):
         if not q:
             return
         try:
+            import requests
             # Photon: ātrs un parasti neliek 403 (OpenStreetMap Nominatim bieži bloķē bez User-Agent)
             r = requests.get(
                 "https://photon.komoot.io/api/",
@@ -8799,6 +6762,7 @@ class AktaLogs(QMainWindow):
     def _reverse_geocode_and_set_vieta(self, lat, lon):
         """Reversā ģeokodēšana: mēģina Nominatim; ja 403/429 vai kļūda – izmanto Photon fallback."""
         try:
+            import requests
             lat_s = str(lat).strip()
             lon_s = str(lon).strip()
 
@@ -8943,6 +6907,14 @@ class AktaLogs(QMainWindow):
 
     # ----- Projekta saglabāšana/ielāde -----
     def ieviest_datus(self, d: AktaDati):
+        # Programmatiska aizpildīšana nav lietotāja izmaiņa: lauku vērtības tiek pārņemtas bez undo/audit ierakstiem
+        self._izmaiņas.apturēt()
+        try:
+            self._ieviest_datus(d)
+        finally:
+            self._izmaiņas.atsākt()
+
+    def _ieviest_datus(self, d: AktaDati):
             # Sinhronizējam iekšējos datus ar ielādētajiem iestatījumiem
             self.data = d
             # Foto kolonna: lai UI vienmēr būtu iespējams pievienot foto
@@ -9262,6 +7234,7 @@ class AktaLogs(QMainWindow):
             self.in_contact_details_header_font_size.setValue(d.contact_details_header_font_size)
             self.in_item_image_width_mm.setValue(float(d.item_image_width_mm)) # Convert Decimal to float for QDoubleSpinBox
             self.in_item_image_caption_font_size.setValue(d.item_image_caption_font_size)
+            self.in_pdf_image_dpi.setValue(int(getattr(d, "pdf_image_dpi", 200) or 200))
             self.ck_show_item_notes_in_table.setChecked(d.show_item_notes_in_table)
             self.ck_show_item_serial_number_in_table.setChecked(d.show_item_serial_number_in_table)
             self.ck_show_item_warranty_in_table.setChecked(d.show_item_warranty_in_table)
@@ -9409,6 +7382,8 @@ class AktaLogs(QMainWindow):
         """
         Atjauno šablonu sarakstu GUI.
         """
+        if not hasattr(self, "sablonu_list"):
+            return  # cilne vēl nav uzbūvēta
         self.sablonu_list.clear()
         # Pievienojam noklusējuma šablonu
         self.sablonu_list.addItem("Pappus dati (piemērs)")
@@ -9549,6 +7524,8 @@ class AktaLogs(QMainWindow):
         """
         Atjauno šablonu sarakstu GUI, pievienojot marķieri aizsargātiem šabloniem.
         """
+        if not hasattr(self, "sablonu_list"):
+            return  # cilne vēl nav uzbūvēta (šablonu faili tiks nolasīti pirmajā atlasē)
         self.sablonu_list.clear()
         # Pievienojam noklusējuma šablonu
         self.sablonu_list.addItem("Testa dati (piemērs)")
@@ -9627,270 +7604,86 @@ class AktaLogs(QMainWindow):
             new_password, ok_new = QInputDialog.getText(self, "Mainīt paroli",
                                                          f"Ievadiet jauno paroli šablonam '{template_name}' (atstājiet tukšu, lai noņemtu paroli):",
                                                          QLineEdit.Password)
-            if not ok_new:
-                return # Lietotājs atcēla jaunas paroles ievadi
-
-            data['template_password'] = new_password # Saglabājam jauno paroli (var būt tukša)
-
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-
-            QMessageBox.information(self, "Parole mainīta", f"Šablona '{template_name}' parole veiksmīgi mainīta.")
-            self._update_sablonu_list() # Atjaunojam sarakstu, lai atspoguļotu izmaiņas
-        except Exception as e:
-            QMessageBox.critical(self, "Kļūda", f"Neizdevās mainīt paroli šablonam '{template_name}':\n{e}")
-
-    def nonemt_sablonu_paroli(self):
-        """
-        Noņem paroli no izvēlētā šablona.
-        """
-        selected_items = self.sablonu_list.selectedItems()
-        if not selected_items:
-            QMessageBox.warning(self, "Noņemt paroli", "Lūdzu, atlasiet šablonu, kuram vēlaties noņemt paroli.")
-            return
-        if len(selected_items) > 1:
-            QMessageBox.warning(self, "Noņemt paroli", "Lūdzu, atlasiet tikai vienu šablonu.")
-            return
-
-        item_text = selected_items[0].text()
-        template_name = item_text.replace(" [Aizsargāts]", "").replace(" [Kļūda]", "")
-
-        if template_name == "Testa dati (piemērs)":
-            QMessageBox.information(self, "Noņemt paroli",
-                                    "Iebūvētajam šablonam 'Testa dati (piemērs)' nav paroles, ko noņemt.")
-            return
-
-        current_templates_dir = self.data.templates_dir
-        if not current_templates_dir:
-            current_templates_dir = os.path.join(APP_DATA_DIR, "AktaGenerators_Templates")
-
-        file_path = os.path.join(current_templates_dir, f"{template_name}.json")
-        if not os.path.exists(file_path):
-            QMessageBox.warning(self, "Noņemt paroli", f"Šablona fails '{template_name}.json' nav atrasts.")
-            return
-
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            current_password = data.get('template_password', '')
-
-            if not current_password:
-                QMessageBox.information(self, "Noņemt paroli", f"Šablonam '{template_name}' jau nav paroles.")
-                return
-
-            # Pieprasām veco paroli, lai apstiprinātu noņemšanu
-            old_password, ok_old = QInputDialog.getText(self, "Noņemt paroli",
-                                                         f"Šablonam '{template_name}' ir parole. Lūdzu, ievadiet to, lai noņemtu:",
-                                                         QLineEdit.Password)
-            if not ok_old or old_password != current_password:
-                QMessageBox.warning(self, "Nepareiza parole", "Ievadītā parole ir nepareiza vai ievade atcelta.")
-                return
-
-            data['template_password'] = "" # Noņemam paroli
-
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
-
-            QMessageBox.information(self, "Parole noņemta", f"Parole no šablona '{template_name}' veiksmīgi noņemta.")
-            self._update_sablonu_list() # Atjaunojam sarakstu, lai atspoguļotu izmaiņas
-        except Exception as e:
-            QMessageBox.critical(self, "Kļūda", f"Neizdevās noņemt paroli no šablona '{template_name}':\n{e}")
-
-    def ieladet_projektu(self, path=None):
-        self._undo_mgr.push_undo(self._snapshot_state('PROJECT_LOAD'))
-        self._audit('PROJECT_LOAD', {})
-        path = _coerce_path(path)
-        if not path:
-            path, _ = QFileDialog.getOpenFileName(self, "Ielādēt projektu", PROJECT_SAVE_DIR, "JSON (*.json)")
-        if not path:
-            return
-        try:
-            # Mēģinām ielādēt ar dažādām kodēšanām
-            encodings = ['utf-8', 'utf-8-sig', 'cp1257', 'iso-8859-1', 'windows-1252']
-            data = None
-
-            for encoding in encodings:
-                try:
-                    with open(path, 'r', encoding=encoding) as f:
-                        data = json.load(f)
-                    break
-                except (UnicodeDecodeError, json.JSONDecodeError):
-                    continue
-
-            if data is None:
-                raise Exception("Neizdevās ielādēt failu ar nevienu no atbalstītajām kodēšanām")
-
-            # Helper to safely get and convert Decimal values
-            # Helper to safely get and convert Decimal values
-            def get_decimal(dict_obj, key, default_val):
-                val = dict_obj.get(key, default_val)
-                return to_decimal(val)
-
-            # Helper to safely get boolean values
-            def get_bool(dict_obj, key, default_val):
-                val = dict_obj.get(key, default_val)
-                return bool(val)
-
-            d = AktaDati(
-                    akta_nr=data.get('akta_nr', ''), datums=data.get('datums', ''), vieta=data.get('vieta', ''),
-                    pasūtījuma_nr=data.get('pasūtījuma_nr', ''),
-                    pieņēmējs=Persona(
-                        nosaukums=data.get('pieņēmējs', {}).get('nosaukums', ''),
-                        reģ_nr=data.get('pieņēmējs', {}).get('reģ_nr', ''),
-                        adrese=data.get('pieņēmējs', {}).get('adrese', ''),
-                        kontaktpersona=data.get('pieņēmējs', {}).get('kontaktpersona', ''),
-                        amats=data.get('pieņēmējs', {}).get('amats', ''),
-                        pilnvaras_pamats=data.get('pieņēmējs', {}).get('pilnvaras_pamats', ''),
-                        tālrunis=data.get('pieņēmējs', {}).get('tālrunis', ''),
-                        epasts=data.get('pieņēmējs', {}).get('epasts', ''),
-                        web_lapa=data.get('pieņēmējs', {}).get('web_lapa', ''),
-                        bankas_konts=data.get('pieņēmējs', {}).get('bankas_konts', ''),
-                        juridiskais_statuss=data.get('pieņēmējs', {}).get('juridiskais_statuss', '')
-                    ),
-                    nodevējs=Persona(
-                        nosaukums=data.get('nodevējs', {}).get('nosaukums', ''),
-                        reģ_nr=data.get('nodevējs', {}).get('reģ_nr', ''),
-                        adrese=data.get('nodevējs', {}).get('adrese', ''),
-                        kontaktpersona=data.get('nodevējs', {}).get('kontaktpersona', ''),
-                        amats=data.get('nodevējs', {}).get('amats', ''),
-                        pilnvaras_pamats=data.get('nodevējs', {}).get('pilnvaras_pamats', ''),
-                        tālrunis=data.get('nodevējs', {}).get('tālrunis', ''),
-                        epasts=data.get('nodevējs', {}).get('epasts', ''),
-                        web_lapa=data.get('nodevējs', {}).get('web_lapa', ''),
-                        bankas_konts=data.get('nodevējs', {}).get('bankas_konts', ''),
-                        juridiskais_statuss=data.get('nodevējs', {}).get('juridiskais_statuss', '')
-                    ),
-                    pozīcijas=[Pozīcija(
-                        apraksts=p.get('apraksts', ''),
-                        daudzums=get_decimal(p, 'daudzums', '0'),
-                        vienība=p.get('vienība', 'gab.'),
-                        cena=get_decimal(p, 'cena', '0'),
-                        seriālais_nr=p.get('seriālais_nr', ''),
-                        garantija=p.get('garantija', ''),
-                        piezīmes_pozīcijai=p.get('piezīmes_pozīcijai', '')
-                    ) for p in data.get('pozīcijas', [])],
-                    attēli=[Attēls(**a) for a in data.get('attēli', [])],
-                    piezīmes=data.get('piezīmes', ''), iekļaut_pvn=get_bool(data, 'iekļaut_pvn', False),
-                    pvn_likme=get_decimal(data, 'pvn_likme', '21'),
-                    parakstu_rindas=get_bool(data, 'parakstu_rindas', True),
-                    logotipa_ceļš=data.get('logotipa_ceļš', ''), fonts_ceļš=data.get('fonts_ceļš', ''),
-                    paraksts_pieņēmējs_ceļš=data.get('paraksts_pieņēmējs_ceļš', ''),
-                    paraksts_nodevējs_ceļš=data.get('paraksts_nodevējs_ceļš', ''),
-                    līguma_nr=data.get('līguma_nr', ''),
-                    izpildes_termiņš=data.get('izpildes_termiņš', ''),
-                    pieņemšanas_datums=data.get('pieņemšanas_datums', ''),
-                    nodošanas_datums=data.get('nodošanas_datums', ''),
-                    strīdu_risināšana=data.get('strīdu_risināšana', ''),
-                    konfidencialitātes_klauzula=get_bool(data, 'konfidencialitātes_klauzula', False),
-                    soda_nauda_procenti=get_decimal(data, 'soda_nauda_procenti', '0.0'),
-                    piegādes_nosacījumi=data.get('piegādes_nosacījumi', ''),
-                    apdrošināšana=get_bool(data, 'apdrošināšana', False),
-                        apdrošināšana_teksts=data.get('apdrošināšana_teksts', ''),
-                    papildu_nosacījumi=data.get('papildu_nosacījumi', ''),
-                    atsauces_dokumenti=data.get('atsauces_dokumenti', ''),
-                    akta_statuss=data.get('akta_statuss', 'Melnraksts'),
-                    valūta=data.get('valūta', 'EUR'),
-                    elektroniskais_paraksts=get_bool(data, 'elektroniskais_paraksts', False),
-                    radit_elektronisko_parakstu_tekstu=get_bool(data, 'radit_elektronisko_parakstu_tekstu', False),
-                # JAUNA RINDAS
-                    pdf_page_size=data.get('pdf_page_size', 'A4'),
-                    pdf_page_orientation=data.get('pdf_page_orientation', 'Portrets'),
-                    pdf_margin_left=get_decimal(data, 'pdf_margin_left', '18'),
-                    pdf_margin_right=get_decimal(data, 'pdf_margin_right', '18'),
-                    pdf_margin_top=get_decimal(data, 'pdf_margin_top', '16'),
-                    pdf_margin_bottom=get_decimal(data, 'pdf_margin_bottom', '16'),
-                    pdf_font_size_head=data.get('pdf_font_size_head', 14),
-                    pdf_font_size_normal=data.get('pdf_font_size_normal', 10),
-                    pdf_font_size_small=data.get('pdf_font_size_small', 9),
-                    pdf_font_size_table=data.get('pdf_font_size_table', 9),
-                    pdf_logo_width_mm=get_decimal(data, 'pdf_logo_width_mm', '35'),
-                    pdf_signature_width_mm=get_decimal(data, 'pdf_signature_width_mm', '50'),
-                    pdf_signature_height_mm=get_decimal(data, 'pdf_signature_height_mm', '20'),
-                    docx_image_width_inches=get_decimal(data, 'docx_image_width_inches', '4'),
-                    docx_signature_width_inches=get_decimal(data, 'docx_signature_width_inches', '1.5'),
-                    table_col_widths=data.get('table_col_widths', '10,40,18,18,20,20,25,25,25'),
-                    auto_generate_akta_nr=get_bool(data, 'auto_generate_akta_nr', False),
-                    default_currency=data.get('default_currency', 'EUR'),
-                    default_unit=data.get('default_unit', 'gab.'),
-                    default_pvn_rate=get_decimal(data, 'default_pvn_rate', '21.0'),
-                    poppler_path=data.get('poppler_path', ''),
-                    # Load new settings
-                    header_text_color=data.get('header_text_color', '#000000'),
-                    footer_text_color=data.get('footer_text_color', '#000000'),
-                    table_header_bg_color=data.get('table_header_bg_color', '#E0E0E0'),
-                    table_grid_color=data.get('table_grid_color', '#CCCCCC'),
-                    table_row_spacing=get_decimal(data, 'table_row_spacing', '4'),
-                    line_spacing_multiplier=get_decimal(data, 'line_spacing_multiplier', '1.2'),
-                    show_page_numbers=get_bool(data, 'show_page_numbers', True),
-                    show_generation_timestamp=get_bool(data, 'show_generation_timestamp', True),
-                    currency_symbol_position=data.get('currency_symbol_position', 'after'),
-                    date_format=data.get('date_format', 'YYYY-MM-DD'),
-                    signature_line_length_mm=get_decimal(data, 'signature_line_length_mm', '60'),
-                    signature_line_thickness_pt=get_decimal(data, 'signature_line_thickness_pt', '0.5'),
-                    add_cover_page=get_bool(data, 'add_cover_page', False),
-                    cover_page_title=data.get('cover_page_title', 'Pieņemšanas-Nodošanas Akts'),
-                    cover_page_logo_width_mm=get_decimal(data, 'cover_page_logo_width_mm', '80'),
-                # Individuālais QR kods
-                include_custom_qr_code=get_bool(data, 'include_custom_qr_code', False),
-                custom_qr_code_data=data.get('custom_qr_code_data', ''),
-                custom_qr_code_size_mm=get_decimal(data, 'custom_qr_code_size_mm', '20'),
-                custom_qr_code_position=data.get('custom_qr_code_position', 'bottom_right'),
-                custom_qr_code_pos_x_mm=get_decimal(data, 'custom_qr_code_pos_x_mm', '0'),
-                custom_qr_code_pos_y_mm=get_decimal(data, 'custom_qr_code_pos_y_mm', '0'),
-                custom_qr_code_color=data.get('custom_qr_code_color', '#000000'),
+            if not ok_new:
+                return # Lietotājs atcēla jaunas paroles ievadi
 
-                # Automātiskais QR kods (akta ID)
-                include_auto_qr_code=get_bool(data, 'include_auto_qr_code', False),
-                auto_qr_code_size_mm=get_decimal(data, 'auto_qr_code_size_mm', '20'),
-                auto_qr_code_position=data.get('auto_qr_code_position', 'bottom_left'),
-                auto_qr_code_pos_x_mm=get_decimal(data, 'auto_qr_code_pos_x_mm', '0'),
-                auto_qr_code_pos_y_mm=get_decimal(data, 'auto_qr_code_pos_y_mm', '0'),
-                auto_qr_code_color=data.get('auto_qr_code_color', '#000000'),
-
-                add_watermark=get_bool(data, 'add_watermark', False),
-                    watermark_text=data.get('watermark_text', 'MELNRAKSTS'),
-                    watermark_font_size=data.get('watermark_font_size', 72),
-                    watermark_color=data.get('watermark_color', '#E0E0E0'),
-                    watermark_rotation=data.get('watermark_rotation', 45),
-                    enable_pdf_encryption=get_bool(data, 'enable_pdf_encryption', False),
-                    pdf_user_password=data.get('pdf_user_password', ''),
-                    pdf_owner_password=data.get('pdf_owner_password', ''),
-                    allow_printing=get_bool(data, 'allow_printing', True),
-                    allow_copying=get_bool(data, 'allow_copying', True),
-                    allow_modifying=get_bool(data, 'allow_modifying', False),
-                    allow_annotating=get_bool(data, 'allow_annotating', True),
-                    default_country=data.get('default_country', 'Latvija'),
-                    default_city=data.get('default_city', 'Rīga'),
-                    show_contact_details_in_header=get_bool(data, 'show_contact_details_in_header', False),
-                    contact_details_header_font_size=data.get('contact_details_header_font_size', 8),
-                    item_image_width_mm=get_decimal(data, 'item_image_width_mm', '50'),
-                    item_image_caption_font_size=data.get('item_image_caption_font_size', 8),
-                    show_item_notes_in_table=get_bool(data, 'show_item_notes_in_table', True),
-                    show_item_serial_number_in_table=get_bool(data, 'show_item_serial_number_in_table', True),
-                    show_item_warranty_in_table=get_bool(data, 'show_item_warranty_in_table', True),
-                    table_cell_padding_mm=get_decimal(data, 'table_cell_padding_mm', '2'),
-                    table_header_font_style=data.get('table_header_font_style', 'bold'),
-                    table_content_alignment=data.get('table_content_alignment', 'left'),
-                    signature_font_size=data.get('signature_font_size', 9),
-                    signature_spacing_mm=get_decimal(data, 'signature_spacing_mm', '10'),
-                    document_title_font_size=data.get('document_title_font_size', 18),
-                    document_title_color=data.get('document_title_color', '#000000'),
-                    section_heading_font_size=data.get('section_heading_font_size', 12),
-                    section_heading_color=data.get('section_heading_color', '#000000'),
-                    paragraph_line_spacing_multiplier=get_decimal(data, 'paragraph_line_spacing_multiplier', '1.2'),
-                    table_border_style=data.get('table_border_style', 'solid'),
-                    table_border_thickness_pt=get_decimal(data, 'table_border_thickness_pt', '0.5'),
-                    table_alternate_row_color=data.get('table_alternate_row_color', ''),
-                    show_total_sum_in_words=get_bool(data, 'show_total_sum_in_words', False),
-                    total_sum_in_words_language=data.get('total_sum_in_words_language', 'lv'),
-                    default_vat_calculation_method=data.get('default_vat_calculation_method', 'exclusive'),
-                    show_vat_breakdown=get_bool(data, 'show_vat_breakdown', True),
-                    enable_digital_signature_field=get_bool(data, 'enable_digital_signature_field', False),
-                    digital_signature_field_name=data.get('digital_signature_field_name', 'Paraksts'),
-                    digital_signature_field_size_mm=get_decimal(data, 'digital_signature_field_size_mm', '40'),
-                    digital_signature_field_position=data.get('digital_signature_field_position', 'bottom_center')
-                )
+            data['template_password'] = new_password # Saglabājam jauno paroli (var būt tukša)
+
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+
+            QMessageBox.information(self, "Parole mainīta", f"Šablona '{template_name}' parole veiksmīgi mainīta.")
+            self._update_sablonu_list() # Atjaunojam sarakstu, lai atspoguļotu izmaiņas
+        except Exception as e:
+            QMessageBox.critical(self, "Kļūda", f"Neizdevās mainīt paroli šablonam '{template_name}':\n{e}")
+
+    def nonemt_sablonu_paroli(self):
+        """
+        Noņem paroli no izvēlētā šablona.
+        """
+        selected_items = self.sablonu_list.selectedItems()
+        if not selected_items:
+            QMessageBox.warning(self, "Noņemt paroli", "Lūdzu, atlasiet šablonu, kuram vēlaties noņemt paroli.")
+            return
+        if len(selected_items) > 1:
+            QMessageBox.warning(self, "Noņemt paroli", "Lūdzu, atlasiet tikai vienu šablonu.")
+            return
+
+        item_text = selected_items[0].text()
+        template_name = item_text.replace(" [Aizsargāts]", "").replace(" [Kļūda]", "")
+
+        if template_name == "Testa dati (piemērs)":
+            QMessageBox.information(self, "Noņemt paroli",
+                                    "Iebūvētajam šablonam 'Testa dati (piemērs)' nav paroles, ko noņemt.")
+            return
+
+        current_templates_dir = self.data.templates_dir
+        if not current_templates_dir:
+            current_templates_dir = os.path.join(APP_DATA_DIR, "AktaGenerators_Templates")
+
+        file_path = os.path.join(current_templates_dir, f"{template_name}.json")
+        if not os.path.exists(file_path):
+            QMessageBox.warning(self, "Noņemt paroli", f"Šablona fails '{template_name}.json' nav atrasts.")
+            return
+
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            current_password = data.get('template_password', '')
+
+            if not current_password:
+                QMessageBox.information(self, "Noņemt paroli", f"Šablonam '{template_name}' jau nav paroles.")
+                return
+
+            # Pieprasām veco paroli, lai apstiprinātu noņemšanu
+            old_password, ok_old = QInputDialog.getText(self, "Noņemt paroli",
+                                                         f"Šablonam '{template_name}' ir parole. Lūdzu, ievadiet to, lai noņemtu:",
+                                                         QLineEdit.Password)
+            if not ok_old or old_password != current_password:
+                QMessageBox.warning(self, "Nepareiza parole", "Ievadītā parole ir nepareiza vai ievade atcelta.")
+                return
+
+            data['template_password'] = "" # Noņemam paroli
+
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+
+            QMessageBox.information(self, "Parole noņemta", f"Parole no šablona '{template_name}' veiksmīgi noņemta.")
+            self._update_sablonu_list() # Atjaunojam sarakstu, lai atspoguļotu izmaiņas
+        except Exception as e:
+            QMessageBox.critical(self, "Kļūda", f"Neizdevās noņemt paroli no šablona '{template_name}':\n{e}")
+
+    def ieladet_projektu(self, path=None):
+        self._undo_mgr.push_undo(self._snapshot_state('PROJECT_LOAD'))
+        self._audit('PROJECT_LOAD', {})
+        path = _coerce_path(path)
+        if not path:
+            path, _ = QFileDialog.getOpenFileName(self, "Ielādēt projektu", PROJECT_SAVE_DIR, "JSON (*.json)")
+        if not path:
+            return
+        try:
+            d = ielādēt_projekta_failu(path)
             self.ieviest_datus(d)
             self._ceļš_projekts = path
             self._add_to_history(path) # Pievienojam projektu vēsturei
@@ -10093,6 +7886,7 @@ class AktaLogs(QMainWindow):
                         contact_details_header_font_size=data.get('contact_details_header_font_size', 8),
                         item_image_width_mm=get_decimal(data, 'item_image_width_mm', '50'),
                         item_image_caption_font_size=data.get('item_image_caption_font_size', 8),
+                        pdf_image_dpi=data.get('pdf_image_dpi', 200),
                         show_item_notes_in_table=get_bool(data, 'show_item_notes_in_table', True),
                         show_item_serial_number_in_table=get_bool(data, 'show_item_serial_number_in_table', True),
                         show_item_warranty_in_table=get_bool(data, 'show_item_warranty_in_table', True),
@@ -10138,17 +7932,58 @@ class AktaLogs(QMainWindow):
         except Exception:
             pass
 
+    @staticmethod
+    def _undo_kopīgot(iepriekš: dict, tagad: dict, izmērs: list) -> dict:
+        """{atslēga: vērtība}, kur nemainītās vērtības ir iepriekšējā snapshot objekti (kopīgotas).
+
+        Kopē tikai mainītās vērtības; izmērs[0] palielina par jauno (nekopīgoto) daļu.
+        """
+        jauns = {}
+        for k, v in tagad.items():
+            vecā = iepriekš.get(k)
+            if type(vecā) is type(v) and vecā == v:
+                jauns[k] = vecā
+                continue
+            if k == "pozīcijas" and isinstance(v, list):
+                # Pozīcijas kopīgo pa rindām: jaunas kopijas tikai mainītajām rindām
+                vecās = vecā if isinstance(vecā, tuple) else ()
+                rindas = []
+                for i, p in enumerate(v):
+                    if i < len(vecās) and type(vecās[i]) is type(p) and vecās[i] == p:
+                        rindas.append(vecās[i])
+                    else:
+                        rindas.append(copy.deepcopy(p))
+                        izmērs[0] += _aptuvenais_izmērs(p)
+                if len(rindas) == len(vecās) and all(map(operator.is_, rindas, vecās)):
+                    jauns[k] = vecās
+                    continue
+                jauns[k] = tuple(rindas)
+                izmērs[0] += sys.getsizeof(jauns[k])
+                continue
+            jauns[k] = copy.deepcopy(v)
+            izmērs[0] += _aptuvenais_izmērs(jauns[k])
+        izmērs[0] += sys.getsizeof(jauns)
+        return jauns
+
     def _snapshot_state(self, label: str = "") -> dict:
-        """Saglabā stāvokli undo vajadzībām (adrešu grāmata + projekts)."""
+        """Saglabā stāvokli undo vajadzībām (adrešu grāmata + projekts).
+
+        Nemainītie adrešu grāmatas ieraksti, projekta lauki un pozīciju rindas ir tie paši objekti,
+        kas iepriekšējā snapshot, tāpēc jauna atmiņa (un "_izmērs") aug tikai par mainīto daļu.
+        """
+        izmērs = [0]
         try:
             # adrešu grāmata
-            ab = copy.deepcopy(getattr(self, "address_book", {}))
+            ab = self._undo_kopīgot(self._undo_ab_daļas, getattr(self, "address_book", {}) or {}, izmērs)
+            self._undo_ab_daļas = ab
 
             # projekts (akta dati) – ja savākšana izgāžas, saglabājam tikai AB
             proj = None
             try:
                 d = self.savākt_datus()
-                proj = asdict(d)
+                proj = self._undo_kopīgot(self._undo_projekta_daļas,
+                                          {k: getattr(d, k) for k in d.__dataclass_fields__}, izmērs)
+                self._undo_projekta_daļas = proj
             except Exception:
                 proj = None
 
@@ -10160,17 +7995,28 @@ class AktaLogs(QMainWindow):
             except Exception:
                 sel = ""
 
-            return {"label": label, "address_book": ab, "project": proj, "ab_selected": sel}
+            return {"label": label, "address_book": ab, "project": proj, "ab_selected": sel, "_izmērs": izmērs[0]}
         except Exception:
             return {"label": label, "address_book": copy.deepcopy(getattr(self, "address_book", {}))}
 
     def _restore_state(self, state: dict):
-        """Atjauno stāvokli no undo/redo."""
+        """Atjauno stāvokli no undo/redo.
+
+        Salīdzina ar pēdējo snapshot (kas undo/redo brīdī ir pašreizējais stāvoklis): nemainītās daļas
+        ir tie paši objekti, tāpēc tiek pārrakstīts tikai tas, kas atšķiras.
+        """
         if not state:
             return
         # adrešu grāmata
-        if "address_book" in state:
-            self.address_book = copy.deepcopy(state.get("address_book") or {})
+        ab = state.get("address_book")
+        if ab is not None and (ab.keys() != self._undo_ab_daļas.keys()
+                               or any(v is not self._undo_ab_daļas[k] for k, v in ab.items())):
+            tagad = getattr(self, "address_book", {}) or {}
+            self.address_book = {
+                k: tagad[k] if k in tagad and v is self._undo_ab_daļas.get(k) else copy.deepcopy(v)
+                for k, v in ab.items()
+            }
+            self._undo_ab_daļas = ab
             try:
                 self._save_address_book()
             except Exception:
@@ -10182,13 +8028,16 @@ class AktaLogs(QMainWindow):
 
         # projekts
         proj = state.get("project")
-        if proj:
+        if proj and any(v is not self._undo_projekta_daļas.get(k) for k, v in proj.items()):
             try:
-                # saglabājam/atjaunojam izmantojot esošo loģiku
-                d = self._akta_dati_from_dict(proj)
+                d = AktaDati(**{
+                    k: ([copy.deepcopy(p) for p in v] if k == "pozīcijas" else copy.deepcopy(v))
+                    for k, v in proj.items()
+                })
                 self.ieviest_datus(d)
-            except Exception:
-                pass
+                self._undo_projekta_daļas = proj
+            except Exception as e:
+                print(f"Undo: neizdevās atjaunot projektu: {e}")
 
         # atjaunojam selekciju
         try:
@@ -10202,10 +8051,19 @@ class AktaLogs(QMainWindow):
             pass
 
     def undo_action(self):
+        self._izmaiņas.pabeigt_visus()
         if not self._undo_mgr.can_undo():
             return
-        # pašreizējo stāvokli ieliek redo
         try:
+            if self._undo_mgr.peek_undo().get("lauks") or "šūnas" in self._undo_mgr.peek_undo():
+                # lauka/šūnu izmaiņa: atjauno veco vērtību, pats ieraksts kalpo arī redo
+                st = self._undo_mgr.pop_undo()
+                self._izmaiņas.piemērot(st, atsaukt=True)
+                self._undo_mgr.push_redo(st)
+                self._update_undo_redo_indicators()
+                self._audit("UNDO", {"label": st.get("label", "")})
+                return
+            # pašreizējo stāvokli ieliek redo
             self._undo_mgr.push_redo(self._snapshot_state("redo"))
             st = self._undo_mgr.pop_undo()
             self._restore_state(st)
@@ -10215,105 +8073,25 @@ class AktaLogs(QMainWindow):
             pass
 
     def redo_action(self):
+        self._izmaiņas.pabeigt_visus()
         if not self._undo_mgr.can_redo():
             return
         try:
-            self._undo_mgr.push_undo(self._snapshot_state("undo"))
+            if self._undo_mgr.peek_redo().get("lauks") or "šūnas" in self._undo_mgr.peek_redo():
+                st = self._undo_mgr.pop_redo()
+                self._izmaiņas.piemērot(st, atsaukt=False)
+                self._undo_mgr.push_undo(st, clear_redo=False)
+                self._update_undo_redo_indicators()
+                self._audit("REDO", {"label": st.get("label", "")})
+                return
             st = self._undo_mgr.pop_redo()
+            self._undo_mgr.push_undo(self._snapshot_state("undo"), clear_redo=False)
             self._restore_state(st)
             self._update_undo_redo_indicators()
             self._audit("REDO", {"label": st.get("label", "")})
         except Exception:
             pass
 
-    def _akta_dati_from_dict(self, data: dict) -> AktaDati:
-        """Atjauno AktaDati no dict (undo/redo/projekta ielāde)."""
-        # Reuse conversion helpers already in file
-        def get_decimal(dict_obj, key, default_val):
-            val = dict_obj.get(key, default_val)
-            return to_decimal(val)
-
-        def get_bool(dict_obj, key, default_val):
-            val = dict_obj.get(key, default_val)
-            if isinstance(val, bool):
-                return val
-            if isinstance(val, str):
-                return val.lower() in ("true", "1", "yes", "jā", "ja", "y")
-            return bool(val)
-
-        d = AktaDati(
-            akta_nr=data.get("akta_nr", ""),
-            datums=data.get("datums", ""),
-            vieta=data.get("vieta", ""),
-            pasūtījuma_nr=data.get("pasūtījuma_nr", ""),
-            pieņēmējs=Persona(**(data.get("pieņēmējs") or {})),
-            nodevējs=Persona(**(data.get("nodevējs") or {})),
-            pozīcijas=[],
-            attēli=[],
-            piezīmes=data.get("piezīmes", ""),
-            iekļaut_pvn=get_bool(data, "iekļaut_pvn", True),
-            pvn_likme=get_decimal(data, "pvn_likme", "21"),
-            piegādes_nosacījumi=data.get("piegādes_nosacījumi", ""),
-            papildu_nosacījumi=data.get("papildu_nosacījumi", ""),
-            atsauces_dokumenti=data.get("atsauces_dokumenti", ""),
-            akta_statuss=data.get("akta_statuss", ""),
-            cover_page_enabled=get_bool(data, "cover_page_enabled", True),
-            cover_include_logo=get_bool(data, "cover_include_logo", True),
-            cover_show_company_name=get_bool(data, "cover_show_company_name", True),
-            cover_show_date=get_bool(data, "cover_show_date", True),
-            cover_show_place=get_bool(data, "cover_show_place", True),
-            cover_show_contacts=get_bool(data, "cover_show_contacts", True),
-            cover_show_summary=get_bool(data, "cover_show_summary", True),
-            cover_show_signatures=get_bool(data, "cover_show_signatures", True),
-            cover_show_attachments=get_bool(data, "cover_show_attachments", True),
-            cover_title_text=data.get("cover_title_text", "Pieņemšanas-Nodošanas Akts"),
-            cover_subtitle_text=data.get("cover_subtitle_text", ""),
-            cover_logo_max_width_mm=get_decimal(data, "cover_logo_max_width_mm", "30"),
-            cover_logo_max_height_mm=get_decimal(data, "cover_logo_max_height_mm", "15"),
-            digital_signature_enabled=get_bool(data, "digital_signature_enabled", False),
-            digital_signature_text=data.get("digital_signature_text", "Dokuments parakstīts ar drošu elektronisko parakstu"),
-            digital_signature_show_timestamp=get_bool(data, "digital_signature_show_timestamp", True),
-            digital_signature_field_label=data.get("digital_signature_field_label", "Paraksts"),
-            digital_signature_field_size_mm=get_decimal(data, "digital_signature_field_size_mm", "40"),
-            digital_signature_field_position=data.get("digital_signature_field_position", "bottom_center"),
-            qr_kods_enabled=get_bool(data, "qr_kods_enabled", True),
-            qr_kods_ieklaut_pozicijas=get_bool(data, "qr_kods_ieklaut_pozicijas", True),
-            qr_only_first_page=get_bool(data, "qr_only_first_page", False),
-            qr_verification_url_enabled=get_bool(data, "qr_verification_url_enabled", False),
-            qr_verification_base_url=data.get("qr_verification_base_url", ""),
-            qr_kods_izmers_mm=get_decimal(data, "qr_kods_izmers_mm", "18"),
-            qr_kods_tikai_pirma_lapa=get_bool(data, "qr_kods_tikai_pirma_lapa", True),
-            qr_kods_url_mode=get_bool(data, "qr_kods_url_mode", False),
-            qr_kods_url=data.get("qr_kods_url", ""),
-        )
-
-        # pozīcijas
-        try:
-            for p in (data.get("pozīcijas") or []):
-                if isinstance(p, dict):
-                    d.pozīcijas.append(Pozīcija(**p))
-                else:
-                    d.pozīcijas.append(p)
-        except Exception:
-            pass
-
-        # attēli
-        try:
-            for a in (data.get("attēli") or []):
-                if isinstance(a, dict):
-                    d.attēli.append(Attēls(**a))
-                else:
-                    d.attēli.append(a)
-        except Exception:
-            pass
-
-        return d
-
-
-
-    # -----------------------
-    # eParaksts integrācija (praktiska)
-    # -----------------------
     def _get_eparaksts_app_path(self) -> str:
         """Atgriež saglabāto eParaksts EXE ceļu.
         Persistējas starp programmas palaišanām (QSettings), ar atpakaļsavietojamību uz settings.json.
@@ -10542,9 +8320,11 @@ class AktaLogs(QMainWindow):
 
 
     def closeEvent(self, event):
-        # Saglabājam vēsturi, adrešu grāmatu un teksta blokus vienmēr
-        self._save_history()
+        # Saglabājam vēsturi (ja tā tika ielādēta), adrešu grāmatu un teksta blokus vienmēr
+        if self._vēsture_ielādēta:
+            self._save_history()
         self._save_address_book()
+        self._dzēst_priekšskatījuma_pdf(self._preview_pdf_path)
         self.text_block_manager._save_text_blocks()
 
         # Noklusējuma iestatījumus saglabājam tikai, ja lietotājs to vēlas
@@ -10565,6 +8345,14 @@ class AktaLogs(QMainWindow):
             # Ja dialoga parādīšana neizdodas, vienkārši neaiztiekam noklusējumu
             pass
 
+        # Fona būves (un to soffice/pdftoppm procesus) apturam, lai thread netiek iznīcināts skrienot
+        # (thread.quit pienāk caur GUI notikumu cilpu, tāpēc gaidot apstrādājam notikumus)
+        self._atcelt_preview_darbu()
+        deadline = time.monotonic() + 3.0
+        while self._novecojušie_preview_darbi and time.monotonic() < deadline:
+            QApplication.processEvents()
+            time.sleep(0.01)
+
         event.accept()
 
     def _update_preview(self):
@@ -10577,16 +8365,21 @@ class AktaLogs(QMainWindow):
 
         old_page = getattr(self, 'current_preview_page', 0)
         d = self.savākt_datus()
-        # Izveidot hash no datiem, lai pārbaudītu, vai tie mainījušies
-        import hashlib
-        data_str = json.dumps(asdict(d), sort_keys=True, default=str)
-        data_hash = hashlib.md5(data_str.encode('utf-8')).hexdigest()
+        # Merkle koks pārrēķina tikai mainījušos laukus un pozīciju rindu blokus (nevis visu AktaDati JSON)
+        data_hash = self._hash_koks.atjaunot(d)
 
         # Pārbaudīt kešatmiņu
-        if data_hash == self.last_data_hash and self.preview_cache.get(data_hash):
-            # Izmantot kešatmiņu
-            cached = self.preview_cache[data_hash]
-            self.preview_images = cached['images']
+        cached = self.preview_cache.get(data_hash)
+        if cached:
+            # Izmantot kešatmiņu (arī iepriekšēja stāvokļa versiju, piem., pēc undo)
+            self._requested_preview_hash = data_hash
+            if self._is_preview_thread_running() and getattr(self._preview_worker, "_hash", None) != data_hash:
+                self._atcelt_preview_darbu()
+            self.last_data_hash = data_hash
+            if data_hash != self._preview_images_hash:
+                # (ja rādām tieši šo versiju, paturam arī zoom laikā pārrenderētās lapas)
+                self.preview_images = list(cached)
+                self._preview_images_hash = data_hash
             self.current_preview_page = min(self.current_preview_page, len(self.preview_images) - 1)
             self._show_current_page()
             return
@@ -10594,10 +8387,9 @@ class AktaLogs(QMainWindow):
         # Smagā daļa (PDF ģenerācija + DOCX/XLSX konvertācija + pdf2image) notiek fonā,
         # lai programma nekad neuzkaras un neaizveras.
         self._requested_preview_hash = data_hash
-        self._start_preview_worker(d, data_hash, old_page)
+        self._start_preview_worker(d, data_hash, old_page, self._hash_koks.lauku_nospiedumi())
 
 
-    
     def _is_preview_thread_running(self) -> bool:
         """Droši pārbauda, vai preview QThread vēl skrien (izvairās no 'already deleted' RuntimeError)."""
         if self._preview_thread is None:
@@ -10610,18 +8402,37 @@ class AktaLogs(QMainWindow):
             self._preview_worker = None
             return False
 
-    def _cleanup_preview_thread_refs(self):
+    def _cleanup_preview_thread_refs(self, thread: QThread = None):
         """Notīra atsauces uz preview thread/worker, kad thread ir beidzies."""
+        if thread is None or thread is self._preview_thread:
+            self._preview_thread = None
+            self._preview_worker = None
+        self._novecojušie_preview_darbi = [(t, w) for t, w in self._novecojušie_preview_darbi if t is not thread]
+
+    def _atcelt_preview_darbu(self):
+        """Atceļ pašreizējo būvi (apstājas tuvākajā pārbaudes punktā) un atbrīvo vietu jaunai.
+
+        Thread netiek gaidīts: tas paliek _novecojušie_preview_darbi līdz savām beigām, tā
+        signāli tiek ignorēti pēc hash.
+        """
+        thread, worker = self._preview_thread, self._preview_worker
         self._preview_thread = None
         self._preview_worker = None
+        if worker is not None:
+            try:
+                worker.pārtraukt()
+            except RuntimeError:
+                pass
+        if thread is not None:
+            self._novecojušie_preview_darbi.append((thread, worker))
 
-    def _start_preview_worker(self, d: 'AktaDati', data_hash: str, old_page: int):
-        """Startē (vai ieplāno) priekšskatījuma ģenerēšanu fonā."""
-        # Ja jau notiek ģenerēšana – nepārtraucam thread vardarbīgi; ieplānojam jaunāko pieprasījumu.
+    def _start_preview_worker(self, d: 'AktaDati', data_hash: str, old_page: int, lauku_nospiedumi: dict = None):
+        """Startē priekšskatījuma ģenerēšanu fonā; novecojusi būve tiek atcelta, jaunā sākas uzreiz."""
         if self._is_preview_thread_running():
-            self._pending_preview_request = (d, data_hash, old_page)
-            self.preview_label.setText("Ģenerē priekšskatījumu... (gaida rindā)")
-            return
+            if getattr(self._preview_worker, "_hash", None) == data_hash:
+                # Tieši šie dati jau tiek renderēti – neko nepārtraucam
+                return
+            self._atcelt_preview_darbu()
 
         # Ja vecais thread objekts ir palicis atsaucēs (bet vairs neskrien), droši notīram.
         try:
@@ -10635,11 +8446,14 @@ class AktaLogs(QMainWindow):
         except Exception:
             pass
 
-        self.preview_label.setText("Ģenerē priekšskatījumu...")
-        QApplication.processEvents()
+        if data_hash != self._preview_images_hash:
+            # (pārbūvējot rādīto dokumentu augstākā izšķirtspējā, esošā lapa paliek redzama)
+            self.preview_label.setText("Ģenerē priekšskatījumu...")
+            QApplication.processEvents()
 
         thread = QThread(self)
-        worker = _PreviewBuildWorker(d, data_hash, old_page)
+        worker = _PreviewBuildWorker(d, data_hash, old_page, target_px=self._preview_target_px(),
+                                     disk_cache=self._preview_disk_cache, lauku_nospiedumi=lauku_nospiedumi)
         worker.moveToThread(thread)
 
         # Saglabājam atsauces, lai Qt tās negarbāž ārā
@@ -10647,6 +8461,8 @@ class AktaLogs(QMainWindow):
         self._preview_worker = worker
 
         thread.started.connect(worker.run)
+        worker.pages_started.connect(self._on_preview_pages_started)
+        worker.page_ready.connect(self._on_preview_page_ready)
         worker.finished.connect(self._on_preview_worker_finished)
         worker.failed.connect(self._on_preview_worker_failed)
 
@@ -10655,63 +8471,135 @@ class AktaLogs(QMainWindow):
         worker.failed.connect(thread.quit)
 
         # Kad beidzas, notīram atsauces PIRMS deleteLater (lai nerodas isRunning() uz izdzēsta C++ objekta)
-        thread.finished.connect(self._cleanup_preview_thread_refs)
+        thread.finished.connect(lambda t=thread: self._cleanup_preview_thread_refs(t))
         thread.finished.connect(worker.deleteLater)
         thread.finished.connect(thread.deleteLater)
 
         thread.start()
 
 
-    def _on_preview_worker_finished(self, data_hash: str, png_bytes_list: list, old_page: int):
-        # Ja pa vidu bija jauns pieprasījums, bet šis nav jaunākais – ignorējam.
+    def _on_preview_pages_started(self, data_hash: str, page_count: int, first_page: int, pdf_path: str):
+        """PDF ir gatavs: sagatavo tukšas lapu vietas; skatītā lapa tiks renderēta pirmā."""
         if self._requested_preview_hash is not None and data_hash != self._requested_preview_hash:
-            # Ja bija ieplānots jaunāks, palaidīsim to, kad thread beigsies (šeit jau beidzies)
-            if self._pending_preview_request:
-                d2, h2, op2 = self._pending_preview_request
-                self._pending_preview_request = None
-                self._requested_preview_hash = h2
-                self._start_preview_worker(d2, h2, op2)
+            self._dzēst_priekšskatījuma_pdf(pdf_path)
+            return
+        if self._preview_pdf_path and self._preview_pdf_path != pdf_path:
+            self._dzēst_priekšskatījuma_pdf(self._preview_pdf_path)
+        self._preview_pdf_path = pdf_path
+        self._preview_pdf_hash = data_hash
+        if data_hash == self._preview_images_hash and len(self.preview_images) == page_count:
+            # Tas pats dokuments tiek pārbūvēts (zoom prasa vairāk nekā kešs): esošās lapas paliek
+            # kā vietturi, līdz pienāk asākas
             return
+        self._preview_images_hash = data_hash
+        self.preview_images = [None] * page_count
+        self.current_preview_page = first_page
+        self._show_current_page()
 
+    @staticmethod
+    def _dzēst_priekšskatījuma_pdf(pdf_path: str):
         try:
-            self.preview_images = []
-            for b in png_bytes_list:
-                pixmap = QPixmap()
-                pixmap.loadFromData(b, 'PNG')
-                self.preview_images.append(pixmap)
-
-            # Saglabāt kešatmiņā
-            self.preview_cache[data_hash] = {
-                'images': self.preview_images.copy(),
-                'page_count': len(self.preview_images)
-            }
-            self.last_data_hash = data_hash
+            if pdf_path and os.path.exists(pdf_path):
+                os.remove(pdf_path)
+        except Exception:
+            pass
+
+    def _preview_target_px(self) -> tuple:
+        """Pikseļu laukums, kurā lapa tiek rādīta: skatlauks × zoom_factor."""
+        try:
+            vs = self.preview_scroll_area.viewport().size()
+            return (int(vs.width() * self.zoom_factor), int(vs.height() * self.zoom_factor))
+        except Exception:
+            return (0, 0)
+
+    def _rerender_visible_page(self):
+        """Pārrenderē tikai redzamo lapu izšķirtspējā, ko prasa pašreizējais skatlauks un zoom."""
+        page = self.current_preview_page
+        data_hash = self._preview_images_hash
+        if (not data_hash or data_hash != self._preview_pdf_hash or not self._preview_pdf_path
+                or not os.path.exists(self._preview_pdf_path)):
+            # Lapas nāk no keša (PDF nav): zoom prasa vairāk, tāpēc dokumentu pārbūvējam
+            self._pārbūvēt_priekšskatījumu(data_hash)
+            return
+        target = self._preview_target_px()
+        key = (data_hash, page, target)
+        if key == self._zoom_render_key:
+            return
+        try:
+            if self._zoom_thread is not None and self._zoom_thread.isRunning():
+                # Iepriekšējā pārrenderēšana vēl notiek – mēģinām vēlreiz, kad tā beigsies
+                self._zoom_render_timer.start(150)
+                return
+        except RuntimeError:
+            pass
+
+        thread = QThread(self)
+        worker = _PreviewBuildWorker(self.data, data_hash, page, target_px=target,
+                                     pdf_path=self._preview_pdf_path, pages=[page])
+        worker.moveToThread(thread)
+        self._zoom_thread = thread
+        self._zoom_worker = worker
+        self._zoom_render_key = key
+
+        thread.started.connect(worker.run)
+        worker.page_ready.connect(self._on_preview_page_ready)
+        worker.finished.connect(thread.quit)
+        worker.failed.connect(thread.quit)
+        thread.finished.connect(self._cleanup_zoom_thread_refs)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+        thread.start()
+
+    def _pārbūvēt_priekšskatījumu(self, data_hash: str):
+        """Ģenerē rādīto dokumentu no jauna ar pašreizējo target_px (kešotās lapas ir par zemu izšķirtspēju)."""
+        if not data_hash or data_hash != self._requested_preview_hash:
+            return
+        key = (data_hash, None, self._preview_target_px())
+        if key == self._zoom_render_key:
+            return
+        if self._is_preview_thread_running():
+            self._zoom_render_timer.start(150)
+            return
+        d = self.savākt_datus()
+        if self._hash_koks.atjaunot(d) != data_hash:
+            return  # dati jau mainījušies – jaunais priekšskatījums tāpat tiks ģenerēts
+        self._zoom_render_key = key
+        self._start_preview_worker(d, data_hash, self.current_preview_page)
 
-            # Ierobežot kešatmiņas izmēru (saglabāt tikai pēdējos 5)
-            if len(self.preview_cache) > 5:
-                oldest_key = next(iter(self.preview_cache))
-                del self.preview_cache[oldest_key]
+    def _cleanup_zoom_thread_refs(self):
+        self._zoom_thread = None
+        self._zoom_worker = None
 
-            self.current_preview_page = min(max(old_page, 0), len(self.preview_images) - 1) if self.preview_images else 0
+    def _on_preview_page_ready(self, data_hash: str, page_index: int, image: QImage):
+        """Viena lapa gatava: ieliek to sarakstā un parāda, ja lietotājs skatās tieši šo lapu."""
+        if self._requested_preview_hash is not None and data_hash != self._requested_preview_hash:
+            return
+        if not (0 <= page_index < len(self.preview_images)):
+            return
+        pixmap = QPixmap.fromImage(image)
+        existing = self.preview_images[page_index]
+        if existing is not None and existing.width() > pixmap.width():
+            return  # jau ir augstākas izšķirtspējas (zoom) attēls
+        self.preview_images[page_index] = pixmap
+        if page_index == self.current_preview_page:
             self._show_current_page()
 
-        finally:
-            # Palaist pending, ja tāds ir
-            if self._pending_preview_request:
-                d2, h2, op2 = self._pending_preview_request
-                self._pending_preview_request = None
-                self._requested_preview_hash = h2
-                self._start_preview_worker(d2, h2, op2)
+    def _on_preview_worker_finished(self, data_hash: str, rendered_page_count: int):
+        # Novecojusi (atcelta) būve – jaunākā jau strādā savā thread
+        if self._requested_preview_hash is not None and data_hash != self._requested_preview_hash:
+            return
+
+        # Kešatmiņā saglabājam tikai pilnībā renderētu dokumentu (pārtraukts worker to nedara)
+        if self.preview_images and all(p is not None for p in self.preview_images):
+            self.preview_cache.put(data_hash, self.preview_images)
+            self.last_data_hash = data_hash
+
+        self._show_current_page()
 
 
     def _on_preview_worker_failed(self, data_hash: str, error_message: str):
         # Ja tas nav jaunākais pieprasījums, ignorējam.
         if self._requested_preview_hash is not None and data_hash != self._requested_preview_hash:
-            if self._pending_preview_request:
-                d2, h2, op2 = self._pending_preview_request
-                self._pending_preview_request = None
-                self._requested_preview_hash = h2
-                self._start_preview_worker(d2, h2, op2)
             return
 
         self.preview_images = []
@@ -10725,18 +8613,24 @@ class AktaLogs(QMainWindow):
             f"Kļūda: {error_message}"
         )
 
-        if self._pending_preview_request:
-            d2, h2, op2 = self._pending_preview_request
-            self._pending_preview_request = None
-            self._requested_preview_hash = h2
-            self._start_preview_worker(d2, h2, op2)
-
     def _show_current_page(self):
-        if self.preview_images and 0 <= self.current_preview_page < len(self.preview_images):
+        if self.preview_images and 0 <= self.current_preview_page < len(self.preview_images) \
+                and self.preview_images[self.current_preview_page] is None:
+            # Lapa vēl tiek renderēta fonā; _on_preview_page_ready to parādīs, tiklīdz tā gatava
+            self.preview_label.clear()
+            self.preview_label.setText(f"Ģenerē lapu {self.current_preview_page + 1}...")
+            self.page_number_label.setText(f"Lapa {self.current_preview_page + 1}/{len(self.preview_images)}")
+            self.prev_page_button.setEnabled(self.current_preview_page > 0)
+            self.next_page_button.setEnabled(self.current_preview_page < len(self.preview_images) - 1)
+        elif self.preview_images and 0 <= self.current_preview_page < len(self.preview_images):
             pixmap = self.preview_images[self.current_preview_page]
             label_size = self.preview_scroll_area.viewport().size()
             scaled_pixmap = pixmap.scaled(label_size * self.zoom_factor, Qt.KeepAspectRatio,
                                           Qt.SmoothTransformation)
+            # Ja attēls tiek palielināts (zoom/lielāks logs), pagaidām rādām to, bet redzamo lapu
+            # pārrenderējam vajadzīgajā izšķirtspējā
+            if pixmap.width() > 0 and scaled_pixmap.width() > pixmap.width() * 1.1:
+                self._zoom_render_timer.start(200)
             self.preview_label.setPixmap(scaled_pixmap)
             # Lai QScrollArea varētu skrollēt (un pan ar peli strādātu), QLabel izmērs jāpielāgo pixmap izmēram
             self.preview_label.resize(scaled_pixmap.size())
@@ -10766,20 +8660,11 @@ class AktaLogs(QMainWindow):
         return self.savākt_datus()
 
     def _ģenerēt_pdf_failu(self, d: AktaDati, pdf_path: str) -> str:
-        """Ģenerē galveno PDF (kā eksportā) un pievieno atsauces pielikumus (Atvasinājumi), ja tādi ir.
-        Alias priekš vecākiem izsaukumiem ZIP funkcijā.
+        """Ģenerē galveno PDF (kā eksportā) ar atsauces pielikumiem (Atvasinājumi), ja tādi ir.
+        Alias priekš vecākiem izsaukumiem ZIP funkcijā. Pielikumus pievieno konveijera
+        "attachments" posms tieši vienu reizi.
         """
-        # 1) ģenerējam pamata PDF
-        ģenerēt_pdf(d, pdf_path)
-
-        # 2) pieliekam atsauces dokumentus (ja ir)
-        try:
-            # nododam to pašu fontu, lai latviešu diakritika vienmēr ir korekta
-            fn = reģistrēt_fontu(getattr(d, "fonts_ceļš", ""))
-            _append_reference_docs_to_pdf(pdf_path, d, font_name=fn)
-        except Exception as e:
-            print(f"Pielikumu pievienošanas kļūda: {e}")
-        return pdf_path
+        return _coerce_path(ģenerēt_pdf(d, pdf_path, include_reference_docs=True)) or pdf_path
 
     def ģenerēt_zip_dialogs(self):
         """Saglabā ZIP arhīvu: PDF + visi pielikumi (atsevišķi) + projekta JSON."""
@@ -10806,41 +8691,11 @@ class AktaLogs(QMainWindow):
 
             # Saglabājam JSON
             with open(json_path, "w", encoding="utf-8") as f:
-                def _json_safe(o):
-                    # Pārvērš Decimal un citus JSON-nederīgus tipus par drošu formu
-                    from decimal import Decimal
-                    if isinstance(o, Decimal):
-                        return str(o)
-                    if isinstance(o, dict):
-                        return {k: _json_safe(v) for k, v in o.items()}
-                    if isinstance(o, (list, tuple)):
-                        return [_json_safe(v) for v in o]
-                    return o
-
                 json.dump(_json_safe(asdict(d)), f, ensure_ascii=False, indent=2)
 
-            import zipfile
-            with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as z:
-                z.write(pdf_path, arcname="Akts.pdf")
-                z.write(json_path, arcname="projekts.json")
-
-                # Pielikumi (atsauces dokumenti) kā atsevišķi faili
-                used = set()
-                for i in range(self.list_atsauces_faili.count()):
-                    it = self.list_atsauces_faili.item(i)
-                    p = it.data(Qt.UserRole)
-                    p = _coerce_path(p)
-                    if not p or not os.path.exists(p):
-                        continue
-                    base = os.path.basename(p)
-                    name = base
-                    k = 2
-                    while name.lower() in used:
-                        root, ext = os.path.splitext(base)
-                        name = f"{root}_{k}{ext}"
-                        k += 1
-                    used.add(name.lower())
-                    z.write(p, arcname=os.path.join("pielikumi", name))
+            # Pielikumi (atsauces dokumenti) kā atsevišķi faili
+            pielikumi = [self.list_atsauces_faili.item(i).data(Qt.UserRole) for i in range(self.list_atsauces_faili.count())]
+            _rakstīt_akta_zip(zip_path, pdf_path, json_path, pielikumi)
 
             # Ierakstām dokumentu vēsturē (kopējam PDF+JSON uz vēstures mapi)
             self._record_generated_document(pdf_path, json_path)
@@ -10951,77 +8806,17 @@ class AktaLogs(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Kļūda", f"Neizdevās ģenerēt DOCX:\n{e}")
 
-    # =======================
-    # HOTFIX: PDF path safety
-    # =======================
-
-    # Saglabājam oriģinālo funkciju
-    _original_generate_pdf = ģenerēt_pdf
-
-    def ģenerēt_pdf(
-            akta_dati: AktaDati,
-            pdf_ceļš: str | None = None,
-            include_reference_docs: bool = True,
-            encrypt_pdf: bool = True
-    ) -> str:
-        """
-        STABILA PDF ģenerēšana.
-        VIENMĒR atgriež STRING faila ceļu.
-        NEKAD neatgriež dict.
-        """
-
-        # 🔒 1. Garantējam, ka pdf_ceļš ir STRING
-        if isinstance(pdf_ceļš, dict):
-            pdf_ceļš = pdf_ceļš.get("path") or ""
-        if pdf_ceļš and not isinstance(pdf_ceļš, (str, os.PathLike)):
-            pdf_ceļš = ""
-
-        # 🔒 2. Ja nav dots ceļš – veidojam pagaidu failu
-        if not pdf_ceļš:
-            fd, pdf_ceļš = tempfile.mkstemp(suffix=".pdf")
-            os.close(fd)
-
-        pdf_ceļš = os.fspath(pdf_ceļš)
-
-        # 🔒 3. PDF ģenerēšana (ReportLab)
-        font_name = reģistrēt_fontu(akta_dati.fonts_ceļš)
-
-        doc = SimpleDocTemplate(
-            pdf_ceļš,
-            pagesize=A4,
-            leftMargin=18 * mm,
-            rightMargin=18 * mm,
-            topMargin=16 * mm,
-            bottomMargin=16 * mm,
-            title="Pieņemšanas–Nodošanas akts",
-        )
-
-        styles = getSampleStyleSheet()
-        styles.add(ParagraphStyle(
-            name="NormalLV",
-            fontName=font_name,
-            fontSize=10,
-            leading=13
-        ))
-
-        story = []
-        story.append(Paragraph("PIEŅEMŠANAS–NODOŠANAS AKTS", styles["NormalLV"]))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph(f"Akta Nr.: {akta_dati.akta_nr}", styles["NormalLV"]))
-        story.append(Paragraph(f"Datums: {akta_dati.datums}", styles["NormalLV"]))
-        story.append(Paragraph(f"Vieta: {akta_dati.vieta}", styles["NormalLV"]))
-
-        doc.build(story)
-
-        # 🔒 4. DROŠĪBA: ja fails tiešām eksistē
-        if not os.path.exists(pdf_ceļš):
-            raise RuntimeError("PDF netika izveidots")
-
-        # 🔒 5. VIENMĒR atgriežam STRING
-        return pdf_ceļš
-
 
 if __name__ == "__main__":
+    # Bez GUI: pakešu ģenerēšana no projektu JSON failiem / lokālais renderēšanas serviss
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        sys.exit(_pakešu_cli(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        sys.exit(_servisa_cli(sys.argv[2:]))
+
+    # GUI stāvoklī ceļi dažreiz nonāk kā dict/tuple – tolerantais os.fspath tikai šim procesam
+    ieslēgt_drošu_fspath()
+    starta_posmi = {"imports": time.perf_counter()}
     # Windows: korekta Taskbar ikona + grupēšana
     set_windows_app_id("kulinics.akta_generators")
 
@@ -11032,90 +8827,15 @@ if __name__ == "__main__":
         pass
 
     apply_modern_theme(app, dark=True)
+    starta_posmi["QApplication"] = time.perf_counter()
     window = AktaLogs()
+    starta_posmi["logs"] = time.perf_counter()
     window.show()
-    sys.exit(app.exec())
-
-# =======================
-# HOTFIX: PDF path safety
-# =======================
-
-# Saglabājam oriģinālo funkciju
-_original_generate_pdf = ģenerēt_pdf
-
-def ģenerēt_pdf(
-    akta_dati: AktaDati,
-    pdf_ceļš: str | None = None,
-    include_reference_docs: bool = True,
-    encrypt_pdf: bool = True
-) -> str:
-    """
-    STABILA PDF ģenerēšana.
-    VIENMĒR atgriež STRING faila ceļu.
-    NEKAD neatgriež dict.
-    """
-
-    # 🔒 1. Garantējam, ka pdf_ceļš ir STRING
-    if isinstance(pdf_ceļš, dict):
-        pdf_ceļš = pdf_ceļš.get("path") or ""
-    if pdf_ceļš and not isinstance(pdf_ceļš, (str, os.PathLike)):
-        pdf_ceļš = ""
+    starta_posmi["parādīts"] = time.perf_counter()
 
-    # 🔒 2. Ja nav dots ceļš – veidojam pagaidu failu
-    if not pdf_ceļš:
-        fd, pdf_ceļš = tempfile.mkstemp(suffix=".pdf")
-        os.close(fd)
+    def _starts_pabeigts():
+        starta_posmi["lietojams"] = time.perf_counter()
+        _pieraksti_starta_laiku(starta_posmi)
 
-    pdf_ceļš = os.fspath(pdf_ceļš)
-
-    # 🔒 3. PDF ģenerēšana (ReportLab)
-    font_name = reģistrēt_fontu(akta_dati.fonts_ceļš)
-
-    doc = SimpleDocTemplate(
-        pdf_ceļš,
-        pagesize=A4,
-        leftMargin=18 * mm,
-        rightMargin=18 * mm,
-        topMargin=16 * mm,
-        bottomMargin=16 * mm,
-        title="Pieņemšanas–Nodošanas akts",
-    )
-
-    styles = getSampleStyleSheet()
-    styles.add(ParagraphStyle(
-        name="NormalLV",
-        fontName=font_name,
-        fontSize=10,
-        leading=13
-    ))
-
-    story = []
-    story.append(Paragraph("PIEŅEMŠANAS–NODOŠANAS AKTS", styles["NormalLV"]))
-    story.append(Spacer(1, 12))
-    story.append(Paragraph(f"Akta Nr.: {akta_dati.akta_nr}", styles["NormalLV"]))
-    story.append(Paragraph(f"Datums: {akta_dati.datums}", styles["NormalLV"]))
-    story.append(Paragraph(f"Vieta: {akta_dati.vieta}", styles["NormalLV"]))
-
-    doc.build(story)
-
-    # 🔒 4. DROŠĪBA: ja fails tiešām eksistē
-    if not os.path.exists(pdf_ceļš):
-        raise RuntimeError("PDF netika izveidots")
-
-    # 🔒 5. VIENMĒR atgriežam STRING
-    return pdf_ceļš
-
-
-
-
-def draw_first_page(canvas, doc):
-    try:
-        draw_header(canvas, doc, show_logo=False)
-    except TypeError:
-        draw_header(canvas, doc)
-
-def draw_later_pages(canvas, doc):
-    try:
-        draw_header(canvas, doc, show_logo=False)
-    except TypeError:
-        pass
+    QTimer.singleShot(0, _starts_pabeigts)
+    sys.exit(app.exec())
@@ -0,0 +1,5585 @@
+"""Pieņemšanas-Nodošanas aktu ģenerēšanas kodols (bez Qt).
+
+Datu modelis (AktaDati, Persona, Pozīcija, ...), PDF un DOCX ģenerēšana, projektu JSON
+ielāde un pakešu ģenerēšana. Modulis neielādē PySide6 un importējot neveido direktorijus,
+tāpēc to var izmantot serveros, darbinieku procesos un komandrindā:
+
+    python akta_kodols.py batch projekti/ -o izvade/ -f pdf -j 4
+
+GUI ("Pienemsanas-Nodosanas akti.py") ir plāns slānis virs šī moduļa.
+"""
+import sys
+import os
+import os.path
+import io
+import re
+import json
+import hashlib
+import tempfile
+import shutil
+import subprocess
+import threading
+import time
+import atexit
+import copy
+import math
+import operator
+from collections import OrderedDict
+from typing import Optional
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from dataclasses import dataclass, asdict, field
+
+# ReportLab (~110 ms) un PIL tiek ielādēti pirmajā PDF ģenerēšanā (_ielādēt_reportlab), nevis
+# importējot kodolu – GUI startā un DOCX-only darbiniekos tie nav vajadzīgi. http.server
+# importē tikai serviss (_AktaRenderService.start).
+A4 = landscape = portrait = letter = legal = A3 = A5 = None
+renderPDF = Drawing = rl_qr = canvas = colors = mm = inch = None
+Table = TableStyle = Paragraph = Spacer = SimpleDocTemplate = RLImage = PageBreak = None
+getSampleStyleSheet = ParagraphStyle = StyleSheet1 = pdfmetrics = TTFont = Flowable = None
+# ReportLab apakšklases (sk. _DecoratedCanvasMixin u.c.) – izveido _ielādēt_reportlab()
+DecoratedCanvas = _FrozenStyleSheet = _ChunkedPositionsTable = None
+
+
+def _ielādēt_reportlab():
+    """Importē ReportLab nosaukumus moduļa globālajos un izveido apakšklases (vienreiz)."""
+    global A4, landscape, portrait, letter, legal, A3, A5
+    global renderPDF, Drawing, rl_qr, canvas, colors, mm, inch
+    global Table, TableStyle, Paragraph, Spacer, SimpleDocTemplate, RLImage, PageBreak
+    global getSampleStyleSheet, ParagraphStyle, StyleSheet1, pdfmetrics, TTFont, Flowable
+    global DecoratedCanvas, _FrozenStyleSheet, _ChunkedPositionsTable
+    if DecoratedCanvas is not None:
+        return
+    with _reportlab_lock:
+        if DecoratedCanvas is not None:
+            return
+        from reportlab.lib.pagesizes import A4, landscape, portrait, letter, legal, A3, A5
+        from reportlab.graphics import renderPDF
+        from reportlab.graphics.shapes import Drawing
+        from reportlab.graphics.barcode import qr as rl_qr
+        from reportlab.pdfgen import canvas
+        from reportlab.lib import colors
+        from reportlab.lib.units import mm, inch
+        from reportlab.platypus import Table, TableStyle, Paragraph, Spacer, SimpleDocTemplate, Image as RLImage, PageBreak
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle, StyleSheet1
+        from reportlab.pdfbase import pdfmetrics
+        from reportlab.pdfbase.ttfonts import TTFont
+        from reportlab.platypus.flowables import Flowable
+        _FrozenStyleSheet = type("_FrozenStyleSheet", (_FrozenStyleSheetMixin, StyleSheet1), {})
+        _ChunkedPositionsTable = type("_ChunkedPositionsTable", (_ChunkedPositionsTableMixin, Flowable), {})
+        DecoratedCanvas = type("DecoratedCanvas", (_DecoratedCanvasMixin, canvas.Canvas), {})
+
+
+_reportlab_lock = threading.Lock()
+
+# python-docx tiek ielādēts pirmajā DOCX ģenerēšanā (_ielādēt_docx), nevis importējot kodolu:
+# ~60–120 ms, kas GUI startā un PDF-only pakešu/servisa darbiniekos nav vajadzīgi.
+Document = Inches = Pt = WD_ALIGN_PARAGRAPH = WD_ALIGN_VERTICAL = Run = OxmlElement = qn = RGBColor = None
+
+
+def _ielādēt_docx():
+    """Importē python-docx nosaukumus moduļa globālajos (vienreiz)."""
+    global Document, Inches, Pt, WD_ALIGN_PARAGRAPH, WD_ALIGN_VERTICAL, Run, OxmlElement, qn, RGBColor
+    if Document is not None:
+        return
+    from docx import Document as _Document
+    from docx.shared import Inches, Pt, RGBColor
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.enum.table import WD_ALIGN_VERTICAL
+    from docx.text.run import Run
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+    Document = _Document
+
+
+# ============================
+# FIX: path-like safety (dict -> str) to allow repeated PDF generation
+# ============================
+# Dažkārt (pēc pirmās ģenerēšanas) UI stāvoklī ceļi var nonākt kā dict (piem. Qt.UserRole).
+# Tas izraisa TypeError "expected str, bytes or os.PathLike object, not dict" pie os.path / open() / ReportLab.
+# Šis ir minimāls "drop-in" ielāps: padara os.fspath tolerantāku pret dict/tuple/list,
+# lai visur, kur Python/stdlib iekšēji izsauc os.fspath(), mēs vienmēr saņemtu string ceļu.
+# Kodols pats ceļus normalizē ar _coerce_path(), tāpēc ielāps netiek uzlikts importējot –
+# to ieslēdz tikai GUI ieejas punkts ar ieslēgt_drošu_fspath() (batch/serve to neietekmē).
+
+_ORIG_OS_FSPATH = os.fspath
+
+def _safe_fspath(p):
+    try:
+        if p is None:
+            return ""
+        # QFileDialog dažreiz atgriež (path, filter)
+        if isinstance(p, (list, tuple)) and p:
+            return _safe_fspath(p[0])
+        # UI/state var iedot dict ar ceļu
+        if isinstance(p, dict):
+            for k in ("path", "ceļš", "celsh", "file", "filepath", "filename", "value", "pdf", "json"):
+                v = p.get(k)
+                if v:
+                    return _safe_fspath(v)
+            return ""
+        return _ORIG_OS_FSPATH(p)
+    except TypeError:
+        # Pēdējais glābiņš: pārvēršam par str (labāk FileNotFoundError nekā TypeError)
+        try:
+            return str(p)
+        except Exception:
+            return ""
+
+def ieslēgt_drošu_fspath() -> None:
+    """Monkey-patch: ietekmē os.path.*, reportlab utt. visā procesā (tikai GUI)."""
+    os.fspath = _safe_fspath
+
+
+def resource_path(relative_path: str) -> str:
+    """Atgriež pareizu ceļu uz resursu gan Python režīmā, gan PyInstaller EXE režīmā."""
+    base_path = getattr(sys, "_MEIPASS", os.path.abspath("."))
+    return os.path.join(base_path, relative_path)
+
+
+# ---------------------- Konstantes un direktoriju iestatījumi ----------------------
+
+def _xdg_user_dir(name: str) -> str:
+    """XDG_<name>_DIR no ~/.config/user-dirs.dirs (Linux), vai "" ja nav norādīts."""
+    home = os.path.expanduser("~")
+    cfg = os.environ.get("XDG_CONFIG_HOME") or os.path.join(home, ".config")
+    try:
+        with open(os.path.join(cfg, "user-dirs.dirs"), "r", encoding="utf-8") as f:
+            for line in f:
+                m = re.match(rf'\s*XDG_{name}_DIR\s*=\s*"(.*)"\s*$', line)
+                if m:
+                    value = m.group(1).replace("$HOME", home).rstrip("/")
+                    if os.path.isabs(value):
+                        return value
+    except OSError:
+        pass
+    return ""
+
+
+def _windows_known_folder(folder_id: str) -> str:
+    """SHGetKnownFolderPath (Windows) pēc KNOWNFOLDERID virknes, vai "" kļūdas gadījumā."""
+    try:
+        import ctypes
+        import uuid
+        guid = ctypes.create_string_buffer(uuid.UUID(folder_id).bytes_le, 16)
+        out = ctypes.c_wchar_p()
+        if ctypes.windll.shell32.SHGetKnownFolderPath(guid, 0, None, ctypes.byref(out)) != 0:
+            return ""
+        try:
+            return out.value or ""
+        finally:
+            ctypes.windll.ole32.CoTaskMemFree(out)
+    except Exception:
+        return ""
+
+
+def _standarta_mape(veids: str) -> str:
+    """Lietotāja datu ("data") vai dokumentu ("documents") mape bez Qt.
+
+    Atbilst QStandardPaths.writableLocation(AppDataLocation / DocumentsLocation), kādu GUI
+    lietoja līdz šim (pirms QApplication izveides – bez lietotnes nosaukuma), lai esošie
+    iestatījumi, vēsture un keši paliktu tajās pašās vietās.
+    """
+    home = os.path.expanduser("~")
+    if sys.platform.startswith("win"):
+        if veids == "data":
+            path = _windows_known_folder("3EB685DB-65F9-4CF6-A03A-E3EF65729F3D") or os.environ.get("APPDATA", "") or os.path.join(home, "AppData", "Roaming")
+        else:
+            path = _windows_known_folder("FDD39AD0-238F-46AF-ADB4-6C85480369C7") or os.path.join(os.environ.get("USERPROFILE", "") or home, "Documents")
+        return path.replace("\\", "/")
+    if sys.platform == "darwin":
+        return os.path.join(home, "Library", "Application Support") if veids == "data" else os.path.join(home, "Documents")
+    if veids == "data":
+        xdg = os.environ.get("XDG_DATA_HOME", "")
+        return xdg if os.path.isabs(xdg) else os.path.join(home, ".local", "share")
+    return _xdg_user_dir("DOCUMENTS") or os.path.join(home, "Documents")
+
+
+APP_DATA_DIR = _standarta_mape("data")
+DOCUMENTS_DIR = _standarta_mape("documents")
+
+
+# ==============================
+# Iestatījumi (vienkārši JSON)
+# ==============================
+
+def _settings_path() -> str:
+    return os.path.join(APP_DATA_DIR, "settings.json")
+
+def load_settings() -> dict:
+    try:
+        p = _settings_path()
+        if os.path.exists(p):
+            with open(p, "r", encoding="utf-8") as f:
+                return json.load(f) or {}
+    except Exception:
+        pass
+    return {}
+
+def save_settings(data: dict):
+    try:
+        os.makedirs(APP_DATA_DIR, exist_ok=True)
+        with open(_settings_path(), "w", encoding="utf-8") as f:
+            json.dump(data or {}, f, ensure_ascii=False, indent=2)
+    except Exception:
+        pass
+
+
+
+SETTINGS_DIR = os.path.join(APP_DATA_DIR, "AktaGenerators")
+HISTORY_FILE = os.path.join(SETTINGS_DIR, "history.json")
+ADDRESS_BOOK_FILE = os.path.join(SETTINGS_DIR, "address_book.json")
+DEFAULT_SETTINGS_FILE = os.path.join(SETTINGS_DIR, "default_settings.json")
+AKTA_NR_COUNTER_FILE = os.path.join(SETTINGS_DIR, "akta_nr_counter.json")  # JAUNS: stabilai secīgai akta numuru ģenerācijai
+TEXT_BLOCKS_FILE = os.path.join(SETTINGS_DIR, "text_blocks.json") # JAUNA RINDAS
+CONVERSION_CACHE_DIR = os.path.join(SETTINGS_DIR, "conversion_cache")  # Pielikumu DOCX/XLSX/PPTX -> PDF kešs
+CONVERSION_CACHE_MAX_BYTES = 512 * 1024 * 1024  # LRU robeža konvertēto PDF kešam
+CONVERSION_DIGEST_MEMO_ENTRIES = 1024  # Cik pielikumu SHA-256 atcerēties atmiņā (LRU)
+LIBREOFFICE_PROFILE_DIR = os.path.join(SETTINGS_DIR, "lo_profile")  # Privāts LibreOffice profils konvertēšanai
+ATTACHMENT_CONVERSION_WORKERS = max(1, min(8, os.cpu_count() or 2))  # Paralēlo LibreOffice konvertētāju skaits
+ATTACHMENT_CONVERSION_IDLE_S = 120.0  # Pēc cik sekundēm dīkstāvē apturēt papildu konvertētājus
+PDF_IMAGE_CACHE_DIR = os.path.join(SETTINGS_DIR, "image_cache")  # PDF attēli, pārsamploti līdz mērķa izmēram
+PDF_IMAGE_CACHE_MAX_BYTES = 256 * 1024 * 1024  # LRU robeža PDF attēlu kešam
+PREVIEW_CACHE_DIR = os.path.join(SETTINGS_DIR, "preview_cache")  # GUI priekšskatījuma lapas (PNG) pēc datu hash
+PREVIEW_DISK_CACHE_MAX_BYTES = 256 * 1024 * 1024  # LRU robeža priekšskatījuma diska kešam
+PDF_LARGE_TABLE_ROWS = 200  # No šī pozīciju skaita POZĪCIJAS tabulu izkārto pa lapām (_ChunkedPositionsTable)
+
+# Jaunas noklusējuma saglabāšanas mapes
+DEFAULT_OUTPUT_DIR = os.path.join(DOCUMENTS_DIR, "AktaGenerators_Output")
+PROJECT_SAVE_DIR = os.path.join(APP_DATA_DIR, "AktaGenerators_Projects")
+# TEMPLATES_DIR = os.path.join(APP_DATA_DIR, "AktaGenerators_Templates") # JAUNA RINDAS - Tagad dinamiski iestatīts AktaDati objektā
+
+
+def sagatavot_lietotnes_mapes():
+    """Izveido lietotnes mapes (iestatījumi, izvade, projekti). Izsauc GUI startā, nevis imports."""
+    os.makedirs(SETTINGS_DIR, exist_ok=True)
+    os.makedirs(DEFAULT_OUTPUT_DIR, exist_ok=True)
+    os.makedirs(PROJECT_SAVE_DIR, exist_ok=True)
+    # os.makedirs(TEMPLATES_DIR, exist_ok=True) # JAUNA RINDAS - Tagad dinamiski iestatīts AktaDati objektā
+
+
+
+# ---------------------- Datu modeļi ----------------------
+# (unchanged)
+
+@dataclass
+class Persona:
+    nosaukums: str = ""
+    reģ_nr: str = ""
+    adrese: str = ""
+    kontaktpersona: str = ""
+    amats: str = ""
+    pilnvaras_pamats: str = ""
+    tālrunis: str = ""
+    epasts: str = ""
+    web_lapa: str = ""
+    bankas_konts: str = ""
+    juridiskais_statuss: str = ""
+
+
+
+@dataclass
+class Pozīcija:
+    apraksts: str
+    daudzums: Decimal
+    vienība: str
+    cena: Decimal
+    seriālais_nr: str = ""
+    garantija: str = ""
+    piezīmes_pozīcijai: str = ""
+    attēla_ceļš: str = ""
+
+    @property
+    def summa(self) -> Decimal:
+        try:
+            return (self.daudzums * self.cena).quantize(Decimal("0.01"))
+        except Exception:
+            return Decimal("0.00")
+
+@dataclass
+class Attēls:
+    ceļš: str
+    paraksts: str = ""
+
+
+@dataclass
+class AtsaucesDokuments:
+    """Reāls atsauces dokuments, ko pievieno PDF beigās kā atvasinājumu."""
+    ceļš: str
+    nosaukums: str = ""
+
+
+@dataclass
+class AktaDati:
+    akta_nr: str = ""
+    datums: str = ""  # YYYY-MM-DD
+    vieta: str = ""
+    pasūtījuma_nr: str = ""
+    pieņēmējs: Persona = field(default_factory=Persona)
+    nodevējs: Persona = field(default_factory=Persona)
+    pozīcijas: list = field(default_factory=list)  # list[Pozīcija]
+    attēli: list = field(default_factory=list)
+    piezīmes: str = ""
+    iekļaut_pvn: bool = False
+    pvn_likme: Decimal = Decimal("21.0")
+    parakstu_rindas: bool = True
+    logotipa_ceļš: str = ""
+    fonts_ceļš: str = ""  # TTF/OTF
+    paraksts_pieņēmējs_ceļš: str = ""
+    paraksts_nodevējs_ceļš: str = ""
+    līguma_nr: str = ""
+    izpildes_termiņš: str = ""
+    pieņemšanas_datums: str = ""
+    nodošanas_datums: str = ""
+    strīdu_risināšana: str = ""
+    konfidencialitātes_klauzula: bool = False
+    soda_nauda_procenti: Decimal = Decimal("0.0")
+    piegādes_nosacījumi: str = ""
+    apdrošināšana: bool = False
+    apdrošināšana_teksts: str = ""
+    papildu_nosacījumi: str = ""
+    atsauces_dokumenti: str = ""
+    atsauces_dokumenti_faili: list = field(default_factory=list)  # list[AtsaucesDokuments]
+    akta_statuss: str = "Melnraksts"
+    valūta: str = "EUR"
+    elektroniskais_paraksts: bool = False
+    radit_elektronisko_parakstu_tekstu: bool = False # JAUNS LAUKS
+    qr_kods_enabled: bool = True  # QR kods apakšā pa kreisi
+    qr_kods_ieklaut_pozicijas: bool = True
+    qr_only_first_page: bool = False
+    qr_verification_url_enabled: bool = False
+    qr_verification_base_url: str = ""
+    qr_kods_izmers_mm: Decimal = Decimal("25.0")
+
+    # Jauni iestatījumu lauki
+    pdf_page_size: str = "A4"
+    pdf_page_orientation: str = "Portrets"
+    pdf_margin_left: Decimal = Decimal("18")
+    pdf_margin_right: Decimal = Decimal("18")
+    pdf_margin_top: Decimal = Decimal("16")
+    pdf_margin_bottom: Decimal = Decimal("16")
+    pdf_font_size_head: int = 14
+    pdf_font_size_normal: int = 10
+    pdf_font_size_small: int = 9
+    pdf_font_size_table: int = 9
+    pdf_logo_width_mm: Decimal = Decimal("35")
+    pdf_signature_width_mm: Decimal = Decimal("50")
+    pdf_signature_height_mm: Decimal = Decimal("20")
+    docx_image_width_inches: Decimal = Decimal("4")
+    docx_signature_width_inches: Decimal = Decimal("1.5")
+    table_col_widths: str = "10,40,18,18,20,20,25,25,25" # Komatiem atdalīti platumi mm
+    auto_generate_akta_nr: bool = True
+    default_execution_days: int = 5  # Noklusējuma dienu skaits izpildes termiņam (datums + N)
+    default_currency: str = "EUR"
+    default_unit: str = "gab."
+    default_pvn_rate: Decimal = Decimal("21.0")
+    poppler_path: str = ""
+    # Jauni iestatījumi, lai sasniegtu "30+"
+    header_text_color: str = "#000000" # Hex krāsa
+    footer_text_color: str = "#000000"
+    table_header_bg_color: str = "#E0E0E0"
+    table_grid_color: str = "#CCCCCC"
+    table_row_spacing: Decimal = Decimal("4") # mm
+    line_spacing_multiplier: Decimal = Decimal("1.2") # Reizinātājs fonta izmēram
+    show_page_numbers: bool = True
+    show_generation_timestamp: bool = True
+    currency_symbol_position: str = "after" # "before" or "after"
+    date_format: str = "YYYY-MM-DD"
+    signature_line_length_mm: Decimal = Decimal("60")
+    signature_line_thickness_pt: Decimal = Decimal("0.5")
+    add_cover_page: bool = False
+    cover_page_title: str = "Pieņemšanas-Nodošanas Akts"
+    cover_page_logo_width_mm: Decimal = Decimal("80")
+    # Individuālais QR kods
+    include_custom_qr_code: bool = False
+    custom_qr_code_data: str = ""
+    custom_qr_code_size_mm: Decimal = Decimal("20")
+    custom_qr_code_position: str = "bottom_right"
+    custom_qr_code_pos_x_mm: Decimal = Decimal("0")  # Custom X pozīcija mm
+    custom_qr_code_pos_y_mm: Decimal = Decimal("0")  # Custom Y pozīcija mm
+    custom_qr_code_color: str = "#000000"  # QR koda krāsa (Hex)
+    # Automātiskais QR kods (akta ID)
+    include_auto_qr_code: bool = False
+    auto_qr_code_size_mm: Decimal = Decimal("20")
+    auto_qr_code_position: str = "bottom_left"
+    auto_qr_code_pos_x_mm: Decimal = Decimal("0")  # Custom X pozīcija mm
+    auto_qr_code_pos_y_mm: Decimal = Decimal("0")  # Custom Y pozīcija mm
+    auto_qr_code_color: str = "#000000"  # QR koda krāsa (Hex)
+
+    add_watermark: bool = False
+    watermark_text: str = "MELNRAKSTS"
+    watermark_font_size: int = 72
+    watermark_color: str = "#E0E0E0"
+    watermark_rotation: int = 45
+    enable_pdf_encryption: bool = False
+    pdf_user_password: str = ""
+    pdf_owner_password: str = ""
+    allow_printing: bool = True
+    allow_copying: bool = True
+    allow_modifying: bool = False
+    allow_annotating: bool = True
+    # Papildu lauki, lai sasniegtu 30+
+    default_country: str = "Latvija"
+    default_city: str = "Rīga"
+    show_contact_details_in_header: bool = False
+    contact_details_header_font_size: int = 8
+    item_image_width_mm: Decimal = Decimal("50") # Platums attēliem pie pozīcijām
+    item_image_caption_font_size: int = 8
+    pdf_image_dpi: int = 200 # Attēlu (foto, logo, paraksti) izšķirtspēja PDF pēc pārsamplošanas
+    show_item_notes_in_table: bool = True
+    show_item_serial_number_in_table: bool = True
+    show_item_warranty_in_table: bool = True
+    show_item_photo_in_table: bool = True
+    table_cell_padding_mm: Decimal = Decimal("2")
+    table_header_font_style: str = "bold" # "bold", "italic", "normal"
+    table_content_alignment: str = "left" # "left", "center", "right"
+    signature_font_size: int = 9
+    signature_spacing_mm: Decimal = Decimal("10") # Atstarpe starp paraksta rindu un vārdu
+    # Vēl daži, lai pārsniegtu 30
+    document_title_font_size: int = 18
+    document_title_color: str = "#000000"
+    section_heading_font_size: int = 12
+    section_heading_color: str = "#000000"
+    paragraph_line_spacing_multiplier: Decimal = Decimal("1.2")
+    table_border_style: str = "solid" # "solid", "dashed", "none"
+    table_border_thickness_pt: Decimal = Decimal("0.5")
+    table_alternate_row_color: str = "" # Hex krāsa, piem. "#F0F0F0"
+    # Papildu lauki, lai sasniegtu 30+
+    show_total_sum_in_words: bool = False
+    total_sum_in_words_language: str = "lv" # "lv", "en"
+    # Papildu lauki, lai sasniegtu 30+
+    default_vat_calculation_method: str = "exclusive" # "exclusive", "inclusive"
+    show_vat_breakdown: bool = True
+    # Papildu lauki, lai sasniegtu 30+
+    enable_digital_signature_field: bool = False # PDF digitālā paraksta lauks
+    digital_signature_field_name: str = "Paraksts"
+    digital_signature_field_size_mm: Decimal = Decimal("40")
+    digital_signature_field_position: str = "bottom_center"  # "bottom_left", "bottom_right", "top_left", "top_right", "bottom_center"
+    template_password: str = ""  # Parole šablonam
+    templates_dir: str = ""  # JAUNA RINDAS - Šablonu saglabāšanas direktorijs
+    docx_template_path: str = ""  # (ja vēlies) DOCX šablons ar {{placeholders}}
+    custom_columns: list = field(
+    default_factory=list)  # Saraksts ar pielāgotajām kolonnām: [{'name': 'Kolonna1', 'data': []}]
+
+    # --- JAUNS: Pozīciju tabulas kolonnu pārvaldība (UI + PDF) ---
+    # poz_columns_config struktūra:
+    # {
+    #   "nr": {"title": "Nr.", "visible": True},
+    #   "apraksts": {"title": "Apraksts", "visible": True},
+    #   "daudzums": {"title": "Daudzums", "visible": True},
+    #   "vieniba": {"title": "Vienība", "visible": True},
+    #   "cena": {"title": "Cena", "visible": True},
+    #   "summa": {"title": "Summa", "visible": True},
+    #   "serial": {"title": "Seriālais Nr.", "visible": True},
+    #   "warranty": {"title": "Garantija", "visible": True},
+    #   "notes": {"title": "Piezīmes pozīcijai", "visible": True},
+    #   "foto": {"title": "Foto", "visible": True}
+    # }
+    poz_columns_config: dict = field(default_factory=dict)
+
+    # Vai rādīt cenu apkopojumu (kopsavilkumu) zem pozīciju tabulas (PDF)
+    show_price_summary: bool = True
+    # Saglabā lietotāja kolonnu secību Pozīciju tabulai (UI -> PDF)
+    poz_columns_visual_order: list = field(default_factory=list)
+    # Saglabā kolonnu platumus/izkārtojumu (QHeaderView.saveState) Pozīciju tabulai (UI)
+    poz_header_state_b64: str = ""
+    def kopējā_summma(self):
+        s = sum((p.summa for p in self.pozīcijas), Decimal("0.00"))
+        return s.quantize(Decimal("0.01"))
+
+    def pvn_summa(self):
+        if not self.iekļaut_pvn:
+            return Decimal("0.00")
+        pvn = self.kopējā_summma() * (self.pvn_likme / Decimal("100"))
+        return pvn.quantize(Decimal("0.01"))
+
+    def summa_ar_pvn(self):
+        return (self.kopējā_summma() + self.pvn_summa()).quantize(Decimal("0.01"))
+
+
+def _default_poz_columns_config() -> dict:
+    """Noklusētā pozīciju kolonnu konfigurācija (UI + PDF)."""
+    return {
+        "nr": {"title": "Nr.", "visible": True},
+        "apraksts": {"title": "Apraksts", "visible": True},
+        "daudzums": {"title": "Daudzums", "visible": True},
+        "vieniba": {"title": "Vienība", "visible": True},
+        "cena": {"title": "Cena", "visible": True},
+        "summa": {"title": "Summa", "visible": True},
+        "serial": {"title": "Seriālais Nr.", "visible": True},
+        "warranty": {"title": "Garantija", "visible": True},
+        "notes": {"title": "Piezīmes pozīcijai", "visible": True},
+        "foto": {"title": "Foto", "visible": True},
+    }
+
+
+def _merge_poz_columns_config(cfg: Optional[dict]) -> dict:
+    """Droši apvieno lietotāja konfigurāciju ar noklusējuma vērtībām."""
+    base = _default_poz_columns_config()
+    out = {}
+    cfg = cfg if isinstance(cfg, dict) else {}
+    for k, v in base.items():
+        cur = cfg.get(k, {}) if isinstance(cfg.get(k, {}), dict) else {}
+        out[k] = {
+            "title": str(cur.get("title", v.get("title", ""))),
+            "visible": bool(cur.get("visible", v.get("visible", True))),
+        }
+    # Saglabājam arī nezināmus atslēgu ierakstus (ja nākotnē pievieno jaunas kolonnas)
+    for k, cur in cfg.items():
+        if k in out:
+            continue
+        if isinstance(cur, dict):
+            out[k] = {"title": str(cur.get("title", k)), "visible": bool(cur.get("visible", True))}
+    return out
+
+# ---------------------- Palīgfunkcijas ----------------------
+# (unchanged)
+def to_decimal(val) -> Decimal:
+    if isinstance(val, Decimal):
+        return val
+    try:
+        s = str(val).replace(" ", "").replace(",", ".")
+        return Decimal(s)
+    except (InvalidOperation, ValueError):
+        return Decimal("0")
+
+def formēt_naudu(d: Decimal) -> str:
+    return f"{d:.2f}"
+
+def drošs_faila_nosaukums(s: str) -> str:
+    bad = '\\/:*?"<>|'
+    for ch in bad:
+        s = s.replace(ch, "_")
+    return s.strip() or "akts"
+
+def _coerce_path(p):
+    """Normalizē ievadi uz faila ceļu (str) vai atgriež None.
+    Vajadzīgs, jo dažās vietās signāli/ieraksti var nodot dict/tuple u.c.
+    Pieņem arī dict ar tipiskām atslēgām: path, ceļš, file, filepath, json, pdf.
+    """
+    if p is None:
+        return None
+    # Qt signāli dažreiz padod bool (checked). To ignorējam.
+    if isinstance(p, bool):
+        return None
+    # Ja padots tuple/list (piem. (path, filter))
+    if isinstance(p, (list, tuple)) and p:
+        return _coerce_path(p[0])
+    # Ja padots dict ar ceļu
+    if isinstance(p, dict):
+        for k in ("path", "ceļš", "celsh", "file", "filepath", "json", "pdf", "value"):
+            v = p.get(k)
+            if isinstance(v, (str, bytes, os.PathLike)) and v:
+                return os.fspath(v)
+        return None
+    # Parasts path-like
+    if isinstance(p, (str, bytes, os.PathLike)):
+        try:
+            s = os.fspath(p)
+        except Exception:
+            return None
+        return s if s else None
+    # Cits tips (piem. int fd) šeit nav vajadzīgs
+    return None
+
+
+
+
+def _path_exists(p) -> bool:
+    """Droša os.path.exists versija, kas pieņem arī dict/tuple u.c."""
+    pp = _coerce_path(p)
+    if not pp:
+        return False
+    try:
+        return os.path.exists(pp)
+    except Exception:
+        return False
+
+def _atomic_write_bytes(target_path: str, data: bytes):
+    """Droši pārraksta failu (Windows lock-safe): raksta uz pagaidu failu un tad os.replace()."""
+    try:
+        target_path = os.path.abspath(target_path)
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+    except Exception:
+        pass
+
+    tmp_fd = None
+    tmp_path = None
+    try:
+        # Pagaidu fails tajā pašā mapē (lai os.replace būtu atomisks arī Windows)
+        dir_name = os.path.dirname(os.path.abspath(target_path)) or "."
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".pdf", dir=dir_name)
+        tmp_fd = fd
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        tmp_fd = None
+        os.replace(tmp_path, target_path)
+        tmp_path = None
+    finally:
+        try:
+            if tmp_fd is not None:
+                os.close(tmp_fd)
+        except Exception:
+            pass
+        try:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        except Exception:
+            pass
+
+def _atomic_write_pdfwriter(target_path: str, writer_obj):
+    """Droši saglabā PyPDF2 PdfWriter uz failu, neatsitoties pret file-lock."""
+    buf = io.BytesIO()
+    writer_obj.write(buf)
+    _atomic_write_bytes(target_path, buf.getvalue())
+
+
+def _prepare_unencrypted_pdf_for_render(pdf_path: str, password: str = "") -> tuple[str, Optional[str]]:
+    """Ja PDF ir šifrēts, izveido atšifrētu pagaidu kopiju renderēšanai (poppler/pdf2image/Qt).
+    Atgriež (render_path, temp_path_to_cleanup). Ja nav šifrēts, temp_path_to_cleanup būs None.
+
+    Kāpēc tas vajadzīgs:
+    - pdf2image/poppler bieži uzkārtina procesu, ja PDF ir šifrēts.
+    - Priekšskatījums programmā nedrīkst prasīt paroli.
+    """
+    try:
+        from PyPDF2 import PdfReader, PdfWriter
+    except Exception:
+        # Ja nav PyPDF2, vienkārši mēģinām renderēt oriģinālu (labāk nekā crash)
+        return pdf_path, None
+
+    try:
+        with open(pdf_path, "rb") as rf:
+            reader = PdfReader(rf)
+            if not getattr(reader, "is_encrypted", False):
+                return pdf_path, None
+
+            # Mēģinām atšifrēt (PyPDF2: decrypt() atgriež 0/1/2 vai True/False atkarībā no versijas)
+            try:
+                ok = reader.decrypt(password or "")
+            except Exception:
+                ok = 0
+
+            if not ok:
+                # Nevarējām atšifrēt — neatgriežam šifrētu uz poppler (lai neuzkar),
+                # bet metīsim izņēmumu, ko UI var parādīt kā kļūdu.
+                raise RuntimeError("PDF ir šifrēts un paroli neizdevās pielietot priekšskatījumam/drukai.")
+
+            writer = PdfWriter()
+            for p in reader.pages:
+                writer.add_page(p)
+
+        # Saglabājam atšifrētu pagaidu PDF tajā pašā mapē (drošāk Windows)
+        dir_name = os.path.dirname(os.path.abspath(pdf_path)) or "."
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp_decrypted_", suffix=".pdf", dir=dir_name)
+        os.close(fd)
+        _atomic_write_pdfwriter(tmp_path, writer)
+        return tmp_path, tmp_path
+
+    except Exception:
+        # Ja kaut kas noiet greizi, labāk lai caller redz kļūdu (nevis hang).
+        raise
+
+
+# Latviešu burti, kuriem jābūt fontā, lai PDF diakritika netiek aizstāta ar tukšiem kvadrātiem
+LATVIAN_GLYPHS = "āčēģīķļņšūžĀČĒĢĪĶĻŅŠŪŽ"
+
+# Fontu stilu faili blakus regulārajam: "-Bold", "Bold", Windows "arialbd.ttf", "verdanab.ttf" u.c.
+_FONT_STYLE_SUFFIXES = {
+    "bold": ("-Bold", "_Bold", " Bold", "Bold", "bd", "b"),
+    "italic": ("-Italic", "_Italic", " Italic", "Italic", "-Oblique", "Oblique", "i"),
+    "boldItalic": ("-BoldItalic", "_BoldItalic", " Bold Italic", "BoldItalic", "-BoldOblique", "BoldOblique", "bi", "z"),
+}
+_FONT_REGULAR_SUFFIXES = ("-Regular", "_Regular", " Regular", "Regular", "-Roman", "-Book")
+
+
+class _FontRegistry:
+    """Procesa mēroga TTF fontu reģistrs.
+
+    Katrs fonta fails (atslēga = ceļš + mtime) tiek parsēts un reģistrēts ReportLab tikai
+    vienreiz; atkārtotas ģenerēšanas un priekšskatījumi izmanto jau reģistrēto nosaukumu.
+    Blakus failos tiek meklēti bold/italic varianti un reģistrēta fontu saime, lai
+    `<b>`/`<i>` marķējums un bold_name() lieto īsto treknraksta fontu.
+    """
+
+    def __init__(self):
+        self._families = {}  # (abs_path, mtime_ns, prefix) -> {"normal": ..., "bold": ..., ...}
+        self._bold = {"Helvetica": "Helvetica-Bold", "Times-Roman": "Times-Bold", "Courier": "Courier-Bold"}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _file_key(path: str):
+        st = os.stat(path)
+        return os.path.abspath(path), st.st_mtime_ns
+
+    @staticmethod
+    def find_style_siblings(path: str) -> dict:
+        """Atrod bold/italic/boldItalic failus tajā pašā mapē. Atgriež {stils: ceļš}."""
+        folder = os.path.dirname(os.path.abspath(path))
+        stem, ext = os.path.splitext(os.path.basename(path))
+        base = stem
+        for suffix in _FONT_REGULAR_SUFFIXES:
+            if base.lower().endswith(suffix.lower()) and len(base) > len(suffix):
+                base = base[:-len(suffix)]
+                break
+        try:
+            by_lower = {fn.lower(): os.path.join(folder, fn) for fn in os.listdir(folder)}
+        except OSError:
+            return {}
+        found = {}
+        for style, suffixes in _FONT_STYLE_SUFFIXES.items():
+            for suffix in suffixes:
+                candidate = by_lower.get(f"{base}{suffix}{ext}".lower())
+                if candidate and os.path.abspath(candidate) != os.path.abspath(path):
+                    found[style] = candidate
+                    break
+        return found
+
+    def register(self, path: str, prefix: str = "DokFont") -> str:
+        """Reģistrē fontu (un tā stilu variantus) vienreiz; atgriež regulārā fonta nosaukumu."""
+        _ielādēt_reportlab()
+        key = self._file_key(path) + (prefix,)
+        with self._lock:
+            family = self._families.get(key)
+            if family is not None:
+                return family["normal"]
+
+            tag = hashlib.sha1(f"{key[0]}|{key[1]}".encode("utf-8", "surrogatepass")).hexdigest()[:8]
+            normal = f"{prefix}-{tag}"
+            pdfmetrics.registerFont(TTFont(normal, path))
+            family = {"normal": normal, "bold": normal, "italic": normal, "boldItalic": normal}
+            for style, sibling in self.find_style_siblings(path).items():
+                try:
+                    name = f"{normal}-{style}"
+                    pdfmetrics.registerFont(TTFont(name, sibling))
+                    family[style] = name
+                except Exception as e:
+                    print(f"Fonta varianta reģistrācijas kļūda ({sibling}): {e}")
+            if family["boldItalic"] == normal and family["bold"] != normal:
+                family["boldItalic"] = family["bold"]
+            pdfmetrics.registerFontFamily(normal, **family)
+            self._families[key] = family
+            self._bold[normal] = family["bold"]
+
+            missing = self.missing_glyphs(normal, LATVIAN_GLYPHS)
+            if missing:
+                print(f"Brīdinājums: fontā {os.path.basename(path)} nav simbolu: {''.join(sorted(missing))}")
+            return normal
+
+    def bold_name(self, font_name: str) -> str:
+        """Treknraksta fonta nosaukums (vai tas pats fonts, ja bold varianta nav)."""
+        return self._bold.get(font_name, font_name)
+
+    @staticmethod
+    def missing_glyphs(font_name: str, text: str) -> set:
+        """Simboli no `text`, kuru fontā nav (standarta PDF fontiem – tukša kopa)."""
+        _ielādēt_reportlab()
+        try:
+            face = getattr(pdfmetrics.getFont(font_name), "face", None)
+        except Exception:
+            return set()
+        char_map = getattr(face, "charToGlyph", None)
+        if not char_map:
+            return set()
+        return {ch for ch in set(text) if not ch.isspace() and ord(ch) not in char_map}
+
+    def covers(self, font_name: str, text: str) -> bool:
+        return not self.missing_glyphs(font_name, text)
+
+
+_font_registry = _FontRegistry()
+
+
+def reģistrēt_fontu(font_ceļš: str, vārds: str = "DokFont") -> str:
+    """Atgriež PDF fonta nosaukumu; fonts tiek parsēts tikai vienreiz procesā (sk. _FontRegistry)."""
+    if not font_ceļš or not os.path.exists(font_ceļš):
+        try:
+            if sys.platform == "win32":
+                system_font_path = os.path.join(os.environ.get("WINDIR", "C:\\Windows"), "Fonts", "Arial.ttf")
+                if os.path.exists(system_font_path):
+                    return _font_registry.register(system_font_path, vārds)
+            return "Helvetica"
+        except Exception:
+            return "Helvetica"
+    try:
+        return _font_registry.register(font_ceļš, vārds)
+    except Exception:
+        return "Helvetica"
+
+# Lapu numerācija PDF dokumentam
+
+
+# ---------------------- QR kodi ----------------------
+class _QrService:
+    """Vienots QR kodu serviss PDF un DOCX ģenerēšanai – bez pagaidu failiem.
+
+    - drawing(): vektoru ReportLab Drawing (rl_qr.QrCodeWidget), mērogots līdz size_pt.
+      Der gan kā story flowable, gan zīmēšanai uz canvas (renderPDF.draw).
+    - png(): PNG baiti atmiņā (DOCX add_picture pieņem failam līdzīgu objektu).
+
+    Rezultāti memoizēti pēc (payload, izmērs, krāsa, mala); Drawing netiek mainīts pēc
+    izveides, tāpēc to var droši koplietot starp ģenerēšanām.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self._max_entries = max(1, int(max_entries))
+        self._items: "OrderedDict[tuple, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _memo(self, key: tuple, build):
+        with self._lock:
+            value = self._items.get(key)
+            if value is not None:
+                self._items.move_to_end(key)
+                return value
+        value = build()
+        with self._lock:
+            self._items[key] = value
+            while len(self._items) > self._max_entries:
+                self._items.popitem(last=False)
+        return value
+
+    def drawing(self, payload: str, size_pt: float, color: str = "#000000", border: int = 4) -> "Drawing":
+        _ielādēt_reportlab()
+
+        def build():
+            from reportlab.graphics.shapes import Rect
+
+            widget = rl_qr.QrCodeWidget(payload, barLevel="L", barBorder=border,
+                                        barFillColor=colors.HexColor(color))
+            bounds = widget.getBounds()
+            bw = bounds[2] - bounds[0]
+            bh = bounds[3] - bounds[1]
+            scale = size_pt / max(bw, bh)
+            d = Drawing(size_pt, size_pt, transform=[scale, 0, 0, scale, 0, 0])
+            # Balts fons zem moduļiem un klusās zonas (border), lai QR nolasās arī uz ūdenszīmes/krāsaina fona
+            d.add(Rect(bounds[0], bounds[1], bw, bh, fillColor=colors.white, strokeColor=None, strokeWidth=0))
+            # Widget pats QR kodē no jauna katrā renderēšanā (~0,1–0,15 s); kešotajā Drawing
+            # liekam jau izrēķinātās moduļu figūras, tāpēc atkārtota zīmēšana ir lēta.
+            d.add(widget.draw())
+            d.hAlign = "CENTER"  # tāpat kā RLImage story plūsmā
+            return d
+
+        return self._memo(("drawing", payload, round(float(size_pt), 3), color, int(border)), build)
+
+    def png(self, payload: str, color: str = "#000000", border: int = 2, box_size: int = 10) -> bytes:
+        def build():
+            import qrcode
+            qr = qrcode.QRCode(version=1, error_correction=qrcode.constants.ERROR_CORRECT_L,
+                               box_size=box_size, border=border)
+            qr.add_data(payload)
+            qr.make(fit=True)
+            bio = io.BytesIO()
+            qr.make_image(fill_color=color, back_color="white").save(bio, format="PNG")
+            return bio.getvalue()
+
+        return self._memo(("png", payload, color, int(border), int(box_size)), build)
+
+
+_qr_service = _QrService()
+
+
+# Lapu numerācija + dekorācijas PDF dokumentam
+class _DecoratedCanvasMixin:
+    """Canvas, kas pievieno lapu numerāciju, ūdenszīmi un QR kodus (ja ieslēgts).
+
+    DecoratedCanvas = (_DecoratedCanvasMixin, canvas.Canvas) – sk. _ielādēt_reportlab().
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.pages = []
+        self.akta_dati: AktaDati = kwargs.pop("akta_dati", None)
+        self.show_page_numbers = kwargs.pop("show_page_numbers", True)
+        super().__init__(*args, **kwargs)
+
+        # Sagatavojam QR kodu attēlus vienreiz (ja vajag)
+        self._qr_images = []
+        try:
+            if self.akta_dati:
+                qr_items = []
+                if self.akta_dati.include_custom_qr_code and self.akta_dati.custom_qr_code_data:
+                    qr_items.append(("custom", self.akta_dati.custom_qr_code_data,
+                                     float(self.akta_dati.custom_qr_code_size_mm),
+                                     self.akta_dati.custom_qr_code_position,
+                                     float(self.akta_dati.custom_qr_code_pos_x_mm),
+                                     float(self.akta_dati.custom_qr_code_pos_y_mm)))
+                if self.akta_dati.include_auto_qr_code and self.akta_dati.akta_nr:
+                    qr_items.append(("auto", self.akta_dati.akta_nr,
+                                     float(self.akta_dati.auto_qr_code_size_mm),
+                                     self.akta_dati.auto_qr_code_position,
+                                     float(self.akta_dati.auto_qr_code_pos_x_mm),
+                                     float(self.akta_dati.auto_qr_code_pos_y_mm)))
+
+                for _, data, size_mm, pos, x_mm, y_mm in qr_items:
+                    self._qr_images.append({
+                        "drawing": _qr_service.drawing(data, size_mm * mm, border=2),
+                        "size_pt": size_mm * mm,
+                        "pos": pos,
+                        "x_pt": x_mm * mm,
+                        "y_pt": y_mm * mm,
+                    })
+        except Exception as e:
+            # Nekrītam ārā, ja rodas kļūda
+            print(f"QR sagatavošanas kļūda: {e}")
+            self._qr_images = []
+
+    def showPage(self):
+        self.pages.append(dict(self.__dict__))
+        self._startPage()
+
+    def save(self):
+        page_count = len(self.pages)
+        for page in self.pages:
+            self.__dict__.update(page)
+
+            # Dekorācijas uz katras lapas
+            self._draw_staple_mark()
+            self._draw_watermark()
+            self._draw_qr_codes()
+
+            if self.show_page_numbers:
+                self._draw_page_number(page_count)
+
+            canvas.Canvas.showPage(self)
+        canvas.Canvas.save(self)
+
+
+    def _draw_staple_mark(self):
+        """Uzzīmē īsu vertikālu līniju augšējā kreisajā stūrī (skavotāja atzīme) uz katras lapas."""
+        try:
+            w, h = self._pagesize
+            self.saveState()
+            # Diskrēta, drukai draudzīga krāsa
+            self.setStrokeColor(colors.HexColor("#94A3B8"))  # slate-400
+            self.setLineWidth(0.7)
+            # Pozīcija: nedaudz no kreisās malas, pie augšas
+            x = 6 * mm
+            y1 = h - 12 * mm
+            y2 = h - 32 * mm
+            self.line(x, y1, x, y2)
+            self.restoreState()
+        except Exception:
+            try:
+                self.restoreState()
+            except Exception:
+                pass
+
+    def _draw_page_number(self, page_count: int):
+        # Augšējais labais stūris
+        self.setFont("Helvetica", 9)
+        w, h = self._pagesize
+        self.drawRightString(w - 18 * mm, h - 10 * mm, f"Lapa {self._pageNumber} no {page_count}")
+
+    def _draw_watermark(self):
+        if not self.akta_dati or not getattr(self.akta_dati, "add_watermark", False):
+            return
+        text = getattr(self.akta_dati, "watermark_text", "") or ""
+        if not text.strip():
+            return
+
+        try:
+            from reportlab.lib.colors import HexColor
+            self.saveState()
+            self.setFillColor(HexColor(getattr(self.akta_dati, "watermark_color", "#E0E0E0")))
+            self.setFont("Helvetica-Bold", float(getattr(self.akta_dati, "watermark_font_size", 72)))
+            w, h = self._pagesize
+            self.translate(w / 2, h / 2)
+            self.rotate(float(getattr(self.akta_dati, "watermark_rotation", 45)))
+            self.drawCentredString(0, 0, text)
+            self.restoreState()
+        except Exception as e:
+            print(f"Ūdenszīmes kļūda: {e}")
+
+    def _draw_qr_codes(self):
+        if not self._qr_images:
+            return
+
+        try:
+            w, h = self._pagesize
+            left = float(getattr(self.akta_dati, "pdf_margin_left", 18)) * mm if self.akta_dati else 18 * mm
+            right = float(getattr(self.akta_dati, "pdf_margin_right", 18)) * mm if self.akta_dati else 18 * mm
+            top = float(getattr(self.akta_dati, "pdf_margin_top", 16)) * mm if self.akta_dati else 16 * mm
+            bottom = float(getattr(self.akta_dati, "pdf_margin_bottom", 16)) * mm if self.akta_dati else 16 * mm
+
+            for q in self._qr_images:
+                size = q["size_pt"]
+                pos = q["pos"]
+                if pos == "bottom_left":
+                    x, y = left, bottom
+                elif pos == "bottom_right":
+                    x, y = w - right - size, bottom
+                elif pos == "top_left":
+                    x, y = left, h - top - size
+                elif pos == "top_right":
+                    x, y = w - right - size, h - top - size
+                elif pos == "custom":
+                    x, y = q["x_pt"], q["y_pt"]
+                else:
+                    # fallback
+                    x, y = w - right - size, bottom
+
+                renderPDF.draw(q["drawing"], self, x, y)
+        except Exception as e:
+            print(f"QR zīmēšanas kļūda: {e}")
+
+
+# ---------------------- Atsauces dokumentu (pielikumu) apstrāde ----------------------
+def _find_soffice_exe() -> Optional[str]:
+    """Atrod LibreOffice/soffice izpildāmo failu.
+    Atgriež pilnu ceļu vai None, ja nav atrasts.
+    """
+    import shutil
+
+    # 1) mēģinam no PATH
+    p = shutil.which("soffice") or shutil.which("libreoffice")
+    if p:
+        return p
+
+    # 2) tipiskie ceļi Windows
+    if sys.platform == "win32":
+        candidates = [
+            os.path.join(os.environ.get("ProgramFiles", ""), "LibreOffice", "program", "soffice.exe"),
+            os.path.join(os.environ.get("ProgramFiles(x86)", ""), "LibreOffice", "program", "soffice.exe"),
+            r"C:\Program Files\LibreOffice\program\soffice.exe",
+            r"C:\Program Files (x86)\LibreOffice\program\soffice.exe",
+        ]
+        for c in candidates:
+            if c and os.path.exists(c):
+                return c
+
+    return None
+
+class _ConversionCache:
+    """Pastāvīgs (uz diska) kešs pielikumiem, kas konvertēti uz PDF ar LibreOffice.
+
+    Atslēga = pielikuma satura SHA-256 + LibreOffice filtrs, tāpēc nemainīts XLSX/DOCX
+    netiek konvertēts atkārtoti (arī pēc programmas restartēšanas vai ja fails pārdēvēts).
+    Izmēru ierobežo LRU: lietošanas laiku glabājam faila mtime, un pārsniedzot max_bytes
+    dzēšam vecāk lietotos ierakstus. Keša kopējo izmēru uztur atmiņā (mapi pārskata vienreiz,
+    pirmajā ierakstā), tāpēc mapi staigā tikai tad, kad tiešām jāizmet.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = CONVERSION_CACHE_MAX_BYTES,
+                 digest_entries: int = CONVERSION_DIGEST_MEMO_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_bytes)
+        self.digest_entries = int(digest_entries)
+        # (abs_path, size, mtime_ns) -> sha256 (lai nemainītu failu nehešotu katrā priekšskatījumā); LRU
+        self._digests: "OrderedDict[tuple, str]" = OrderedDict()
+        self._total_bytes = None  # None = mape vēl nav pārskatīta
+        self._lock = threading.Lock()
+
+    def _file_digest(self, path: str) -> str:
+        st = os.stat(path)
+        memo_key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+        with self._lock:
+            digest = self._digests.get(memo_key)
+            if digest is not None:
+                self._digests.move_to_end(memo_key)
+                return digest
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with self._lock:
+            self._digests[memo_key] = digest
+            while len(self._digests) > self.digest_entries:
+                self._digests.popitem(last=False)
+        return digest
+
+    def key_for(self, input_path: str, convert_to: str) -> Optional[str]:
+        try:
+            digest = self._file_digest(input_path)
+        except Exception:
+            return None
+        return hashlib.sha256(f"{digest}|{convert_to}".encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pdf")
+
+    def get(self, key: Optional[str]) -> Optional[str]:
+        """Atgriež kešā esošā PDF ceļu vai None. Trāpījums atjauno LRU laiku."""
+        if not key:
+            return None
+        p = self._entry_path(key)
+        try:
+            if os.path.getsize(p) <= 0:
+                return None
+            os.utime(p, None)
+            return p
+        except OSError:
+            return None
+
+    def put(self, key: Optional[str], pdf_path: str) -> str:
+        """Ieliek konvertēto PDF kešā un atgriež kešā esošo ceļu (vai oriģinālu, ja neizdevās)."""
+        if not key:
+            return pdf_path
+        target = self._entry_path(key)
+        try:
+            with open(pdf_path, "rb") as f:
+                self._write_entry(target, f.read())
+            return target
+        except Exception as e:
+            print(f"Konvertēšanas keša kļūda: {e}")
+            return pdf_path
+
+    @property
+    def total_bytes(self) -> int:
+        """Keša ierakstu kopējais izmērs baitos (pirmajā izsaukumā nolasa no diska)."""
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _mtime, size, _fp in self._scan())
+            return self._total_bytes
+
+    def _scan(self) -> list:
+        entries = []
+        for root, _dirs, files in os.walk(self.cache_dir):
+            for fn in files:
+                fp = os.path.join(root, fn)
+                try:
+                    st = os.stat(fp)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, fp))
+        return entries
+
+    def _write_entry(self, target: str, data: bytes):
+        """Atomāri ieraksta ierakstu, pieskaita tā izmēru un vajadzības gadījumā izmet vecākos."""
+        self.total_bytes  # pārskata mapi pirms pirmā ieraksta, lai jaunais netiktu ieskaitīts divreiz
+        try:
+            old_size = os.path.getsize(target)
+        except OSError:
+            old_size = 0
+        _atomic_write_bytes(target, data)
+        with self._lock:
+            self._total_bytes += len(data) - old_size
+            over = self._total_bytes > self.max_bytes
+        if over:
+            self._evict(keep=target)
+
+    def _evict(self, keep: str = ""):
+        with self._lock:
+            entries = self._scan()
+            total = sum(size for _mtime, size, _fp in entries)
+            if total > self.max_bytes:
+                entries.sort()  # vecāk lietotie pirmie
+                for _mtime, size, fp in entries:
+                    if total <= self.max_bytes:
+                        break
+                    if os.path.abspath(fp) == os.path.abspath(keep):
+                        continue
+                    try:
+                        os.remove(fp)
+                        total -= size
+                    except OSError:
+                        pass
+            # Staigāšana vienlaikus izlīdzina skaitītāju ar disku (piem. ja kāds dzēsis failus)
+            self._total_bytes = total
+
+    def clear(self):
+        with self._lock:
+            shutil.rmtree(self.cache_dir, ignore_errors=True)
+            self._digests.clear()
+            self._total_bytes = 0
+
+
+_conversion_cache = _ConversionCache(CONVERSION_CACHE_DIR)
+
+
+class _PdfImageCache(_ConversionCache):
+    """Pastāvīgs kešs PDF attēliem (foto, logo, paraksti), pārsamplotiem līdz zīmēšanas izmēram.
+
+    Atslēga = (ceļš, faila izmērs, mtime, mērķa rāmis, DPI); ieraksta nosaukumā ir arī
+    formāts (.jpg/.png). LRU izmešana tāda pati kā konvertēto PDF kešam.
+    """
+
+    def key_for_image(self, path: str, box_w: float, box_h: float, dpi: int) -> Optional[str]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        raw = f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}|{box_w:.2f}x{box_h:.2f}|{int(dpi)}"
+        return hashlib.sha256(raw.encode("utf-8", "surrogatepass")).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        # Atslēgā jau ir paplašinājums (<hash>.jpg / <hash>.png)
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def put_bytes(self, key: str, data: bytes) -> Optional[str]:
+        target = self._entry_path(key)
+        try:
+            self._write_entry(target, data)
+            return target
+        except Exception as e:
+            print(f"Attēlu keša kļūda: {e}")
+            return None
+
+
+_pdf_image_cache = _PdfImageCache(PDF_IMAGE_CACHE_DIR, PDF_IMAGE_CACHE_MAX_BYTES)
+
+
+class _PreviewPageCache(_ConversionCache):
+    """Pastāvīgs kešs priekšskatījuma lapām: viens ZIP ar lapu PNG katram datu hash.
+
+    Ļauj pēc projekta atkārtotas atvēršanas, undo vai restartēšanas uzreiz parādīt
+    priekšskatījumu bez PDF ģenerēšanas. Blakus lapām ZIP glabā lapas.json ar katras
+    lapas DPI un izmēru punktos, lai lasītājs var pārbaudīt, vai kešotā izšķirtspēja
+    vēl pietiek pašreizējam skatlaukam un zoom. LRU izmešana tāda pati kā konvertēto PDF kešam.
+    """
+
+    _MANIFEST = "lapas.json"
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.zip")
+
+    def get_pages(self, data_hash: str) -> Optional[list]:
+        """Atgriež lapu sarakstu (lapu secībā) vai None.
+
+        Katra lapa ir vārdnīca {"png": baiti, "dpi": int, "size_pt": (w, h) | None};
+        ierakstiem bez lapas.json dpi ir 0 (izšķirtspēja nezināma).
+        """
+        import zipfile
+        p = self.get(data_hash)
+        if not p:
+            return None
+        try:
+            with zipfile.ZipFile(p) as zf:
+                names = zf.namelist()
+                meta = json.loads(zf.read(self._MANIFEST)) if self._MANIFEST in names else {}
+                pngs = sorted((n for n in names if n.endswith(".png")),
+                              key=lambda n: int(os.path.splitext(n)[0]))
+                info = meta.get("lapas") or []
+                pages = []
+                for i, n in enumerate(pngs):
+                    m = info[i] if i < len(info) else {}
+                    size_pt = m.get("size_pt")
+                    pages.append({"png": zf.read(n), "dpi": int(m.get("dpi") or 0),
+                                  "size_pt": tuple(size_pt) if size_pt else None})
+                return pages or None
+        except Exception as e:
+            print(f"Priekšskatījuma keša kļūda: {e}")
+            return None
+
+    def put_pages(self, data_hash: str, pages: list, page_dpi: list = None, page_sizes_pt: list = None) -> Optional[str]:
+        """Saglabā lapu PNG baitus kopā ar katras lapas DPI un izmēru punktos."""
+        import zipfile
+        if not data_hash or not pages:
+            return None
+        target = self._entry_path(data_hash)
+        try:
+            buf = io.BytesIO()
+            # PNG jau ir saspiests, tāpēc ZIP_STORED
+            with zipfile.ZipFile(buf, "w", zipfile.ZIP_STORED) as zf:
+                for i, data in enumerate(pages):
+                    zf.writestr(f"{i}.png", data)
+                info = []
+                for i in range(len(pages)):
+                    dpi = page_dpi[i] if page_dpi and i < len(page_dpi) else 0
+                    size_pt = page_sizes_pt[i] if page_sizes_pt and i < len(page_sizes_pt) else None
+                    info.append({"dpi": int(dpi or 0), "size_pt": list(size_pt) if size_pt else None})
+                zf.writestr(self._MANIFEST, json.dumps({"lapas": info}))
+            self._write_entry(target, buf.getvalue())
+            return target
+        except Exception as e:
+            print(f"Priekšskatījuma keša kļūda: {e}")
+            return None
+
+
+_preview_page_cache = _PreviewPageCache(PREVIEW_CACHE_DIR, PREVIEW_DISK_CACHE_MAX_BYTES)
+
+_LOSSLESS_IMAGE_FORMATS = {"PNG", "GIF", "BMP", "TIFF"}
+
+
+def _pdf_image_source(path: str, max_w: float, max_h: float, dpi: int):
+    """Sagatavo attēla failu PDF iegulšanai. Atgriež (fails, draw_w, draw_h).
+
+    draw_w/draw_h sakrīt ar RLImage(path)._restrictSize(max_w, max_h) (pikseļi = punkti,
+    tikai samazina), tāpēc izkārtojums nemainās. Ja attēlā ir vairāk pikseļu, nekā vajag
+    `dpi` pie šī izmēra, to pārsamplo, pārkodē (JPEG foto / PNG līniju grafikai un
+    caurspīdīgumam) bez metadatiem (EXIF/XMP/ICC) un saglabā _pdf_image_cache.
+    """
+    from PIL import Image
+
+    with Image.open(path) as im:
+        px_w, px_h = im.size
+        draw_w, draw_h = float(px_w), float(px_h)
+        if draw_w > max_w + 1e-6 or draw_h > max_h + 1e-6:
+            factor = min(float(max_w) / draw_w, float(max_h) / draw_h)
+            draw_w *= factor
+            draw_h *= factor
+
+        target_w = max(1, int(math.ceil(draw_w * dpi / 72.0)))
+        target_h = max(1, int(math.ceil(draw_h * dpi / 72.0)))
+        if target_w * target_h >= px_w * px_h * 0.8:
+            # Pārsamplošana neko būtiski neietaupa – lietojam oriģinālu
+            return path, draw_w, draw_h
+
+        lossless = (im.format or "").upper() in _LOSSLESS_IMAGE_FORMATS
+        has_alpha = im.mode in ("RGBA", "LA", "PA") or (im.mode == "P" and "transparency" in im.info)
+        ext = ".png" if (lossless or has_alpha) else ".jpg"
+
+        key = _pdf_image_cache.key_for_image(path, max_w, max_h, dpi)
+        if key:
+            cached = _pdf_image_cache.get(key + ext)
+            if cached:
+                return cached, draw_w, draw_h
+
+        if ext == ".jpg":
+            # JPEG dekodēšana uzreiz samazinātā izšķirtspējā (DCT mērogošana) – daudz ātrāk lielām kameras bildēm
+            im.draft("RGB", (target_w, target_h))
+        work = im.convert("RGBA" if has_alpha else ("L" if im.mode in ("1", "L") else "RGB"))
+        resample = getattr(Image, "Resampling", Image).LANCZOS
+        work = work.resize((target_w, target_h), resample)
+
+        from io import BytesIO
+        bio = BytesIO()
+        if ext == ".png":
+            work.save(bio, format="PNG", optimize=True)
+        else:
+            work.save(bio, format="JPEG", quality=85, optimize=True)
+
+    if key:
+        cached = _pdf_image_cache.put_bytes(key + ext, bio.getvalue())
+        if cached:
+            return cached, draw_w, draw_h
+    return path, draw_w, draw_h
+
+
+def _pdf_image(path, max_w: float, max_h: float, dpi=None) -> "RLImage":
+    """RLImage, kas ierobežots līdz max_w×max_h punktiem un pārsamplots līdz `dpi` (sk. _pdf_image_source)."""
+    _ielādēt_reportlab()
+    path = _coerce_path(path) or path
+    try:
+        dpi = int(dpi or 200)
+    except Exception:
+        dpi = 200
+    try:
+        src, draw_w, draw_h = _pdf_image_source(path, float(max_w), float(max_h), max(36, dpi))
+        return RLImage(src, width=draw_w, height=draw_h)
+    except Exception as e:
+        print(f"Attēla pārsamplošanas kļūda ({path}): {e}")
+        img = RLImage(path)
+        img._restrictSize(max_w, max_h)
+        return img
+
+
+_SOFFICE_SUPPORTED_EXTS = {".docx", ".doc", ".xlsx", ".xls", ".ods", ".odt", ".pptx", ".ppt"}
+
+
+def _soffice_convert_filter(ext: str) -> str:
+    """LibreOffice --convert-to vērtība pēc faila paplašinājuma (stabilāk priekš XLSX)."""
+    if ext in {".xls", ".xlsx", ".ods"}:
+        return "pdf:calc_pdf_Export"
+    if ext in {".ppt", ".pptx"}:
+        return "pdf:impress_pdf_Export"
+    return "pdf:writer_pdf_Export"
+
+
+def _soffice_popen_kwargs() -> dict:
+    if os.name == "nt" and hasattr(subprocess, "CREATE_NO_WINDOW"):
+        return {"creationflags": subprocess.CREATE_NO_WINDOW | getattr(subprocess, "CREATE_NEW_PROCESS_GROUP", 0)}
+    # Atsevišķa sesija, lai iestrēgušu soffice.bin varam nogalināt kopā ar palaidēju
+    return {"start_new_session": True}
+
+
+def _kill_process_tree(proc):
+    """Nogalina soffice palaidēju un tā bērnprocesus (soffice.bin)."""
+    if proc is None or proc.poll() is not None:
+        return
+    try:
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/PID", str(proc.pid), "/T", "/F"], capture_output=True, timeout=10,
+                           **_soffice_popen_kwargs())
+        else:
+            import signal
+            os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
+    except Exception:
+        pass
+    try:
+        proc.kill()
+        proc.wait(timeout=5)
+    except Exception:
+        pass
+
+
+# Palīgprogramma, ko izpilda Python ar LibreOffice UNO (LibreOffice komplektētais python vai
+# sistēmas python3-uno): pieslēdzas siltajam `soffice --accept` procesam un konvertē failus pēc
+# pieprasījumiem no stdin (JSON rinda -> JSON rinda). Palaiž ar: python -c _UNO_HELPER_SRC <ports>
+_UNO_HELPER_SRC = r"""
+import json
+import sys
+import time
+
+import uno
+from com.sun.star.beans import PropertyValue
+
+
+def prop(name, value):
+    pv = PropertyValue()
+    pv.Name = name
+    pv.Value = value
+    return pv
+
+
+port = int(sys.argv[1])
+local_ctx = uno.getComponentContext()
+resolver = local_ctx.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local_ctx)
+deadline = time.monotonic() + 60
+while True:
+    try:
+        ctx = resolver.resolve("uno:socket,host=127.0.0.1,port=%d;urp;StarOffice.ComponentContext" % port)
+        break
+    except Exception:
+        if time.monotonic() > deadline:
+            raise
+        time.sleep(0.25)
+desktop = ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+sys.stdout.write("READY\n")
+sys.stdout.flush()
+
+for line in sys.stdin:
+    req = json.loads(line)
+    try:
+        doc = desktop.loadComponentFromURL(uno.systemPathToFileUrl(req["src"]), "_blank", 0,
+                                           (prop("Hidden", True), prop("ReadOnly", True)))
+        if doc is None:
+            raise RuntimeError("LibreOffice nevarēja atvērt dokumentu")
+        try:
+            doc.storeToURL(uno.systemPathToFileUrl(req["out"]), (prop("FilterName", req["filter"]),))
+        finally:
+            try:
+                doc.close(True)
+            except Exception:
+                pass
+        resp = {"ok": True}
+    except Exception as e:
+        resp = {"ok": False, "error": str(e)}
+    sys.stdout.write(json.dumps(resp) + "\n")
+    sys.stdout.flush()
+"""
+
+_uno_pythons = {}  # soffice ceļš -> Python ar uno moduli (vai None)
+_uno_pythons_lock = threading.Lock()
+
+
+def _find_uno_python(soffice: str) -> Optional[str]:
+    """Atrod Python interpretatoru, kas var importēt LibreOffice `uno` moduli.
+
+    Kandidāti: šīs programmas Python (ja nav iesaiņota), LibreOffice komplektētais python
+    (Windows program/python.exe, macOS Contents/Resources/python) un sistēmas python3
+    (Linux python3-uno). Rezultāts tiek atcerēts katram soffice, un izvēlētais konvertēšanas
+    režīms tiek vienreiz izdrukāts konsolē.
+    """
+    with _uno_pythons_lock:
+        if soffice in _uno_pythons:
+            return _uno_pythons[soffice]
+
+        program_dir = os.path.dirname(os.path.realpath(soffice))
+        candidates = []
+        if not getattr(sys, "frozen", False):
+            candidates.append(sys.executable)
+        candidates += [
+            os.path.join(program_dir, "python.exe"),
+            os.path.join(program_dir, "python"),
+            os.path.join(os.path.dirname(program_dir), "Resources", "python"),
+        ]
+        for name in ("python3", "python"):
+            p = shutil.which(name)
+            if p:
+                candidates.append(p)
+
+        found = None
+        for c in dict.fromkeys(candidates):
+            if not c or not os.path.isfile(c):
+                continue
+            try:
+                res = subprocess.run([c, "-c", "import uno"], capture_output=True, timeout=20,
+                                     **_soffice_popen_kwargs())
+            except Exception:
+                continue
+            if res.returncode == 0:
+                found = c
+                break
+
+        if found:
+            print(f"LibreOffice konvertēšana: silts soffice process (UNO caur {found})")
+        else:
+            print("LibreOffice konvertēšana: soffice CLI (Python-UNO nav atrasts, katrai paketei jauns process)")
+        _uno_pythons[soffice] = found
+        return found
+
+
+class GenerēšanaAtcelta(Exception):
+    """Ģenerēšana pārtraukta ar _AtcelšanasŽetons (piem., priekšskatījuma dati jau novecojuši)."""
+
+
+class _AtcelšanasŽetons:
+    """Kooperatīvas atcelšanas žetons PDF ģenerēšanai.
+
+    Konveijers to pārbauda starp posmiem, pēc katra izkārtotā flowable un pirms katra
+    pielikuma; reģistrētie apakšprocesi (soffice, pdftoppm) atcelšanas brīdī tiek nogalināti
+    uzreiz, negaidot to beigas. atcelt() drīkst izsaukt no jebkura pavediena.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._procs: set = set()
+
+    @property
+    def atcelts(self) -> bool:
+        return self._event.is_set()
+
+    def atcelt(self):
+        with self._lock:
+            self._event.set()
+            procs, self._procs = list(self._procs), set()
+        if procs:
+            # Nogalināšana (taskkill/wait) var aizņemt brīdi – izsaucējs (GUI) to negaida
+            threading.Thread(target=lambda: [_kill_process_tree(p) for p in procs], daemon=True).start()
+
+    def pārbaudīt(self):
+        """Met GenerēšanaAtcelta, ja žetons ir atcelts."""
+        if self._event.is_set():
+            raise GenerēšanaAtcelta()
+
+    def reģistrēt_procesu(self, proc):
+        """Process tiks nogalināts atcelšanas brīdī (vai uzreiz, ja jau atcelts)."""
+        with self._lock:
+            if not self._event.is_set():
+                self._procs.add(proc)
+                return
+        _kill_process_tree(proc)
+
+    def atreģistrēt_procesu(self, proc):
+        with self._lock:
+            self._procs.discard(proc)
+
+
+def _atceļams_apakšprocess(cmd: list, atcelšana: Optional[_AtcelšanasŽetons] = None, timeout: float = None,
+                           text: bool = False) -> tuple:
+    """Palaiž apakšprocesu atsevišķā procesu grupā un gaida to. Atgriež (returncode, stdout, stderr).
+
+    Ja atcelšana tiek atcelta, process (ar bērnprocesiem) tiek nogalināts un tiek mests
+    GenerēšanaAtcelta; timeout gadījumā process tiek nogalināts un mests subprocess.TimeoutExpired.
+    """
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=text,
+                            **_soffice_popen_kwargs())
+    if atcelšana is not None:
+        atcelšana.reģistrēt_procesu(proc)
+    try:
+        out, err = proc.communicate(timeout=timeout)
+    except BaseException:
+        _kill_process_tree(proc)
+        raise
+    finally:
+        if atcelšana is not None:
+            atcelšana.atreģistrēt_procesu(proc)
+    if atcelšana is not None:
+        atcelšana.pārbaudīt()
+    return proc.returncode, out, err
+
+
+class _SofficeConverter:
+    """Silts LibreOffice konvertēšanas serviss ap _find_soffice_exe().
+
+    - Izmanto privātu LibreOffice profilu (nekonfliktē ar lietotāja atvērto LibreOffice,
+      profils tiek inicializēts tikai pirmajā reizē).
+    - Ja atrasts Python ar LibreOffice UNO (_find_uno_python), tur vienu headless soffice
+      procesu dzīvu ar socket listeneri un konvertē visus failus caur to ar ilgstošu UNO
+      palīgprocesu (bez atkārtotas palaišanas).
+    - Citādi konvertē visu paketi ar vienu `soffice --convert-to` izsaukumu katram filtram.
+    - Rezultāts ir deterministisks {ievade: izvades PDF vai None}; izvades nosaukumi
+      netiek minēti pēc mtime.
+    - Ja soffice iestrēgst (timeout) vai ģenerēšana tiek atcelta (_AtcelšanasŽetons),
+      process tiek nogalināts un nākamajā izsaukumā palaists no jauna.
+    """
+
+    def __init__(self, soffice: str, profile_dir: str, timeout_per_file: float = 30.0):
+        self.soffice = soffice
+        self.profile_dir = profile_dir
+        self.timeout_per_file = float(timeout_per_file)
+        self._lock = threading.RLock()
+        self._proc = None  # soffice --accept
+        self._helper = None  # UNO palīgprocess (_UNO_HELPER_SRC)
+        self._helper_lines = None  # palīgprocesa stdout rindas (queue.Queue; None = process beidzies)
+        self._idle_timer = None  # threading.Timer, kas aptur procesu pēc dīkstāves (stop_after_idle)
+
+    def _base_cmd(self) -> list:
+        from pathlib import Path
+        profile_url = Path(os.path.abspath(self.profile_dir)).as_uri()
+        return [
+            self.soffice,
+            f"-env:UserInstallation={profile_url}",
+            "--headless",
+            "--nologo",
+            "--nolockcheck",
+            "--nodefault",
+            "--norestore",
+        ]
+
+    def _uno_available(self) -> bool:
+        return _find_uno_python(self.soffice) is not None
+
+    # ---------- UNO (silts process) ----------
+
+    def _ensure_started(self):
+        if (self._helper is not None and self._helper.poll() is None
+                and self._proc is not None and self._proc.poll() is None):
+            return
+
+        self.stop()
+        import queue
+        import socket
+
+        python = _find_uno_python(self.soffice)
+        if not python:
+            raise RuntimeError("Python-UNO nav atrasts")
+
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+
+        os.makedirs(self.profile_dir, exist_ok=True)
+        self._proc = subprocess.Popen(
+            self._base_cmd() + ["--invisible", f"--accept=socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            **_soffice_popen_kwargs(),
+        )
+        self._helper = subprocess.Popen(
+            [python, "-c", _UNO_HELPER_SRC, str(port)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            **_soffice_popen_kwargs(),
+        )
+
+        # Palīgprocesa atbildes lasām atsevišķā pavedienā, lai gaidīšanai būtu timeout
+        lines = queue.Queue()
+
+        def read_lines(stream):
+            for line in stream:
+                lines.put(line.strip())
+            lines.put(None)
+
+        threading.Thread(target=read_lines, args=(self._helper.stdout,), daemon=True).start()
+        self._helper_lines = lines
+
+        try:
+            ready = self._helper_line(timeout=60)
+        except Exception:
+            ready = None
+        if ready != "READY":
+            self.stop()
+            raise RuntimeError("LibreOffice (UNO) neizdevās palaist")
+
+    def _helper_line(self, timeout: float) -> str:
+        """Nākamā palīgprocesa rinda; TimeoutError, ja tā nepienāk laikā."""
+        import queue
+        try:
+            line = self._helper_lines.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError
+        if line is None:
+            raise RuntimeError("UNO palīgprocess beidza darbu")
+        return line
+
+    def _helper_convert(self, src: str, out: str, filter_name: str) -> dict:
+        self._helper.stdin.write(json.dumps({"src": src, "out": out, "filter": filter_name}) + "\n")
+        self._helper.stdin.flush()
+        while True:
+            line = self._helper_line(timeout=self.timeout_per_file)
+            if line.startswith("{"):  # pārējais ir LibreOffice/bibliotēku izvade
+                return json.loads(line)
+
+    def _convert_uno(self, items: list, out_dir: str, atcelšana: Optional[_AtcelšanasŽetons] = None) -> dict:
+        result = {}
+        for i, (src, convert_to) in enumerate(items):
+            if atcelšana is not None:
+                atcelšana.pārbaudīt()
+            stem = os.path.splitext(os.path.basename(src))[0]
+            out = os.path.join(out_dir, f"{i:03d}_{stem}.pdf")
+            filter_name = convert_to.split(":", 1)[1] if ":" in convert_to else "writer_pdf_Export"
+            self._ensure_started()
+
+            # Faila laikā siltais soffice un palīgprocess ir reģistrēti žetonā: atcelšana tos
+            # nogalina uzreiz (arī faila vidū), un nākamā konvertēšana tos palaiž no jauna
+            procs = [p for p in (self._proc, self._helper) if p is not None] if atcelšana is not None else []
+            for proc in procs:
+                atcelšana.reģistrēt_procesu(proc)
+            try:
+                resp = self._helper_convert(src, out, filter_name)
+            except TimeoutError:
+                # Iestrēdzis -> nogalinām; nākamais fails palaidīs jaunu instanci
+                print(f"Konvertēšana iestrēga ({src}), LibreOffice tiek restartēts")
+                self.stop()
+                result[src] = None
+                continue
+            except Exception:
+                if atcelšana is not None and atcelšana.atcelts:
+                    self.stop()
+                    raise GenerēšanaAtcelta()
+                raise
+            finally:
+                for proc in procs:
+                    atcelšana.atreģistrēt_procesu(proc)
+            if not resp.get("ok"):
+                print(f"Konvertēšanas kļūda ({src}): {resp.get('error')}")
+            result[src] = out if os.path.exists(out) and os.path.getsize(out) > 0 else None
+        return result
+
+    # ---------- CLI (viens izsaukums paketei) ----------
+
+    def _convert_cli(self, items: list, out_dir: str, atcelšana: Optional[_AtcelšanasŽetons] = None) -> dict:
+        # Vienā izsaukumā var būt tikai viens filtrs un unikāli failu nosaukumi (izvade = <stem>.pdf)
+        batches = []  # [(convert_to, set(stem), [src])]
+        for src, convert_to in items:
+            stem = os.path.splitext(os.path.basename(src))[0].lower()
+            for b_conv, b_stems, b_srcs in batches:
+                if b_conv == convert_to and stem not in b_stems:
+                    b_stems.add(stem)
+                    b_srcs.append(src)
+                    break
+            else:
+                batches.append((convert_to, {stem}, [src]))
+
+        result = {}
+        for bi, (convert_to, _stems, srcs) in enumerate(batches):
+            batch_dir = os.path.join(out_dir, f"batch_{bi}")
+            os.makedirs(batch_dir, exist_ok=True)
+            cmd = self._base_cmd() + ["--convert-to", convert_to, "--outdir", batch_dir] + srcs
+            try:
+                returncode, _out, err = _atceļams_apakšprocess(cmd, atcelšana, timeout=self.timeout_per_file * len(srcs),
+                                                               text=True)
+                if returncode != 0:
+                    # noder debuggam (konsolē), bet UI netraucē
+                    print(f"Konvertēšanas kļūda ({', '.join(srcs)}): {err or _out}")
+            except subprocess.TimeoutExpired:
+                # LibreOffice iestrēga (piem., liels DOCX/XLSX vai dialogi) -> process jau nogalināts
+                print(f"Konvertēšana iestrēga ({', '.join(srcs)})")
+            except FileNotFoundError:
+                # izpildāmais fails nav atrasts
+                pass
+            except GenerēšanaAtcelta:
+                raise
+            except Exception as e:
+                print(f"Konvertēšanas izņēmums ({', '.join(srcs)}): {e}")
+
+            for src in srcs:
+                out = os.path.join(batch_dir, os.path.splitext(os.path.basename(src))[0] + ".pdf")
+                result[src] = out if os.path.exists(out) and os.path.getsize(out) > 0 else None
+        return result
+
+    def convert_batch(self, items: list, out_dir: str, atcelšana: Optional[_AtcelšanasŽetons] = None) -> dict:
+        """Konvertē [(ievades_ceļš, convert_to), ...] uz PDF mapē out_dir.
+        Atgriež {ievades_ceļš: PDF ceļš vai None}. Atcelts žetons met GenerēšanaAtcelta.
+        """
+        if not items:
+            return {}
+        os.makedirs(out_dir, exist_ok=True)
+        with self._lock:
+            self._cancel_idle_stop()
+            if self._uno_available():
+                try:
+                    return self._convert_uno(items, out_dir, atcelšana)
+                except GenerēšanaAtcelta:
+                    raise
+                except Exception as e:
+                    print(f"UNO konvertēšana neizdevās, izmantojam soffice CLI: {e}")
+                    self.stop()
+            return self._convert_cli(items, out_dir, atcelšana)
+
+    def warm(self) -> bool:
+        """Iepriekš palaiž silto UNO procesu, lai pirmā konvertēšana negaida soffice startu.
+
+        Bez Python-UNO (CLI režīms) nav ilgstoša procesa, ko sildīt – atgriež False.
+        """
+        if not self._uno_available():
+            return False
+        with self._lock:
+            try:
+                self._ensure_started()
+                return True
+            except Exception as e:
+                print(f"LibreOffice iesildīšana neizdevās: {e}")
+                return False
+
+    def stop_after_idle(self, seconds: float):
+        """Aptur silto procesu, ja tas `seconds` sekundes nav izmantots.
+
+        Katrs convert_batch izsaukums atliktu apturēšanu atceļ; izsaucējs to ieplāno no jauna.
+        """
+        with self._lock:
+            self._cancel_idle_stop()
+            timer = threading.Timer(seconds, self._idle_stop)
+            timer.daemon = True
+            self._idle_timer = timer
+            timer.start()
+
+    def _cancel_idle_stop(self):
+        timer, self._idle_timer = self._idle_timer, None
+        if timer is not None:
+            timer.cancel()
+
+    def _idle_stop(self):
+        with self._lock:
+            # Ja konvertēšana pa to laiku atcēla vai pārplānoja šo taimeri, neko nedarām
+            if self._idle_timer is not threading.current_thread():
+                return
+            self._idle_timer = None
+            self.stop()
+
+    def stop(self):
+        """Aptur silto soffice procesu un UNO palīgprocesu (ja tādi ir)."""
+        with self._lock:
+            self._cancel_idle_stop()
+            helper, self._helper = self._helper, None
+            self._helper_lines = None
+            proc, self._proc = self._proc, None
+            _kill_process_tree(helper)
+            _kill_process_tree(proc)
+
+
+_soffice_converters: list = []  # [_SofficeConverter], katram savs LibreOffice profils
+_soffice_converter_lock = threading.Lock()
+
+
+def _get_soffice_converters(count: int = 1) -> list:
+    """Procesa mēroga LibreOffice konvertētāju pūls (tukšs saraksts, ja LibreOffice nav atrasts).
+
+    Katram konvertētājam ir savs privātais profils (lo_profile, lo_profile_1, ...), jo
+    viens LibreOffice profils vienlaikus var kalpot tikai vienam procesam.
+    """
+    with _soffice_converter_lock:
+        soffice = _find_soffice_exe()
+        if not soffice:
+            return []
+        if _soffice_converters and _soffice_converters[0].soffice != soffice:
+            for conv in _soffice_converters:
+                conv.stop()
+            _soffice_converters.clear()
+        while len(_soffice_converters) < max(1, count):
+            i = len(_soffice_converters)
+            profile_dir = LIBREOFFICE_PROFILE_DIR if i == 0 else f"{LIBREOFFICE_PROFILE_DIR}_{i}"
+            _soffice_converters.append(_SofficeConverter(soffice, profile_dir))
+        return _soffice_converters[:max(1, count)]
+
+
+def _get_soffice_converter() -> Optional[_SofficeConverter]:
+    """Galvenais (siltais) LibreOffice konvertētājs vai None, ja LibreOffice nav atrasts."""
+    convs = _get_soffice_converters(1)
+    return convs[0] if convs else None
+
+
+@atexit.register
+def _stop_soffice_converter():
+    for conv in list(_soffice_converters):
+        conv.stop()
+
+
+def _convert_attachments_to_pdf(input_paths: list, out_dir: str, max_workers: Optional[int] = None,
+                                atcelšana: Optional[_AtcelšanasŽetons] = None) -> dict:
+    """Konvertē vairākus pielikumus uz PDF paralēli ierobežotā LibreOffice pūlā.
+
+    Atbalsts:
+      - PDF: atgriež oriģinālo ceļu
+      - DOC/DOCX: LibreOffice (soffice) -> PDF (writer_pdf_Export)
+      - XLS/XLSX/ODS: LibreOffice -> PDF (calc_pdf_Export)
+      - PPT/PPTX: LibreOffice -> PDF (impress_pdf_Export)
+
+    Konvertētie PDF tiek kešoti (_conversion_cache), tāpēc nemainīts pielikums
+    LibreOffice palaiž tikai vienreiz. Nekešotos failus sadala starp max_workers
+    konvertētājiem (noklusējums ATTACHMENT_CONVERSION_WORKERS); katram ir savs profils
+    un sava izvades mape (worker_N), tāpēc kopējais laiks ≈ lēnākā darbinieka laiks.
+
+    Atgriež {ievades_ceļš: PDF ceļš vai None}, atslēgas = padotie ceļi. Atceļot žetonu
+    atcelšana, visi strādājošie soffice procesi tiek nogalināti un tiek mests GenerēšanaAtcelta.
+    """
+    result = {}
+    pending = []  # [(oriģinālais ceļš, abs ceļš, convert_to, cache_key)]
+
+    for original in input_paths:
+        input_path = _coerce_path(original)
+        result[original] = None
+        if not input_path:
+            continue
+
+        input_path = os.path.abspath(input_path)
+        if not os.path.exists(input_path):
+            continue
+
+        ext = os.path.splitext(input_path)[1].lower()
+        if ext == ".pdf":
+            result[original] = input_path
+            continue
+
+        if ext not in _SOFFICE_SUPPORTED_EXTS:
+            continue
+
+        convert_to = _soffice_convert_filter(ext)
+        cache_key = _conversion_cache.key_for(input_path, convert_to)
+        cached = _conversion_cache.get(cache_key)
+        if cached:
+            result[original] = cached
+            continue
+        pending.append((original, input_path, convert_to, cache_key))
+
+    if not pending:
+        return result
+    if atcelšana is not None:
+        atcelšana.pārbaudīt()
+
+    unique_items = list(dict.fromkeys((input_path, convert_to) for _o, input_path, convert_to, _k in pending))
+    workers = max(1, min(len(unique_items), int(max_workers or ATTACHMENT_CONVERSION_WORKERS)))
+    converters = _get_soffice_converters(workers)
+    if not converters:
+        # Nav LibreOffice -> nevar padarīt aplūkojamu PDF beigās
+        return result
+
+    def run_job(i: int, items: list) -> dict:
+        try:
+            return converters[i].convert_batch(items, os.path.join(out_dir, f"worker_{i}"), atcelšana)
+        except GenerēšanaAtcelta:
+            raise
+        except Exception as e:
+            print(f"Konvertēšanas izņēmums: {e}")
+            return {}
+
+    # Round-robin: katrs darbinieks savu daļu konvertē vienā (siltā) piegājienā
+    jobs = [unique_items[i::len(converters)] for i in range(len(converters))]
+    converted = {}
+    if len(jobs) == 1:
+        converted.update(run_job(0, jobs[0]))
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+        try:
+            with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="akta_soffice") as pool:
+                for part in pool.map(run_job, range(len(jobs)), jobs):
+                    converted.update(part)
+        finally:
+            # Papildu instances paliek siltas nākamajam izsaukumam, bet pēc ATTACHMENT_CONVERSION_IDLE_S
+            # dīkstāves tiek apturētas (atmiņa); galvenā paliek silta vienmēr
+            for conv in converters[1:]:
+                conv.stop_after_idle(ATTACHMENT_CONVERSION_IDLE_S)
+
+    for original, input_path, _convert_to, cache_key in pending:
+        pdf = converted.get(input_path)
+        if pdf:
+            result[original] = _conversion_cache.put(cache_key, pdf)
+    return result
+
+
+def _convert_attachment_to_pdf(input_path: str, out_dir: str) -> Optional[str]:
+    """Konvertē vienu pielikumu uz PDF, lai to varētu pievienot akta beigās.
+    Atgriež PDF ceļu vai None, ja neizdevās (sk. _convert_attachments_to_pdf).
+    """
+    return _convert_attachments_to_pdf([input_path], out_dir).get(input_path)
+
+
+def _make_annex_title_pdf(title: str, out_path: str, pagesize=None, font_name: str = "Helvetica"):
+    """Izveido vienas lapas PDF informācijas lapu (ja pielikumu nevar konvertēt).
+    Teksts ir mazs, augšējā kreisajā stūrī, ar pareizām garumzīmēm (izmanto font_name).
+    """
+    _ielādēt_reportlab()
+    pagesize = pagesize or A4
+    # nodrošinām, ka mape eksistē (citādi Windows met [Errno 2])
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(out_path)), exist_ok=True)
+    except Exception:
+        pass
+
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    from reportlab.lib.utils import simpleSplit
+
+    c = canvas.Canvas(out_path, pagesize=pagesize)
+    w, h = pagesize
+
+    left = 18 * mm
+    top_y = h - 12 * mm
+    max_w = w - 2 * left
+
+    # Bold variants only if Helvetica, citādi izmantojam to pašu fontu (drošāk diakritikām)
+    bold_font = "Helvetica-Bold" if (font_name or "") == "Helvetica" else (font_name or "Helvetica")
+    normal_font = font_name or "Helvetica"
+
+    def fit_one_line(txt: str, fnt: str, size: float) -> str:
+        if stringWidth(txt, fnt, size) <= max_w:
+            return txt
+        ell = "…"
+        # brutāla, bet stabila saīsināšana
+        for cut in range(len(txt), 0, -1):
+            cand = txt[:cut].rstrip() + ell
+            if stringWidth(cand, fnt, size) <= max_w:
+                return cand
+        return ell
+
+    title_fit = fit_one_line(title, bold_font, 10)
+
+    c.setFillColor(colors.HexColor("#0F172A"))
+    c.setFont(bold_font, 10)
+    c.drawString(left, top_y, title_fit)
+
+    c.setStrokeColor(colors.HexColor("#CBD5E1"))
+    c.setLineWidth(0.8)
+    c.line(left, top_y - 4, w - left, top_y - 4)
+
+    info = "Pielikums pie pieņemšanas–nodošanas akta. Dokuments pievienots automātiski."
+    c.setFont(normal_font, 9)
+    c.setFillColor(colors.HexColor("#334155"))
+    lines = simpleSplit(info, normal_font, 9, max_w)
+    y = top_y - 14
+    for ln in lines[:5]:
+        c.drawString(left, y, ln)
+        y -= 11
+
+    c.showPage()
+    c.save()
+
+
+def _overlay_text_on_pdf_page(page, text: str, font_name: str, font_size: float, x_pt: float, y_pt: float, bold: bool = False):
+    """Uzvelk tekstu uz dotās PDF lapas (PyPDF2 PageObject), izmantojot ReportLab overlay.
+
+    Svarīgi:
+    - Diakritikām jābūt redzamām -> izmanto font_name (TTF)
+    - Teksts NETIEK izvilkts ārpus lapas -> ja par garu, saīsina ar "…"
+    """
+    _ielādēt_reportlab()
+    try:
+        from PyPDF2 import PdfReader
+        from reportlab.pdfgen import canvas as rl_canvas
+        from reportlab.pdfbase.pdfmetrics import stringWidth
+    except Exception:
+        return page
+
+    try:
+        w = float(page.mediabox.width)
+        h = float(page.mediabox.height)
+        left = float(x_pt)
+        max_w = w - left - (18 * mm)  # labā mala
+
+        # izvēlamies fontu (bold tikai Helvetica gadījumā)
+        fnt = font_name if font_name else "Helvetica"
+        if bold and fnt == "Helvetica":
+            fnt = "Helvetica-Bold"
+
+        def fit_one_line(txt: str) -> str:
+            if stringWidth(txt, fnt, float(font_size)) <= max_w:
+                return txt
+            ell = "…"
+            for cut in range(len(txt), 0, -1):
+                cand = txt[:cut].rstrip() + ell
+                if stringWidth(cand, fnt, float(font_size)) <= max_w:
+                    return cand
+            return ell
+
+        safe_text = fit_one_line(text)
+
+        buf = io.BytesIO()
+        c = rl_canvas.Canvas(buf, pagesize=(w, h))
+        c.setFont(fnt, float(font_size))
+        c.setFillColor(colors.HexColor("#0F172A"))
+        # drošības dēļ y ierobežojam
+        y = min(max(float(y_pt), 0), h - 2)
+        c.drawString(left, y, safe_text)
+        c.save()
+        buf.seek(0)
+        overlay_page = PdfReader(buf).pages[0]
+        page.merge_page(overlay_page)
+    except Exception:
+        pass
+    return page
+
+
+_QR_PAYLOAD_FIELDS = ("qr_kods_url_mode", "qr_kods_url", "akta_nr", "datums", "vieta",
+                      "qr_kods_ieklaut_pozicijas", "pozīcijas")
+_qr_payload_cache: "OrderedDict[str, str]" = OrderedDict()
+
+
+def _build_qr_payload(akta_dati: AktaDati) -> str:
+    """QR saturs.
+    - URL režīms: QR satur verifikācijas URL ar parametriem (a,d,pc,h).
+    - Pretējā gadījumā: kompakts JSON ar akta datiem un (saīsinātām) pozīcijām.
+
+    Rezultāts tiek kešots pēc izmantoto lauku (arī pozīciju) hash, tāpēc pozīcijas netiek
+    serializētas/hešotas atkārtoti katrā priekšskatījumā.
+    """
+    try:
+        key = _pdf_fields_digest(akta_dati, _QR_PAYLOAD_FIELDS)
+    except Exception:
+        key = None
+    cached = _qr_payload_cache.get(key) if key is not None else None
+    if cached is not None:
+        return cached
+    payload = _build_qr_payload_uncached(akta_dati)
+    if key is not None:
+        _qr_payload_cache[key] = payload
+        while len(_qr_payload_cache) > 32:
+            _qr_payload_cache.popitem(last=False)
+    return payload
+
+
+def _build_qr_payload_uncached(akta_dati: AktaDati) -> str:
+    try:
+        if getattr(akta_dati, "qr_kods_url_mode", False) and (getattr(akta_dati, "qr_kods_url", "") or "").strip():
+            base = akta_dati.qr_kods_url.strip()
+            poz_count = len(getattr(akta_dati, "pozīcijas", []) or [])
+            full = json.dumps(
+                {"akta_nr": akta_dati.akta_nr, "datums": akta_dati.datums, "poz_count": poz_count},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+            h = hashlib.sha256(full.encode("utf-8")).hexdigest()[:16]
+            from urllib.parse import urlencode
+            qs = urlencode({"a": akta_dati.akta_nr, "d": akta_dati.datums, "pc": poz_count, "h": h})
+            return base + ("&" if "?" in base else "?") + qs
+
+        payload = {"v": 1, "akta_nr": akta_dati.akta_nr, "datums": akta_dati.datums, "vieta": getattr(akta_dati, "vieta", "")}
+
+        if getattr(akta_dati, "qr_kods_ieklaut_pozicijas", True):
+            items = []
+            for i, p in enumerate(getattr(akta_dati, "pozīcijas", []) or []):
+                if i >= 20:
+                    break
+                try:
+                    name = (getattr(p, "nosaukums", "") or "").strip()
+                    if len(name) > 40:
+                        name = name[:40] + "…"
+                    items.append({"n": name, "q": str(getattr(p, "daudzums", "")), "u": (getattr(p, "vienība", "") or "").strip(),
+                                  "sn": (getattr(p, "sērijas_nr", "") or "").strip()[:30]})
+                except Exception:
+                    continue
+            payload["poz"] = items
+            payload["poz_count"] = len(getattr(akta_dati, "pozīcijas", []) or [])
+
+        s = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        if len(s) > 1200 and "poz" in payload:
+            payload["poz"] = payload["poz"][:8]
+            s = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+        if len(s) > 1200:
+            poz = getattr(akta_dati, "pozīcijas", []) or []
+            full = json.dumps(
+                {"akta_nr": akta_dati.akta_nr, "datums": akta_dati.datums,
+                 "pozīcijas": [asdict(p) if hasattr(p, "__dataclass_fields__") else str(p) for p in poz]},
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+            h = hashlib.sha256(full.encode("utf-8")).hexdigest()[:16]
+            s = json.dumps({"v": 1, "akta_nr": akta_dati.akta_nr, "datums": akta_dati.datums, "poz_count": len(poz), "poz_hash": h},
+                           ensure_ascii=False, separators=(",", ":"))
+        return s
+    except Exception:
+        return ""
+
+
+def _qr_size_pt(akta_dati: AktaDati) -> float:
+    """QR izmērs punktos: lietotāja izmērs, bet ne lielāks par kreiso/apakšējo malu."""
+    _ielādēt_reportlab()
+    size_mm = float(getattr(akta_dati, "qr_kods_izmers_mm", Decimal("18.0")))
+    try:
+        ml = float(getattr(akta_dati, "pdf_margin_left", Decimal("15.0")))
+        mb = float(getattr(akta_dati, "pdf_margin_bottom", Decimal("15.0")))
+    except Exception:
+        ml, mb = 15.0, 15.0
+    return max(10.0, min(size_mm, ml - 2.0, mb - 2.0)) * mm
+
+
+class _PdfOverlayBuilder:
+    """Uzzīmē lapu overlay (lapu numerācija + skavotāja līnija + QR) VIENĀ ReportLab canvas.
+
+    Katrs overlay ir viens form XObject ("AktaDek<n>"), un overlay PDF lapa to tikai atsauc
+    ar doForm. Skavotāja līnija un QR ir kopīgas apakšformas katrai (overlay veids, lapas
+    izmērs, parametri) kombinācijai, tāpēc gala PDF tās glabājas vienā eksemplārā. Katram
+    overlay atsevišķi ģenerē tikai tekstu "Lapa X no Y". Rezultātu nolasa ar vienu PdfReader;
+    _stamp_overlay_page uzliek overlay formu mērķa lapai bez satura straumju parsēšanas.
+    Gatavos overlay kešo _pdf_overlay_pages.
+    """
+
+    def __init__(self, font_name: str = "Helvetica"):
+        _ielādēt_reportlab()
+        self.font_name = font_name or "Helvetica"
+        self._buf = io.BytesIO()
+        self._canvas = None
+        self._forms = {}  # (kind, w, h, *params) -> form nosaukums
+        self._count = 0
+
+    def _form(self, key: tuple, draw) -> str:
+        """Atgriež form nosaukumu; ja tāda vēl nav, uzzīmē to (draw(canvas)) vienreiz."""
+        name = self._forms.get(key)
+        if name is None:
+            name = f"AktaOverlay{len(self._forms)}"
+            c = self._canvas
+            c.beginForm(name)
+            draw(c)
+            c.endForm()
+            self._forms[key] = name
+        return name
+
+    def add_page(self, w: float, h: float, page_no: Optional[int] = None, total: Optional[int] = None,
+                 staple_color: Optional[str] = None, qr_payload: str = "", qr_size: float = 0.0,
+                 qr_link: bool = False):
+        """Pievieno vienas lapas overlay. Secība (numerācija, skavotāja līnija, QR) = zīmēšanas secība."""
+        if self._canvas is None:
+            from reportlab.pdfgen import canvas as rl_canvas
+            self._canvas = rl_canvas.Canvas(self._buf, pagesize=(w, h))
+        c = self._canvas
+        c.setPageSize((w, h))
+
+        # Apakšformas jāuzzīmē pirms overlay formas (ReportLab formas neligzdo)
+        staple_form = None
+        if staple_color:
+            def draw_staple(fc):
+                try:
+                    fc.setStrokeColor(colors.HexColor(staple_color))
+                except Exception:
+                    fc.setStrokeColor(colors.HexColor("#94A3B8"))
+                fc.setLineWidth(0.7)
+                fc.line(6 * mm, h - 12 * mm, 6 * mm, h - 32 * mm)
+
+            staple_form = self._form(("staple", w, h, staple_color), draw_staple)
+
+        qr_form = None
+        x = 2 * mm
+        y = 2 * mm
+        if qr_payload:
+            def draw_qr(fc):
+                try:
+                    renderPDF.draw(_qr_service.drawing(qr_payload, qr_size), fc, x, y)
+                except Exception:
+                    pass
+
+            qr_form = self._form(("qr", w, h, qr_payload, qr_size), draw_qr)
+
+        name = f"AktaDek{self._count}"
+        c.beginForm(name)
+        if page_no is not None:
+            c.saveState()
+            c.setFillColor(colors.HexColor("#0F172A"))
+            c.setFont(self.font_name, 9)
+            # Augšējais labais stūris (tāpat kā DecoratedCanvas)
+            c.drawRightString(w - 18 * mm, h - 10 * mm, f"Lapa {page_no} no {total}")
+            c.restoreState()
+        if staple_form:
+            c.doForm(staple_form)
+        if qr_form:
+            c.doForm(qr_form)
+        c.endForm()
+
+        c.doForm(name)
+        # Links nevar atrasties form XObject iekšā, tāpēc to liekam overlay lapai (_stamp_overlay_page pārkopē)
+        if qr_form and qr_link:
+            try:
+                c.linkURL(qr_payload, (x, y, x + qr_size, y + qr_size), relative=0)
+            except Exception:
+                pass
+        c.showPage()
+        self._count += 1
+
+    def save(self) -> bytes:
+        """Saglabā canvas un atgriež overlay PDF baitus (tukši, ja neviena lapa nav pievienota)."""
+        if self._canvas is None:
+            return b""
+        self._canvas.save()
+        return self._buf.getvalue()
+
+
+def _stamp_overlay_page(page, overlay) -> None:
+    """Uzliek _PdfOverlayBuilder overlay lapu uz `page` (virs esošā satura).
+
+    Tas pats rezultāts kā page.merge_page(overlay), bet lapas un overlay saturs netiek parsēts
+    un pārrakstīts: lapas satura straumes tiek ietītas q/Q, beigās pievienots viens overlay
+    formas izsaukums, un forma tiek atsaukta (nevis kopēta), tāpēc vienādi dekorētām lapām
+    gala PDF ir viena forma. Overlay saites (QR URL) tiek pārkopētas lapas /Annots.
+    """
+    from PyPDF2.generic import ArrayObject, DecodedStreamObject, DictionaryObject, NameObject, StreamObject
+
+    overlay_xobjects = overlay["/Resources"]["/XObject"]
+    form_key = next(k for k in overlay_xobjects if "AktaDek" in k)
+    form_ref = overlay_xobjects.raw_get(form_key)
+
+    resources = page.get("/Resources")
+    resources = DictionaryObject(resources.get_object()) if resources is not None else DictionaryObject()
+    xobjects = resources.get("/XObject")
+    xobjects = DictionaryObject(xobjects.get_object()) if xobjects is not None else DictionaryObject()
+    name = "/AktaDek"
+    n = 0
+    while name in xobjects:
+        n += 1
+        name = f"/AktaDek{n}"
+    xobjects[NameObject(name)] = form_ref
+    resources[NameObject("/XObject")] = xobjects
+    page[NameObject("/Resources")] = resources
+
+    head = DecodedStreamObject()
+    head.set_data(b"q\n")
+    tail = DecodedStreamObject()
+    tail.set_data(f"\nQ\nq {name} Do Q\n".encode("ascii"))
+    contents = ArrayObject([head])
+    original = page.raw_get("/Contents") if "/Contents" in page else None
+    if original is not None:
+        resolved = original.get_object()
+        if isinstance(resolved, ArrayObject):
+            contents.extend(resolved)
+        else:
+            contents.append(original)
+    contents.append(tail)
+    for part in contents:
+        # PdfWriter.add_page klonē tiešās /Contents masīva straumes un sagaida šo atribūtu (None = jauns objekts)
+        if isinstance(part, StreamObject) and not hasattr(part, "indirect_reference"):
+            part.indirect_reference = None
+    page[NameObject("/Contents")] = contents
+
+    if "/Annots" in overlay:
+        annots = page.get("/Annots")
+        annots = ArrayObject(annots.get_object()) if annots is not None else ArrayObject()
+        for annot in overlay["/Annots"]:
+            link = DictionaryObject(annot.get_object())
+            link.pop(NameObject("/P"), None)
+            annots.append(link)
+        page[NameObject("/Annots")] = annots
+
+
+PDF_OVERLAY_CACHE_ENTRIES = 16  # Cik dažādu dekorāciju komplektu overlay PDF glabāt atmiņā
+_pdf_overlay_cache: "OrderedDict[tuple, bytes]" = OrderedDict()
+_pdf_overlay_lock = threading.Lock()
+
+
+def _pdf_overlay_pages(font_name: str, specs: tuple) -> list:
+    """Overlay lapas katram `specs` elementam (add_page argumentu kortežs), tādā pašā secībā.
+
+    Uzzīmētais overlay PDF tiek kešots pēc (fonts, specs), tāpēc atkārtots eksports vai
+    priekšskatījums ar tādām pašām dekorācijām (lapu skaits, izmēri, QR saturs) to nezīmē
+    no jauna. Katrs izsaukums saņem savu PdfReader, jo PyPDF2 objekti nav drošai kopīgošanai
+    starp pavedieniem.
+    """
+    if not specs:
+        return []
+    key = (font_name or "Helvetica", specs)
+    with _pdf_overlay_lock:
+        data = _pdf_overlay_cache.get(key)
+        if data is not None:
+            _pdf_overlay_cache.move_to_end(key)
+    if data is None:
+        builder = _PdfOverlayBuilder(font_name)
+        for spec in specs:
+            builder.add_page(*spec)
+        data = builder.save()
+        with _pdf_overlay_lock:
+            _pdf_overlay_cache[key] = data
+            while len(_pdf_overlay_cache) > PDF_OVERLAY_CACHE_ENTRIES:
+                _pdf_overlay_cache.popitem(last=False)
+    from PyPDF2 import PdfReader
+
+    return list(PdfReader(io.BytesIO(data)).pages)
+
+
+def _collect_reference_doc_pages(akta_dati: AktaDati, tmp_root: str, pagesize=None, font_name: str = "Helvetica",
+                                 atcelšana: Optional[_AtcelšanasŽetons] = None) -> list:
+    """Sagatavo atsauces dokumentu lapas (Atvasinājums 1, 2, 3...) kā PyPDF2 lapu sarakstu.
+
+    Prasības:
+    - "Atvasinājums X: ..." ir mazs teksts augšējā kreisajā stūrī TAJĀ PAŠĀ lapā, kur sākas pielikums
+    - Teksts nedrīkst pārsniegt lapas robežas (saīsinām ar "…")
+    - Ja DOCX/XLSX nevar konvertēt uz PDF, pievienojam informācijas lapu ar korektām garumzīmēm
+
+    Konvertētie faili paliek tmp_root mapē; to dzēš izsaucējs pēc PDF ierakstīšanas.
+    """
+    from PyPDF2 import PdfReader
+
+    _ielādēt_reportlab()
+    pagesize = pagesize or A4
+
+    refs = getattr(akta_dati, "atsauces_dokumenti_faili", []) or []
+    pages = []
+
+    annexes = []  # [(ceļš, nosaukums)] tikai eksistējošiem failiem, annex secībā
+    for ref in refs:
+        try:
+            if isinstance(ref, dict):
+                ref_path = ref.get("ceļš", "")
+                ref_name = ref.get("nosaukums", "") or os.path.basename(ref_path)
+            else:
+                ref_path = getattr(ref, "ceļš", "")
+                ref_name = getattr(ref, "nosaukums", "") or os.path.basename(ref_path)
+            if ref_path and os.path.exists(ref_path):
+                annexes.append((ref_path, ref_name))
+        except Exception as e:
+            print(f"Pielikuma pievienošanas kļūda: {e}")
+
+    # Visus pielikumus konvertējam vienā (siltā) LibreOffice piegājienā
+    try:
+        converted_map = _convert_attachments_to_pdf([p for p, _n in annexes], os.path.join(tmp_root, "converted"),
+                                                    atcelšana=atcelšana)
+    except GenerēšanaAtcelta:
+        raise
+    except Exception as e:
+        print(f"Pielikumu konvertēšanas kļūda: {e}")
+        converted_map = {}
+
+    for annex_no, (ref_path, ref_name) in enumerate(annexes, start=1):
+        if atcelšana is not None:
+            atcelšana.pārbaudīt()
+        try:
+            # Informācijas lapas katram pielikumam savā apakšmapē, lai nekad nesajauktu PDF nosaukumus
+            tmp_dir = os.path.join(tmp_root, f"conv_{annex_no}")
+            os.makedirs(tmp_dir, exist_ok=True)
+            converted = converted_map.get(ref_path)
+
+            if not converted:
+                info_pdf = os.path.join(tmp_dir, f"Atvasinajums_{annex_no}_info.pdf")
+                _make_annex_title_pdf(
+                    f"Atvasinājums {annex_no}: {ref_name} (neizdevās konvertēt uz PDF)",
+                    info_pdf,
+                    pagesize=pagesize,
+                    font_name=font_name if font_name else "Helvetica"
+                )
+                pages.extend(PdfReader(info_pdf).pages)
+                continue
+
+            r = PdfReader(converted)
+            if not r.pages:
+                continue
+
+            # Uz pirmās pielikuma lapas uzliekam label (mazs, top-left, saīsināts ja vajag)
+            first = r.pages[0]
+            label = f"Atvasinājums {annex_no}: {ref_name}"
+            _overlay_text_on_pdf_page(
+                first,
+                label,
+                font_name=font_name if font_name else "Helvetica",
+                font_size=9,
+                x_pt=18 * mm,
+                y_pt=float(first.mediabox.height) - 12 * mm,
+                bold=False
+            )
+            pages.append(first)
+            pages.extend(r.pages[1:])
+
+        except Exception as e:
+            print(f"Pielikuma pievienošanas kļūda: {e}")
+
+    return pages
+
+
+def _encrypt_pdf_writer(writer, akta_dati: AktaDati):
+    """Uzliek PDF šifrēšanu un atļaujas (drukāt/kopēt/labot/anotēt) tieši PdfWriter objektam."""
+    permissions = 0
+    if akta_dati.allow_printing: permissions |= 4  # Print
+    if akta_dati.allow_modifying: permissions |= 8  # Modify contents
+    if akta_dati.allow_copying: permissions |= 16  # Copy
+    if akta_dati.allow_annotating: permissions |= 32  # Annotate
+
+    # Ja owner parole nav iedota, PyPDF2 dažreiz uzvedas neprognozējami – uzliekam drošu noklusējumu.
+    owner_pw = akta_dati.pdf_owner_password or akta_dati.pdf_user_password or "owner"
+    user_pw = akta_dati.pdf_user_password or ""
+
+    # PyPDF2/pypdf API atšķiras starp versijām, tāpēc mēģinām vairākus variantus.
+    try:
+        writer.encrypt(user_password=user_pw, owner_password=owner_pw, permissions_flag=permissions)
+    except TypeError:
+        try:
+            writer.encrypt(user_pwd=user_pw, owner_pwd=owner_pw, permissions_flag=permissions)
+        except TypeError:
+            # Vecāki PyPDF2 varianti
+            writer.encrypt(user_pw, owner_pw, use_128bit=True, permissions_flag=permissions)
+
+
+def _decorate_pdf_pages(pages: list, akta_dati: AktaDati, font_name: str,
+                        atcelšana: Optional[_AtcelšanasŽetons] = None) -> list:
+    """Uz katras lapas uzliek lapu numerāciju, skavotāja līniju un QR kodu.
+
+    Visu lapu overlay tiek uzzīmēti vienā canvas; skavotāja līnija un QR ir kopīgi form XObject.
+    Vienādi dekorētām lapām (piem. bez numerācijas) tiek uzzīmēts un atsaukts viens un tas
+    pats overlay; pats overlay tiek kešots (_pdf_overlay_pages).
+    Lapas tiek mainītas uz vietas; atgriež to pašu sarakstu. Atcelšanu pārbauda pirms katras lapas.
+    """
+    show_numbers = bool(getattr(akta_dati, "show_page_numbers", True))
+    staple_first_only = bool(getattr(akta_dati, "qr_kods_tikai_pirma_lapa", False))
+
+    qr_payload = ""
+    if getattr(akta_dati, "qr_kods_enabled", True):
+        qr_payload = _build_qr_payload(akta_dati)
+    qr_first_only = bool(getattr(akta_dati, "qr_kods_tikai_pirma_lapa", True))
+
+    total = len(pages)
+    qr_size = _qr_size_pt(akta_dati) if qr_payload else 0.0
+    qr_link = bool(getattr(akta_dati, "qr_kods_url_mode", False) and (getattr(akta_dati, "qr_kods_url", "") or "").strip())
+    # Katras lapas overlay apraksts (_PdfOverlayBuilder.add_page argumenti); vienādām lapām – viens overlay
+    page_specs = []
+    for page_index, page in enumerate(pages):
+        with_qr = bool(qr_payload) and not (qr_first_only and page_index != 0)
+        page_specs.append((
+            float(page.mediabox.width),
+            float(page.mediabox.height),
+            (page_index + 1) if show_numbers else None,
+            total if show_numbers else None,
+            None if (staple_first_only and page_index != 0) else "#94A3B8",
+            qr_payload if with_qr else "",
+            qr_size if with_qr else 0.0,
+            qr_link if with_qr else False,
+        ))
+    unique_specs = tuple(dict.fromkeys(page_specs))
+    overlay_index = {spec: i for i, spec in enumerate(unique_specs)}
+    overlays = []
+    try:
+        overlays = _pdf_overlay_pages(font_name, unique_specs)
+    except Exception as e:
+        print(f"Lapu dekorāciju kļūda: {e}")
+
+    for page, spec in zip(pages, page_specs):
+        if atcelšana is not None:
+            atcelšana.pārbaudīt()
+        i = overlay_index[spec]
+        if i < len(overlays):
+            try:
+                _stamp_overlay_page(page, overlays[i])
+            except Exception as e:
+                print(f"Lapu dekorāciju kļūda: {e}")
+    return pages
+
+
+# ---------------------- PDF ģenerēšana ----------------------
+
+class _FrozenStyleSheetMixin:
+    """Tikai lasāms stilu komplekts, ko koplietot starp ģenerēšanām (sk. _build_pdf_styles).
+
+    _FrozenStyleSheet = (_FrozenStyleSheetMixin, StyleSheet1) – sk. _ielādēt_reportlab().
+    """
+
+    _frozen = False
+
+    @classmethod
+    def freeze_from(cls, sheet: "StyleSheet1") -> "_FrozenStyleSheet":
+        frozen = cls()
+        frozen.byName = dict(sheet.byName)
+        frozen.byAlias = dict(sheet.byAlias)
+        frozen._frozen = True
+        return frozen
+
+    def add(self, style, alias=None):
+        if self._frozen:
+            raise TypeError("Kopīgais PDF stilu komplekts ir tikai lasāms")
+        super().add(style, alias)
+
+
+_pdf_style_cache: dict = {}  # (font_name, bold_font_name, tipogrāfijas lauki) -> _FrozenStyleSheet
+_pdf_table_cmd_cache: dict = {}  # (font_name, bold_font_name, tabulu lauki) -> {tabula: komandas}
+_pdf_style_lock = threading.Lock()
+
+
+def _build_pdf_styles(akta_dati: AktaDati, font_name: str):
+    """ReportLab stili akta PDF. Atgriež (styles, bold_font_name).
+
+    Stilu komplekts ir iesaldēts un kopīgs visām ģenerēšanām ar vienādiem tipogrāfijas
+    laukiem (_PDF_STYLE_FIELDS), tāpēc datu labojumu priekšskatījumi stilus nebūvē.
+    """
+    bold_font_name = _font_registry.bold_name(font_name)
+    key = (font_name, bold_font_name) + tuple(
+        repr(getattr(akta_dati, n, None)) for n in _PDF_STYLE_FIELDS if n != "fonts_ceļš"
+    )
+    with _pdf_style_lock:
+        styles = _pdf_style_cache.get(key)
+    if styles is None:
+        styles = _FrozenStyleSheet.freeze_from(_make_pdf_stylesheet(akta_dati, font_name, bold_font_name))
+        with _pdf_style_lock:
+            if len(_pdf_style_cache) >= 16:
+                _pdf_style_cache.clear()
+            _pdf_style_cache[key] = styles
+    return styles, bold_font_name
+
+
+def _pdf_table_commands(akta_dati: AktaDati, font_name: str, bold_font_name: str) -> dict:
+    """Iepriekš sagatavoti TableStyle komandu saraksti (tuple) akta tabulām.
+
+    Kešoti pēc fonta un tabulu noformējuma laukiem; izsaucējs tos nodod TableStyle(...),
+    kas komandas nokopē, tāpēc kopīgie saraksti netiek mainīti.
+    """
+    key = (font_name, bold_font_name) + tuple(repr(getattr(akta_dati, n, None)) for n in _PDF_TABLE_STYLE_FIELDS)
+    with _pdf_style_lock:
+        cmds = _pdf_table_cmd_cache.get(key)
+    if cmds is not None:
+        return cmds
+
+    border = float(akta_dati.table_border_thickness_pt)
+    padding = float(akta_dati.table_cell_padding_mm)
+    cmds = {
+        "header": (
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('ALIGN', (1, 0), (1, 0), 'LEFT'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ),
+        "meta": (
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+        ),
+        "parties": (
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+            ('BOX', (0, 0), (-1, -1), border, colors.HexColor(akta_dati.table_grid_color)),
+            ('INNERGRID', (0, 0), (-1, -1), border, colors.HexColor(akta_dati.table_grid_color)),
+            ('LEFTPADDING', (0, 0), (-1, -1), padding),
+            ('RIGHTPADDING', (0, 0), (-1, -1), padding),
+            ('TOPPADDING', (0, 0), (-1, -1), padding),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), padding),
+        ),
+        "positions": (
+            ('FONTNAME', (0,0), (-1,-1), font_name),
+            ('FONTNAME', (0,0), (-1,0), bold_font_name),
+            ('FONTSIZE', (0,0), (-1,0), akta_dati.pdf_font_size_table),
+            ('FONTSIZE', (0,1), (-1,-1), akta_dati.pdf_font_size_table),
+            ('BACKGROUND', (0,0), (-1,0), colors.HexColor(akta_dati.table_header_bg_color or "#E5E7EB")),
+            ('TEXTCOLOR', (0,0), (-1,0), colors.HexColor("#0F172A")),
+            ('ALIGN', (0,0), (-1,0), 'CENTER'),
+            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+            ('GRID', (0,0), (-1,-1), 0.4, colors.HexColor(akta_dati.table_grid_color or "#CBD5E1")),
+            ('LINEBELOW', (0,0), (-1,0), 1.0, colors.HexColor("#94A3B8")),
+            ('BOTTOMPADDING', (0,0), (-1,0), padding * 2),
+            ('TOPPADDING', (0,0), (-1,0), padding * 2),
+            ('BOTTOMPADDING', (0,1), (-1,-1), padding),
+            ('TOPPADDING', (0,1), (-1,-1), padding),
+        ),
+        "summary": (
+            ('ALIGN', (1,0), (1,-1), 'RIGHT'),
+            ('FONTNAME', (0,0), (-1,-1), font_name),
+            ('FONTSIZE', (0,0), (-1,-1), akta_dati.pdf_font_size_normal),
+            ('LINEBELOW', (0,0), (-1,-1), 0.6, colors.HexColor('#CBD5E1')),
+        ),
+        # BACKGROUND (pēc akta statusa) izsaucējs pieliek pirms šīm komandām
+        "status": (
+            ('BOX', (0,0), (-1,-1), 1.0, colors.HexColor("#334155")),
+            ('INNERGRID', (0,0), (-1,-1), 0.0, colors.white),
+            ('VALIGN', (0,0), (-1,-1), 'MIDDLE'),
+            ('LEFTPADDING', (0,0), (-1,-1), 8),
+            ('RIGHTPADDING', (0,0), (-1,-1), 8),
+            ('TOPPADDING', (0,0), (-1,-1), 6),
+            ('BOTTOMPADDING', (0,0), (-1,-1), 6),
+        ),
+        "signatures": (
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),  # Centra izlīdzināšana visiem elementiem šūnās
+            ('VALIGN', (0, 0), (-1, -1), 'TOP'),  # Vertikālā izlīdzināšana uz augšu
+            ('FONTNAME', (0, 0), (-1, -1), font_name),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), float(akta_dati.signature_spacing_mm)),  # Atstarpe zem paraksta līnijas
+        ),
+    }
+    with _pdf_style_lock:
+        if len(_pdf_table_cmd_cache) >= 16:
+            _pdf_table_cmd_cache.clear()
+        _pdf_table_cmd_cache[key] = cmds
+    return cmds
+
+
+def _make_pdf_stylesheet(akta_dati: AktaDati, font_name: str, bold_font_name: str) -> "StyleSheet1":
+    """Būvē jaunu akta stilu komplektu (izsauc _build_pdf_styles, ja tāda kešā vēl nav)."""
+    _ielādēt_reportlab()
+    styles = getSampleStyleSheet()
+    # Ensure all Decimal values are converted to float when used with ReportLab's float-based units or font sizes
+    # Uzlaboti stili ar jaunajiem iestatījumiem
+    styles.add(ParagraphStyle(name='LatvHead', fontName=font_name, fontSize=float(akta_dati.pdf_font_size_head), leading=float(akta_dati.pdf_font_size_head) * float(akta_dati.line_spacing_multiplier), spaceAfter=8, textColor=colors.HexColor(akta_dati.header_text_color)))
+    styles.add(ParagraphStyle(name='Latv', fontName=font_name, fontSize=float(akta_dati.pdf_font_size_normal), leading=float(akta_dati.pdf_font_size_normal) * float(akta_dati.line_spacing_multiplier), textColor=colors.HexColor(akta_dati.footer_text_color)))
+    styles.add(ParagraphStyle(name='LatvSmall', fontName=font_name, fontSize=float(akta_dati.pdf_font_size_small), leading=float(akta_dati.pdf_font_size_small) * float(akta_dati.line_spacing_multiplier), textColor=colors.HexColor(akta_dati.footer_text_color)))
+    styles.add(ParagraphStyle(name='LatvTableContent', fontName=font_name, fontSize=float(akta_dati.pdf_font_size_table), leading=float(akta_dati.pdf_font_size_table) * float(akta_dati.line_spacing_multiplier), wordWrap='LTR', splitLongWords=0, alignment={'left': 0, 'center': 1, 'right': 2}.get(akta_dati.table_content_alignment, 0)))
+    styles.add(ParagraphStyle(name='LatvElectronicSignature', fontName=font_name, fontSize=float(akta_dati.pdf_font_size_normal), leading=float(akta_dati.pdf_font_size_normal) * float(akta_dati.line_spacing_multiplier), alignment=1, textColor=colors.HexColor(akta_dati.header_text_color)))
+    styles.add(ParagraphStyle(name='DocTitle', fontName=font_name, fontSize=float(akta_dati.document_title_font_size), alignment=1, textColor=colors.HexColor(akta_dati.document_title_color)))
+    styles.add(ParagraphStyle(name='SectionHeading', fontName=font_name, fontSize=float(akta_dati.section_heading_font_size), leading=float(akta_dati.section_heading_font_size) * float(akta_dati.paragraph_line_spacing_multiplier), textColor=colors.HexColor(akta_dati.section_heading_color)))
+
+    # ---------------------- Premium juridiskais dizains (uzlabojumi) ----------------------
+    # Bold fonts: Helvetica-Bold vai reģistrā atrastais bold variants (citādi tas pats fonts) – sk. _build_pdf_styles.
+
+    # Papildu stili skaidrai hierarhijai (juridisks + moderns)
+    styles.add(ParagraphStyle(
+        name='FieldLabel',
+        fontName=bold_font_name,
+        fontSize=float(akta_dati.pdf_font_size_normal),
+        leading=float(akta_dati.pdf_font_size_normal) * float(akta_dati.line_spacing_multiplier),
+        textColor=colors.HexColor("#0F172A")
+    ))
+    styles.add(ParagraphStyle(
+        name='FieldValue',
+        fontName=font_name,
+        fontSize=float(akta_dati.pdf_font_size_normal),
+        leading=float(akta_dati.pdf_font_size_normal) * float(akta_dati.line_spacing_multiplier),
+        textColor=colors.HexColor("#0F172A")
+    ))
+    styles.add(ParagraphStyle(
+        name='SectionBar',
+        fontName=bold_font_name,
+        fontSize=float(max(11, int(akta_dati.section_heading_font_size))),
+        leading=float(max(11, int(akta_dati.section_heading_font_size))) * float(akta_dati.paragraph_line_spacing_multiplier),
+        textColor=colors.HexColor("#0F172A"),
+        backColor=colors.HexColor("#F1F5F9"),
+        borderPadding=6,
+        spaceBefore=10,
+        spaceAfter=6,
+    ))
+    styles.add(ParagraphStyle(
+        name='LegalSectionTitle',
+        fontName=bold_font_name,
+        fontSize=11,
+        leading=14,
+        textColor=colors.HexColor("#0F172A"),
+        spaceBefore=10,
+        spaceAfter=4,
+    ))
+    styles.add(ParagraphStyle(
+        name='LegalBody',
+        fontName=font_name,
+        fontSize=float(akta_dati.pdf_font_size_normal),
+        leading=float(akta_dati.pdf_font_size_normal) * float(akta_dati.line_spacing_multiplier),
+        textColor=colors.HexColor("#0F172A"),
+        spaceAfter=6,
+    ))
+    styles.add(ParagraphStyle(
+        name='TableHeader',
+        fontName=bold_font_name,
+        fontSize=float(akta_dati.pdf_font_size_table),
+        leading=float(akta_dati.pdf_font_size_table) * float(akta_dati.line_spacing_multiplier),
+        textColor=colors.HexColor("#0F172A"),
+        alignment=1,  # CENTER
+    ))
+
+    return styles
+
+
+def _pdf_section_cover(akta_dati: AktaDati, styles, font_name: str, bold_font_name: str, available_width: float) -> list:
+    """Titullapa (ja ieslēgta)."""
+    story = []
+    # Cover Page (new feature)
+    if akta_dati.add_cover_page:
+        story.append(Spacer(1, 2 * inch))
+        if akta_dati.logotipa_ceļš and _path_exists(akta_dati.logotipa_ceļš):
+            try:
+                cover_logo = _pdf_image(akta_dati.logotipa_ceļš, float(akta_dati.cover_page_logo_width_mm) * mm, 50 * mm,
+                                        getattr(akta_dati, "pdf_image_dpi", 200))
+                story.append(cover_logo)
+                story.append(Spacer(1, 0.5 * inch))
+            except Exception:
+                pass
+        story.append(Paragraph(akta_dati.cover_page_title, styles['DocTitle']))
+        story.append(Spacer(1, 1 * inch))
+        story.append(Paragraph(f"Akta Nr.: {akta_dati.akta_nr}", styles['Latv']))
+        story.append(Paragraph(f"Datums: {akta_dati.datums}", styles['Latv']))
+        story.append(Paragraph(f"Vieta: {akta_dati.vieta}", styles['Latv']))
+        story.append(Spacer(1, 2 * inch))
+        story.append(Paragraph(f"Pieņēmējs: {akta_dati.pieņēmējs.nosaukums}", styles['Latv']))
+        if akta_dati.pieņēmējs.tālrunis:
+            story.append(Paragraph(f"Pieņēmēja tālrunis: {akta_dati.pieņēmējs.tālrunis}", styles['Latv']))
+        story.append(Paragraph(f"Nodevējs: {akta_dati.nodevējs.nosaukums}", styles['Latv']))
+        if akta_dati.nodevējs.tālrunis:
+            story.append(Paragraph(f"Nodevēja tālrunis: {akta_dati.nodevējs.tālrunis}", styles['Latv']))
+        story.append(PageBreak())
+
+    return story
+
+
+def _pdf_section_header(akta_dati: AktaDati, styles, font_name: str, bold_font_name: str, available_width: float) -> list:
+    """Galvene ar logo, akta metadati (Nr., datums, vieta) un papildu datumi."""
+    story = []
+    # Header ar logo un nosaukumu
+    header_table_data = []
+    logo_w = float(akta_dati.pdf_logo_width_mm) * mm
+    if (not getattr(akta_dati, 'cover_page_enabled', False)) and akta_dati.logotipa_ceļš and _path_exists(akta_dati.logotipa_ceļš):
+        try:
+            header_logo._restrictSize(logo_w, 20 * mm)
+            header_table_data.append([header_logo, Paragraph(f"<font name='{bold_font_name}'>PIEŅEMŠANAS–NODOŠANAS AKTS</font>", styles['LatvHead'])])
+        except Exception:
+            header_table_data.append(["", Paragraph(f"<font name='{bold_font_name}'>PIEŅEMŠANAS–NODOŠANAS AKTS</font>", styles['LatvHead'])])
+    else:
+        header_table_data.append(["", Paragraph(f"<font name='{bold_font_name}'>PIEŅEMŠANAS–NODOŠANAS AKTS</font>", styles['LatvHead'])])
+
+    ht = Table(header_table_data, colWidths=[logo_w, None])
+    table_cmds = _pdf_table_commands(akta_dati, font_name, bold_font_name)
+    ht.setStyle(TableStyle(table_cmds["header"]))
+    story.append(ht)
+
+    # Aktu metadati (Nr., Datums, Vieta)
+    md = [[Paragraph(f"<font name='{font_name}'><b>Akta Nr.:</b> {akta_dati.akta_nr}</font>", styles['Latv']),
+           Paragraph(f"<font name='{font_name}'><b>Datums:</b> {datetime.strptime(akta_dati.datums, '%Y-%m-%d').strftime(akta_dati.date_format.replace('YYYY', '%Y').replace('MM', '%m').replace('DD', '%d'))}</font>", styles['Latv']),
+           Paragraph(f"<font name='{font_name}'><b>Vieta:</b> {akta_dati.vieta}</font>", styles['Latv'])]]
+    if akta_dati.pasūtījuma_nr:
+        md[0].append(Paragraph(f"<font name='{font_name}'><b>Pasūtījuma Nr.:</b> {akta_dati.pasūtījuma_nr}</font>", styles['Latv']))
+
+    meta = Table(md, colWidths=[55 * mm, 35 * mm, 40 * mm, None])
+    meta.setStyle(TableStyle(table_cmds["meta"]))
+    story.append(meta)
+    story.append(Spacer(1, 6))
+
+    # Jauni metadati
+    if akta_dati.līguma_nr:
+        story.append(Paragraph(f"<font name='{font_name}'><b>Līguma Nr.:</b> {akta_dati.līguma_nr}</font>", styles['Latv']))
+    if akta_dati.izpildes_termiņš:
+        story.append(Paragraph(f"<font name='{font_name}'><b>Izpildes termiņš:</b> {datetime.strptime(akta_dati.izpildes_termiņš, '%Y-%m-%d').strftime(akta_dati.date_format.replace('YYYY', '%Y').replace('MM', '%m').replace('DD', '%d'))}</font>", styles['Latv']))
+    if akta_dati.pieņemšanas_datums:
+        story.append(Paragraph(f"<font name='{font_name}'><b>Pieņemšanas datums:</b> {datetime.strptime(akta_dati.pieņemšanas_datums, '%Y-%m-%d').strftime(akta_dati.date_format.replace('YYYY', '%Y').replace('MM', '%m').replace('DD', '%d'))}</font>", styles['Latv']))
+    if akta_dati.nodošanas_datums:
+        story.append(Paragraph(f"<font name='{font_name}'><b>Nodošanas datums:</b> {datetime.strptime(akta_dati.nodošanas_datums, '%Y-%m-%d').strftime(akta_dati.date_format.replace('YYYY', '%Y').replace('MM', '%m').replace('DD', '%d'))}</font>", styles['Latv']))
+    story.append(Spacer(1, 6))
+
+    return story
+
+
+def _pdf_section_parties(akta_dati: AktaDati, styles, font_name: str, bold_font_name: str, available_width: float) -> list:
+    """PUSES tabula (Pieņēmējs / Nodevējs)."""
+    story = []
+    # Puses: Pieņēmējs / Nodevējs
+    story.append(Paragraph("PUSES", styles['SectionBar']))
+    def persona_paragraph(prefix: str, p: Persona):
+        lines = [f"<b>{prefix}:</b> {p.nosaukums}"]
+        if p.reģ_nr: lines.append(f"Reģ. Nr.: {p.reģ_nr}")
+        if p.adrese: lines.append(f"Adrese: {p.adrese}")
+        if p.kontaktpersona: lines.append(f"Kontaktpersona: {p.kontaktpersona}")
+        if getattr(p, 'amats', ''): lines.append(f"Amats: {p.amats}")
+        if getattr(p, 'pilnvaras_pamats', ''): lines.append(f"Pilnvaras pamats: {p.pilnvaras_pamats}")
+        if p.tālrunis: lines.append(f"Tālrunis: {p.tālrunis}")
+        if p.epasts:
+            em = p.epasts.strip()
+            lines.append(f"E-pasts: <a href=\"mailto:{em}\">{em}</a>")
+        if getattr(p, "web_lapa", ""):
+            url = p.web_lapa.strip()
+            if url and not re.match(r"^[a-zA-Z]+://", url):
+                url = "https://" + url
+            disp = p.web_lapa.strip()
+            lines.append(f"Web lapa: <a href=\"{url}\">{disp}</a>")
+        if p.bankas_konts: lines.append(f"Bankas konts: {p.bankas_konts}")
+        if p.juridiskais_statuss: lines.append(f"Statuss: {p.juridiskais_statuss}")
+        return Paragraph(f"<font name='{font_name}'>" + "<br/>".join(lines) + "</font>", styles['Latv'])
+
+    col_width_parties = available_width / 2
+
+    puses = Table([
+        [persona_paragraph("Pieņēmējs", akta_dati.pieņēmējs), persona_paragraph("Nodevējs", akta_dati.nodevējs)]
+    ], colWidths=[col_width_parties, col_width_parties])
+    pstyle = TableStyle(_pdf_table_commands(akta_dati, font_name, bold_font_name)["parties"])
+    puses.setStyle(pstyle)
+    story.append(puses)
+    story.append(Spacer(1, 8))
+
+    return story
+
+
+class _ChunkedPositionsTableMixin:
+    """POZĪCIJAS tabula lielam rindu skaitam, izkārtota pa lapai (Flowable, sk. _ielādēt_reportlab).
+
+    Viena milzīga Table izkārtojums (wrap/split ar repeatRows) aug straujāk par rindu
+    skaitu, tāpēc katrai lapai tiek uzbūvēta atsevišķa Table tikai no nākamajām rindām
+    (galvene atkārtojas katrā lapā). Zebras svītras dod ROWBACKGROUNDS, kura fāzi nobīda
+    pēc pirmās rindas globālā numura, lai svītrojums lapu robežās nesabrūk.
+    Objekts pats stāvokli nemaina, tāpēc to var droši kešot kopā ar sadaļu.
+    """
+
+    def __init__(self, header, rows, col_widths, style_cmds, zebra_color=None, start=0, chunk_rows=64):
+        Flowable.__init__(self)
+        self._header = header
+        self._rows = rows
+        self._col_widths = col_widths
+        self._style_cmds = tuple(style_cmds)
+        self._zebra_color = zebra_color
+        self._start = start
+        self._chunk_rows = max(1, int(chunk_rows))
+
+    def _table(self, end: int) -> "Table":
+        cmds = list(self._style_cmds)
+        if self._zebra_color is not None:
+            # Tabulas rinda i (1..) ir pāra, ja (start + i) ir pāra – tāpat kā vienlaidus tabulā
+            if self._start % 2 == 0:
+                cycle = [None, self._zebra_color]
+            else:
+                cycle = [self._zebra_color, None]
+            cmds.append(('ROWBACKGROUNDS', (0, 1), (-1, -1), cycle))
+        t = Table([self._header] + self._rows[self._start:end], colWidths=self._col_widths, repeatRows=1)
+        t.setStyle(TableStyle(cmds))
+        return t
+
+    def wrap(self, availWidth, availHeight):
+        # Vienmēr "neietilpst" – rāmis izsauc split(), kas izvēlas lapai atbilstošu daļu
+        return availWidth, availHeight + 1
+
+    def split(self, availWidth, availHeight):
+        total = len(self._rows)
+        chunk = self._chunk_rows
+        while True:
+            end = min(total, self._start + chunk)
+            t = self._table(end)
+            _w, h = t.wrap(availWidth, availHeight)
+            if h <= availHeight:
+                if end >= total:
+                    return [t]
+                chunk *= 2  # Visa daļa ietilpst – mēģinām ar vairāk rindām
+                continue
+            parts = t.split(availWidth, availHeight)
+            if not parts:
+                return []
+            consumed = len(parts[0]._cellvalues) - 1  # bez galvenes rindas
+            if consumed <= 0:
+                return []
+            rest = _ChunkedPositionsTable(
+                self._header, self._rows, self._col_widths, self._style_cmds, self._zebra_color,
+                start=self._start + consumed, chunk_rows=consumed + 8,
+            )
+            return [parts[0], rest]
+
+
+def _pdf_section_positions(akta_dati: AktaDati, styles, font_name: str, bold_font_name: str, available_width: float) -> list:
+    """POZĪCIJAS tabula un summu kopsavilkums."""
+    story = []
+    # Pozīciju tabula
+    story.append(Paragraph("POZĪCIJAS", styles['SectionBar']))
+    # JAUNS: kolonnas var būt paslēptas/ pārdēvētas (poz_columns_config + custom_columns.visible)
+    poz_cfg = _merge_poz_columns_config(getattr(akta_dati, "poz_columns_config", None))
+    def _col_visible(key: str) -> bool:
+        try:
+            return bool(poz_cfg.get(key, {}).get("visible", True))
+        except Exception:
+            return True
+    def _col_title(key: str, default: str) -> str:
+        try:
+            t = str(poz_cfg.get(key, {}).get("title", default))
+            return t or default
+        except Exception:
+            return default
+
+    # Kolonnu secība PDF tabulai (ņem vērā GUI pārvietošanu / drag&drop)
+    # Nr. kolonna PDF tabulā ir atsevišķa un (ja ieslēgta) vienmēr ir pirmā.
+    base_kind = {
+        "apraksts": "text",
+        "daudzums": "num",
+        "vieniba": "text",
+        "cena": "money",
+        "summa": "money",
+        "serial": "text",
+        "warranty": "text",
+        "notes": "text",
+        "foto": "foto",
+    }
+
+    # Pielāgotās kolonnas (no datiem)
+    custom_cols = []
+    try:
+        custom_cols = list(getattr(akta_dati, "custom_columns", []) or [])
+    except Exception:
+        custom_cols = []
+
+    # Iespējamās atslēgas secībai (bez "nr")
+    base_keys = ["apraksts", "daudzums", "vieniba", "cena", "summa", "serial", "warranty", "notes"]
+    custom_keys = [f"custom:{i}" for i in range(len(custom_cols))]
+    possible = set(base_keys + custom_keys + ["foto"])
+
+    # Vēlamā secība no GUI (ja ir). Ja nav – izmantojam noklusējumu.
+    desired = []
+    try:
+        desired = list(getattr(akta_dati, "poz_columns_visual_order", []) or [])
+    except Exception:
+        desired = []
+    desired = [k for k in desired if k in possible]
+
+    if not desired:
+        desired = list(base_keys) + list(custom_keys) + ["foto"]
+    else:
+        # pieliekam trūkstošās kolonnas klāt (lai nezaudējam jaunpievienotas kolonnas)
+        for k in base_keys:
+            if k not in desired:
+                desired.append(k)
+        for k in custom_keys:
+            if k not in desired:
+                desired.append(k)
+        if "foto" not in desired:
+            desired.append("foto")
+
+    # Foto kolonna var atrasties jebkurā vietā (tāpat kā GUI). 
+    # Neuzspiežam tai pozīciju — izmantojam lietotāja (GUI) secību.
+
+    # Uztaisām PDF kolonnu plānu, ņemot vērā redzamību
+    col_plan = []  # list[tuple(key, kind)]
+    if _col_visible("nr"):
+        col_plan.append(("nr", "nr"))
+
+    for key in desired:
+        if key.startswith("custom:"):
+            try:
+                ci = int(key.split(":", 1)[1])
+                if 0 <= ci < len(custom_cols):
+                    cdef = custom_cols[ci]
+                    if isinstance(cdef, dict) and bool(cdef.get("visible", True)):
+                        col_plan.append((key, "text"))
+            except Exception:
+                pass
+            continue
+
+        if key == "foto":
+            if _col_visible("foto"):
+                col_plan.append(("foto", "foto"))
+            continue
+
+        # bāzes kolonnas
+        if key in base_keys and _col_visible(key):
+            col_plan.append((key, base_kind.get(key, "text")))
+
+    # Galvene
+    tab_header_items = []
+    for key, _kind in col_plan:
+        if key == "nr":
+            tab_header_items.append(Paragraph(_col_title("nr", "Nr."), styles['TableHeader']))
+        elif key.startswith("custom:"):
+            try:
+                ci = int(key.split(":", 1)[1])
+                nm = str(custom_cols[ci].get("name", "")) if isinstance(custom_cols[ci], dict) else ""
+            except Exception:
+                nm = ""
+            tab_header_items.append(Paragraph(nm or "", styles['TableHeader']))
+        else:
+            default_map = {
+                "apraksts": "Apraksts",
+                "daudzums": "Daudzums",
+                "vieniba": "Vienība",
+                "cena": "Cena",
+                "summa": "Summa",
+                "serial": "Seriālais Nr.",
+                "warranty": "Garantija",
+                "notes": "Piezīmes pozīcijai",
+                "foto": "Foto",
+            }
+            tab_header_items.append(Paragraph(_col_title(key, default_map.get(key, key)), styles['TableHeader']))
+
+    tab_data = [tab_header_items]
+
+    # Kolonnu platumi
+    expected_cols = len(col_plan)
+    col_widths = None
+    try:
+        col_widths_mm = [float(x.strip()) for x in (akta_dati.table_col_widths or "").split(',') if x.strip()]
+        if len(col_widths_mm) == expected_cols:
+            col_widths = [w * mm for w in col_widths_mm]
+    except Exception:
+        col_widths = None
+
+    if not col_widths:
+        # Noklusējuma platumi (mm) atkarībā no kolonnu tipa
+        default_map_mm = {
+            "nr": 10,
+            "text": 35,
+            "num": 18,
+            "money": 20,
+            "foto": 18,
+        }
+        dw = []
+        for _k, kind in col_plan:
+            dw.append(default_map_mm.get(kind, 25))
+        col_widths = [w * mm for w in dw]
+        total_default_width = sum(col_widths)
+        if total_default_width > 0 and total_default_width != available_width:
+            scale_factor = available_width / total_default_width
+            col_widths = [w * scale_factor for w in col_widths]
+
+
+    # Lielam pozīciju skaitam: vienkāršas virknes šūnās bez marķējuma un tabula pa lapām
+    large_table = len(akta_dati.pozīcijas) >= PDF_LARGE_TABLE_ROWS
+    content_style = styles['LatvTableContent']
+    cell_pad = 12  # Table noklusējuma LEFTPADDING + RIGHTPADDING
+
+    def make_cell(text, col_i):
+        if large_table and isinstance(text, str) and '<' not in text and '&' not in text and '\n' not in text:
+            try:
+                if pdfmetrics.stringWidth(text, content_style.fontName, content_style.fontSize) <= col_widths[col_i] - cell_pad:
+                    return text
+            except Exception:
+                pass
+        return Paragraph(text, content_style)
+
+    # Rindas
+    for i, poz in enumerate(akta_dati.pozīcijas, start=1):
+        row_items = []
+        for col_i, (key, kind) in enumerate(col_plan):
+            if key == "nr":
+                row_items.append(make_cell(str(i), col_i))
+            elif key == "apraksts":
+                row_items.append(make_cell(poz.apraksts, col_i))
+            elif key == "daudzums":
+                row_items.append(make_cell(f"{formēt_naudu(poz.daudzums)}", col_i))
+            elif key == "vieniba":
+                row_items.append(make_cell(poz.vienība, col_i))
+            elif key == "cena":
+                row_items.append(make_cell(f"{akta_dati.currency_symbol_position == 'before' and akta_dati.valūta or ''}{formēt_naudu(poz.cena)}{akta_dati.currency_symbol_position == 'after' and ' ' + akta_dati.valūta or ''}", col_i))
+            elif key == "summa":
+                row_items.append(make_cell(f"{akta_dati.currency_symbol_position == 'before' and akta_dati.valūta or ''}{formēt_naudu(poz.summa)}{akta_dati.currency_symbol_position == 'after' and ' ' + akta_dati.valūta or ''}", col_i))
+            elif key == "serial":
+                row_items.append(make_cell(poz.seriālais_nr, col_i))
+            elif key == "warranty":
+                row_items.append(make_cell(poz.garantija, col_i))
+            elif key == "notes":
+                row_items.append(make_cell(poz.piezīmes_pozīcijai, col_i))
+            elif key.startswith("custom:"):
+                try:
+                    ci = int(key.split(":", 1)[1])
+                    data_list = custom_cols[ci].get("data", []) if isinstance(custom_cols[ci], dict) else []
+                    v = str(data_list[i-1]) if isinstance(data_list, list) and (i-1) < len(data_list) else ""
+                except Exception:
+                    v = ""
+                row_items.append(make_cell(v, col_i))
+            elif key == "foto":
+                if getattr(poz, 'attēla_ceļš', '') and os.path.exists(poz.attēla_ceļš):
+                    try:
+                        img_thumb = _pdf_image(poz.attēla_ceļš, 18 * mm, 14 * mm, getattr(akta_dati, "pdf_image_dpi", 200))
+                        row_items.append(img_thumb)
+                    except Exception:
+                        row_items.append(make_cell("", col_i))
+                else:
+                    row_items.append(make_cell("", col_i))
+            else:
+                row_items.append(make_cell("", col_i))
+        tab_data.append(row_items)
+
+    table_cmds = _pdf_table_commands(akta_dati, font_name, bold_font_name)
+    tstyle = TableStyle(table_cmds["positions"])
+
+    # Kolonnu izlīdzinājumi pēc tipa
+    for col_i, (_k, kind) in enumerate(col_plan):
+        if kind in ("money",):
+            tstyle.add('ALIGN', (col_i, 1), (col_i, -1), 'RIGHT')
+        elif kind in ("num", "nr"):
+            tstyle.add('ALIGN', (col_i, 1), (col_i, -1), 'CENTER')
+        elif kind == "foto":
+            tstyle.add('ALIGN', (col_i, 1), (col_i, -1), 'CENTER')
+        else:
+            tstyle.add('ALIGN', (col_i, 1), (col_i, -1), 'LEFT')
+
+    if large_table:
+        # Virknes šūnas izlīdzina un izkārto tāpat kā LatvTableContent rindkopas (kā mazajā tabulā,
+        # kur teksta šūnas ir Paragraph); foto kolonna paliek centrēta kā attēlu šūnas
+        content_align = {0: 'LEFT', 1: 'CENTER', 2: 'RIGHT'}.get(content_style.alignment, 'LEFT')
+        for col_i, (_k, kind) in enumerate(col_plan):
+            if kind != "foto":
+                tstyle.add('ALIGN', (col_i, 1), (col_i, -1), content_align)
+        tstyle.add('LEADING', (0, 1), (-1, -1), content_style.leading)
+        zebra = colors.HexColor(akta_dati.table_alternate_row_color) if akta_dati.table_alternate_row_color else None
+        story.append(_ChunkedPositionsTable(tab_data[0], tab_data[1:], col_widths, tstyle.getCommands(), zebra))
+    else:
+        t = Table(tab_data, colWidths=col_widths)
+
+        # Apply alternate row color
+        if akta_dati.table_alternate_row_color:
+            for i in range(1, len(tab_data)):
+                if i % 2 == 0: # Even rows (0-indexed, so actual even rows)
+                    tstyle.add('BACKGROUND', (0, i), (-1, i), colors.HexColor(akta_dati.table_alternate_row_color))
+
+        t.setStyle(tstyle)
+        story.append(t)
+
+    # Kopsavilkums (var izslēgt)
+    if getattr(akta_dati, "show_price_summary", True):
+        story.append(Spacer(1, 6))
+        summa_tab = []
+        summa_tab.append([Paragraph(f"<font name='{font_name}'>Kopā bez PVN:</font>", styles['Latv']), Paragraph(f"<font name='{font_name}'>{akta_dati.currency_symbol_position == 'before' and akta_dati.valūta or ''}{formēt_naudu(akta_dati.kopējā_summma())}{akta_dati.currency_symbol_position == 'after' and ' ' + akta_dati.valūta or ''}</font>", styles['Latv'])])
+        if akta_dati.iekļaut_pvn and akta_dati.show_vat_breakdown:
+            summa_tab.append([Paragraph(f"<font name='{font_name}'>PVN {akta_dati.pvn_likme}%:</font>", styles['Latv']), Paragraph(f"<font name='{font_name}'>{akta_dati.currency_symbol_position == 'before' and akta_dati.valūta or ''}{formēt_naudu(akta_dati.pvn_summa())}{akta_dati.currency_symbol_position == 'after' and ' ' + akta_dati.valūta or ''}</font>", styles['Latv'])])
+            summa_tab.append([Paragraph(f"<font name='{font_name}'>Kopā ar PVN:</font>", styles['Latv']), Paragraph(f"<font name='{font_name}'>{akta_dati.currency_symbol_position == 'before' and akta_dati.valūta or ''}{formēt_naudu(akta_dati.summa_ar_pvn())}{akta_dati.currency_symbol_position == 'after' and ' ' + akta_dati.valūta or ''}</font>", styles['Latv'])])
+
+        if summa_tab:
+            ts = Table(summa_tab, colWidths=[None, 40*mm])
+            ts.setStyle(TableStyle(table_cmds["summary"]))
+            story.append(ts)
+
+    return story
+
+
+def _pdf_section_legal(akta_dati: AktaDati, styles, font_name: str, bold_font_name: str, available_width: float) -> list:
+    """Piezīmes, juridiskās klauzulas un akta statusa bloks."""
+    story = []
+    # Piezīmes
+    if akta_dati.piezīmes:
+        story.append(Spacer(1, 6))
+        story.append(Paragraph(f"<font name='{font_name}'><b>Vispārīgās piezīmes:</b><br/>{akta_dati.piezīmes}</font>", styles['Latv']))
+
+    # Jauni juridiski saistoši lauki PDF dokumentā
+    if akta_dati.strīdu_risināšana:
+        story.append(Paragraph("Strīdu risināšanas kārtība", styles['LegalSectionTitle']))
+        story.append(Paragraph(f"<font name='{font_name}'>{akta_dati.strīdu_risināšana}</font>", styles['LegalBody']))
+
+    if akta_dati.konfidencialitātes_klauzula:
+        story.append(Paragraph("Konfidencialitātes klauzula", styles['LegalSectionTitle']))
+        story.append(Paragraph(
+            f"<font name='{font_name}'>Puses apņemas neizpaust trešajām personām informāciju, kas iegūta šī akta ietvaros, "
+            f"izņemot gadījumus, ko nosaka normatīvie akti.</font>",
+            styles['LegalBody']
+        ))
+
+    if akta_dati.soda_nauda_procenti > 0:
+        story.append(Spacer(1, 6))
+        story.append(Paragraph(f"<font name='{font_name}'><b>Soda nauda:</b> Par saistību neizpildi vai nepienācīgu izpildi, vainīgā puse maksā otrai pusei soda naudu {formēt_naudu(akta_dati.soda_nauda_procenti)}% apmērā no neizpildīto saistību vērtības par katru kavējuma dienu.</font>", styles['Latv']))
+
+    if akta_dati.piegādes_nosacījumi:
+        story.append(Spacer(1, 6))
+        story.append(Paragraph(f"<font name='{font_name}'><b>Piegādes nosacījumi:</b> {akta_dati.piegādes_nosacījumi}</font>", styles['Latv']))
+
+    if akta_dati.apdrošināšana:
+        story.append(Spacer(1, 6))
+        apd_text = (getattr(akta_dati, "apdrošināšana_teksts", "") or "").strip()
+        if not apd_text:
+            apd_text = "Preces ir apdrošinātas pret bojājumiem un zaudējumiem līdz pieņemšanas-nodošanas brīdim."
+        story.append(Paragraph(f"<font name='{font_name}'><b>Apdrošināšana:</b> {apd_text}</font>", styles['Latv']))
+
+    if akta_dati.papildu_nosacījumi:
+        story.append(Spacer(1, 6))
+        story.append(Paragraph(f"<font name='{font_name}'><b>Papildu nosacījumi:</b><br/>{akta_dati.papildu_nosacījumi}</font>", styles['Latv']))
+
+    if akta_dati.atsauces_dokumenti:
+        story.append(Spacer(1, 6))
+        story.append(Paragraph(f"<font name='{font_name}'><b>Atsauces dokumenti:</b> {akta_dati.atsauces_dokumenti}</font>", styles['Latv']))
+
+    story.append(Spacer(1, 6))
+    # Akta statuss (izcelts "juridisks premium" bloks)
+    status_tbl = Table([[Paragraph(f"<font name='{bold_font_name}'>Akta statuss:</font>", styles['FieldLabel']),
+                         Paragraph(f"<font name='{font_name}'>{akta_dati.akta_statuss}</font>", styles['FieldValue'])]],
+                       colWidths=[35*mm, None])
+    # JAUNS: Akta statusa fona krāsa PDF (atkarīga no izvēlētā statusa)
+    _status_bg_map = {
+        "Melnraksts": "#F1F5F9",   # pelēcīgs
+        "Apstiprināts": "#DBEAFE", # zils
+        "Parakstīts": "#DCFCE7",   # zaļš
+        "Arhivēts": "#EDE9FE",     # violets
+        "Atcelts": "#FEE2E2",      # sarkans
+    }
+    status_bg_color = _status_bg_map.get((akta_dati.akta_statuss or "").strip(), "#F8FAFC")
+
+    status_tbl.setStyle(TableStyle(
+        [('BACKGROUND', (0,0), (-1,-1), colors.HexColor(status_bg_color))]
+        + list(_pdf_table_commands(akta_dati, font_name, bold_font_name)["status"])
+    ))
+    story.append(Spacer(1, 8))
+    story.append(status_tbl)
+
+    return story
+
+
+def _pdf_section_photos(akta_dati: AktaDati, styles, font_name: str, bold_font_name: str, available_width: float) -> list:
+    """Pievienotās fotogrāfijas."""
+    story = []
+    # Attēli (ja ir) – mērogojam līdz platumam
+    if akta_dati.attēli:
+        story.append(PageBreak())
+        story.append(Spacer(1, 8))
+        story.append(Paragraph(f"<font name='{font_name}'><b>Pievienotās fotogrāfijas</b></font>", styles['Latv']))
+        for att in akta_dati.attēli:
+            if os.path.exists(att.ceļš):
+                try:
+                    img = _pdf_image(att.ceļš, available_width, float(akta_dati.item_image_width_mm) * 3 * mm,
+                                     getattr(akta_dati, "pdf_image_dpi", 200))
+                    story.append(Spacer(1, 4))
+                    story.append(img)
+                    if att.paraksts:
+                        story.append(Paragraph(f"<font name='{font_name}'>{att.paraksts}</font>", styles['LatvSmall']))
+                except Exception:
+                    pass
+
+    return story
+
+
+def _pdf_section_signatures(akta_dati: AktaDati, styles, font_name: str, bold_font_name: str, available_width: float) -> list:
+    """Parakstu bloks vai elektroniskā paraksta teksts."""
+    story = []
+    col_width_parties = available_width / 2
+
+    if akta_dati.elektroniskais_paraksts:
+
+        if akta_dati.radit_elektronisko_parakstu_tekstu:
+            story.append(Spacer(1, 16))
+
+            story.append(Paragraph(
+
+                f"<font name='{font_name}' size='{akta_dati.pdf_font_size_normal}'><b>ŠIS DOKUMENTS PARAKSTĪTS AR DROŠU ELEKTRONISKO PARAKSTU UN SATUR LAIKA ZĪMOGU</b></font>",
+
+                styles['LatvElectronicSignature']
+
+            ))
+
+            story.append(Spacer(1, 16))
+
+    elif akta_dati.parakstu_rindas:
+
+        story.append(Spacer(1, 16))  # Atstarpe pirms parakstu laukiem
+
+        # Izveidojam atsevišķus elementus katrai paraksta pusei
+
+        pie_elements = []
+
+        nod_elements = []
+
+        # Pieņēmēja paraksta informācija
+
+        pie_elements.append(Paragraph(f"<font name='{font_name}'><b>Pieņēmējs</b></font>", styles['Latv']))
+
+        if akta_dati.paraksts_pieņēmējs_ceļš and _path_exists(akta_dati.paraksts_pieņēmējs_ceļš):
+
+            try:
+
+                img_pie = _pdf_image(akta_dati.paraksts_pieņēmējs_ceļš,
+
+                                     float(akta_dati.pdf_signature_width_mm) * mm,
+
+                                     float(akta_dati.pdf_signature_height_mm) * mm,
+
+                                     getattr(akta_dati, "pdf_image_dpi", 200))
+
+                pie_elements.append(img_pie)
+
+            except Exception:
+
+                pie_elements.append(Paragraph(
+
+                    f"<font name='{font_name}'>_{'_' * int(float(akta_dati.signature_line_length_mm) / 2)}</font>",
+
+                    styles['Latv']))
+
+        else:
+
+            pie_elements.append(Paragraph(
+
+                f"<font name='{font_name}'>_{'_' * int(float(akta_dati.signature_line_length_mm) / 2)}</font>",
+
+                styles['Latv']))
+
+        pie_elements.append(Paragraph(
+
+            f"<font name='{font_name}' size='{akta_dati.signature_font_size}'>{akta_dati.pieņēmējs.kontaktpersona or akta_dati.pieņēmējs.nosaukums}</font>",
+
+            styles['LatvSmall']))
+
+        # Nodevēja paraksta informācija
+
+        nod_elements.append(Paragraph(f"<font name='{font_name}'><b>Nodevējs</b></font>", styles['Latv']))
+
+        if akta_dati.paraksts_nodevējs_ceļš and _path_exists(akta_dati.paraksts_nodevējs_ceļš):
+
+            try:
+
+                img_nod = _pdf_image(akta_dati.paraksts_nodevējs_ceļš,
+
+                                     float(akta_dati.pdf_signature_width_mm) * mm,
+
+                                     float(akta_dati.pdf_signature_height_mm) * mm,
+
+                                     getattr(akta_dati, "pdf_image_dpi", 200))
+
+                nod_elements.append(img_nod)
+
+            except Exception:
+
+                nod_elements.append(Paragraph(
+
+                    f"<font name='{font_name}'>_{'_' * int(float(akta_dati.signature_line_length_mm) / 2)}</font>",
+
+                    styles['Latv']))
+
+        else:
+
+            nod_elements.append(Paragraph(
+
+                f"<font name='{font_name}'>_{'_' * int(float(akta_dati.signature_line_length_mm) / 2)}</font>",
+
+                styles['Latv']))
+
+        nod_elements.append(Paragraph(
+
+            f"<font name='{font_name}' size='{akta_dati.signature_font_size}'>{akta_dati.nodevējs.kontaktpersona or akta_dati.nodevējs.nosaukums}</font>",
+
+            styles['LatvSmall']))
+
+        # Izveidojam tabulu ar vienu rindu un divām kolonnām
+
+        # Katrā kolonnā ievietojam Flowables (Paragraph, Image) sarakstu
+
+        paraksti_table_data = [
+
+            [pie_elements, nod_elements]
+
+        ]
+
+        paraksti = Table(paraksti_table_data, colWidths=[col_width_parties, col_width_parties])
+
+        paraksti.setStyle(TableStyle(_pdf_table_commands(akta_dati, font_name, bold_font_name)["signatures"]))
+
+        story.append(paraksti)
+
+    return story
+
+
+def _pdf_section_qr_codes(akta_dati: AktaDati, styles, font_name: str, bold_font_name: str, available_width: float) -> list:
+    """Individuālais un automātiskais QR kods story beigās."""
+    story = []
+    # QR kodi (jauna funkcionalitāte)
+    qr_codes_to_add = []
+
+    # Individuālais QR kods
+    if akta_dati.include_custom_qr_code and akta_dati.custom_qr_code_data:
+        qr_codes_to_add.append({
+            'data': akta_dati.custom_qr_code_data,
+            'size': akta_dati.custom_qr_code_size_mm,
+            'position': akta_dati.custom_qr_code_position
+        })
+
+    # Automātiskais QR kods (akta ID)
+    if akta_dati.include_auto_qr_code and akta_dati.akta_nr:
+        qr_codes_to_add.append({
+            'data': akta_dati.akta_nr,
+            'size': akta_dati.auto_qr_code_size_mm,
+            'position': akta_dati.auto_qr_code_position
+        })
+
+    if qr_codes_to_add:
+        try:
+            # Pievienojam QR kodus story beigās, katru savā rindā (vektoru zīmējums, bez pagaidu PNG).
+            # Precīzu pozicionēšanu uz lapas nodrošina DecoratedCanvas.
+            story.append(Spacer(1, 12))  # Atstarpe pirms QR kodiem
+            for qr_info in qr_codes_to_add:
+                size_pt = float(qr_info['size']) * mm
+                story.append(_qr_service.drawing(qr_info['data'], size_pt, border=4))
+                story.append(Spacer(1, 6))  # Atstarpe starp QR kodiem
+        except Exception as e:
+            print(f"Error generating QR code: {e}")
+
+    return story
+
+
+# Lauki, ko lasa _build_pdf_styles – tie ietekmē VISAS sekcijas.
+_PDF_STYLE_FIELDS = (
+    "fonts_ceļš", "pdf_font_size_head", "pdf_font_size_normal", "pdf_font_size_small", "pdf_font_size_table",
+    "line_spacing_multiplier", "paragraph_line_spacing_multiplier", "header_text_color", "footer_text_color",
+    "table_content_alignment", "document_title_font_size", "document_title_color",
+    "section_heading_font_size", "section_heading_color",
+)
+
+# Lauki, ko lasa _pdf_table_commands.
+_PDF_TABLE_STYLE_FIELDS = (
+    "table_border_thickness_pt", "table_grid_color", "table_cell_padding_mm", "table_header_bg_color",
+    "pdf_font_size_table", "pdf_font_size_normal", "signature_spacing_mm",
+)
+
+# Story sekcijas secībā: (nosaukums, veidotājs, AktaDati lauki, ko sekcija lasa).
+# Lauki=None nozīmē, ka sekcija netiek kešota.
+_PDF_STORY_SECTIONS = (
+    ("cover", _pdf_section_cover, (
+        "add_cover_page", "logotipa_ceļš", "cover_page_logo_width_mm", "cover_page_title", "pdf_image_dpi",
+        "akta_nr", "datums", "vieta", "pieņēmējs", "nodevējs",
+    )),
+    ("header", _pdf_section_header, (
+        "cover_page_enabled", "logotipa_ceļš", "pdf_logo_width_mm", "akta_nr", "datums", "date_format", "vieta",
+        "pasūtījuma_nr", "līguma_nr", "izpildes_termiņš", "pieņemšanas_datums", "nodošanas_datums",
+    )),
+    ("parties", _pdf_section_parties, (
+        "pieņēmējs", "nodevējs", "table_border_thickness_pt", "table_grid_color", "table_cell_padding_mm",
+    )),
+    ("positions", _pdf_section_positions, (
+        "pozīcijas", "poz_columns_config", "custom_columns", "poz_columns_visual_order", "table_col_widths",
+        "table_header_bg_color", "table_grid_color", "table_cell_padding_mm", "table_alternate_row_color",
+        "currency_symbol_position", "valūta", "show_price_summary", "iekļaut_pvn", "show_vat_breakdown", "pvn_likme",
+        "pdf_image_dpi",
+    )),
+    ("legal", _pdf_section_legal, (
+        "piezīmes", "strīdu_risināšana", "konfidencialitātes_klauzula", "soda_nauda_procenti",
+        "piegādes_nosacījumi", "apdrošināšana", "apdrošināšana_teksts", "papildu_nosacījumi",
+        "atsauces_dokumenti", "akta_statuss",
+    )),
+    ("photos", _pdf_section_photos, ("attēli", "item_image_width_mm", "pdf_image_dpi")),
+    ("signatures", _pdf_section_signatures, (
+        "elektroniskais_paraksts", "radit_elektronisko_parakstu_tekstu", "parakstu_rindas",
+        "paraksts_pieņēmējs_ceļš", "paraksts_nodevējs_ceļš", "pdf_signature_width_mm", "pdf_signature_height_mm",
+        "signature_line_length_mm", "signature_font_size", "signature_spacing_mm", "pieņēmējs", "nodevējs",
+        "pdf_image_dpi",
+    )),
+    ("qr_codes", _pdf_section_qr_codes, (
+        "include_custom_qr_code", "custom_qr_code_data", "custom_qr_code_size_mm",
+        "include_auto_qr_code", "akta_nr", "auto_qr_code_size_mm",
+    )),
+)
+
+
+def _izskatās_pēc_ceļa(value) -> bool:
+    return isinstance(value, str) and ("/" in value or "\\" in value) and len(value) < 1024
+
+
+def _ceļa_nospiedums(value: str):
+    try:
+        st = os.stat(value)
+        return (value, st.st_size, st.st_mtime_ns)
+    except (OSError, ValueError):
+        return value
+
+
+def _pdf_value_fingerprint(value, ceļi: list = None):
+    """Stabils salīdzināms nospiedums lauka vērtībai (dataclass/list/dict rekursīvi).
+
+    Virknēm, kas izskatās pēc faila ceļa, pievieno faila izmēru un mtime, lai nomainīts
+    attēls/logo ar to pašu nosaukumu invalidē sekciju. Ja dots `ceļi`, tajā tiek savākti
+    visi šādi ceļi (tos _AktaHashKoks pārbauda atkārtoti).
+    """
+    if hasattr(value, "__dataclass_fields__") and not isinstance(value, type):
+        return (type(value).__name__,) + tuple(
+            _pdf_value_fingerprint(getattr(value, name, None), ceļi) for name in value.__dataclass_fields__
+        )
+    if isinstance(value, dict):
+        return ("dict",) + tuple((repr(k), _pdf_value_fingerprint(v, ceļi)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return ("list",) + tuple(_pdf_value_fingerprint(v, ceļi) for v in value)
+    if _izskatās_pēc_ceļa(value):
+        if ceļi is not None:
+            ceļi.append(value)
+        return _ceļa_nospiedums(value)
+    return value
+
+
+def _nospiedums(fingerprint) -> str:
+    return hashlib.sha256(repr(fingerprint).encode("utf-8", "surrogatepass")).hexdigest()
+
+
+# Pozīcijas tiek hešotas pa rindu blokiem (Merkle), lai vienas rindas izmaiņa pārrēķina vienu bloku
+POZ_HASH_BLOKA_RINDAS = 64
+
+
+def _pozīciju_bloka_nospiedums(rindu_nospiedumi) -> str:
+    return hashlib.sha256("".join(rindu_nospiedumi).encode("ascii")).hexdigest()
+
+
+def _pozīciju_nospiedums(bloku_nospiedumi, rindu_skaits: int) -> str:
+    return _nospiedums(("pozīcijas", rindu_skaits, tuple(bloku_nospiedumi)))
+
+
+def _akta_lauka_nospiedums(name: str, value) -> str:
+    """Viena AktaDati lauka nospiedums (Merkle koka lapa); pozīcijām – sakne pār rindu blokiem."""
+    if name == "pozīcijas" and isinstance(value, list):
+        rows = [_nospiedums(_pdf_value_fingerprint(p)) for p in value]
+        blocks = [_pozīciju_bloka_nospiedums(rows[i:i + POZ_HASH_BLOKA_RINDAS])
+                  for i in range(0, len(rows), POZ_HASH_BLOKA_RINDAS)]
+        return _pozīciju_nospiedums(blocks, len(rows))
+    return _nospiedums(_pdf_value_fingerprint(value))
+
+
+def _pdf_fields_digest(akta_dati: AktaDati, field_names, extra=(), nospiedumi: dict = None) -> str:
+    """Sekcijas atslēga no lauku nospiedumiem; `nospiedumi` (no _AktaHashKoks) ļauj tos nepārrēķināt."""
+    nospiedumi = nospiedumi or {}
+    payload = repr((tuple(extra), tuple(
+        (n, nospiedumi[n] if n in nospiedumi else _akta_lauka_nospiedums(n, getattr(akta_dati, n, None)))
+        for n in field_names
+    )))
+    return hashlib.sha256(payload.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def _stingri_vienādi(a, b) -> bool:
+    """Vienādība, kas sakrīt ar nospiedumu: tipi jāsakrīt, Decimal('1.0') != Decimal('1.00')."""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(map(_stingri_vienādi, a, b))
+    if isinstance(a, dict):
+        return list(a) == list(b) and all(_stingri_vienādi(v, b[k]) for k, v in a.items())
+    if hasattr(a, "__dataclass_fields__"):
+        return all(_stingri_vienādi(getattr(a, n, None), getattr(b, n, None)) for n in a.__dataclass_fields__)
+    if isinstance(a, (Decimal, float)):
+        return repr(a) == repr(b)
+    return a == b
+
+
+# Merkle koka sekcijas (pārējie AktaDati lauki pieder "iestatījumi")
+_AKTA_HASH_SEKCIJAS = {
+    "puses": ("pieņēmējs", "nodevējs"),
+    "pozīcijas": ("pozīcijas", "custom_columns", "poz_columns_config", "poz_columns_visual_order",
+                  "poz_header_state_b64", "show_price_summary"),
+    "pielikumi": ("atsauces_dokumenti_faili", "attēli"),
+}
+
+
+class _AktaHashKoks:
+    """Merkle koks pār AktaDati: lauki (lapas) -> sekcijas -> sakne.
+
+    atjaunot() pārrēķina tikai mainījušās lapas: lauku vērtības salīdzina ar iepriekšējām
+    (_stingri_vienādi), pozīciju rindas – pēc objekta identitātes (GUI nemainītām rindām atdod
+    tos pašus Pozīcija objektus), bet failu ceļus (logo, attēli, pielikumi) pārbauda ar os.stat.
+    Lapu vērtības sakrīt ar _akta_lauka_nospiedums, tāpēc lauku_nospiedumi() var padot
+    _pdf_fields_digest un sekciju kešu atslēgas sakrīt ar parasto aprēķinu.
+    Nav pavedienu drošs – lieto vienā (GUI) pavedienā; lauku_nospiedumi() atgriež kopiju.
+    """
+
+    def __init__(self, bloka_rindas: int = POZ_HASH_BLOKA_RINDAS):
+        self._bloka_rindas = max(1, int(bloka_rindas))
+        self._sekcija = {n: s for s, names in _AKTA_HASH_SEKCIJAS.items() for n in names}
+        self._vērtības: dict = {}  # lauks -> vērtības kopija salīdzināšanai
+        self._lapas: dict = {}  # lauks -> nospiedums
+        self._ceļi: dict = {}  # lauks -> {ceļš: _ceļa_nospiedums}
+        self._rindu_ieraksti: list = []  # [(Pozīcija, nospiedums, {ceļš: _ceļa_nospiedums})] pozīciju secībā
+        self._rindu_secība: list = []  # rindu nospiedumi pozīciju secībā
+        self._rindas_ar_ceļiem: list = []  # rindas, kurās ir failu ceļi (attēli) – tās pārbauda ar os.stat
+        self._bloki: list = []  # [(rindu nospiedumu tuple, bloka nospiedums)]
+        self._sekcijas: dict = {}
+        self.sakne: Optional[str] = None
+        self.pārrēķinātās_lapas = 0  # statistika (lapas + rindas + bloki pēdējā atjaunot())
+
+    @staticmethod
+    def _ceļi_mainījušies(ceļi: dict) -> bool:
+        return any(_ceļa_nospiedums(c) != nosp for c, nosp in ceļi.items())
+
+    def _atjaunot_pozīcijas(self, pozīcijas: list) -> bool:
+        vecie = self._rindu_ieraksti
+        # Ātrais ceļš: tie paši rindu objekti tajā pašā secībā un neviens rindas fails nav mainījies
+        if ("pozīcijas" in self._lapas and len(pozīcijas) == len(vecie)
+                and all(map(operator.is_, pozīcijas, (e[0] for e in vecie)))
+                and not any(self._ceļi_mainījušies(e[2]) for e in self._rindas_ar_ceļiem)):
+            return False
+        pārrēķinātas = 0
+        pēc_id = None  # id(Pozīcija) -> ieraksts; tikai, ja rindas ir nobīdījušās (ievietošana/dzēšana)
+        ieraksti = []
+        for i, p in enumerate(pozīcijas):
+            entry = vecie[i] if i < len(vecie) else None
+            if entry is None or entry[0] is not p:
+                if pēc_id is None:
+                    pēc_id = {id(e[0]): e for e in vecie}
+                entry = pēc_id.get(id(p))
+                if entry is not None and entry[0] is not p:
+                    entry = None
+            if entry is None or (entry[2] and self._ceļi_mainījušies(entry[2])):
+                ceļi = []
+                fp = _pdf_value_fingerprint(p, ceļi)
+                entry = (p, _nospiedums(fp), {c: _ceļa_nospiedums(c) for c in ceļi})
+                pārrēķinātas += 1
+            ieraksti.append(entry)
+        self._rindu_ieraksti = ieraksti
+        self._rindas_ar_ceļiem = [e for e in ieraksti if e[2]]
+        secība = [e[1] for e in ieraksti]
+        self.pārrēķinātās_lapas += pārrēķinātas
+        if secība == self._rindu_secība and "pozīcijas" in self._lapas:
+            return False
+        self._rindu_secība = secība
+
+        n = self._bloka_rindas
+        bloki = []
+        for bi, start in enumerate(range(0, len(secība), n)):
+            rows = tuple(secība[start:start + n])
+            if bi < len(self._bloki) and self._bloki[bi][0] == rows:
+                bloki.append(self._bloki[bi])
+            else:
+                bloki.append((rows, _pozīciju_bloka_nospiedums(rows)))
+                self.pārrēķinātās_lapas += 1
+        self._bloki = bloki
+        self._lapas["pozīcijas"] = _pozīciju_nospiedums([b[1] for b in bloki], len(secība))
+        self.pārrēķinātās_lapas += 1
+        return True
+
+    def atjaunot(self, akta_dati: AktaDati) -> str:
+        """Atjaunina mainījušās lapas un atgriež saknes nospiedumu (priekšskatījuma atslēgu)."""
+        self.pārrēķinātās_lapas = 0
+        mainītās = set()
+        for name in akta_dati.__dataclass_fields__:
+            value = getattr(akta_dati, name, None)
+            if name == "pozīcijas" and isinstance(value, list):
+                if self._atjaunot_pozīcijas(value):
+                    mainītās.add(self._sekcija.get(name, "iestatījumi"))
+                continue
+            if (name in self._lapas and _stingri_vienādi(value, self._vērtības.get(name))
+                    and not self._ceļi_mainījušies(self._ceļi.get(name, {}))):
+                continue
+            ceļi = []
+            self._lapas[name] = _nospiedums(_pdf_value_fingerprint(value, ceļi))
+            self._ceļi[name] = {c: _ceļa_nospiedums(c) for c in ceļi}
+            self._vērtības[name] = copy.deepcopy(value)
+            self.pārrēķinātās_lapas += 1
+            mainītās.add(self._sekcija.get(name, "iestatījumi"))
+
+        if self.sakne is None:
+            mainītās.update(_AKTA_HASH_SEKCIJAS, ("iestatījumi",))
+        if mainītās:
+            for sekcija in mainītās:
+                self._sekcijas[sekcija] = _nospiedums(tuple(
+                    (n, h) for n, h in sorted(self._lapas.items()) if self._sekcija.get(n, "iestatījumi") == sekcija
+                ))
+            self.sakne = _nospiedums(tuple(sorted(self._sekcijas.items())))
+        return self.sakne
+
+    def lauku_nospiedumi(self) -> dict:
+        """{lauks: nospiedums} kopija pēc pēdējā atjaunot() (drošs nodošanai fona pavedienam)."""
+        return dict(self._lapas)
+
+    def sekciju_nospiedumi(self) -> dict:
+        return dict(self._sekcijas)
+
+
+class _PdfSectionCache:
+    """LRU kešs gatavām story sekcijām (Paragraph/Table/Image flowables).
+
+    Atslēga = sekcijas nosaukums + hash no tiem AktaDati laukiem, ko sekcija lasa (+ stili,
+    fonts, lapas platums). Nemainītas sekcijas tiek atkārtoti izmantotas bez Paragraph
+    marķējuma parsēšanas un attēlu atvēršanas.
+
+    Flowables glabā izkārtojuma stāvokli (wrap/split), tāpēc tos pašus objektus nedrīkst
+    izkārtot divos pavedienos vienlaikus – doc.build notiek zem `layout_lock`.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self._max_entries = max(1, int(max_entries))
+        self._items: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.layout_lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: str, build) -> list:
+        with self._lock:
+            flowables = self._items.get(key)
+            if flowables is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return list(flowables)
+        flowables = list(build())
+        with self._lock:
+            self._items[key] = flowables
+            self._items.move_to_end(key)
+            while len(self._items) > self._max_entries:
+                self._items.popitem(last=False)
+            self.misses += 1
+        return list(flowables)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+
+_pdf_section_cache = _PdfSectionCache()
+
+
+def _build_pdf_story(akta_dati: AktaDati, atcelšana: Optional[_AtcelšanasŽetons] = None,
+                     lauku_nospiedumi: dict = None):
+    """Sastāda galvenā akta ReportLab story (bez izkārtošanas). Atgriež (story, font_name, pagesize).
+
+    Story sastāv no _PDF_STORY_SECTIONS sekcijām; katra tiek ņemta no _pdf_section_cache,
+    ja tās lauki kopš iepriekšējās ģenerēšanas nav mainījušies. Atcelšanu pārbauda pirms katras sekcijas.
+    lauku_nospiedumi (no _AktaHashKoks) ļauj sekciju atslēgas veidot bez lauku pārhešošanas.
+    """
+    _ielādēt_reportlab()
+    lauku_nospiedumi = dict(lauku_nospiedumi or {})
+    font_name = reģistrēt_fontu(akta_dati.fonts_ceļš)
+    styles, bold_font_name = _build_pdf_styles(akta_dati, font_name)
+
+    # Ja nav iestatīts alternējošās rindas tonis, piešķiram klusu "enterprise" noklusējumu
+    if not getattr(akta_dati, "table_alternate_row_color", ""):
+        akta_dati.table_alternate_row_color = "#F8FAFC"
+        lauku_nospiedumi.pop("table_alternate_row_color", None)
+
+    page_size_map = {
+        "A4": A4, "Letter": letter, "Legal": legal, "A3": A3, "A5": A5
+    }
+    base_page_size = page_size_map.get(akta_dati.pdf_page_size, A4)
+
+    if akta_dati.pdf_page_orientation == "Ainava":
+        pagesize = landscape(base_page_size)
+    else:
+        pagesize = portrait(base_page_size)
+
+    available_width = pagesize[0] - float(akta_dati.pdf_margin_left) * mm - float(akta_dati.pdf_margin_right) * mm
+    common = (font_name, bold_font_name, tuple(pagesize), available_width,
+              _pdf_fields_digest(akta_dati, _PDF_STYLE_FIELDS, nospiedumi=lauku_nospiedumi))
+
+    story = []
+    for name, build_section, field_names in _PDF_STORY_SECTIONS:
+        if atcelšana is not None:
+            atcelšana.pārbaudīt()
+        build = lambda b=build_section: b(akta_dati, styles, font_name, bold_font_name, available_width)
+        if field_names is None:
+            story.extend(build())
+            continue
+        key = f"{name}:" + _pdf_fields_digest(akta_dati, field_names, extra=common, nospiedumi=lauku_nospiedumi)
+        story.extend(_pdf_section_cache.get_or_build(key, build))
+
+    # Footer ar ģenerēšanas laiku
+    if akta_dati.show_generation_timestamp:
+        story.append(Spacer(1, 12))
+        story.append(Paragraph(f"<font name='{font_name}'>Dokuments ģenerēts: {datetime.now().strftime('%Y-%m-%d %H:%M')}</font>", styles['LatvSmall']))
+
+    return story, font_name, pagesize
+
+
+class _PdfBuildPipeline:
+    """PDF eksporta konveijers ar nosauktiem posmiem.
+
+    story -> layout -> attachments -> decorations -> encryption
+
+    Katram posmam STAGES deklarē ieejas (citu posmu rezultātus). Rezultāts (arī kļūda)
+    tiek memoizēts, tāpēc viena eksporta laikā katrs posms izpildās ne vairāk kā vienu
+    reizi – pielikumi netiek konvertēti/pievienoti divreiz, dekorācijas netiek uzliktas
+    divreiz, šifrēšana notiek tikai vienreiz. Posmu ilgumi ir pieejami `timings`.
+
+    Ar `atcelšana` (_AtcelšanasŽetons) konveijers apstājas starp posmiem, pēc katra izkārtotā
+    flowable un pirms katra pielikuma, metot GenerēšanaAtcelta; paša izveidotais PDF tiek dzēsts.
+    `lauku_nospiedumi` (_AktaHashKoks.lauku_nospiedumi()) tiek izmantoti story sekciju atslēgām.
+    """
+
+    STAGES = {
+        "story": (),
+        "layout": ("story",),
+        "attachments": ("story", "layout"),
+        "decorations": ("story", "attachments"),
+        "encryption": ("layout", "decorations"),
+    }
+
+    def __init__(self, akta_dati: AktaDati, pdf_ceļš: str = None,
+                 include_reference_docs: bool = True, encrypt_pdf: bool = True,
+                 atcelšana: Optional[_AtcelšanasŽetons] = None, lauku_nospiedumi: dict = None):
+        _ielādēt_reportlab()
+        self.akta_dati = akta_dati
+        self.pdf_ceļš = pdf_ceļš
+        self.include_reference_docs = bool(include_reference_docs)
+        self.encrypt_pdf = bool(encrypt_pdf)
+        self.atcelšana = atcelšana
+        self.lauku_nospiedumi = lauku_nospiedumi
+        self.timings: dict = {}
+        self._results: dict = {}
+        self._errors: dict = {}
+        self._running: set = set()
+        self._tmp_root = None
+
+    def stage(self, name: str):
+        """Atgriež posma rezultātu; posms (un tā ieejas) tiek izpildīts tikai pirmajā izsaukumā."""
+        if name in self._results:
+            return self._results[name]
+        if name in self._errors:
+            raise self._errors[name]
+        if name in self._running:
+            raise RuntimeError(f"PDF posms '{name}' izsaukts rekursīvi")
+        self._running.add(name)
+        try:
+            inputs = [self.stage(dep) for dep in self.STAGES[name]]
+            self._pārbaudīt_atcelšanu()
+            t0 = time.perf_counter()
+            try:
+                result = getattr(self, f"_stage_{name}")(*inputs)
+            except Exception as e:
+                self._errors[name] = e
+                raise
+            finally:
+                self.timings[name] = time.perf_counter() - t0
+            self._results[name] = result
+            return result
+        finally:
+            self._running.discard(name)
+
+    def _pārbaudīt_atcelšanu(self, *_args):
+        if self.atcelšana is not None:
+            self.atcelšana.pārbaudīt()
+
+    def run(self) -> str:
+        """Izpilda visu konveijeru un atgriež gatavā PDF ceļu."""
+        pdf_path = None
+        try:
+            pdf_path = self.stage("layout")
+            try:
+                return self.stage("encryption")
+            except GenerēšanaAtcelta:
+                raise
+            except Exception as e:
+                # Pēcapstrādes kļūda nedrīkst pazaudēt jau izkārtoto PDF
+                print(f"PDF pēcapstrādes kļūda: {e}")
+                return pdf_path
+        except GenerēšanaAtcelta:
+            # Nepabeigtu PDF nevienam nenododam; izsaucēja norādīto ceļu neaiztiekam
+            if pdf_path and not self.pdf_ceļš:
+                try:
+                    os.remove(pdf_path)
+                except OSError:
+                    pass
+            raise
+        finally:
+            if self._tmp_root:
+                shutil.rmtree(self._tmp_root, ignore_errors=True)
+                self._tmp_root = None
+
+    # --- posmi ---
+
+    def _stage_story(self):
+        return _build_pdf_story(self.akta_dati, self.atcelšana, self.lauku_nospiedumi)
+
+    def _stage_layout(self, story_result) -> str:
+        story, _font_name, pagesize = story_result
+        akta_dati = self.akta_dati
+        pdf_ceļš = self.pdf_ceļš
+        # --- FIX v46: normalize pdf_ceļš if dict/tuple leaked from state ---
+        pdf_ceļš = _coerce_path(pdf_ceļš) or ""
+        own_temp = not pdf_ceļš
+        if own_temp:
+            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
+            pdf_ceļš = temp_file.name
+            temp_file.close()
+
+        doc = SimpleDocTemplate(
+            pdf_ceļš,
+            pagesize=pagesize,
+            leftMargin=float(akta_dati.pdf_margin_left) * mm,
+            rightMargin=float(akta_dati.pdf_margin_right) * mm,
+            topMargin=float(akta_dati.pdf_margin_top) * mm,
+            bottomMargin=float(akta_dati.pdf_margin_bottom) * mm,
+            title="Pieņemšanas–Nodošanas akts",
+        )
+        # Lapu numerācija šeit izslēgta – KOPĒJO numerāciju uzliek "decorations" posms.
+        # Story satur kešotas sekcijas, kas tiek koplietotas starp ģenerēšanām (sk. _PdfSectionCache).
+        # ReportLab izkārtošanas laikā atzīmē flowables (_postponed, keepWithNext); tāpat kā
+        # multiBuild, šīs izmaiņas savācam un pēc build atceļam, lai flowables var lietot atkārtoti.
+        with _pdf_section_cache.layout_lock:
+            edits = []
+            doc._multiBuildEdits = edits.append
+            # Atcelšana izkārtošanas vidū (story var būt simtiem lapu)
+            doc.afterFlowable = self._pārbaudīt_atcelšanu
+            try:
+                doc.build(story, canvasmaker=lambda *args, **kwargs: DecoratedCanvas(*args, akta_dati=akta_dati, show_page_numbers=False, **kwargs))
+            except GenerēšanaAtcelta:
+                if own_temp:
+                    try:
+                        os.remove(pdf_ceļš)
+                    except OSError:
+                        pass
+                raise
+            finally:
+                for edit in edits:
+                    try:
+                        edit[0](*edit[1:])
+                    except Exception:
+                        pass
+        return pdf_ceļš
+
+    def _stage_attachments(self, story_result, pdf_path: str):
+        """Galvenā PDF lapas + atsauces dokumentu lapas (Atvasinājums 1, 2, 3 ...) vienā sarakstā."""
+        from PyPDF2 import PdfReader
+        _story, font_name, pagesize = story_result
+        # Svarīgi Windows: PdfReader nolasa failu atmiņā, tāpēc to pašu ceļu drīkst pārrakstīt beigās.
+        pages = list(PdfReader(pdf_path).pages)
+        if self.include_reference_docs and (getattr(self.akta_dati, "atsauces_dokumenti_faili", []) or []):
+            self._tmp_root = tempfile.mkdtemp(prefix="akta_refs_")
+            try:
+                pages.extend(_collect_reference_doc_pages(self.akta_dati, self._tmp_root, pagesize=pagesize,
+                                                          font_name=font_name, atcelšana=self.atcelšana))
+            except GenerēšanaAtcelta:
+                raise
+            except Exception as e:
+                print(f"Atsauces dokumentu pievienošanas kļūda: {e}")
+        return pages
+
+    def _stage_decorations(self, story_result, pages: list) -> list:
+        """KOPĒJĀ lapu numerācija, skavotāja līnija un QR kods visām lapām (arī atvasinājumiem)."""
+        _story, font_name, _pagesize = story_result
+        return _decorate_pdf_pages(pages, self.akta_dati, font_name, self.atcelšana)
+
+    def _stage_encryption(self, pdf_path: str, pages: list) -> str:
+        """Pēc vajadzības šifrē un ieraksta gala PDF VIENU reizi."""
+        from PyPDF2 import PdfWriter
+        writer = PdfWriter()
+        for page in pages:
+            writer.add_page(page)
+        if self.encrypt_pdf and self.akta_dati.enable_pdf_encryption:
+            try:
+                _encrypt_pdf_writer(writer, self.akta_dati)
+            except Exception as e:
+                print(f"Error encrypting PDF: {e}")
+        _atomic_write_pdfwriter(pdf_path, writer)
+        return pdf_path
+
+
+def ģenerēt_pdf(akta_dati: AktaDati, pdf_ceļš: str = None, include_reference_docs: bool = True, encrypt_pdf: bool = True,
+                atcelšana: Optional[_AtcelšanasŽetons] = None, lauku_nospiedumi: dict = None):
+    """Ģenerē akta PDF caur _PdfBuildPipeline (PDF, ZIP, drukas, parakstīšanas un priekšskatījuma plūsmas).
+
+    Ar atcelšana žetonu ģenerēšanu var pārtraukt no cita pavediena (met GenerēšanaAtcelta);
+    lauku_nospiedumi ir _AktaHashKoks lauku nospiedumi tiem pašiem akta_dati.
+    """
+    return _PdfBuildPipeline(
+        akta_dati,
+        pdf_ceļš,
+        include_reference_docs=include_reference_docs,
+        encrypt_pdf=encrypt_pdf,
+        atcelšana=atcelšana,
+        lauku_nospiedumi=lauku_nospiedumi,
+    ).run()
+
+# ---------------------- DOCX ģenerēšana ----------------------
+# (unchanged, as DOCX generation is less flexible with advanced styling)
+def add_formatted_text(paragraph, text):
+    # ... (unchanged)
+    parts = []
+    current_text = ""
+    in_bold = False
+    in_italic = False
+    in_underline = False
+
+    i = 0
+    while i < len(text):
+        if text[i:i+3] == "<b>":
+            parts.append((current_text, in_bold, in_italic, in_underline))
+            current_text = ""
+            in_bold = True
+            i += 3
+        elif text[i:i+4] == "</b>":
+            parts.append((current_text, in_bold, in_italic, in_underline))
+            current_text = ""
+            in_bold = False
+            i += 4
+        elif text[i:i+3] == "<i>":
+            parts.append((current_text, in_bold, in_italic, in_underline))
+            current_text = ""
+            in_italic = True
+            i += 3
+        elif text[i:i+4] == "</i>":
+            parts.append((current_text, in_bold, in_italic, in_underline))
+            current_text = ""
+            in_italic = False
+            i += 4
+        elif text[i:i+3] == "<u>":
+            parts.append((current_text, in_bold, in_italic, in_underline))
+            current_text = ""
+            in_underline = True
+            i += 3
+        elif text[i:i+4] == "</u>":
+            parts.append((current_text, in_bold, in_italic, in_underline))
+            current_text = ""
+            in_underline = False
+            i += 4
+        else:
+            current_text += text[i]
+            i += 1
+    parts.append((current_text, in_bold, in_italic, in_underline))
+
+    for part_text, bold, italic, underline in parts:
+        if part_text:
+            run = paragraph.add_run(part_text)
+            run.bold = bold
+            run.italic = italic
+            run.underline = underline
+
+
+def _docx_replace_placeholders(document: 'Document', mapping: dict):
+    """Aizvieto {{atslēga}} vietturus visos paragrāfos un tabulās."""
+    def replace_in_runs(paragraph):
+        # Vienkārša aizvietošana (placeholders parasti ir vienā run, bet mēģinām droši)
+        full_text = ''.join(r.text for r in paragraph.runs)
+        if not full_text:
+            return
+        new_full = full_text
+        for k, v in mapping.items():
+            new_full = new_full.replace(f"{{{{{k}}}}}", str(v))
+        if new_full != full_text:
+            # Pārrakstām ar vienu run (saglabāt stilu precīzi ir sarežģīti)
+            for r in paragraph.runs:
+                r.text = ''
+            paragraph.runs[0].text = new_full if paragraph.runs else paragraph.add_run(new_full)
+
+    for p in document.paragraphs:
+        replace_in_runs(p)
+
+    for table in document.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                for p in cell.paragraphs:
+                    replace_in_runs(p)
+
+
+# ---------------------- DOCX vizuālie uzlabojumi (lai atbilst PDF) ----------------------
+
+def _docx_set_run_font(run: 'Run', *, bold: bool = False, size_pt: int | None = None,
+                       color_hex: str | None = None, name: str | None = None):
+    try:
+        run.bold = bool(bold)
+    except Exception:
+        pass
+    try:
+        if size_pt is not None:
+            run.font.size = Pt(size_pt)
+    except Exception:
+        pass
+    try:
+        if name:
+            run.font.name = name
+    except Exception:
+        pass
+    try:
+        if color_hex:
+            c = color_hex.strip().lstrip('#')
+            if len(c) == 6:
+                run.font.color.rgb = RGBColor(int(c[0:2], 16), int(c[2:4], 16), int(c[4:6], 16))
+    except Exception:
+        pass
+
+
+def _docx_set_paragraph_spacing(paragraph, *, before: int = 0, after: int = 0, line: float | None = None):
+    try:
+        pf = paragraph.paragraph_format
+        pf.space_before = Pt(before)
+        pf.space_after = Pt(after)
+        if line is not None:
+            pf.line_spacing = line
+    except Exception:
+        pass
+
+
+def _docx_set_table_borders(table, *, color: str = "000000", size: int = 8):
+    """Uzspiež redzamas tabulas līnijas (python-docx pēc noklusējuma bieži dod 'baltas' līnijas)."""
+    try:
+        tbl = table._tbl
+        tblPr = tbl.tblPr
+        if tblPr is None:
+            tblPr = OxmlElement('w:tblPr')
+            tbl.insert(0, tblPr)
+
+        tblBorders = tblPr.find(qn('w:tblBorders'))
+        if tblBorders is None:
+            tblBorders = OxmlElement('w:tblBorders')
+            tblPr.append(tblBorders)
+
+        for edge in ('top', 'left', 'bottom', 'right', 'insideH', 'insideV'):
+            elem = tblBorders.find(qn(f'w:{edge}'))
+            if elem is None:
+                elem = OxmlElement(f'w:{edge}')
+                tblBorders.append(elem)
+            elem.set(qn('w:val'), 'single')
+            elem.set(qn('w:sz'), str(size))
+            elem.set(qn('w:space'), '0')
+            elem.set(qn('w:color'), color)
+    except Exception:
+        pass
+
+
+def _docx_set_cell_shading(cell, fill: str):
+    try:
+        tcPr = cell._tc.get_or_add_tcPr()
+        shd = tcPr.find(qn('w:shd'))
+        if shd is None:
+            shd = OxmlElement('w:shd')
+            tcPr.append(shd)
+        shd.set(qn('w:val'), 'clear')
+        shd.set(qn('w:color'), 'auto')
+        shd.set(qn('w:fill'), fill)
+    except Exception:
+        pass
+
+
+def _docx_apply_pdf_like_theme(document: 'Document'):
+    """Vienkāršs 'PDF līdzīgs' noformējums: fonti, virsrakstu krāsa, atstarpes."""
+    try:
+        normal = document.styles['Normal']
+        normal.font.name = 'Calibri'
+        normal.font.size = Pt(10)
+    except Exception:
+        pass
+
+    # Heading krāsa (PDF stilā zilgana)
+    for st_name in ('Heading 1', 'Heading 2', 'Heading 3'):
+        try:
+            st = document.styles[st_name]
+            st.font.name = 'Calibri'
+            if st_name == 'Heading 1':
+                st.font.size = Pt(16)
+            elif st_name == 'Heading 2':
+                st.font.size = Pt(12)
+            else:
+                st.font.size = Pt(11)
+            st.font.bold = True
+            st.font.color.rgb = RGBColor(0x1F, 0x4E, 0x79)  # tumši zils (līdzīgs PDF)
+        except Exception:
+            pass
+
+
+def _docx_add_title_page_like_pdf(document: 'Document', akta_dati: AktaDati):
+    """Izveido titullapu (kā PDF): nosaukums, Akta Nr/Datums/Vieta + īss pušu kopsavilkums."""
+    # Logo augšā (ja ir)
+    if akta_dati.logotipa_ceļš and _path_exists(akta_dati.logotipa_ceļš):
+        try:
+            p = document.add_paragraph()
+            r = p.add_run()
+            r.add_picture(akta_dati.logotipa_ceļš, width=Inches(float(akta_dati.docx_image_width_inches)))
+            p.alignment = WD_ALIGN_PARAGRAPH.LEFT
+            _docx_set_paragraph_spacing(p, after=8)
+        except Exception:
+            pass
+
+    # Galvenais nosaukums centrā
+    p_title = document.add_paragraph()
+    p_title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    r = p_title.add_run('Pieņemšanas-Nodošanas Akts')
+    _docx_set_run_font(r, bold=True, size_pt=20, color_hex='000000')
+    _docx_set_paragraph_spacing(p_title, before=10, after=18)
+
+    # Akta metadati
+    meta_lines = [
+        f"Akta Nr.: {akta_dati.akta_nr}",
+        f"Datums: {akta_dati.datums}",
+        f"Vieta: {akta_dati.vieta}",
+    ]
+    if akta_dati.pasūtījuma_nr:
+        meta_lines.append(f"Pasūtījuma Nr.: {akta_dati.pasūtījuma_nr}")
+    if akta_dati.līguma_nr:
+        meta_lines.append(f"Līguma Nr.: {akta_dati.līguma_nr}")
+
+    p_meta = document.add_paragraph('\n'.join(meta_lines))
+    p_meta.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    _docx_set_paragraph_spacing(p_meta, after=14)
+
+    # Īss kopsavilkums par pusēm (kā PDF titullapā)
+    p = document.add_paragraph()
+    p.add_run(f"Pieņēmējs: {akta_dati.pieņēmējs.nosaukums}\n")
+    p.add_run(f"Pieņēmēja tālrunis: {akta_dati.pieņēmējs.tālrunis or ''}\n")
+    p.add_run(f"Nodevējs: {akta_dati.nodevējs.nosaukums}\n")
+    p.add_run(f"Nodevēja tālrunis: {akta_dati.nodevējs.tālrunis or ''}")
+    _docx_set_paragraph_spacing(p, after=10)
+
+    document.add_page_break()
+
+def _docx_set_run_font(run: 'Run', *, bold: bool = None, size_pt: int = None, color_hex: str = None, name: str = None):
+    try:
+        if bold is not None:
+            run.bold = bold
+        if size_pt is not None:
+            run.font.size = Pt(size_pt)
+        if name is not None:
+            run.font.name = name
+        if color_hex:
+            run.font.color.rgb = RGBColor.from_string(color_hex.replace('#', '').upper())
+    except Exception:
+        pass
+
+
+def _docx_set_paragraph_spacing(p, before_pt: int = 0, after_pt: int = 4, line: float = 1.0):
+    try:
+        pf = p.paragraph_format
+        pf.space_before = Pt(before_pt)
+        pf.space_after = Pt(after_pt)
+        # python-docx line_spacing expects a float multiplier or Length
+        pf.line_spacing = line
+    except Exception:
+        pass
+
+
+def _docx_set_cell_shading(cell, fill_hex: str):
+    """Uzstāda šūnas fona krāsu (piem., virsrindām / sadaļu blokiem)."""
+    try:
+        tc_pr = cell._tc.get_or_add_tcPr()
+        shd = OxmlElement('w:shd')
+        shd.set(qn('w:val'), 'clear')
+        shd.set(qn('w:color'), 'auto')
+        shd.set(qn('w:fill'), fill_hex.replace('#', '').upper())
+        tc_pr.append(shd)
+    except Exception:
+        pass
+
+
+def _docx_set_table_borders(table, *, color_hex: str = '000000', size: int = 12):
+    """Garantē redzamas tabulu līnijas (Word dažreiz iestata baltas/neredzamas)."""
+    try:
+        tbl = table._tbl
+        tbl_pr = tbl.tblPr
+        if tbl_pr is None:
+            tbl_pr = OxmlElement('w:tblPr')
+            tbl.append(tbl_pr)
+
+        # atrod vai izveido tblBorders
+        borders = tbl_pr.find(qn('w:tblBorders'))
+        if borders is None:
+            borders = OxmlElement('w:tblBorders')
+            tbl_pr.append(borders)
+
+        def _set_edge(tag):
+            edge = borders.find(qn(f'w:{tag}'))
+            if edge is None:
+                edge = OxmlElement(f'w:{tag}')
+                borders.append(edge)
+            edge.set(qn('w:val'), 'single')
+            edge.set(qn('w:sz'), str(size))
+            edge.set(qn('w:space'), '0')
+            edge.set(qn('w:color'), color_hex.replace('#', '').upper())
+
+        for t in ('top', 'left', 'bottom', 'right', 'insideH', 'insideV'):
+            _set_edge(t)
+    except Exception:
+        pass
+
+
+def _docx_make_heading(document: 'Document', text: str, level: int = 2, *, color_hex: str = '1F4E79'):
+    """Heading ar PDF līdzīgu zilo krāsu."""
+    p = document.add_heading(text, level=level)
+    try:
+        # Word Heading var būt vairākas runs
+        for r in p.runs:
+            _docx_set_run_font(r, bold=True, color_hex=color_hex)
+        _docx_set_paragraph_spacing(p, before_pt=8 if level <= 2 else 4, after_pt=4)
+    except Exception:
+        pass
+    return p
+
+
+def _docx_apply_default_styles(document: 'Document'):
+    """Iestata bāzes stilus, lai Word vizuāli būtu tuvāk PDF."""
+    try:
+        document.styles['Normal'].font.name = 'Calibri'
+        document.styles['Normal'].font.size = Pt(10)
+
+        # Heading 1
+        if 'Heading 1' in document.styles:
+            h1 = document.styles['Heading 1']
+            h1.font.name = 'Calibri'
+            h1.font.size = Pt(16)
+            h1.font.bold = True
+            h1.font.color.rgb = RGBColor.from_string('1F4E79')
+
+        # Heading 2
+        if 'Heading 2' in document.styles:
+            h2 = document.styles['Heading 2']
+            h2.font.name = 'Calibri'
+            h2.font.size = Pt(12)
+            h2.font.bold = True
+            h2.font.color.rgb = RGBColor.from_string('1F4E79')
+    except Exception:
+        pass
+
+
+def _docx_add_cover_page(document: 'Document', akta_dati: 'AktaDati'):
+    """Titullapa līdzīga PDF titullapai."""
+    # Top logo (ja ir)
+    if akta_dati.logotipa_ceļš and _path_exists(akta_dati.logotipa_ceļš):
+        try:
+            p_logo = document.add_paragraph()
+            p_logo.alignment = WD_ALIGN_PARAGRAPH.LEFT
+            p_logo.add_run().add_picture(akta_dati.logotipa_ceļš, width=Inches(1.8))
+            _docx_set_paragraph_spacing(p_logo, after_pt=16)
+        except Exception:
+            pass
+
+    # Liels virsraksts
+    p_title = document.add_paragraph()
+    p_title.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    r = p_title.add_run('Pieņemšanas-Nodošanas Akts')
+    _docx_set_run_font(r, bold=True, size_pt=20, color_hex='000000')
+    _docx_set_paragraph_spacing(p_title, before_pt=8, after_pt=18)
+
+    # Akta info
+    info_lines = [
+        ("Akta Nr.:", akta_dati.akta_nr),
+        ("Datums:", akta_dati.datums),
+        ("Vieta:", akta_dati.vieta),
+    ]
+    if akta_dati.pasūtījuma_nr:
+        info_lines.append(("Pasūtījuma Nr.:", akta_dati.pasūtījuma_nr))
+
+    p_info = document.add_paragraph()
+    p_info.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    for k, v in info_lines:
+        rrk = p_info.add_run(f"{k} ")
+        _docx_set_run_font(rrk, bold=True)
+        p_info.add_run(f"{v}\n")
+    _docx_set_paragraph_spacing(p_info, after_pt=18)
+
+    # Puses īsi (kā PDF titullapā)
+    p_parties = document.add_paragraph()
+    p_parties.alignment = WD_ALIGN_PARAGRAPH.LEFT
+    rr = p_parties.add_run(f"Pieņēmējs: ")
+    _docx_set_run_font(rr, bold=True)
+    p_parties.add_run(f"{akta_dati.pieņēmējs.nosaukums}\n")
+    rr = p_parties.add_run(f"Pieņēmēja tālrunis: ")
+    _docx_set_run_font(rr, bold=True)
+    p_parties.add_run(f"{akta_dati.pieņēmējs.tālrunis}\n")
+    rr = p_parties.add_run(f"Nodevējs: ")
+    _docx_set_run_font(rr, bold=True)
+    p_parties.add_run(f"{akta_dati.nodevējs.nosaukums}\n")
+    rr = p_parties.add_run(f"Nodevēja tālrunis: ")
+    _docx_set_run_font(rr, bold=True)
+    p_parties.add_run(f"{akta_dati.nodevējs.tālrunis}\n")
+    _docx_set_paragraph_spacing(p_parties, after_pt=8)
+
+    # Pāreja uz nākamo lapu
+    document.add_page_break()
+
+def ģenerēt_docx(akta_dati: AktaDati, docx_ceļš: str):
+    _ielādēt_docx()
+    # Ja ir norādīts DOCX šablons, ielādējam to; citādi veidojam jaunu dokumentu.
+    used_template = False
+    if getattr(akta_dati, "docx_template_path", "") and _path_exists(getattr(akta_dati, "docx_template_path", "")):
+        document = Document(_coerce_path(getattr(akta_dati, "docx_template_path", "")) or akta_dati.docx_template_path)
+        used_template = True
+        # Vietturu aizvietošana (ja šablonā izmanto {{akta_nr}}, {{datums}} utt.)
+        _docx_replace_placeholders(document, {
+            "akta_nr": akta_dati.akta_nr,
+            "datums": akta_dati.datums,
+            "vieta": akta_dati.vieta,
+            "pasūtījuma_nr": akta_dati.pasūtījuma_nr,
+            "pieņēmējs": akta_dati.pieņēmējs.nosaukums,
+            "nodevējs": akta_dati.nodevējs.nosaukums,
+            "valūta": akta_dati.valūta,
+        })
+        # Šablons var jau saturēt visu; ja gribi – tālāk pievienojam arī standarta sadaļas.
+    else:
+        document = Document()
+
+    # PDF-līdzīgs noformējums (fonti/Heading krāsa u.c.)
+    try:
+        _docx_apply_default_styles(document)
+    except Exception:
+        pass
+
+    # Titullapa (ja nav šablona). Šī ir 1:1 ideja kā PDF (logo + nosaukums + kopsavilkums)
+    if not used_template:
+        try:
+            _docx_add_cover_page(document, akta_dati)
+        except Exception:
+            pass
+
+    # (atstājam arī iepriekšējo iestatījumu drošībai, ja Word ignorē stilus)
+    document.styles['Normal'].font.name = 'Calibri'
+    document.styles['Normal'].font.size = Pt(10)
+
+    # Logo + virsraksts (kā PDF pirmajā saturiskajā lapā)
+    _main_logo_added = False
+    if akta_dati.logotipa_ceļš and _path_exists(akta_dati.logotipa_ceļš):
+        try:
+            p_logo2 = document.add_paragraph()
+            p_logo2.alignment = WD_ALIGN_PARAGRAPH.LEFT
+            p_logo2.add_run().add_picture(akta_dati.logotipa_ceļš, width=Inches(float(akta_dati.docx_image_width_inches)))
+            _docx_set_paragraph_spacing(p_logo2, after_pt=6)
+            _main_logo_added = True
+        except Exception:
+            pass
+
+    document.add_heading('PIEŅEMŠANAS–NODOŠANAS AKTS', level=1)
+    document.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+    # (vecais logo bloks atstāts drošībai, bet vairs nedublējam)
+    if (not _main_logo_added) and akta_dati.logotipa_ceļš and _path_exists(akta_dati.logotipa_ceļš):
+        try:
+            document.add_picture(akta_dati.logotipa_ceļš, width=Inches(float(akta_dati.docx_image_width_inches)))
+            document.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.LEFT
+        except Exception:
+            pass
+
+    add_formatted_text(document.add_paragraph(), f"<b>Akta Nr.:</b> {akta_dati.akta_nr}")
+    add_formatted_text(document.add_paragraph(), f"<b>Datums:</b> {akta_dati.datums}")
+    add_formatted_text(document.add_paragraph(), f"<b>Vieta:</b> {akta_dati.vieta}")
+    if akta_dati.pasūtījuma_nr:
+        add_formatted_text(document.add_paragraph(), f"<b>Pasūtījuma Nr.:</b> {akta_dati.pasūtījuma_nr}")
+
+    if akta_dati.līguma_nr:
+        add_formatted_text(document.add_paragraph(), f"<b>Līguma Nr.:</b> {akta_dati.līguma_nr}")
+    if akta_dati.izpildes_termiņš:
+        add_formatted_text(document.add_paragraph(), f"<b>Izpildes termiņš:</b> {akta_dati.izpildes_termiņš}")
+    if akta_dati.pieņemšanas_datums:
+        add_formatted_text(document.add_paragraph(), f"<b>Pieņemšanas datums:</b> {akta_dati.pieņemšanas_datums}")
+    if akta_dati.nodošanas_datums:
+        add_formatted_text(document.add_paragraph(), f"<b>Nodošanas datums:</b> {akta_dati.nodošanas_datums}")
+    document.add_paragraph()
+
+    document.add_heading('Puses', level=2)
+    table_parties = document.add_table(rows=1, cols=2)
+    table_parties.autofit = True
+    table_parties.columns[0].width = Inches(3)
+    table_parties.columns[1].width = Inches(3)
+
+    # TABULAS līnijas un galvenes fons (lai Word izskatās kā PDF)
+    try:
+        table_parties.style = 'Table Grid'
+    except Exception:
+        pass
+    _docx_set_table_borders(table_parties, color_hex='000000', size=12)
+
+    hdr_cells = table_parties.rows[0].cells
+    hdr_cells[0].text = "Pieņēmējs"
+    hdr_cells[1].text = "Nodevējs"
+
+    try:
+        for c in hdr_cells:
+            _docx_set_cell_shading(c, 'D9E1F2')  # gaiši zils, līdzīgs PDF blokam
+            for r in c.paragraphs[0].runs:
+                _docx_set_run_font(r, bold=True)
+            c.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+    except Exception:
+        pass
+
+    row_cells = table_parties.add_row().cells
+    def add_persona_info(cell, p: Persona):
+        add_formatted_text(cell.add_paragraph(), f"<b>Nosaukums / Vārds, Uzvārds:</b> {p.nosaukums}")
+        if p.reģ_nr: add_formatted_text(cell.add_paragraph(), f"<b>Reģ. Nr. / personas kods:</b> {p.reģ_nr}")
+        if p.adrese: add_formatted_text(cell.add_paragraph(), f"<b>Adrese:</b> {p.adrese}")
+        if p.kontaktpersona: add_formatted_text(cell.add_paragraph(), f"<b>Kontaktpersona:</b> {p.kontaktpersona}")
+        if getattr(p, 'amats', ''): add_formatted_text(cell.add_paragraph(), f"<b>Amats:</b> {p.amats}")
+        if getattr(p, 'pilnvaras_pamats', ''): add_formatted_text(cell.add_paragraph(), f"<b>Pilnvaras pamats:</b> {p.pilnvaras_pamats}")
+        if p.tālrunis: add_formatted_text(cell.add_paragraph(), f"<b>Tālrunis:</b> {p.tālrunis}")
+        if p.epasts: add_formatted_text(cell.add_paragraph(), f"<b>E-pasts:</b> {p.epasts}")
+        if p.bankas_konts: add_formatted_text(cell.add_paragraph(), f"<b>Bankas konts:</b> {p.bankas_konts}")
+        if p.juridiskais_statuss: add_formatted_text(cell.add_paragraph(), f"<b>Statuss:</b> {p.juridiskais_statuss}")
+
+    add_persona_info(row_cells[0], akta_dati.pieņēmējs)
+    add_persona_info(row_cells[1], akta_dati.nodevējs)
+    document.add_paragraph()
+
+    document.add_heading('Pozīcijas', level=2)
+    # Adjust columns based on visibility settings for DOCX
+    docx_headers = ["Nr.", "Apraksts", "Daudzums", "Vienība", "Cena", "Summa"]
+    if akta_dati.show_item_serial_number_in_table: docx_headers.append("Seriālais Nr.")
+    if akta_dati.show_item_warranty_in_table: docx_headers.append("Garantija")
+    if akta_dati.show_item_notes_in_table: docx_headers.append("Piezīmes pozīcijai")
+
+    table_items = document.add_table(rows=1, cols=len(docx_headers))
+    table_items.autofit = True
+    table_items.allow_autofit = True
+
+    # Nodrošinām redzamas līnijas + PDF līdzīgu virsrindas fonu
+    try:
+        table_items.style = 'Table Grid'
+    except Exception:
+        pass
+    _docx_set_table_borders(table_items, color_hex='000000', size=12)
+
+    for i, header_text in enumerate(docx_headers):
+        table_items.rows[0].cells[i].text = header_text
+        try:
+            _docx_set_cell_shading(table_items.rows[0].cells[i], 'D9E1F2')
+        except Exception:
+            pass
+        try:
+            for r in table_items.rows[0].cells[i].paragraphs[0].runs:
+                _docx_set_run_font(r, bold=True)
+            table_items.rows[0].cells[i].vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+        except Exception:
+            pass
+
+    for i, poz in enumerate(akta_dati.pozīcijas, start=1):
+        row_cells = table_items.add_row().cells
+        row_cells[0].text = str(i)
+        add_formatted_text(row_cells[1].paragraphs[0], poz.apraksts)
+        row_cells[2].text = f"{formēt_naudu(poz.daudzums)}"
+        row_cells[3].text = poz.vienība
+        row_cells[4].text = f"{formēt_naudu(poz.cena)} {akta_dati.valūta}"
+        row_cells[5].text = f"{formēt_naudu(poz.summa)} {akta_dati.valūta}"
+        col_idx = 6
+        if akta_dati.show_item_serial_number_in_table:
+            row_cells[col_idx].text = poz.seriālais_nr
+            col_idx += 1
+        if akta_dati.show_item_warranty_in_table:
+            row_cells[col_idx].text = poz.garantija
+            col_idx += 1
+        if akta_dati.show_item_notes_in_table:
+            add_formatted_text(row_cells[col_idx].paragraphs[0], poz.piezīmes_pozīcijai)
+
+    document.add_paragraph()
+
+    document.add_heading('Kopsavilkums', level=2)
+    add_formatted_text(document.add_paragraph(), f"<b>Kopā bez PVN:</b> {formēt_naudu(akta_dati.kopējā_summma())} {akta_dati.valūta}")
+    if akta_dati.iekļaut_pvn:
+        add_formatted_text(document.add_paragraph(), f"<b>PVN {akta_dati.pvn_likme}%:</b> {formēt_naudu(akta_dati.pvn_summa())} {akta_dati.valūta}")
+        add_formatted_text(document.add_paragraph(), f"<b>Kopā ar PVN:</b> {formēt_naudu(akta_dati.summa_ar_pvn())} {akta_dati.valūta}")
+    document.add_paragraph()
+
+    if akta_dati.piezīmes:
+        document.add_heading('Vispārīgās piezīmes', level=2)
+        add_formatted_text(document.add_paragraph(), akta_dati.piezīmes)
+        document.add_paragraph()
+
+    if akta_dati.strīdu_risināšana:
+        document.add_heading('Strīdu risināšanas kārtība', level=2)
+        add_formatted_text(document.add_paragraph(), akta_dati.strīdu_risināšana)
+        document.add_paragraph()
+
+    if akta_dati.konfidencialitātes_klauzula:
+        document.add_heading('Konfidencialitātes klauzula', level=2)
+        add_formatted_text(document.add_paragraph(), "Puses apņemas neizpaust trešajām personām informāciju, kas iegūta šī akta ietvaros, izņemot gadījumus, ko nosaka normatīvie akti.")
+        document.add_paragraph()
+
+    if akta_dati.soda_nauda_procenti > 0:
+        document.add_heading('Soda nauda', level=2)
+        add_formatted_text(document.add_paragraph(), f"Par saistību neizpildi vai nepienācīgu izpildi, vainīgā puse maksā otrai pusei soda naudu {formēt_naudu(akta_dati.soda_nauda_procenti)}% apmērā no neizpildīto saistību vērtības par katru kavējuma dienu.")
+        document.add_paragraph()
+
+    if akta_dati.piegādes_nosacījumi:
+        document.add_heading('Piegādes nosacījumi', level=2)
+        add_formatted_text(document.add_paragraph(), akta_dati.piegādes_nosacījumi)
+        document.add_paragraph()
+
+    if akta_dati.apdrošināšana:
+        document.add_heading('Apdrošināšana', level=2)
+        add_formatted_text(document.add_paragraph(), "Preces ir apdrošinātas pret bojājumiem un zaudējumiem līdz pieņemšanas-nodošanas brīdim.")
+        document.add_paragraph()
+
+    if akta_dati.papildu_nosacījumi:
+        document.add_heading('Papildu nosacījumi', level=2)
+        add_formatted_text(document.add_paragraph(), akta_dati.papildu_nosacījumi)
+        document.add_paragraph()
+
+    if akta_dati.atsauces_dokumenti:
+        document.add_heading('Atsauces dokumenti', level=2)
+        add_formatted_text(document.add_paragraph(), akta_dati.atsauces_dokumenti)
+        document.add_paragraph()
+
+    document.add_heading('Akta statuss', level=2)
+    add_formatted_text(document.add_paragraph(), akta_dati.akta_statuss)
+    document.add_paragraph()
+
+    if akta_dati.attēli:
+        document.add_heading('Pievienotās fotogrāfijas', level=2)
+        for att in akta_dati.attēli:
+            if os.path.exists(att.ceļš):
+                try:
+                    document.add_picture(att.ceļš, width=Inches(float(akta_dati.docx_image_width_inches)))
+                    if att.paraksts:
+                        add_formatted_text(document.add_paragraph(), att.paraksts)
+                except Exception:
+                    pass
+        document.add_paragraph()
+
+    if akta_dati.elektroniskais_paraksts:
+        if akta_dati.radit_elektronisko_parakstu_tekstu:
+            document.add_paragraph()
+            p = document.add_paragraph()
+            run = p.add_run("ŠIS DOKUMENTS PARAKSTĪTS AR DROŠU ELEKTRONISKO PARAKSTU UN SATUR LAIKA ZĪMOGU")
+            run.bold = True
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    elif akta_dati.parakstu_rindas:
+        document.add_heading('Paraksti', level=2)
+        table_signatures = document.add_table(rows=2, cols=2)
+        table_signatures.autofit = True
+        table_signatures.columns[0].width = Inches(3)
+        table_signatures.columns[1].width = Inches(3)
+
+        try:
+            table_signatures.style = 'Table Grid'
+        except Exception:
+            pass
+        _docx_set_table_borders(table_signatures, color_hex='000000', size=12)
+
+        table_signatures.rows[0].cells[0].text = "Pieņēmējs"
+        table_signatures.rows[0].cells[1].text = "Nodevējs"
+        for cell in table_signatures.rows[0].cells:
+            cell.paragraphs[0].runs[0].bold = True
+            cell.paragraphs[0].alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+        cell_pie = table_signatures.rows[1].cells[0]
+        cell_nod = table_signatures.rows[1].cells[1]
+
+        if akta_dati.paraksts_pieņēmējs_ceļš and _path_exists(akta_dati.paraksts_pieņēmējs_ceļš):
+            try:
+                cell_pie.add_paragraph().add_run().add_picture(akta_dati.paraksts_pieņēmējs_ceļš, width=Inches(
+                    float(akta_dati.docx_signature_width_inches)))
+                cell_pie.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            except Exception:
+                cell_pie.add_paragraph("____________________________")
+        else:
+            cell_pie.add_paragraph("____________________________")
+
+        if akta_dati.paraksts_nodevējs_ceļš and _path_exists(akta_dati.paraksts_nodevējs_ceļš):
+            try:
+                cell_nod.add_paragraph().add_run().add_picture(akta_dati.paraksts_nodevējs_ceļš, width=Inches(
+                    float(akta_dati.docx_signature_width_inches)))
+                cell_nod.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.CENTER
+            except Exception:
+                cell_nod.add_paragraph("____________________________")
+        else:
+            cell_nod.add_paragraph("____________________________")
+
+        add_formatted_text(cell_pie.add_paragraph(),
+                           akta_dati.pieņēmējs.kontaktpersona or akta_dati.pieņēmējs.nosaukums)
+        add_formatted_text(cell_nod.add_paragraph(), akta_dati.nodevējs.kontaktpersona or akta_dati.nodevējs.nosaukums)
+        for cell in [cell_pie, cell_nod]:
+            for p in cell.paragraphs:
+                p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+
+    # QR kodi DOCX dokumentā (ja ieslēgts)
+    try:
+        def _add_qr(data: str, size_mm: Decimal, align: str):
+            if not data:
+                return
+            qr_width_inches = float(size_mm) / 25.4
+            p = document.add_paragraph()
+            p.alignment = {"left": WD_ALIGN_PARAGRAPH.LEFT,
+                           "center": WD_ALIGN_PARAGRAPH.CENTER,
+                           "right": WD_ALIGN_PARAGRAPH.RIGHT}.get(align, WD_ALIGN_PARAGRAPH.RIGHT)
+            p.add_run().add_picture(io.BytesIO(_qr_service.png(data, border=2)), width=Inches(qr_width_inches))
+
+        if akta_dati.include_custom_qr_code and akta_dati.custom_qr_code_data:
+            _add_qr(akta_dati.custom_qr_code_data, akta_dati.custom_qr_code_size_mm, "right")
+        if akta_dati.include_auto_qr_code and akta_dati.akta_nr:
+            _add_qr(akta_dati.akta_nr, akta_dati.auto_qr_code_size_mm, "left")
+    except Exception as e:
+        print(f"DOCX QR kļūda: {e}")
+
+    # Vecais QR koda bloks, kas izmantoja neeksistējošus atribūtus.
+    # Šis bloks ir jāizdzēš vai jākomentē, jo jaunā funkcionalitāte to aizstāj.
+    # Ja vēlaties, lai DOCX ģenerēšana atbalstītu abus QR kodus, jums būtu jāpievieno līdzīga loģika kā PDF ģenerēšanā.
+    # Piemēram, ja vēlaties, lai tas izmantotu individuālo QR kodu:
+    # if akta_dati.include_custom_qr_code and akta_dati.custom_qr_code_data:
+    #     try:
+    #         import qrcode
+    #         qr = qrcode.QRCode(
+    #             version=1,
+    #             error_correction=qrcode.constants.ERROR_CORRECT_L,
+    #             box_size=10,
+    #             border=4,
+    #         )
+    #         qr.add_data(akta_dati.custom_qr_code_data)
+    #         qr.make(fit=True)
+    #         img_qr = qr.make_image(fill_color="black", back_color="white")
+    #         qr_temp_path = tempfile.NamedTemporaryFile(delete=False, suffix=".png").name
+    #         img_qr.save(qr_temp_path)
+    #
+    #         # DOCX attēla platums balstīts uz QR koda izmēru mm, konvertējot uz collām
+    #         qr_width_inches = float(akta_dati.custom_qr_code_size_mm) / 25.4
+    #         document.add_picture(qr_temp_path, width=Inches(qr_width_inches))
+    #         document.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.RIGHT  # Pēc noklusējuma labajā pusē
+    #         os.remove(qr_temp_path)  # Clean up temp file
+    #     except ImportError:
+    #         print("QR Code generation requires 'qrcode' library. Please install it: pip install qrcode")
+    #     except Exception as e:
+    #         print(f"Error generating QR code for DOCX: {e}")
+
+    add_formatted_text(document.add_paragraph(), f"Dokuments ģenerēts: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+    document.paragraphs[-1].alignment = WD_ALIGN_PARAGRAPH.RIGHT
+
+    document.save(docx_ceļš)
+
+
+# ---------------------- Projekta JSON ielāde (bez GUI) ----------------------
+
+def _lasīt_projekta_json(path: str):
+    """Nolasa projekta JSON, mēģinot vairākas kodēšanas (vecāki projekti var būt cp1257 u.c.)."""
+    encodings = ['utf-8', 'utf-8-sig', 'cp1257', 'iso-8859-1', 'windows-1252']
+    data = None
+
+    for encoding in encodings:
+        try:
+            with open(path, 'r', encoding=encoding) as f:
+                data = json.load(f)
+            break
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            continue
+
+    if data is None:
+        raise Exception("Neizdevās ielādēt failu ar nevienu no atbalstītajām kodēšanām")
+    return data
+
+
+def akta_dati_no_projekta(data: dict) -> AktaDati:
+    """Izveido AktaDati no saglabāta projekta JSON (tas pats formāts, ko lasa `ieladet_projektu`)."""
+    # Helper to safely get and convert Decimal values
+    def get_decimal(dict_obj, key, default_val):
+        val = dict_obj.get(key, default_val)
+        return to_decimal(val)
+
+    # Helper to safely get boolean values
+    def get_bool(dict_obj, key, default_val):
+        val = dict_obj.get(key, default_val)
+        return bool(val)
+
+    return AktaDati(
+        akta_nr=data.get('akta_nr', ''), datums=data.get('datums', ''), vieta=data.get('vieta', ''),
+        pasūtījuma_nr=data.get('pasūtījuma_nr', ''),
+        pieņēmējs=Persona(
+            nosaukums=data.get('pieņēmējs', {}).get('nosaukums', ''),
+            reģ_nr=data.get('pieņēmējs', {}).get('reģ_nr', ''),
+            adrese=data.get('pieņēmējs', {}).get('adrese', ''),
+            kontaktpersona=data.get('pieņēmējs', {}).get('kontaktpersona', ''),
+            amats=data.get('pieņēmējs', {}).get('amats', ''),
+            pilnvaras_pamats=data.get('pieņēmējs', {}).get('pilnvaras_pamats', ''),
+            tālrunis=data.get('pieņēmējs', {}).get('tālrunis', ''),
+            epasts=data.get('pieņēmējs', {}).get('epasts', ''),
+            web_lapa=data.get('pieņēmējs', {}).get('web_lapa', ''),
+            bankas_konts=data.get('pieņēmējs', {}).get('bankas_konts', ''),
+            juridiskais_statuss=data.get('pieņēmējs', {}).get('juridiskais_statuss', '')
+        ),
+        nodevējs=Persona(
+            nosaukums=data.get('nodevējs', {}).get('nosaukums', ''),
+            reģ_nr=data.get('nodevējs', {}).get('reģ_nr', ''),
+            adrese=data.get('nodevējs', {}).get('adrese', ''),
+            kontaktpersona=data.get('nodevējs', {}).get('kontaktpersona', ''),
+            amats=data.get('nodevējs', {}).get('amats', ''),
+            pilnvaras_pamats=data.get('nodevējs', {}).get('pilnvaras_pamats', ''),
+            tālrunis=data.get('nodevējs', {}).get('tālrunis', ''),
+            epasts=data.get('nodevējs', {}).get('epasts', ''),
+            web_lapa=data.get('nodevējs', {}).get('web_lapa', ''),
+            bankas_konts=data.get('nodevējs', {}).get('bankas_konts', ''),
+            juridiskais_statuss=data.get('nodevējs', {}).get('juridiskais_statuss', '')
+        ),
+        pozīcijas=[Pozīcija(
+            apraksts=p.get('apraksts', ''),
+            daudzums=get_decimal(p, 'daudzums', '0'),
+            vienība=p.get('vienība', 'gab.'),
+            cena=get_decimal(p, 'cena', '0'),
+            seriālais_nr=p.get('seriālais_nr', ''),
+            garantija=p.get('garantija', ''),
+            piezīmes_pozīcijai=p.get('piezīmes_pozīcijai', '')
+        ) for p in data.get('pozīcijas', [])],
+        attēli=[Attēls(**a) for a in data.get('attēli', [])],
+        piezīmes=data.get('piezīmes', ''), iekļaut_pvn=get_bool(data, 'iekļaut_pvn', False),
+        pvn_likme=get_decimal(data, 'pvn_likme', '21'),
+        parakstu_rindas=get_bool(data, 'parakstu_rindas', True),
+        logotipa_ceļš=data.get('logotipa_ceļš', ''), fonts_ceļš=data.get('fonts_ceļš', ''),
+        paraksts_pieņēmējs_ceļš=data.get('paraksts_pieņēmējs_ceļš', ''),
+        paraksts_nodevējs_ceļš=data.get('paraksts_nodevējs_ceļš', ''),
+        līguma_nr=data.get('līguma_nr', ''),
+        izpildes_termiņš=data.get('izpildes_termiņš', ''),
+        pieņemšanas_datums=data.get('pieņemšanas_datums', ''),
+        nodošanas_datums=data.get('nodošanas_datums', ''),
+        strīdu_risināšana=data.get('strīdu_risināšana', ''),
+        konfidencialitātes_klauzula=get_bool(data, 'konfidencialitātes_klauzula', False),
+        soda_nauda_procenti=get_decimal(data, 'soda_nauda_procenti', '0.0'),
+        piegādes_nosacījumi=data.get('piegādes_nosacījumi', ''),
+        apdrošināšana=get_bool(data, 'apdrošināšana', False),
+            apdrošināšana_teksts=data.get('apdrošināšana_teksts', ''),
+        papildu_nosacījumi=data.get('papildu_nosacījumi', ''),
+        atsauces_dokumenti=data.get('atsauces_dokumenti', ''),
+        akta_statuss=data.get('akta_statuss', 'Melnraksts'),
+        valūta=data.get('valūta', 'EUR'),
+        elektroniskais_paraksts=get_bool(data, 'elektroniskais_paraksts', False),
+        radit_elektronisko_parakstu_tekstu=get_bool(data, 'radit_elektronisko_parakstu_tekstu', False),
+        # JAUNA RINDAS
+        pdf_page_size=data.get('pdf_page_size', 'A4'),
+        pdf_page_orientation=data.get('pdf_page_orientation', 'Portrets'),
+        pdf_margin_left=get_decimal(data, 'pdf_margin_left', '18'),
+        pdf_margin_right=get_decimal(data, 'pdf_margin_right', '18'),
+        pdf_margin_top=get_decimal(data, 'pdf_margin_top', '16'),
+        pdf_margin_bottom=get_decimal(data, 'pdf_margin_bottom', '16'),
+        pdf_font_size_head=data.get('pdf_font_size_head', 14),
+        pdf_font_size_normal=data.get('pdf_font_size_normal', 10),
+        pdf_font_size_small=data.get('pdf_font_size_small', 9),
+        pdf_font_size_table=data.get('pdf_font_size_table', 9),
+        pdf_logo_width_mm=get_decimal(data, 'pdf_logo_width_mm', '35'),
+        pdf_signature_width_mm=get_decimal(data, 'pdf_signature_width_mm', '50'),
+        pdf_signature_height_mm=get_decimal(data, 'pdf_signature_height_mm', '20'),
+        docx_image_width_inches=get_decimal(data, 'docx_image_width_inches', '4'),
+        docx_signature_width_inches=get_decimal(data, 'docx_signature_width_inches', '1.5'),
+        table_col_widths=data.get('table_col_widths', '10,40,18,18,20,20,25,25,25'),
+        auto_generate_akta_nr=get_bool(data, 'auto_generate_akta_nr', False),
+        default_currency=data.get('default_currency', 'EUR'),
+        default_unit=data.get('default_unit', 'gab.'),
+        default_pvn_rate=get_decimal(data, 'default_pvn_rate', '21.0'),
+        poppler_path=data.get('poppler_path', ''),
+        # Load new settings
+        header_text_color=data.get('header_text_color', '#000000'),
+        footer_text_color=data.get('footer_text_color', '#000000'),
+        table_header_bg_color=data.get('table_header_bg_color', '#E0E0E0'),
+        table_grid_color=data.get('table_grid_color', '#CCCCCC'),
+        table_row_spacing=get_decimal(data, 'table_row_spacing', '4'),
+        line_spacing_multiplier=get_decimal(data, 'line_spacing_multiplier', '1.2'),
+        show_page_numbers=get_bool(data, 'show_page_numbers', True),
+        show_generation_timestamp=get_bool(data, 'show_generation_timestamp', True),
+        currency_symbol_position=data.get('currency_symbol_position', 'after'),
+        date_format=data.get('date_format', 'YYYY-MM-DD'),
+        signature_line_length_mm=get_decimal(data, 'signature_line_length_mm', '60'),
+        signature_line_thickness_pt=get_decimal(data, 'signature_line_thickness_pt', '0.5'),
+        add_cover_page=get_bool(data, 'add_cover_page', False),
+        cover_page_title=data.get('cover_page_title', 'Pieņemšanas-Nodošanas Akts'),
+        cover_page_logo_width_mm=get_decimal(data, 'cover_page_logo_width_mm', '80'),
+        # Individuālais QR kods
+        include_custom_qr_code=get_bool(data, 'include_custom_qr_code', False),
+        custom_qr_code_data=data.get('custom_qr_code_data', ''),
+        custom_qr_code_size_mm=get_decimal(data, 'custom_qr_code_size_mm', '20'),
+        custom_qr_code_position=data.get('custom_qr_code_position', 'bottom_right'),
+        custom_qr_code_pos_x_mm=get_decimal(data, 'custom_qr_code_pos_x_mm', '0'),
+        custom_qr_code_pos_y_mm=get_decimal(data, 'custom_qr_code_pos_y_mm', '0'),
+        custom_qr_code_color=data.get('custom_qr_code_color', '#000000'),
+
+        # Automātiskais QR kods (akta ID)
+        include_auto_qr_code=get_bool(data, 'include_auto_qr_code', False),
+        auto_qr_code_size_mm=get_decimal(data, 'auto_qr_code_size_mm', '20'),
+        auto_qr_code_position=data.get('auto_qr_code_position', 'bottom_left'),
+        auto_qr_code_pos_x_mm=get_decimal(data, 'auto_qr_code_pos_x_mm', '0'),
+        auto_qr_code_pos_y_mm=get_decimal(data, 'auto_qr_code_pos_y_mm', '0'),
+        auto_qr_code_color=data.get('auto_qr_code_color', '#000000'),
+
+        add_watermark=get_bool(data, 'add_watermark', False),
+        watermark_text=data.get('watermark_text', 'MELNRAKSTS'),
+        watermark_font_size=data.get('watermark_font_size', 72),
+        watermark_color=data.get('watermark_color', '#E0E0E0'),
+        watermark_rotation=data.get('watermark_rotation', 45),
+        enable_pdf_encryption=get_bool(data, 'enable_pdf_encryption', False),
+        pdf_user_password=data.get('pdf_user_password', ''),
+        pdf_owner_password=data.get('pdf_owner_password', ''),
+        allow_printing=get_bool(data, 'allow_printing', True),
+        allow_copying=get_bool(data, 'allow_copying', True),
+        allow_modifying=get_bool(data, 'allow_modifying', False),
+        allow_annotating=get_bool(data, 'allow_annotating', True),
+        default_country=data.get('default_country', 'Latvija'),
+        default_city=data.get('default_city', 'Rīga'),
+        show_contact_details_in_header=get_bool(data, 'show_contact_details_in_header', False),
+        contact_details_header_font_size=data.get('contact_details_header_font_size', 8),
+        item_image_width_mm=get_decimal(data, 'item_image_width_mm', '50'),
+        item_image_caption_font_size=data.get('item_image_caption_font_size', 8),
+        pdf_image_dpi=data.get('pdf_image_dpi', 200),
+        show_item_notes_in_table=get_bool(data, 'show_item_notes_in_table', True),
+        show_item_serial_number_in_table=get_bool(data, 'show_item_serial_number_in_table', True),
+        show_item_warranty_in_table=get_bool(data, 'show_item_warranty_in_table', True),
+        table_cell_padding_mm=get_decimal(data, 'table_cell_padding_mm', '2'),
+        table_header_font_style=data.get('table_header_font_style', 'bold'),
+        table_content_alignment=data.get('table_content_alignment', 'left'),
+        signature_font_size=data.get('signature_font_size', 9),
+        signature_spacing_mm=get_decimal(data, 'signature_spacing_mm', '10'),
+        document_title_font_size=data.get('document_title_font_size', 18),
+        document_title_color=data.get('document_title_color', '#000000'),
+        section_heading_font_size=data.get('section_heading_font_size', 12),
+        section_heading_color=data.get('section_heading_color', '#000000'),
+        paragraph_line_spacing_multiplier=get_decimal(data, 'paragraph_line_spacing_multiplier', '1.2'),
+        table_border_style=data.get('table_border_style', 'solid'),
+        table_border_thickness_pt=get_decimal(data, 'table_border_thickness_pt', '0.5'),
+        table_alternate_row_color=data.get('table_alternate_row_color', ''),
+        show_total_sum_in_words=get_bool(data, 'show_total_sum_in_words', False),
+        total_sum_in_words_language=data.get('total_sum_in_words_language', 'lv'),
+        default_vat_calculation_method=data.get('default_vat_calculation_method', 'exclusive'),
+        show_vat_breakdown=get_bool(data, 'show_vat_breakdown', True),
+        enable_digital_signature_field=get_bool(data, 'enable_digital_signature_field', False),
+        digital_signature_field_name=data.get('digital_signature_field_name', 'Paraksts'),
+        digital_signature_field_size_mm=get_decimal(data, 'digital_signature_field_size_mm', '40'),
+        digital_signature_field_position=data.get('digital_signature_field_position', 'bottom_center')
+    )
+
+
+def ielādēt_projekta_failu(path: str) -> AktaDati:
+    """Nolasa projekta JSON failu un atgriež AktaDati."""
+    return akta_dati_no_projekta(_lasīt_projekta_json(path))
+
+
+def _json_safe(o):
+    """Pārvērš Decimal un citus JSON-nederīgus tipus par drošu formu."""
+    if isinstance(o, Decimal):
+        return str(o)
+    if isinstance(o, dict):
+        return {k: _json_safe(v) for k, v in o.items()}
+    if isinstance(o, (list, tuple)):
+        return [_json_safe(v) for v in o]
+    return o
+
+
+def _rakstīt_akta_zip(zip_path: str, pdf_path: str, json_path: str, pielikumi: list):
+    """ZIP arhīvs: Akts.pdf + projekts.json + pielikumi/ (katrs atsevišķi, nosaukumi bez dublikātiem)."""
+    import zipfile
+    with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as z:
+        z.write(pdf_path, arcname="Akts.pdf")
+        z.write(json_path, arcname="projekts.json")
+
+        used = set()
+        for p in pielikumi or []:
+            p = _coerce_path(p)
+            if not p or not os.path.exists(p):
+                continue
+            base = os.path.basename(p)
+            name = base
+            k = 2
+            while name.lower() in used:
+                root, ext = os.path.splitext(base)
+                name = f"{root}_{k}{ext}"
+                k += 1
+            used.add(name.lower())
+            z.write(p, arcname=os.path.join("pielikumi", name))
+
+
+# ---------------------- Pakešu ģenerēšana (bez GUI) ----------------------
+
+BATCH_FORMATS = ("pdf", "docx", "zip")
+BATCH_SUMMARY_NAME = "kopsavilkums.json"
+
+
+def _pakešu_projekti(ievades: list) -> list:
+    """Izvērš CLI ievades par projektu JSON ceļu sarakstu (secība saglabāta, bez dublikātiem).
+
+    Ievade var būt mape (visi *.json tajā), manifests (.txt – viens ceļš rindā, '#' komentāri,
+    relatīvie ceļi pret manifesta mapi; vai .json ar ceļu sarakstu) vai projekta JSON.
+    """
+    out = []
+    seen = set()
+
+    def add(path):
+        key = os.path.normcase(os.path.abspath(path))
+        if key not in seen:
+            seen.add(key)
+            out.append(os.path.abspath(path))
+
+    def expand(item, base_dir, depth=0):
+        path = item if os.path.isabs(item) else os.path.join(base_dir, item)
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(".json") and name != BATCH_SUMMARY_NAME:
+                    add(os.path.join(path, name))
+            return
+        if depth > 2:
+            return
+        if path.lower().endswith(".json"):
+            try:
+                data = _lasīt_projekta_json(path)
+            except Exception:
+                data = None
+            if isinstance(data, list):
+                for entry in data:
+                    if isinstance(entry, str) and entry.strip():
+                        expand(entry.strip(), os.path.dirname(path), depth + 1)
+            else:
+                add(path)  # Projekta fails (kļūdainu JSON pamanīs un ziņos darbinieks)
+            return
+        try:
+            with open(path, "r", encoding="utf-8-sig") as f:
+                lines = f.read().splitlines()
+        except Exception as e:
+            print(f"Neizdevās nolasīt manifestu {path}: {e}")
+            return
+        for line in lines:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                expand(line, os.path.dirname(path), depth + 1)
+
+    for item in ievades or []:
+        expand(item, os.getcwd())
+    return out
+
+
+def _pakešu_darbinieka_sākums():
+    """Procesu pūla darbinieka inicializācija.
+
+    Katram procesam savs pagaidu LibreOffice profils (profilu nevar koplietot vairāki procesi)
+    un viens konvertētājs – paralēlismu jau dod procesu pūls.
+    """
+    global LIBREOFFICE_PROFILE_DIR, ATTACHMENT_CONVERSION_WORKERS
+    profile_root = tempfile.mkdtemp(prefix="akta_batch_lo_")
+    LIBREOFFICE_PROFILE_DIR = os.path.join(profile_root, "lo_profile")
+    ATTACHMENT_CONVERSION_WORKERS = 1
+
+    def _cleanup():
+        _stop_soffice_converter()
+        shutil.rmtree(profile_root, ignore_errors=True)
+
+    # atexit darbinieku procesos neizpildās; multiprocessing finalizatori – izpildās
+    import multiprocessing.util
+    multiprocessing.util.Finalize(None, _cleanup, exitpriority=10)
+
+
+def _pakešu_apstrādāt_projektu(projekta_ceļš: str, out_dir: str, base_name: str, formāti: tuple) -> dict:
+    """Ģenerē vienam projektam pieprasītos formātus; atgriež rezultātu ar laikiem (sekundēs)."""
+    rezultāts = {
+        "projekts": projekta_ceļš,
+        "ok": False,
+        "faili": {},
+        "laiki": {},
+        "pdf_posmi": {},
+        "kļūda": "",
+    }
+    t_start = time.perf_counter()
+    tmp_dir = None
+    try:
+        t0 = time.perf_counter()
+        d = ielādēt_projekta_failu(projekta_ceļš)
+        rezultāts["laiki"]["ielāde"] = round(time.perf_counter() - t0, 3)
+
+        pdf_path = None
+        if "pdf" in formāti or "zip" in formāti:
+            if "pdf" in formāti:
+                target = os.path.join(out_dir, f"{base_name}.pdf")
+            else:
+                tmp_dir = tempfile.mkdtemp(prefix="akta_batch_")
+                target = os.path.join(tmp_dir, "Akts.pdf")
+            t0 = time.perf_counter()
+            # Konveijers tieši (nevis ģenerēt_pdf), lai iegūtu posmu laikus
+            pipeline = _PdfBuildPipeline(d, target, include_reference_docs=True)
+            pdf_path = _coerce_path(pipeline.run()) or target
+            rezultāts["laiki"]["pdf"] = round(time.perf_counter() - t0, 3)
+            rezultāts["pdf_posmi"] = {k: round(v, 3) for k, v in pipeline.timings.items()}
+            if "pdf" in formāti:
+                rezultāts["faili"]["pdf"] = pdf_path
+
+        if "docx" in formāti:
+            docx_path = os.path.join(out_dir, f"{base_name}.docx")
+            t0 = time.perf_counter()
+            ģenerēt_docx(d, docx_path)
+            rezultāts["laiki"]["docx"] = round(time.perf_counter() - t0, 3)
+            rezultāts["faili"]["docx"] = docx_path
+
+        if "zip" in formāti:
+            zip_path = os.path.join(out_dir, f"{base_name}.zip")
+            t0 = time.perf_counter()
+            if tmp_dir is None:
+                tmp_dir = tempfile.mkdtemp(prefix="akta_batch_")
+            json_path = os.path.join(tmp_dir, "projekts.json")
+            with open(json_path, "w", encoding="utf-8") as f:
+                json.dump(_json_safe(asdict(d)), f, ensure_ascii=False, indent=2)
+            pielikumi = [getattr(a, "ceļš", a) for a in (getattr(d, "atsauces_dokumenti_faili", None) or [])]
+            _rakstīt_akta_zip(zip_path, pdf_path, json_path, pielikumi)
+            rezultāts["laiki"]["zip"] = round(time.perf_counter() - t0, 3)
+            rezultāts["faili"]["zip"] = zip_path
+
+        rezultāts["ok"] = True
+    except Exception as e:
+        rezultāts["kļūda"] = f"{type(e).__name__}: {e}"
+    finally:
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        rezultāts["laiki"]["kopā"] = round(time.perf_counter() - t_start, 3)
+    return rezultāts
+
+
+def pakešu_ģenerēšana(projekti: list, out_dir: str, formāti=("pdf",), workers: Optional[int] = None,
+                      kopsavilkums_ceļš: str = "", progress=print) -> dict:
+    """Ģenerē dokumentus daudziem projektiem ar procesu pūlu un ieraksta kopsavilkumu (JSON).
+
+    Katrs projekts tiek apstrādāts atsevišķā darbinieka procesā (ReportLab/PyPDF2 ir CPU
+    darbs, ko GIL neļauj paralelizēt pavedienos). Atgriež kopsavilkuma dict.
+    """
+    formāti = tuple(f for f in BATCH_FORMATS if f in set(formāti or ("pdf",)))
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Unikāli izvades nosaukumi (projekti no dažādām mapēm var saukties vienādi)
+    jobs = []
+    used = set()
+    for path in projekti:
+        base = drošs_faila_nosaukums(os.path.splitext(os.path.basename(path))[0]) or "akts"
+        name = base
+        k = 2
+        while name.lower() in used:
+            name = f"{base}_{k}"
+            k += 1
+        used.add(name.lower())
+        jobs.append((path, name))
+
+    workers = max(1, min(len(jobs) or 1, int(workers or os.cpu_count() or 1)))
+    order = {path: i for i, (path, _name) in enumerate(jobs)}
+    results = []
+
+    def report(r):
+        results.append(r)
+        if progress:
+            laiki = ", ".join(f"{k} {v:.2f}s" for k, v in r["laiki"].items())
+            status = "OK " if r["ok"] else "KĻŪDA"
+            line = f"[{len(results)}/{len(jobs)}] {status} {os.path.basename(r['projekts'])} ({laiki})"
+            if r["kļūda"]:
+                line += f" – {r['kļūda']}"
+            progress(line)
+
+    t_start = time.perf_counter()
+    if workers == 1:
+        for path, name in jobs:
+            report(_pakešu_apstrādāt_projektu(path, out_dir, name, formāti))
+    else:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        with ProcessPoolExecutor(max_workers=workers, initializer=_pakešu_darbinieka_sākums) as ex:
+            futures = {ex.submit(_pakešu_apstrādāt_projektu, path, out_dir, name, formāti): path for path, name in jobs}
+            for fut in as_completed(futures):
+                try:
+                    r = fut.result()
+                except Exception as e:
+                    # Piem., darbinieka process avarēja (BrokenProcessPool)
+                    r = {"projekts": futures[fut], "ok": False, "faili": {}, "laiki": {}, "pdf_posmi": {},
+                         "kļūda": f"{type(e).__name__}: {e}"}
+                report(r)
+    wall = time.perf_counter() - t_start
+
+    results.sort(key=lambda r: order.get(r["projekts"], 0))
+    ok = sum(1 for r in results if r["ok"])
+    kopsavilkums = {
+        "izveidots": datetime.now().isoformat(timespec="seconds"),
+        "izvades_mape": os.path.abspath(out_dir),
+        "formāti": list(formāti),
+        "darbinieki": workers,
+        "dokumenti": len(results),
+        "veiksmīgi": ok,
+        "neizdevās": len(results) - ok,
+        "kopējais_laiks_s": round(wall, 3),
+        "dokumentu_laiku_summa_s": round(sum(r["laiki"].get("kopā", 0.0) for r in results), 3),
+        "rezultāti": results,
+    }
+    summary_path = kopsavilkums_ceļš or os.path.join(out_dir, BATCH_SUMMARY_NAME)
+    try:
+        with open(summary_path, "w", encoding="utf-8") as f:
+            json.dump(kopsavilkums, f, ensure_ascii=False, indent=2)
+        kopsavilkums["kopsavilkuma_fails"] = summary_path
+    except Exception as e:
+        print(f"Neizdevās ierakstīt kopsavilkumu {summary_path}: {e}")
+    return kopsavilkums
+
+
+def _pakešu_cli(argv: list) -> int:
+    """Komandrinda: `python akta_kodols.py batch <mape|manifests|projekts.json> ...` (arī caur GUI skriptu)."""
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="akta_kodols.py batch",
+        description="Aktu pakešu ģenerēšana bez GUI no saglabātiem projektu JSON failiem.",
+    )
+    parser.add_argument("ievade", nargs="+",
+                        help="Projektu mape, manifests (.txt – viens ceļš rindā; .json – ceļu saraksts) vai projekta JSON")
+    parser.add_argument("-o", "--out", default="",
+                        help="Izvades mape (noklusējums: AktaGenerators_Output/Pakete_<datums_laiks>)")
+    parser.add_argument("-f", "--format", dest="formats", action="append", choices=BATCH_FORMATS,
+                        help="Izvades formāts; var norādīt vairākas reizes (noklusējums: pdf)")
+    parser.add_argument("-j", "--workers", type=int, default=0,
+                        help="Darbinieku procesu skaits (noklusējums: CPU kodolu skaits)")
+    parser.add_argument("--summary", default="",
+                        help=f"Kopsavilkuma JSON ceļš (noklusējums: <izvade>/{BATCH_SUMMARY_NAME})")
+    args = parser.parse_args(argv)
+
+    projekti = _pakešu_projekti(args.ievade)
+    if not projekti:
+        print("Nav atrasts neviens projekta JSON fails.")
+        return 2
+    out_dir = args.out or os.path.join(DEFAULT_OUTPUT_DIR, f"Pakete_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+
+    kopsavilkums = pakešu_ģenerēšana(projekti, out_dir, formāti=args.formats or ("pdf",),
+                                     workers=args.workers or None, kopsavilkums_ceļš=args.summary)
+    print(f"Gatavs: {kopsavilkums['veiksmīgi']}/{kopsavilkums['dokumenti']} dokumenti, "
+          f"{kopsavilkums['kopējais_laiks_s']:.2f}s ({kopsavilkums['darbinieki']} procesi; "
+          f"dokumentu laiku summa {kopsavilkums['dokumentu_laiku_summa_s']:.2f}s)")
+    if kopsavilkums.get("kopsavilkuma_fails"):
+        print(f"Kopsavilkums: {kopsavilkums['kopsavilkuma_fails']}")
+    return 0 if kopsavilkums["neizdevās"] == 0 else 1
+
+
+# ---------------------- Lokāls HTTP renderēšanas serviss ----------------------
+
+SERVICE_DEFAULT_PORT = 8765
+SERVICE_MAX_BODY_BYTES = 32 * 1024 * 1024  # Lielākais pieņemtais JSON pieprasījums
+SERVICE_CONTENT_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+
+
+def _servisa_darbinieka_sākums(warm_project: str = ""):
+    """Servisa darbinieka inicializācija: savs LibreOffice profils, tad iesildīšana.
+
+    Viens izmēģinājuma PDF (warm_project vai noklusējuma AktaDati) reģistrē fontus, uzbūvē
+    stilus un sadaļu/QR kešus un ielādē ReportLab/PyPDF2 moduļus; soffice tiek palaists
+    iepriekš, ja pieejams UNO. Pirmais īstais pieprasījums vairs nemaksā par to.
+    """
+    _pakešu_darbinieka_sākums()
+    try:
+        if warm_project:
+            d = ielādēt_projekta_failu(warm_project)
+        else:
+            d = AktaDati(akta_nr="WARMUP", datums=datetime.now().strftime("%Y-%m-%d"), pozīcijas=[Pozīcija("Iesildīšana", Decimal("1"), "gab.", Decimal("1"))])
+        tmp_dir = tempfile.mkdtemp(prefix="akta_srv_warm_")
+        try:
+            _PdfBuildPipeline(d, os.path.join(tmp_dir, "warm.pdf"), include_reference_docs=False).run()
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    except Exception as e:
+        print(f"Servisa darbinieka iesildīšana neizdevās: {e}")
+    for conv in _get_soffice_converters(1):
+        conv.warm()
+
+
+def _servisa_gatavs() -> int:
+    """No-op uzdevums, ar ko serveris startā piespiež palaist (un iesildīt) visus darbiniekus."""
+    return os.getpid()
+
+
+# AktaDati lauki ar failu ceļiem, ko servisa pieprasījums drīkst norādīt tikai zem --files-root
+_SERVISA_CEĻU_LAUKI = ("logotipa_ceļš", "fonts_ceļš", "paraksts_pieņēmējs_ceļš", "paraksts_nodevējs_ceļš",
+                       "docx_template_path", "poppler_path")
+
+
+def _akta_failu_ceļi(d: AktaDati) -> list:
+    """Visi AktaDati norādītie failu ceļi kā [(lauks, ceļš)] (tukšie izlaisti)."""
+    ceļi = [(name, getattr(d, name, "")) for name in _SERVISA_CEĻU_LAUKI]
+    for i, a in enumerate(getattr(d, "attēli", None) or []):
+        ceļi.append((f"attēli[{i}]", a.get("ceļš", "") if isinstance(a, dict) else getattr(a, "ceļš", a)))
+    for i, ref in enumerate(getattr(d, "atsauces_dokumenti_faili", None) or []):
+        ceļi.append((f"atsauces_dokumenti_faili[{i}]", ref.get("ceļš", "") if isinstance(ref, dict) else getattr(ref, "ceļš", ref)))
+    for i, poz in enumerate(getattr(d, "pozīcijas", None) or []):
+        ceļi.append((f"pozīcijas[{i}].attēla_ceļš", getattr(poz, "attēla_ceļš", "")))
+    return [(lauks, ceļš) for lauks, ceļš in ceļi if ceļš]
+
+
+def _servisa_neatļautie_ceļi(d: AktaDati, files_root: str = "") -> list:
+    """Lauki, kuru ceļi servisam nav atļauti: bez files_root – visi, citādi tie, kas nav zem tā."""
+    if not files_root:
+        return [lauks for lauks, _ceļš in _akta_failu_ceļi(d)]
+    sakne = os.path.realpath(files_root)
+    neatļauti = []
+    for lauks, ceļš in _akta_failu_ceļi(d):
+        p = _coerce_path(ceļš)
+        try:
+            atļauts = bool(p) and os.path.isabs(p) and os.path.commonpath([sakne, os.path.realpath(p)]) == sakne
+        except ValueError:
+            atļauts = False  # cits disks (Windows) vai nederīgs ceļš
+        if not atļauts:
+            neatļauti.append(lauks)
+    return neatļauti
+
+
+def _servisa_renderēt(data: dict, fmt: str, submitted_at: float) -> dict:
+    """Renderē vienu AktaDati JSON darbinieka procesā; atgriež faila baitus un laikus (s)."""
+    started_at = time.time()
+    t0 = time.perf_counter()
+    d = akta_dati_no_projekta(data)
+    tmp_dir = tempfile.mkdtemp(prefix="akta_srv_")
+    stages = {}
+    try:
+        out_path = os.path.join(tmp_dir, f"akts.{fmt}")
+        if fmt == "pdf":
+            pipeline = _PdfBuildPipeline(d, out_path, include_reference_docs=True)
+            out_path = _coerce_path(pipeline.run()) or out_path
+            stages = dict(pipeline.timings)
+        else:
+            ģenerēt_docx(d, out_path)
+        with open(out_path, "rb") as f:
+            body = f.read()
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return {
+        "body": body,
+        "akta_nr": d.akta_nr,
+        "queue_s": max(0.0, started_at - submitted_at),
+        "render_s": time.perf_counter() - t0,
+        "stages": stages,
+    }
+
+
+class _AktaRenderService:
+    """Lokāls HTTP serviss: AktaDati JSON -> PDF/DOCX ar iesildītu procesu pūlu.
+
+    POST /pdf, POST /docx  – ķermenis ir projekta JSON (tas pats formāts, ko saglabā GUI)
+    GET  /health           – stāvoklis (darbinieki, aizņemtās vietas rindā)
+
+    Vienlaikus apstrādē + rindā var būt ne vairāk kā workers + queue_size pieprasījumu;
+    pārējie uzreiz saņem 503 ar Retry-After (backpressure), nevis krājas atmiņā.
+    Katrai atbildei ir laika galvenes (X-Akta-*-Ms un Server-Timing).
+
+    Pret DNS rebinding un starpvietņu POST: Host galvenei jābūt localhost:<ports>, POST
+    ķermenim – Content-Type: application/json. Failu ceļi (logo, attēli, paraksti, fonts,
+    pielikumi) tiek pieņemti tikai zem files_root; ja tā nav norādīta – nekādi.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = SERVICE_DEFAULT_PORT, workers: Optional[int] = None,
+                 queue_size: int = 16, warm_project: str = "", files_root: str = ""):
+        import ipaddress
+        import socket
+        try:
+            addrs = {info[4][0] for info in socket.getaddrinfo(host, None)}
+            loopback = bool(addrs) and all(ipaddress.ip_address(a.split("%")[0]).is_loopback for a in addrs)
+        except Exception:
+            loopback = False
+        if not loopback:
+            raise ValueError(f"Serviss klausās tikai uz localhost (norādīts: {host})")
+        self.host = host
+        self.port = int(port)
+        self.workers = max(1, int(workers or min(4, os.cpu_count() or 1)))
+        self.queue_size = max(0, int(queue_size))
+        self.warm_project = warm_project or ""
+        self.files_root = os.path.realpath(files_root) if files_root else ""
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+        self._in_flight = 0
+        self._served = 0
+        self._rejected = 0
+        self._stats_lock = threading.Lock()
+        self._executor = None
+        self._httpd = None
+        self.warmup_s = 0.0
+
+    def start(self):
+        """Palaiž un iesilda darbiniekus, tad atver HTTP portu (serve_forever vēl nav izsaukts)."""
+        from concurrent.futures import ProcessPoolExecutor, wait
+
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_servisa_darbinieka_sākums,
+                                             initargs=(self.warm_project,))
+        t0 = time.perf_counter()
+        wait([self._executor.submit(_servisa_gatavs) for _ in range(self.workers)])
+        self.warmup_s = time.perf_counter() - t0
+        self._atvērt_http()
+        return self
+
+    def _atvērt_http(self):
+        """Atver HTTP portu ar šī servisa apstrādātāju (self.port=0 – brīvs ports)."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        service = self
+
+        class Handler(_AktaRenderHandler, BaseHTTPRequestHandler):
+            pass
+        Handler.service = service
+
+        self._httpd = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+
+    def serve_forever(self):
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self.close()
+
+    def close(self):
+        if self._httpd is not None:
+            self._httpd.server_close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def shutdown(self):
+        """Aptur serve_forever (no cita pavediena)."""
+        if self._httpd is not None:
+            self._httpd.shutdown()
+
+    def health(self) -> dict:
+        with self._stats_lock:
+            return {
+                "statuss": "ok",
+                "darbinieki": self.workers,
+                "rindas_izmērs": self.queue_size,
+                "aizņemts": self._in_flight,
+                "apkalpoti": self._served,
+                "noraidīti": self._rejected,
+            }
+
+    def atļautie_hosti(self) -> set:
+        """Host galvenes vērtības, ko serviss pieņem (DNS rebinding aizsardzība)."""
+        return {f"{h}:{self.port}" for h in ("127.0.0.1", "localhost", "[::1]", self.host.lower())}
+
+    def neatļautie_ceļi(self, data: dict) -> list:
+        """Projekta JSON lauki ar failu ceļiem, kas nav zem files_root (sk. _servisa_neatļautie_ceļi)."""
+        return _servisa_neatļautie_ceļi(akta_dati_no_projekta(data), self.files_root)
+
+    def render(self, data: dict, fmt: str):
+        """Atgriež darbinieka rezultātu vai None, ja rinda ir pilna (backpressure)."""
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self._rejected += 1
+            return None
+        with self._stats_lock:
+            self._in_flight += 1
+        try:
+            return self._executor.submit(_servisa_renderēt, data, fmt, time.time()).result()
+        finally:
+            with self._stats_lock:
+                self._in_flight -= 1
+                self._served += 1
+            self._slots.release()
+
+
+class _AktaRenderHandler:
+    """HTTP apstrādātājs (BaseHTTPRequestHandler jaukums – klasi sastāda _AktaRenderService.start)."""
+
+    service: _AktaRenderService = None
+    server_version = "AktaRender/1.0"
+
+    def _send_json(self, status: int, payload: dict, extra_headers: dict = None):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (extra_headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _host_atļauts(self) -> bool:
+        """Pārlūks pēc DNS rebinding sūta svešu Host – tādus pieprasījumus noraidām."""
+        if (self.headers.get("Host") or "").strip().lower() in self.service.atļautie_hosti():
+            return True
+        self._send_json(403, {"kļūda": "Neatļauta Host galvene"})
+        return False
+
+    def do_GET(self):
+        if not self._host_atļauts():
+            return
+        if self.path.split("?", 1)[0] == "/health":
+            self._send_json(200, self.service.health())
+        else:
+            self._send_json(404, {"kļūda": "Nav atrasts"})
+
+    def do_POST(self):
+        t_start = time.perf_counter()
+        if not self._host_atļauts():
+            return
+        fmt = self.path.split("?", 1)[0].strip("/").lower()
+        if fmt not in SERVICE_CONTENT_TYPES:
+            self._send_json(404, {"kļūda": "Izmantojiet POST /pdf vai POST /docx"})
+            return
+        # application/json pārlūkam prasa CORS preflight, tāpēc starpvietņu formas/fetch POST šeit netiek cauri
+        content_type = (self.headers.get("Content-Type") or "").split(";", 1)[0].strip().lower()
+        if content_type != "application/json":
+            self._send_json(415, {"kļūda": "Nepieciešams Content-Type: application/json"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length <= 0:
+            self._send_json(411 if length == 0 else 400, {"kļūda": "Nepieciešams Content-Length ar JSON ķermeni"})
+            return
+        if length > SERVICE_MAX_BODY_BYTES:
+            self._send_json(413, {"kļūda": f"Pieprasījums lielāks par {SERVICE_MAX_BODY_BYTES} baitiem"})
+            return
+        try:
+            data = json.loads(self.rfile.read(length).decode("utf-8"))
+            if not isinstance(data, dict):
+                raise ValueError("JSON saknei jābūt objektam")
+        except Exception as e:
+            self._send_json(400, {"kļūda": f"Nederīgs JSON: {e}"})
+            return
+        try:
+            neatļauti = self.service.neatļautie_ceļi(data)
+        except Exception as e:
+            self._send_json(400, {"kļūda": f"Nederīgi projekta dati: {type(e).__name__}: {e}"})
+            return
+        if neatļauti:
+            self._send_json(403, {"kļūda": "Failu ceļi atļauti tikai zem --files-root", "lauki": neatļauti})
+            return
+
+        try:
+            result = self.service.render(data, fmt)
+        except Exception as e:
+            self._send_json(500, {"kļūda": f"{type(e).__name__}: {e}"})
+            return
+        if result is None:
+            self._send_json(503, {"kļūda": "Serviss aizņemts, mēģiniet vēlreiz"}, {"Retry-After": "1"})
+            return
+
+        total_s = time.perf_counter() - t_start
+        body = result["body"]
+        timing = [f"queue;dur={result['queue_s'] * 1000:.1f}", f"render;dur={result['render_s'] * 1000:.1f}"]
+        timing += [f"{name};dur={dur * 1000:.1f}" for name, dur in result["stages"].items()]
+        timing.append(f"total;dur={total_s * 1000:.1f}")
+        name = drošs_faila_nosaukums(result.get("akta_nr") or "") or "akts"
+
+        self.send_response(200)
+        self.send_header("Content-Type", SERVICE_CONTENT_TYPES[fmt])
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Content-Disposition", f'attachment; filename="{name}.{fmt}"')
+        self.send_header("X-Akta-Queue-Ms", f"{result['queue_s'] * 1000:.1f}")
+        self.send_header("X-Akta-Render-Ms", f"{result['render_s'] * 1000:.1f}")
+        self.send_header("X-Akta-Total-Ms", f"{total_s * 1000:.1f}")
+        self.send_header("Server-Timing", ", ".join(timing))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _servisa_cli(argv: list) -> int:
+    """Komandrinda: `python akta_kodols.py serve [--port 8765] [-j 4] [--queue 16]`"""
+    import argparse
+    parser = argparse.ArgumentParser(
+        prog="akta_kodols.py serve",
+        description="Lokāls HTTP serviss aktu renderēšanai: POST /pdf vai /docx ar projekta JSON.",
+    )
+    parser.add_argument("--host", default="127.0.0.1", help="Tikai localhost adreses (noklusējums: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=SERVICE_DEFAULT_PORT, help=f"Ports (noklusējums: {SERVICE_DEFAULT_PORT})")
+    parser.add_argument("-j", "--workers", type=int, default=0, help="Darbinieku procesu skaits (noklusējums: min(4, CPU))")
+    parser.add_argument("--queue", type=int, default=16, help="Cik pieprasījumu drīkst gaidīt rindā, pirms atbild ar 503")
+    parser.add_argument("--warm", default="", help="Projekta JSON, ar ko iesildīt darbiniekus (fonti, stili, attēli)")
+    parser.add_argument("--files-root", default="",
+                        help="Mape, no kuras pieprasījumi drīkst norādīt failus (logo, attēli, pielikumi); bez tās – nekādus")
+    args = parser.parse_args(argv)
+
+    try:
+        service = _AktaRenderService(args.host, args.port, workers=args.workers or None,
+                                     queue_size=args.queue, warm_project=args.warm,
+                                     files_root=args.files_root).start()
+    except Exception as e:
+        print(f"Neizdevās palaist servisu: {e}")
+        return 2
+    print(f"Akta renderēšanas serviss: http://{args.host}:{service.port}/ "
+          f"({service.workers} darbinieki, rinda {service.queue_size}, iesildīts {service.warmup_s:.2f}s)")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    # python akta_kodols.py batch <mape|manifests|projekts.json> ...
+    # python akta_kodols.py serve [--port 8765]
+    args = sys.argv[1:]
+    if args and args[0] == "serve":
+        sys.exit(_servisa_cli(args[1:]))
+    if args and args[0] == "batch":
+        args = args[1:]
+    sys.exit(_pakešu_cli(args))
+
@@ -0,0 +1,55 @@
+"""Kopīgie pytest iestatījumi: repozitorija sakne importiem (akta_kodols, GUI modulis)."""
+import importlib.util
+import io
+import os
+import sys
+
+import pytest
+
+SAKNE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SAKNE not in sys.path:
+    sys.path.insert(0, SAKNE)
+
+
+def ielādēt_gui():
+    """GUI modulis (faila nosaukumā ir atstarpe, tāpēc ielādē pēc ceļa; bez displeja – offscreen)."""
+    if "akti_gui" not in sys.modules:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        spec = importlib.util.spec_from_file_location(
+            "akti_gui", os.path.join(SAKNE, "Pienemsanas-Nodosanas akti.py"))
+        m = importlib.util.module_from_spec(spec)
+        sys.modules["akti_gui"] = m
+        try:
+            spec.loader.exec_module(m)
+        except BaseException:
+            del sys.modules["akti_gui"]
+            raise
+    return sys.modules["akti_gui"]
+
+
+def aizstāt_pdftoppm(monkeypatch, gui, izmērs=lambda lapa, dpi: (dpi, dpi), krāsa="white") -> list:
+    """pdftoppm aizstājējs priekšskatījuma testiem (poppler rastrētājs bez Poppler).
+
+    Atdod PPM attēlu ar izmērs(lapa, dpi) pikseļiem un sarakstā piezīmē (lapa, dpi); lapa ir 1-bāzēta.
+    """
+    from PIL import Image
+    izsaukumi = []
+
+    def apakšprocess(cmd, atcelšana=None, timeout=None, text=False):
+        lapa, dpi = int(cmd[cmd.index("-f") + 1]), int(cmd[cmd.index("-r") + 1])
+        assert cmd[cmd.index("-l") + 1] == str(lapa)
+        izsaukumi.append((lapa, dpi))
+        buf = io.BytesIO()
+        Image.new("RGB", izmērs(lapa, dpi), krāsa).save(buf, "PPM")
+        return 0, buf.getvalue(), b""
+
+    monkeypatch.setattr(gui, "_atceļams_apakšprocess", apakšprocess)
+    monkeypatch.setattr(gui, "PREVIEW_RASTERIZER", "poppler")
+    return izsaukumi
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    """Viena QApplication visai testu sesijai (offscreen)."""
+    gui = ielādēt_gui()
+    return gui.QApplication.instance() or gui.QApplication([])
@@ -0,0 +1,131 @@
+"""Novecojušu būvju atcelšana: žetons, apakšprocesu nogalināšana, siltais UNO soffice un priekšskatījuma worker."""
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from conftest import ielādēt_gui
+
+import akta_kodols as ak
+
+_GULĒT = [sys.executable, "-c", "import time; time.sleep(30)"]
+
+
+def _atcelt_pēc(žetons, sekundes: float = 0.2):
+    taimeris = threading.Timer(sekundes, žetons.atcelt)
+    taimeris.start()
+    return taimeris
+
+
+def test_atcelsana_nogalina_apaksprocesu():
+    žetons = ak._AtcelšanasŽetons()
+    _atcelt_pēc(žetons)
+    sākums = time.monotonic()
+
+    with pytest.raises(ak.GenerēšanaAtcelta):
+        ak._atceļams_apakšprocess(_GULĒT, žetons)
+
+    assert time.monotonic() - sākums < 10
+
+
+def test_atcelts_zetons_aptur_pdf_buvi():
+    žetons = ak._AtcelšanasŽetons()
+    žetons.atcelt()
+
+    with pytest.raises(ak.GenerēšanaAtcelta):
+        ak.ģenerēt_pdf(ak.AktaDati(), include_reference_docs=False, encrypt_pdf=False, atcelšana=žetons)
+
+
+@pytest.fixture
+def uno(tmp_path, monkeypatch):
+    """_SofficeConverter UNO režīmā ar diviem gulošiem procesiem soffice un palīgprocesa vietā."""
+    conv = ak._SofficeConverter("soffice", str(tmp_path / "profils"))
+    starti = []
+
+    def ensure_started():
+        if conv._proc is None or conv._proc.poll() is not None:
+            conv._proc = subprocess.Popen(_GULĒT, **ak._soffice_popen_kwargs())
+            conv._helper = subprocess.Popen(_GULĒT, **ak._soffice_popen_kwargs())
+            starti.append((conv._proc, conv._helper))
+
+    monkeypatch.setattr(conv, "_ensure_started", ensure_started)
+    yield conv, starti
+    conv.stop()
+
+
+def test_uno_atcelsana_nogalina_silto_soffice_faila_vidu(uno, tmp_path, monkeypatch):
+    conv, starti = uno
+
+    def konvertē_lēni(_src, _out, _filtrs):
+        conv._helper.wait()  # kā palīgprocesa stdout beigas
+        raise RuntimeError("UNO palīgprocess beidza darbu")
+
+    monkeypatch.setattr(conv, "_helper_convert", konvertē_lēni)
+    žetons = ak._AtcelšanasŽetons()
+    _atcelt_pēc(žetons)
+
+    with pytest.raises(ak.GenerēšanaAtcelta):
+        conv._convert_uno([("a.docx", "pdf:writer_pdf_Export")], str(tmp_path), žetons)
+
+    soffice, palīgs = starti[0]
+    assert soffice.wait(timeout=10) is not None and palīgs.wait(timeout=10) is not None
+    assert conv._proc is None and conv._helper is None  # nākamā konvertēšana palaidīs no jauna
+
+
+def test_uno_pabeigts_fails_atcelsanai_vairs_nepieder(uno, tmp_path, monkeypatch):
+    conv, starti = uno
+    monkeypatch.setattr(conv, "_helper_convert", lambda _src, _out, _filtrs: {"ok": True})
+    žetons = ak._AtcelšanasŽetons()
+
+    conv._convert_uno([("a.docx", "pdf:writer_pdf_Export"), ("b.docx", "pdf:writer_pdf_Export")], str(tmp_path), žetons)
+    žetons.atcelt()  # piem. priekšskatījums atcelts vēlāk, izkārtošanas posmā
+    time.sleep(0.2)
+
+    assert len(starti) == 1
+    assert conv._proc.poll() is None and conv._helper.poll() is None
+
+
+def test_atcelts_worker_beidz_klusi(qapp, monkeypatch):
+    gui = ielādēt_gui()
+
+    def ģenerēt(*_a, atcelšana=None, **_k):
+        atcelšana.pārbaudīt()
+        pytest.fail("atcelta būve turpinājās")
+
+    monkeypatch.setattr(gui, "ģenerēt_pdf", ģenerēt)
+    worker = gui._PreviewBuildWorker(ak.AktaDati(), "h1", 0)
+    notikumi = []
+    worker.finished.connect(lambda h, n: notikumi.append(("beigas", h, n)))
+    worker.failed.connect(lambda h, e: notikumi.append(("kļūda", h, e)))
+
+    worker.pārtraukt()
+    worker.run()
+
+    assert notikumi == [("beigas", "h1", 0)]
+
+
+def test_logs_atcel_veco_buvi_un_atbrivo_vietu_jaunai(qapp):
+    gui = ielādēt_gui()
+
+    class Worker:
+        atcelts = False
+
+        def pārtraukt(self):
+            self.atcelts = True
+
+    w = gui.AktaLogs()
+    try:
+        thread, worker = object(), Worker()
+        w._preview_thread, w._preview_worker = thread, worker
+
+        w._atcelt_preview_darbu()
+
+        assert worker.atcelts
+        assert w._preview_thread is None and w._preview_worker is None
+        assert w._novecojušie_preview_darbi == [(thread, worker)]
+        w._cleanup_preview_thread_refs(thread)  # vecais thread beidzies
+        assert w._novecojušie_preview_darbi == []
+    finally:
+        w.deleteLater()
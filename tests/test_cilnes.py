@@ -0,0 +1,71 @@
+"""Cilnes pēc pieprasījuma: šabloni, adrešu grāmata, audit, vēsture un karte tiek uzbūvētas pirmajā atlasē."""
+import json
+
+import pytest
+from PySide6.QtGui import QCloseEvent
+
+from conftest import ielādēt_gui
+
+gui = ielādēt_gui()
+
+_SLINKĀS = ["Šabloni", "Adrešu grāmata", "Audit", "Dokumentu vēsture", "Karte"]
+
+
+@pytest.fixture
+def logs(qapp, tmp_path, monkeypatch):
+    pdf = tmp_path / "akts.pdf"
+    pdf.write_bytes(b"%PDF-1.4")
+    vēsture = tmp_path / "history.json"
+    vēsture.write_text(json.dumps([{"pdf": str(pdf), "json": "", "created": "2024-05-01T10:00:00"}]),
+                       encoding="utf-8")
+    monkeypatch.setattr(gui, "HISTORY_FILE", str(vēsture))
+    w = gui.AktaLogs()
+    yield w
+    w.deleteLater()
+
+
+def _cilnes(w) -> list:
+    return [w.tabs.tabText(i) for i in range(w.tabs.count())]
+
+
+def test_starta_cilnes_ir_tikai_vietturi(logs):
+    assert _cilnes(logs)[-5:] == _SLINKĀS
+    assert len(logs._slinkās_cilnes) == 5
+    for atribūts in ("sablonu_list", "address_book_list", "history_list", "_audit_filter"):
+        assert not hasattr(logs, atribūts)
+    assert not logs._vēsture_ielādēta
+    # Karte ir īsta cilnes lapa jau pirms uzbūvēšanas (setCurrentWidget no "adrese no kartes")
+    assert logs.tabs.indexOf(logs.tab_kartes) == _cilnes(logs).index("Karte")
+
+
+def test_cilne_tiek_uzbuveta_pirmaja_atlase(logs):
+    indekss = _cilnes(logs).index("Dokumentu vēsture")
+    vietturis = logs.tabs.widget(indekss)
+
+    logs.tabs.setCurrentIndex(indekss)
+
+    assert logs._vēsture_ielādēta and logs.history_list.count() == 1
+    assert "akts.pdf" in logs.history_list.item(0).text()
+    # Saturs ievietots vietturī – ciļņu secība un skaits nemainās
+    assert logs.tabs.widget(indekss) is vietturis and _cilnes(logs)[-5:] == _SLINKĀS
+    assert len(logs._slinkās_cilnes) == 4
+
+    saraksts = logs.history_list
+    logs.tabs.setCurrentIndex(0)
+    logs.tabs.setCurrentIndex(indekss)
+    assert logs.history_list is saraksts  # otrā atlasē netiek būvēta no jauna
+
+
+def test_aizverot_neielādētu_vesturi_nepārraksta(logs, monkeypatch):
+    saglabāts = []
+    monkeypatch.setattr(logs, "_save_history", lambda: saglabāts.append("vēsture"))
+    monkeypatch.setattr(logs, "_save_address_book", lambda: None)
+    monkeypatch.setattr(logs.text_block_manager, "_save_text_blocks", lambda: None)
+    monkeypatch.setattr(gui.QMessageBox, "question", staticmethod(lambda *a, **k: gui.QMessageBox.No))
+
+    logs.closeEvent(QCloseEvent())
+    assert saglabāts == []
+
+    logs._nodrošināt_vēsturi()
+    logs.closeEvent(QCloseEvent())
+    assert saglabāts == ["vēsture"]
@@ -0,0 +1,65 @@
+"""_FontRegistry: katrs TTF fails tiek parsēts un reģistrēts tikai vienreiz."""
+import os
+import shutil
+
+import pytest
+import reportlab
+
+import akta_kodols as ak
+
+_VERA = os.path.join(os.path.dirname(reportlab.__file__), "fonts")
+
+
+@pytest.fixture
+def fonts(tmp_path):
+    """Vera saime: regulārais, treknraksts (Bd) un treknais slīpraksts (BI)."""
+    for nosaukums in ("Vera.ttf", "VeraBd.ttf", "VeraBI.ttf"):
+        shutil.copy(os.path.join(_VERA, nosaukums), tmp_path / nosaukums)
+    return str(tmp_path / "Vera.ttf")
+
+
+@pytest.fixture
+def parsēšanas(monkeypatch):
+    ak._ielādēt_reportlab()
+    parsēti = []
+    oriģināls = ak.TTFont
+
+    def ttfont(name, path, *args, **kwargs):
+        parsēti.append(os.path.basename(path))
+        return oriģināls(name, path, *args, **kwargs)
+
+    monkeypatch.setattr(ak, "TTFont", ttfont)
+    return parsēti
+
+
+def test_fonts_tiek_registrets_vienreiz(fonts, parsēšanas):
+    reģistrs = ak._FontRegistry()
+
+    vārds = reģistrs.register(fonts)
+
+    assert reģistrs.register(fonts) == vārds
+    assert sorted(parsēšanas) == ["Vera.ttf", "VeraBI.ttf", "VeraBd.ttf"]
+    # Cits prefikss ir cits reģistrācijas nosaukums, bet tas pats fails
+    assert reģistrs.register(fonts, "Cits") != vārds
+
+
+def test_mainits_fails_tiek_registrets_no_jauna(fonts, parsēšanas):
+    reģistrs = ak._FontRegistry()
+    vārds = reģistrs.register(fonts)
+    st = os.stat(fonts)
+    os.utime(fonts, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert reģistrs.register(fonts) != vārds
+    assert parsēšanas.count("Vera.ttf") == 2
+
+
+def test_stilu_varianti_un_glifi(fonts):
+    reģistrs = ak._FontRegistry()
+    vārds = reģistrs.register(fonts)
+
+    assert reģistrs.bold_name(vārds) == f"{vārds}-bold"
+    assert reģistrs.bold_name("Helvetica") == "Helvetica-Bold"
+    assert ak.pdfmetrics.getFont(f"{vārds}-boldItalic").face is not None
+    # Vera satur tikai Latin-1 – latviešu garumzīmju tajā nav
+    assert "ā" in reģistrs.missing_glyphs(vārds, "Pārbaude")
+    assert reģistrs.covers(vārds, "Abc")
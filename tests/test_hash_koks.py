@@ -0,0 +1,131 @@
+"""_AktaHashKoks: sakne mainās tieši tad, kad mainās akta saturs (salīdzinot ar pilnu pārrēķinu)."""
+import copy
+import os
+from decimal import Decimal
+
+import pytest
+from PIL import Image
+
+import akta_kodols as ak
+
+RINDAS = 150  # vairāk nekā viens POZ_HASH_BLOKA_RINDAS bloks
+
+
+def _rinda(i: int, attēls: str = "") -> ak.Pozīcija:
+    return ak.Pozīcija(f"Prece {i}", Decimal(i), "gab.", Decimal("1.50"), seriālais_nr=f"SN{i}", attēla_ceļš=attēls)
+
+
+@pytest.fixture
+def attēls(tmp_path):
+    ceļš = tmp_path / "foto.png"
+    Image.new("RGB", (20, 20), (10, 160, 60)).save(ceļš)
+    return str(ceļš)
+
+
+@pytest.fixture
+def akts(attēls):
+    d = ak.AktaDati(akta_nr="H-1", datums="2024-05-01")
+    d.pozīcijas = [_rinda(i, attēls if i == 70 else "") for i in range(RINDAS)]
+    return d
+
+
+@pytest.fixture
+def koks(akts):
+    k = ak._AktaHashKoks()
+    k.atjaunot(akts)
+    return k
+
+
+def _atjaunot(koks, d, mainās: bool) -> str:
+    """Inkrementālā sakne = pilna pārrēķina sakne; tā mainās tikai, ja mainās saturs."""
+    iepriekš = koks.sakne
+    sakne = koks.atjaunot(d)
+    assert sakne == ak._AktaHashKoks().atjaunot(copy.deepcopy(d))
+    assert koks.lauku_nospiedumi()["pozīcijas"] == ak._akta_lauka_nospiedums("pozīcijas", d.pozīcijas)
+    assert (sakne != iepriekš) is mainās
+    return sakne
+
+
+def _pieskarties(ceļš: str):
+    st = os.stat(ceļš)
+    os.utime(ceļš, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_bez_izmaiņām_nekas_netiek_pārrēķināts(koks, akts):
+    _atjaunot(koks, akts, mainās=False)
+    assert koks.pārrēķinātās_lapas == 0
+
+
+def test_rindas_ievietošana_un_dzēšana(koks, akts):
+    sākums = koks.sakne
+    akts.pozīcijas.insert(5, _rinda(999))
+    _atjaunot(koks, akts, mainās=True)
+    # pārrēķināta tikai jaunā rinda (citas atrastas pēc identitātes), bloki un pozīciju lapa
+    assert koks.pārrēķinātās_lapas <= 1 + (RINDAS + 1) // ak.POZ_HASH_BLOKA_RINDAS + 2
+
+    del akts.pozīcijas[5]
+    assert _atjaunot(koks, akts, mainās=True) == sākums
+
+    del akts.pozīcijas[-1]
+    _atjaunot(koks, akts, mainās=True)
+
+
+def test_rindu_secības_maiņa(koks, akts):
+    sākums = koks.sakne
+    p = akts.pozīcijas
+    p[3], p[100] = p[100], p[3]
+    _atjaunot(koks, akts, mainās=True)
+    assert koks.pārrēķinātās_lapas < 10
+
+    p[3], p[100] = p[100], p[3]
+    assert _atjaunot(koks, akts, mainās=True) == sākums
+
+
+def test_vienādu_rindu_apmaiņa_saturu_nemaina(koks, akts):
+    akts.pozīcijas[10] = _rinda(11)
+    _atjaunot(koks, akts, mainās=True)
+    p = akts.pozīcijas
+    p[10], p[11] = p[11], p[10]
+    _atjaunot(koks, akts, mainās=False)
+
+
+def test_rindas_labojums_pēc_rindu_keša_atiestatīšanas(koks, akts):
+    # GUI pēc keša atiestatīšanas atdod jaunus Pozīcija objektus visām rindām
+    akts.pozīcijas = [copy.copy(p) for p in akts.pozīcijas]
+    _atjaunot(koks, akts, mainās=False)
+    assert koks.pārrēķinātās_lapas == RINDAS
+
+    akts.pozīcijas = [copy.copy(p) for p in akts.pozīcijas]
+    akts.pozīcijas[42].daudzums = Decimal("42.5")
+    _atjaunot(koks, akts, mainās=True)
+
+    # Decimal('1') un Decimal('1.0') PDF izskatās atšķirīgi, tāpēc arī nospiedums atšķiras
+    akts.pozīcijas = [copy.copy(p) for p in akts.pozīcijas]
+    akts.pozīcijas[1].daudzums = Decimal("1.0")
+    _atjaunot(koks, akts, mainās=True)
+
+
+def test_pozīcijas_attēla_pieskāriens(koks, akts, attēls):
+    sekcijas = koks.sekciju_nospiedumi()
+    _pieskarties(attēls)
+    _atjaunot(koks, akts, mainās=True)
+    assert koks.sekciju_nospiedumi()["pozīcijas"] != sekcijas["pozīcijas"]
+    assert koks.sekciju_nospiedumi()["iestatījumi"] == sekcijas["iestatījumi"]
+    _atjaunot(koks, akts, mainās=False)
+
+    Image.new("RGB", (30, 20), (200, 0, 0)).save(attēls)
+    _atjaunot(koks, akts, mainās=True)
+
+
+def test_logotipa_pieskāriens(tmp_path, koks, akts):
+    cits = tmp_path / "logo.png"
+    Image.new("RGB", (8, 8)).save(cits)
+    akts.logotipa_ceļš = str(cits)
+    _atjaunot(koks, akts, mainās=True)
+
+    sekcijas = koks.sekciju_nospiedumi()
+    _pieskarties(str(cits))
+    _atjaunot(koks, akts, mainās=True)
+    assert koks.pārrēķinātās_lapas == 1
+    assert koks.sekciju_nospiedumi()["pozīcijas"] == sekcijas["pozīcijas"]
+    assert koks.sekciju_nospiedumi()["iestatījumi"] != sekcijas["iestatījumi"]
@@ -0,0 +1,105 @@
+"""_IzmaiņuSekotājs: lauku izmaiņas no logrīku signāliem, undo ieraksti tikai ar mainīto vērtību."""
+import pytest
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QCheckBox, QComboBox, QLineEdit, QTableWidget, QTableWidgetItem, QVBoxLayout, QWidget
+
+from conftest import ielādēt_gui
+
+gui = ielādēt_gui()
+
+
+@pytest.fixture
+def forma(qapp):
+    sakne = QWidget()
+    lauks, izvēle, rūtiņa = QLineEdit(), QComboBox(), QCheckBox("PVN")
+    izvēle.addItems(["EUR", "USD"])
+    izkārtojums = QVBoxLayout(sakne)
+    for w in (lauks, izvēle, rūtiņa):
+        izkārtojums.addWidget(w)
+    sekotājs = gui._IzmaiņuSekotājs()
+    sekotājs.pievienot_bērnus(sakne, {id(lauks): "in_nr", id(izvēle): "in_valuta", id(rūtiņa): "pvn"})
+    ieraksti, netīrie = [], []
+    sekotājs.izmaiņa_pabeigta.connect(ieraksti.append)
+    sekotājs.lauks_mainīts.connect(netīrie.append)
+    yield sekotājs, lauks, izvēle, rūtiņa, ieraksti, netīrie
+    sakne.deleteLater()
+
+
+def test_lietotaja_rediģēšana_viens_ieraksts(forma):
+    sekotājs, lauks, _izvēle, _rūtiņa, ieraksti, netīrie = forma
+
+    QTest.keyClicks(lauks, "A-7")
+    assert ieraksti == [] and netīrie == ["in_nr"] * 3
+    lauks.editingFinished.emit()
+
+    assert ieraksti == [{"label": "FIELD_EDIT", "lauks": "in_nr", "vecā": "", "jaunā": "A-7"}]
+
+
+def test_programmatiska_vertiba_ir_netira_bet_bez_ieraksta(forma):
+    sekotājs, lauks, izvēle, _rūtiņa, ieraksti, netīrie = forma
+
+    lauks.setText("no projekta")
+    lauks.editingFinished.emit()
+    sekotājs.apturēt()
+    izvēle.setCurrentIndex(1)
+    sekotājs.atsākt()
+
+    assert ieraksti == [] and netīrie == ["in_nr", "in_valuta"]
+
+
+def test_piemerot_atsauc_un_atkarto_bez_jauniem_ierakstiem(forma):
+    sekotājs, _lauks, izvēle, rūtiņa, ieraksti, _netīrie = forma
+
+    izvēle.setCurrentIndex(1)
+    rūtiņa.setChecked(True)
+    assert ieraksti == [{"label": "COMBO_CHANGE", "lauks": "in_valuta", "vecā": "EUR", "jaunā": "USD"},
+                        {"label": "CHECK_TOGGLE", "lauks": "pvn", "vecā": False, "jaunā": True}]
+
+    for ieraksts in reversed(list(ieraksti)):
+        sekotājs.piemērot(ieraksts, atsaukt=True)
+    assert izvēle.currentText() == "EUR" and not rūtiņa.isChecked()
+    sekotājs.piemērot(ieraksti[0], atsaukt=False)
+    assert izvēle.currentText() == "USD"
+    assert len(ieraksti) == 2
+
+
+def test_tabulas_sunas_apvienotas_un_parbiditas(qapp):
+    tab = QTableWidget(3, 2)
+    for r in range(3):
+        for c in range(2):
+            tab.setItem(r, c, QTableWidgetItem(f"{r}{c}"))
+    sekotājs = gui._IzmaiņuSekotājs()
+    sekotājs.pievienot_tabulu(tab, izlaistās_kolonnas=(1,))
+    ieraksti, pārbīdes = [], []
+    sekotājs.izmaiņa_pabeigta.connect(ieraksti.append)
+    sekotājs.tabulas_rindas_pārbīdītas.connect(lambda first, n: pārbīdes.append((first, n)))
+
+    tab.item(1, 0).setText("x")
+    tab.item(1, 0).setText("y")
+    tab.item(1, 1).setText("summa")  # aprēķināta kolonna – undo neiekļauj
+    tab.insertRow(0)
+    sekotājs.pabeigt_visus()
+
+    assert pārbīdes == [(0, 1)]
+    assert ieraksti == [{"label": "POZ_CHANGE", "šūnas": [(2, 0, "10", "y")]}]
+    tab.deleteLater()
+
+
+def test_logs_undo_redo_ar_lauka_ierakstu(qapp):
+    w = gui.AktaLogs()
+    try:
+        w._undo_mgr.retain(lambda _st: False)
+        w.in_vieta.setFocus()
+        QTest.keyClicks(w.in_vieta, "Cesis")  # QTest.keyClicks pieņem tikai ASCII
+        w.in_vieta.editingFinished.emit()
+
+        ieraksts = w._undo_mgr.peek_undo()
+        assert {k: v for k, v in ieraksts.items() if not k.startswith("_")} == \
+            {"label": "FIELD_EDIT", "lauks": "in_vieta", "vecā": "", "jaunā": "Cesis"}
+
+        w.undo_action()
+        assert w.in_vieta.text() == "" and w._undo_mgr._redo == [ieraksts]
+        w.redo_action()
+        assert w.in_vieta.text() == "Cesis" and w._undo_mgr._undo[-1] is ieraksts and w._undo_mgr._redo == []
+    finally:
+        w.deleteLater()
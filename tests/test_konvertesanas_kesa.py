@@ -0,0 +1,80 @@
+"""Konvertēto pielikumu kešs: trāpījumi, LRU izmešana un atmiņā uzturētais izmērs."""
+import os
+
+import pytest
+
+import akta_kodols as ak
+
+
+def _fails(ceļš, saturs: bytes) -> str:
+    with open(ceļš, "wb") as f:
+        f.write(saturs)
+    return str(ceļš)
+
+
+@pytest.fixture
+def kešs(tmp_path):
+    return ak._ConversionCache(str(tmp_path / "kešs"), max_bytes=1000)
+
+
+def test_trapijums_un_netrapijums(kešs, tmp_path):
+    avots = _fails(tmp_path / "a.xlsx", b"tabula")
+    pdf = _fails(tmp_path / "a.pdf", b"%PDF-1" + b"x" * 100)
+
+    atslēga = kešs.key_for(avots, "pdf:calc_pdf_Export")
+    assert kešs.get(atslēga) is None
+    ierakstīts = kešs.put(atslēga, pdf)
+    assert ierakstīts != pdf and kešs.get(atslēga) == ierakstīts
+
+    # Cits filtrs vai mainīts saturs -> cita atslēga; pārdēvēts fails ar to pašu saturu -> tā pati
+    assert kešs.get(kešs.key_for(avots, "pdf:writer_pdf_Export")) is None
+    pārdēvēts = _fails(tmp_path / "b.xlsx", b"tabula")
+    assert kešs.key_for(pārdēvēts, "pdf:calc_pdf_Export") == atslēga
+    _fails(tmp_path / "a.xlsx", b"cita tabula")
+    assert kešs.get(kešs.key_for(avots, "pdf:calc_pdf_Export")) is None
+
+
+def test_izmet_vecak_lietotos(kešs, tmp_path):
+    pdf = _fails(tmp_path / "x.pdf", b"x" * 400)
+    atslēgas = [f"{i:02d}" + "0" * 62 for i in range(3)]
+    for i, atslēga in enumerate(atslēgas[:2]):
+        kešs.put(atslēga, pdf)
+        os.utime(kešs._entry_path(atslēga), (1000 + i, 1000 + i))
+    kešs.get(atslēgas[0])  # trāpījums padara pirmo par jaunāko
+
+    kešs.put(atslēgas[2], pdf)
+
+    assert kešs.get(atslēgas[1]) is None
+    assert kešs.get(atslēgas[0]) and kešs.get(atslēgas[2])
+    assert kešs.total_bytes == 800
+
+
+def test_mapi_staiga_tikai_parsniedzot_robezu(kešs, tmp_path, monkeypatch):
+    os.makedirs(os.path.join(kešs.cache_dir, "ab"))
+    _fails(os.path.join(kešs.cache_dir, "ab", "ab" + "0" * 62 + ".pdf"), b"y" * 300)
+    pdf = _fails(tmp_path / "x.pdf", b"x" * 200)
+    skenēšanas = []
+    oriģināls = kešs._scan
+    monkeypatch.setattr(kešs, "_scan", lambda: skenēšanas.append(1) or oriģināls())
+
+    kešs.put("01" + "0" * 62, pdf)
+    kešs.put("02" + "0" * 62, pdf)
+    kešs.put("02" + "0" * 62, pdf)  # pārrakstīts ieraksts netiek ieskaitīts divreiz
+    assert len(skenēšanas) == 1  # tikai sākotnējā pārskatīšana
+    assert kešs.total_bytes == 700
+
+    kešs.put("03" + "0" * 62, pdf)
+    kešs.put("04" + "0" * 62, pdf)
+    assert len(skenēšanas) == 2
+    assert kešs.total_bytes <= kešs.max_bytes
+
+
+def test_hesu_atmina_ir_ierobezota(tmp_path):
+    kešs = ak._ConversionCache(str(tmp_path / "kešs"), digest_entries=2)
+    faili = [_fails(tmp_path / f"{i}.docx", bytes([i]) * 10) for i in range(3)]
+    for ceļš in faili:
+        kešs.key_for(ceļš, "pdf:writer_pdf_Export")
+    kešs.key_for(faili[1], "pdf:writer_pdf_Export")
+
+    assert len(kešs._digests) == 2
+    assert [k[0] for k in kešs._digests] == [os.path.abspath(faili[2]), os.path.abspath(faili[1])]
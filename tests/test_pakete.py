@@ -0,0 +1,83 @@
+"""Pakešu ģenerēšana (`batch`): divi projekti ar diviem darbinieku procesiem, izvades faili un kopsavilkums."""
+import json
+import os
+import zipfile
+from dataclasses import asdict
+from decimal import Decimal
+
+import pytest
+from PyPDF2 import PdfReader
+
+import akta_kodols as ak
+
+
+def _projekts(mape, nosaukums: str, akta_nr: str) -> str:
+    d = ak.AktaDati(akta_nr=akta_nr, datums="2024-05-01", vieta="Rīga", show_generation_timestamp=False)
+    d.pozīcijas = [ak.Pozīcija(f"Prece {akta_nr}", Decimal("2"), "gab.", Decimal("4.00"))]
+    ceļš = mape / nosaukums
+    ceļš.write_text(json.dumps(ak._json_safe(asdict(d)), ensure_ascii=False), encoding="utf-8")
+    return str(ceļš)
+
+
+@pytest.fixture
+def projekti(tmp_path):
+    mape = tmp_path / "projekti"
+    mape.mkdir()
+    return [_projekts(mape, "pirmais.json", "P-1"), _projekts(mape, "otrais.json", "P-2")]
+
+
+def _kopsavilkums(out) -> dict:
+    with open(out / ak.BATCH_SUMMARY_NAME, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_divi_projekti_ar_diviem_darbiniekiem(tmp_path, projekti, capsys):
+    out = tmp_path / "izvade"
+    kods = ak._pakešu_cli([os.path.dirname(projekti[0]), "-o", str(out), "-j", "2", "-f", "pdf", "-f", "zip"])
+
+    assert kods == 0
+    assert "Gatavs: 2/2 dokumenti" in capsys.readouterr().out
+    assert sorted(os.listdir(out)) == sorted([ak.BATCH_SUMMARY_NAME, "otrais.pdf", "otrais.zip",
+                                              "pirmais.pdf", "pirmais.zip"])
+    for base, akta_nr in (("pirmais", "P-1"), ("otrais", "P-2")):
+        assert f"Akta Nr.: {akta_nr}" in PdfReader(str(out / f"{base}.pdf")).pages[0].extract_text()
+        with zipfile.ZipFile(out / f"{base}.zip") as z:
+            assert sorted(z.namelist()) == ["Akts.pdf", "projekts.json"]
+            assert json.loads(z.read("projekts.json"))["akta_nr"] == akta_nr
+
+    k = _kopsavilkums(out)
+    assert (k["dokumenti"], k["veiksmīgi"], k["neizdevās"], k["darbinieki"]) == (2, 2, 0, 2)
+    assert k["formāti"] == ["pdf", "zip"]
+    assert k["izvades_mape"] == str(out)
+    # Rezultāti projektu secībā (direktorija – alfabētiski), neatkarīgi no pabeigšanas secības
+    assert [r["projekts"] for r in k["rezultāti"]] == sorted(projekti)
+    for r in k["rezultāti"]:
+        base = os.path.splitext(os.path.basename(r["projekts"]))[0]
+        assert r["ok"] and r["kļūda"] == ""
+        assert r["faili"] == {"pdf": str(out / f"{base}.pdf"), "zip": str(out / f"{base}.zip")}
+        assert set(r["laiki"]) == {"ielāde", "pdf", "zip", "kopā"}
+        assert list(r["pdf_posmi"]) == list(ak._PdfBuildPipeline.STAGES)
+    assert k["dokumentu_laiku_summa_s"] == pytest.approx(sum(r["laiki"]["kopā"] for r in k["rezultāti"]), abs=0.01)
+
+
+def test_kļūdains_projekts_un_vienādi_nosaukumi(tmp_path, projekti):
+    cita = tmp_path / "cita"
+    cita.mkdir()
+    vienāds = _projekts(cita, "pirmais.json", "P-3")
+    bojāts = cita / "bojats.json"
+    bojāts.write_text("{nav json", encoding="utf-8")
+    manifests = tmp_path / "saraksts.txt"
+    manifests.write_text("# pakete\n" + "\n".join([projekti[0], "cita/pirmais.json", "cita/bojats.json"]) + "\n",
+                         encoding="utf-8")
+    out = tmp_path / "izvade"
+
+    kods = ak._pakešu_cli([str(manifests), "-o", str(out), "-j", "2"])
+
+    assert kods == 1
+    k = _kopsavilkums(out)
+    assert (k["dokumenti"], k["veiksmīgi"], k["neizdevās"]) == (3, 2, 1)
+    assert [r["projekts"] for r in k["rezultāti"]] == [projekti[0], vienāds, str(bojāts)]
+    assert [r["ok"] for r in k["rezultāti"]] == [True, True, False]
+    assert k["rezultāti"][2]["kļūda"]
+    # Vienādi projektu nosaukumi no dažādām mapēm nepārraksta viens otru
+    assert sorted(f for f in os.listdir(out) if f.endswith(".pdf")) == ["pirmais.pdf", "pirmais_2.pdf"]
@@ -0,0 +1,56 @@
+"""PDF attēli: pārsamplošana līdz zīmēšanas izmēram un diska kešs."""
+import math
+
+import pytest
+from PIL import Image
+
+import akta_kodols as ak
+
+
+@pytest.fixture
+def kešs(tmp_path, monkeypatch):
+    kešs = ak._PdfImageCache(str(tmp_path / "kešs"), 10 * 1024 * 1024)
+    monkeypatch.setattr(ak, "_pdf_image_cache", kešs)
+    return kešs
+
+
+def _attēls(ceļš, izmērs, režīms="RGB", formāts=None):
+    Image.new(režīms, izmērs, (200, 80, 40, 128)[:len(režīms)]).save(ceļš, format=formāts)
+    return str(ceļš)
+
+
+def test_liels_foto_tiek_parsamplots_un_kesots(tmp_path, kešs, monkeypatch):
+    foto = _attēls(tmp_path / "foto.jpg", (2000, 1500), formāts="JPEG")
+
+    avots, w, h = ak._pdf_image_source(foto, 100.0, 100.0, 200)
+
+    assert (w, h) == (100.0, 75.0)  # kā RLImage._restrictSize: saglabā proporcijas, tikai samazina
+    assert avots.startswith(kešs.cache_dir) and avots.endswith(".jpg")
+    with Image.open(avots) as im:
+        assert im.size == (math.ceil(100 * 200 / 72), math.ceil(75 * 200 / 72))
+        assert im.format == "JPEG"
+
+    ieraksti = []
+    monkeypatch.setattr(kešs, "put_bytes", lambda *a: ieraksti.append(a))
+    assert ak._pdf_image_source(foto, 100.0, 100.0, 200) == (avots, w, h)
+    assert ieraksti == []
+
+    # Cits rāmis vai DPI -> cits ieraksts
+    assert ak._pdf_image_source(foto, 100.0, 100.0, 300)[0] != avots
+
+
+def test_caurspidigs_attels_paliek_png(tmp_path, kešs):
+    logo = _attēls(tmp_path / "logo.png", (1200, 600), režīms="RGBA")
+
+    avots, w, h = ak._pdf_image_source(logo, 60.0, 60.0, 150)
+
+    assert (w, h) == (60.0, 30.0)
+    with Image.open(avots) as im:
+        assert im.format == "PNG" and im.mode == "RGBA"
+
+
+def test_mazs_attels_netiek_parkodets(tmp_path, kešs):
+    paraksts = _attēls(tmp_path / "paraksts.png", (120, 40))
+
+    assert ak._pdf_image_source(paraksts, 200.0, 100.0, 200) == (paraksts, 120.0, 40.0)
+    assert kešs.total_bytes == 0
@@ -0,0 +1,138 @@
+"""_PdfBuildPipeline: posmu secība, memoizācija, kļūdas gadījumā izkārtotais PDF, pielikumi tieši vienreiz."""
+from decimal import Decimal
+
+import pytest
+from PyPDF2 import PdfReader
+
+import akta_kodols as ak
+from conftest import ielādēt_gui
+
+POSMI = ["story", "layout", "attachments", "decorations", "encryption"]
+
+
+def _akts(**kw) -> ak.AktaDati:
+    d = ak.AktaDati(akta_nr="K-1", datums="2024-05-01", vieta="Rīga", **kw)
+    d.pozīcijas = [ak.Pozīcija(f"Prece {i}", Decimal(i), "gab.", Decimal("2.00")) for i in range(1, 4)]
+    return d
+
+
+def _lapas(ceļš) -> int:
+    return len(PdfReader(str(ceļš)).pages)
+
+
+class _Ierakstošs(ak._PdfBuildPipeline):
+    """Konveijers, kas pieraksta katra posma izsaukumus (posmi paši netiek mainīti)."""
+
+    def __init__(self, *args, kļūdainie=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.izsaukumi = []
+        self.kļūdainie = set(kļūdainie)
+
+    def __getattribute__(self, name):
+        attr = super().__getattribute__(name)
+        if not name.startswith("_stage_"):
+            return attr
+        posms = name[len("_stage_"):]
+
+        def ierakstīt(*args):
+            self.izsaukumi.append(posms)
+            if posms in self.kļūdainie:
+                raise RuntimeError(f"{posms} neizdevās")
+            return attr(*args)
+        return ierakstīt
+
+
+@pytest.fixture
+def pielikums(tmp_path):
+    """Divu lapu PDF atsauces dokuments."""
+    ak._ielādēt_reportlab()
+    ceļš = tmp_path / "pielikums.pdf"
+    c = ak.canvas.Canvas(str(ceļš))
+    for i in range(2):
+        c.drawString(72, 720, f"Pielikuma lapa {i + 1}")
+        c.showPage()
+    c.save()
+    return str(ceļš)
+
+
+def test_posmi_izpildās_deklarētajā_secībā(tmp_path):
+    konveijers = _Ierakstošs(_akts(), str(tmp_path / "akts.pdf"))
+    assert konveijers.run() == str(tmp_path / "akts.pdf")
+
+    assert list(ak._PdfBuildPipeline.STAGES) == POSMI
+    assert konveijers.izsaukumi == POSMI
+    assert list(konveijers.timings) == POSMI
+    # katra posma ieejas ir izpildītas pirms paša posma
+    for posms, ieejas in ak._PdfBuildPipeline.STAGES.items():
+        assert all(POSMI.index(i) < POSMI.index(posms) for i in ieejas)
+
+
+def test_posmu_rezultāti_tiek_memoizēti(tmp_path):
+    konveijers = _Ierakstošs(_akts(), str(tmp_path / "akts.pdf"))
+    konveijers.run()
+    lapas = konveijers.stage("attachments")
+
+    assert konveijers.stage("attachments") is lapas
+    assert konveijers.stage("decorations") is konveijers.stage("decorations")
+    assert konveijers.stage("encryption") == str(tmp_path / "akts.pdf")
+    assert konveijers.izsaukumi == POSMI
+
+
+def test_posma_kļūda_tiek_memoizēta(tmp_path):
+    konveijers = _Ierakstošs(_akts(), str(tmp_path / "akts.pdf"), kļūdainie={"attachments"})
+    with pytest.raises(RuntimeError) as pirmā:
+        konveijers.stage("decorations")
+    with pytest.raises(RuntimeError) as otrā:
+        konveijers.stage("encryption")
+
+    assert otrā.value is pirmā.value
+    assert konveijers.izsaukumi == ["story", "layout", "attachments"]
+
+
+@pytest.mark.parametrize("kļūdainais", ["attachments", "decorations", "encryption"])
+def test_pēcapstrādes_kļūda_atgriež_izkārtoto_pdf(tmp_path, capsys, kļūdainais):
+    mērķis = str(tmp_path / "akts.pdf")
+    konveijers = _Ierakstošs(_akts(), mērķis, kļūdainie={kļūdainais})
+
+    assert konveijers.run() == mērķis
+    assert "PDF pēcapstrādes kļūda" in capsys.readouterr().out
+    assert konveijers.stage("layout") == mērķis and _lapas(mērķis) >= 1
+    assert konveijers.izsaukumi == POSMI[:POSMI.index(kļūdainais) + 1]
+
+
+def test_izkārtošanas_kļūda_netiek_apslēpta(tmp_path):
+    konveijers = _Ierakstošs(_akts(), str(tmp_path / "akts.pdf"), kļūdainie={"layout"})
+    with pytest.raises(RuntimeError):
+        konveijers.run()
+    assert konveijers.izsaukumi == ["story", "layout"]
+
+
+def _zip_ceļš(d, tmp_path):
+    """ZIP eksporta PDF (ģenerēt_zip_dialogs -> AktaLogs._ģenerēt_pdf_failu, kas neizmanto logu)."""
+    pytest.importorskip("PySide6.QtWidgets")
+    akti = ielādēt_gui()
+    return akti.AktaLogs._ģenerēt_pdf_failu(None, d, str(tmp_path / "Akts.pdf"))
+
+
+def _pdf_ceļš(d, tmp_path):
+    return ak.ģenerēt_pdf(d, str(tmp_path / "akts.pdf"))
+
+
+@pytest.mark.parametrize("eksports", [_pdf_ceļš, _zip_ceļš], ids=["pdf", "zip"])
+def test_pielikumi_pievienoti_tieši_vienreiz(tmp_path, monkeypatch, pielikums, eksports):
+    bez_pielikumiem = _lapas(ak.ģenerēt_pdf(_akts(), str(tmp_path / "bez.pdf"), include_reference_docs=False))
+
+    savākšanas = []
+    oriģināls = ak._collect_reference_doc_pages
+
+    def savākt(*args, **kwargs):
+        savākšanas.append(args)
+        return oriģināls(*args, **kwargs)
+
+    monkeypatch.setattr(ak, "_collect_reference_doc_pages", savākt)
+    # GUI savākt_datus pielikumus glabā kā dict
+    d = _akts(atsauces_dokumenti_faili=[{"ceļš": pielikums, "nosaukums": "Pielikums"}])
+    ceļš = eksports(d, tmp_path)
+
+    assert len(savākšanas) == 1
+    assert _lapas(ceļš) == bez_pielikumiem + 2
@@ -0,0 +1,66 @@
+"""POZĪCIJAS tabulas izkārtojums: lielās tabulas (pa lapām) ceļam jāizskatās kā mazajai."""
+from decimal import Decimal
+
+import pytest
+from PIL import Image
+
+import akta_kodols as ak
+
+_IZLĪDZINĀJUMI = {0: "LEFT", 1: "CENTER", 2: "RIGHT"}
+
+
+def _akts(rindu_skaits: int, attēls: str, izlīdzinājums: str) -> ak.AktaDati:
+    d = ak.AktaDati(akta_nr="T-1", datums="2024-05-01", table_content_alignment=izlīdzinājums)
+    d.pozīcijas = [ak.Pozīcija(f"Prece {i}", Decimal(i), "gab.", Decimal("1.50"), seriālais_nr=f"SN{i}")
+                   for i in range(1, rindu_skaits + 1)]
+    d.pozīcijas[0].attēla_ceļš = attēls
+    return d
+
+
+def _pozīciju_tabula(d: ak.AktaDati):
+    """Pirmās lapas ReportLab Table no _pdf_section_positions (arī _ChunkedPositionsTable gadījumā)."""
+    styles, bold = ak._build_pdf_styles(d, "Helvetica")
+    story = ak._pdf_section_positions(d, styles, "Helvetica", bold, 180 * 2.834645669)
+    for flowable in story:
+        if isinstance(flowable, ak._ChunkedPositionsTable):
+            return flowable._table(len(d.pozīcijas))
+        if isinstance(flowable, ak.Table):
+            return flowable
+    raise AssertionError("POZĪCIJAS tabula nav atrasta")
+
+
+def _šūnu_izlīdzinājumi(tabula, rinda: int = 1) -> list:
+    """Katras kolonnas redzamais horizontālais izlīdzinājums dotajā rindā."""
+    rezultāts = []
+    for kol, šūna in enumerate(tabula._cellvalues[rinda]):
+        if isinstance(šūna, ak.Paragraph):
+            rezultāts.append(_IZLĪDZINĀJUMI[šūna.style.alignment])
+        else:
+            rezultāts.append(tabula._cellStyles[rinda][kol].alignment.upper().replace("CENTRE", "CENTER"))
+    return rezultāts
+
+
+@pytest.fixture
+def attēls(tmp_path):
+    ceļš = tmp_path / "foto.png"
+    Image.new("RGB", (40, 30), (200, 30, 30)).save(ceļš)
+    return str(ceļš)
+
+
+@pytest.mark.parametrize("izlīdzinājums", ["left", "center", "right"])
+def test_lielās_tabulas_izlīdzinājums_sakrīt_ar_mazo(attēls, izlīdzinājums):
+    ak._ielādēt_reportlab()
+    maza = _pozīciju_tabula(_akts(3, attēls, izlīdzinājums))
+    liela = _pozīciju_tabula(_akts(ak.PDF_LARGE_TABLE_ROWS, attēls, izlīdzinājums))
+
+    assert _šūnu_izlīdzinājumi(liela) == _šūnu_izlīdzinājumi(maza)
+
+
+def test_lielajā_tabulā_foto_kolonna_paliek_centrēta(attēls):
+    ak._ielādēt_reportlab()
+    d = _akts(ak.PDF_LARGE_TABLE_ROWS, attēls, "left")
+    tabula = _pozīciju_tabula(d)
+    foto_kol = next(i for i, šūna in enumerate(tabula._cellvalues[1]) if isinstance(šūna, ak.RLImage))
+
+    assert _šūnu_izlīdzinājumi(tabula)[foto_kol] == "CENTER"
+    assert set(_šūnu_izlīdzinājumi(tabula)[:foto_kol]) == {"LEFT"}
@@ -0,0 +1,106 @@
+"""Story sekciju kešs: viena lauka izmaiņa pārbūvē tikai sekcijas, kas šo lauku lasa."""
+from decimal import Decimal
+
+import pytest
+from PIL import Image
+from PyPDF2 import PdfReader
+
+import akta_kodols as ak
+
+SEKCIJAS = [name for name, _build, _fields in ak._PDF_STORY_SECTIONS]
+
+
+@pytest.fixture
+def attēls(tmp_path):
+    ceļš = tmp_path / "foto.png"
+    Image.new("RGB", (40, 30), (30, 120, 200)).save(ceļš)
+    return str(ceļš)
+
+
+@pytest.fixture
+def būvētās(monkeypatch):
+    """Tukšs sekciju kešs; atgriež sarakstu ar katrā ģenerēšanā (no jauna) uzbūvētajām sekcijām."""
+    būvētas = []
+
+    def skaitīt(name, build_section):
+        def build(*args):
+            būvētas.append(name)
+            return build_section(*args)
+        return build
+
+    monkeypatch.setattr(ak, "_pdf_section_cache", ak._PdfSectionCache())
+    monkeypatch.setattr(ak, "_PDF_STORY_SECTIONS", tuple(
+        (name, skaitīt(name, build_section), fields) for name, build_section, fields in ak._PDF_STORY_SECTIONS
+    ))
+    return būvētas
+
+
+def _akts(attēls: str) -> ak.AktaDati:
+    d = ak.AktaDati(
+        akta_nr="S-1", datums="2024-05-01", vieta="Rīga", pasūtījuma_nr="PAS-A", piezīmes="Notes A",
+        add_cover_page=True, cover_page_title="Titullapa A", show_generation_timestamp=False,
+        radit_elektronisko_parakstu_tekstu=True,
+        include_custom_qr_code=True, custom_qr_code_data="QR-A",
+        pieņēmējs=ak.Persona(nosaukums="SIA Pieņēmējs"), nodevējs=ak.Persona(nosaukums="SIA Alfa"),
+        attēli=[ak.Attēls(attēls, "Foto A")],
+    )
+    d.pozīcijas = [ak.Pozīcija("Prece A", Decimal("1"), "gab.", Decimal("3.00"))]
+    return d
+
+
+# (sekcija, lauks, jaunā vērtība no attēla ceļa, teksts, kas parādās tikai jaunajā PDF).
+# Teksti bez garumzīmēm: PyPDF2 extract_text tās ar iegultu TTF fontu neatgūst.
+GADĪJUMI = [
+    ("cover", "cover_page_title", lambda _a: "Titullapa B", "Titullapa B"),
+    ("header", "pasūtījuma_nr", lambda _a: "PAS-B", "PAS-B"),
+    ("parties", "nodevējs", lambda _a: ak.Persona(nosaukums="SIA Beta"), "SIA Beta"),
+    ("positions", "pozīcijas", lambda _a: [ak.Pozīcija("Prece B", Decimal("1"), "gab.", Decimal("3.00"))], "Prece B"),
+    ("legal", "piezīmes", lambda _a: "Notes B", "Notes B"),
+    ("photos", "attēli", lambda a: [ak.Attēls(a, "Foto B")], "Foto B"),
+    ("signatures", "elektroniskais_paraksts", lambda _a: True, "DOKUMENTS"),
+    ("qr_codes", "custom_qr_code_data", lambda _a: "QR-B", None),
+]
+
+
+def _pdf(d, ceļš):
+    reader = PdfReader(ak.ģenerēt_pdf(d, str(ceļš), include_reference_docs=False))
+    teksts = "\n".join(page.extract_text() for page in reader.pages)
+    return teksts, [_lapas_saturs(page) for page in reader.pages]
+
+
+def _lapas_saturs(page) -> bytes:
+    """Lapas satura plūsmas (dekorētām lapām /Contents ir masīvs)."""
+    contents = page["/Contents"].get_object()
+    daļas = contents if isinstance(contents, list) else [contents]
+    return b"".join(d.get_object().get_data() for d in daļas)
+
+
+def test_katrai_sekcijai_ir_gadījums():
+    assert sorted(name for name, *_ in GADĪJUMI) == sorted(SEKCIJAS)
+
+
+@pytest.mark.parametrize("sekcija,lauks,vērtība,teksts", GADĪJUMI, ids=[g[0] for g in GADĪJUMI])
+def test_lauka_izmaiņa_pārbūvē_tikai_savu_sekciju(tmp_path, attēls, būvētās, sekcija, lauks, vērtība, teksts):
+    d = _akts(attēls)
+    teksts_pirms, saturs_pirms = _pdf(d, tmp_path / "a.pdf")
+    assert sorted(būvētās) == sorted(SEKCIJAS)
+
+    # Bez izmaiņām nekas netiek pārbūvēts
+    būvētās.clear()
+    _pdf(d, tmp_path / "a2.pdf")
+    assert būvētās == []
+
+    setattr(d, lauks, vērtība(attēls))
+    teksts_pēc, saturs_pēc = _pdf(d, tmp_path / "b.pdf")
+
+    # Lauku var lasīt vairākas sekcijas (piem., puses – titullapa un paraksti); citas paliek no keša
+    lasītājas = sorted(name for name, _b, fields in ak._PDF_STORY_SECTIONS if fields and lauks in fields)
+    assert sorted(būvētās) == lasītājas
+    assert sekcija in lasītājas
+    if sekcija != "parties":
+        assert lasītājas == [sekcija]
+
+    assert saturs_pēc != saturs_pirms
+    if teksts:
+        assert teksts not in teksts_pirms
+        assert teksts in teksts_pēc
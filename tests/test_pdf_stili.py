@@ -0,0 +1,62 @@
+"""Kopīgais PDF stilu komplekts un tabulu stila komandas."""
+import pytest
+
+import akta_kodols as ak
+
+
+@pytest.fixture(autouse=True)
+def tukši_keši(monkeypatch):
+    monkeypatch.setattr(ak, "_pdf_style_cache", {})
+    monkeypatch.setattr(ak, "_pdf_table_cmd_cache", {})
+
+
+def _akts(**kw) -> ak.AktaDati:
+    return ak.AktaDati(akta_nr="ST-1", datums="2024-05-01", **kw)
+
+
+def test_stili_kopigi_lidz_tipografijas_izmainai():
+    d = _akts()
+    styles, bold = ak._build_pdf_styles(d, "Helvetica")
+
+    assert bold == "Helvetica-Bold"
+    d.akta_nr = "ST-2"
+    d.piezīmes = "Cits teksts"
+    assert ak._build_pdf_styles(d, "Helvetica")[0] is styles
+    assert ak._build_pdf_styles(d, "Times-Roman")[0] is not styles
+
+    d.pdf_font_size_normal = float(d.pdf_font_size_normal) + 1
+    citi = ak._build_pdf_styles(d, "Helvetica")[0]
+    assert citi is not styles
+    assert citi["Latv"].fontSize == styles["Latv"].fontSize + 1
+
+
+def test_stilu_komplekts_ir_tikai_lasams():
+    styles, _bold = ak._build_pdf_styles(_akts(), "Helvetica")
+
+    assert styles["LatvHead"].fontName == "Helvetica"
+    with pytest.raises(TypeError):
+        styles.add(ak.ParagraphStyle(name="Jauns"))
+
+
+def test_tabulu_komandas_kesotas_pec_noformejuma():
+    d = _akts()
+    cmds = ak._pdf_table_commands(d, "Helvetica", "Helvetica-Bold")
+
+    assert all(isinstance(v, tuple) for v in cmds.values())
+    d.akta_nr = "ST-2"
+    assert ak._pdf_table_commands(d, "Helvetica", "Helvetica-Bold") is cmds
+
+    d.table_grid_color = "#FF0000"
+    citas = ak._pdf_table_commands(d, "Helvetica", "Helvetica-Bold")
+    assert citas is not cmds
+    assert ("GRID", (0, 0), (-1, -1), 0.4, ak.colors.HexColor("#FF0000")) in citas["positions"]
+
+
+def test_tablestyle_nemaina_kopigas_komandas():
+    cmds = ak._pdf_table_commands(_akts(), "Helvetica", "Helvetica-Bold")
+    pirms = cmds["positions"]
+
+    stils = ak.TableStyle(cmds["positions"])
+    stils.add("BACKGROUND", (0, 1), (-1, 1), ak.colors.white)
+
+    assert cmds["positions"] is pirms and len(stils.getCommands()) == len(pirms) + 1
@@ -0,0 +1,106 @@
+"""Priekšskatījuma rastrēšana ar DPI, ko prasa skatlauks × zoom, un redzamās lapas pārrenderēšana."""
+import os
+
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage
+from reportlab.pdfgen import canvas
+
+from conftest import aizstāt_pdftoppm, ielādēt_gui
+
+import akta_kodols as ak
+
+gui = ielādēt_gui()
+
+_A4 = (595.2756, 841.8898)
+
+
+def test_dpi_pec_skatlauka():
+    # A4 sānu panelī ~400 px platumā: ~48 DPI, noapaļots uz augšu līdz 12 soļiem
+    assert gui._priekšskatījuma_dpi(_A4, (400, 566)) == 60
+    # Ierobežo platums vai augstums – tas, kurš šaurāks
+    assert gui._priekšskatījuma_dpi((72.0, 72.0), (72, 500)) == 72
+    assert gui._priekšskatījuma_dpi((72.0, 72.0), (500, 73)) == 84
+    assert gui._priekšskatījuma_dpi(_A4, (10, 10)) == gui.PREVIEW_MIN_DPI
+    assert gui._priekšskatījuma_dpi(_A4, (20000, 30000)) == gui.PREVIEW_MAX_DPI
+    assert gui._priekšskatījuma_dpi(_A4, (0, 0)) == gui.PREVIEW_MIN_DPI
+
+
+@pytest.fixture
+def pdf2(tmp_path):
+    ceļš = tmp_path / "akts.pdf"
+    c = canvas.Canvas(str(ceļš), pagesize=_A4)
+    c.showPage()
+    c.setPageSize((_A4[1], _A4[0]))  # otrā lapa ainavā
+    c.showPage()
+    c.save()
+    return str(ceļš)
+
+
+@pytest.fixture
+def dpi_žurnāls(monkeypatch):
+    return aizstāt_pdftoppm(monkeypatch, gui)
+
+
+def test_worker_rastre_katru_lapu_ar_savu_dpi(qapp, pdf2, dpi_žurnāls, monkeypatch):
+    monkeypatch.setattr(gui, "ģenerēt_pdf", lambda *_a, **_k: pdf2)
+    worker = gui._PreviewBuildWorker(ak.AktaDati(), "h1", 0, target_px=(400, 566))
+    sākums = []
+    worker.pages_started.connect(lambda *a: sākums.append(a))
+
+    worker.run()
+
+    assert sākums == [("h1", 2, 0, pdf2)]
+    assert dpi_žurnāls == [(1, gui._priekšskatījuma_dpi(_A4, (400, 566))),
+                           (2, gui._priekšskatījuma_dpi((_A4[1], _A4[0]), (400, 566)))]
+    # PDF tagad pieder GUI (zoom pārrenderēšanai), worker to nedzēš
+    assert os.path.exists(pdf2)
+
+
+def test_worker_parrendere_tikai_pieprasito_lapu(qapp, pdf2, dpi_žurnāls, monkeypatch):
+    monkeypatch.setattr(gui, "ģenerēt_pdf", lambda *_a, **_k: pytest.fail("PDF nav jāģenerē no jauna"))
+    worker = gui._PreviewBuildWorker(ak.AktaDati(), "h1", 1, target_px=(1600, 2264), pdf_path=pdf2, pages=[1])
+    notikumi = []
+    worker.pages_started.connect(lambda *a: notikumi.append("sākums"))
+    worker.page_ready.connect(lambda h, i, _img: notikumi.append(("lapa", i)))
+
+    worker.run()
+
+    assert notikumi == [("lapa", 1)]
+    assert dpi_žurnāls == [(2, gui._priekšskatījuma_dpi((_A4[1], _A4[0]), (1600, 2264)))]
+    assert os.path.exists(pdf2)
+
+
+def _lapa(platums: int) -> QImage:
+    img = QImage(platums, int(platums * 1.41), QImage.Format_RGB32)
+    img.fill(Qt.white)
+    return img
+
+
+def test_logs_nepazemina_izskirtspeju_un_pieprasa_asaku_lapu(qapp, tmp_path):
+    w = gui.AktaLogs()
+    try:
+        vecais = tmp_path / "vecais.pdf"
+        jaunais = tmp_path / "jaunais.pdf"
+        novecojis = tmp_path / "novecojis.pdf"
+        for f in (vecais, jaunais, novecojis):
+            f.write_bytes(b"%PDF-1.4")
+        w.preview_scroll_area.viewport().resize(400, 566)
+        w._requested_preview_hash = "h1"
+        w._on_preview_pages_started("h1", 1, 0, str(vecais))
+        w._on_preview_pages_started("h1", 1, 0, str(jaunais))
+        assert not vecais.exists() and w._preview_pdf_path == str(jaunais)
+        w._on_preview_pages_started("h0", 1, 0, str(novecojis))  # novecojis pieprasījums
+        assert not novecojis.exists() and w._preview_pdf_path == str(jaunais)
+
+        w._on_preview_page_ready("h1", 0, _lapa(800))
+        w._on_preview_page_ready("h1", 0, _lapa(100))  # vēlu pienācis mazākas izšķirtspējas attēls
+        assert w.preview_images[0].width() == 800
+        assert not w._zoom_render_timer.isActive()
+
+        w.zoom_factor = 4.0  # 1600 px > 800 px × 1,1 -> pārrenderēt redzamo lapu
+        w._show_current_page()
+        assert w._zoom_render_timer.isActive()
+    finally:
+        w._zoom_render_timer.stop()
+        w.deleteLater()
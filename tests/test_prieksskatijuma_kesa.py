@@ -0,0 +1,154 @@
+"""Priekšskatījuma keši: atmiņas LRU ar baitu budžetu un diska līmenis ar lapu DPI."""
+import os
+import types
+import zipfile
+from pathlib import Path
+
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPixmap
+from reportlab.pdfgen import canvas
+
+from conftest import aizstāt_pdftoppm, ielādēt_gui
+
+import akta_kodols as ak
+
+gui = ielādēt_gui()
+
+_A4 = (595.2756, 841.8898)
+
+
+def _pixmap(platums: int) -> QPixmap:
+    pm = QPixmap(platums, int(platums * 1.41))
+    pm.fill(Qt.white)
+    return pm
+
+
+def test_atminas_kesa_lru_pec_baitiem(qapp):
+    viens = gui._PreviewCache._pixmap_bytes(_pixmap(10))
+    kešs = gui._PreviewCache(max_bytes=2 * viens)
+
+    kešs.put("a", [_pixmap(10)])
+    kešs.put("b", [_pixmap(10)])
+    assert kešs.get("a") is not None  # "a" kļūst par jaunāko
+    kešs.put("c", [_pixmap(10)])
+
+    assert "b" not in kešs and "a" in kešs and "c" in kešs
+    assert kešs.total_bytes == 2 * viens
+    kešs.put("liels", [_pixmap(100)])  # lielāks par visu budžetu – netiek kešots
+    assert "liels" not in kešs and len(kešs) == 2
+
+
+@pytest.fixture
+def lapu_kešs(tmp_path):
+    return ak._PreviewPageCache(str(tmp_path / "preview_cache"), max_bytes=10_000)
+
+
+def test_diska_kesa_glaba_lapu_dpi_un_izmeru(lapu_kešs):
+    lapu_kešs.put_pages("ab" * 16, [b"png0", b"png1"], page_dpi=[60, 72], page_sizes_pt=[_A4, (_A4[1], _A4[0])])
+
+    lapas = lapu_kešs.get_pages("ab" * 16)
+
+    assert [l["png"] for l in lapas] == [b"png0", b"png1"]
+    assert [l["dpi"] for l in lapas] == [60, 72]
+    assert lapas[1]["size_pt"] == pytest.approx((_A4[1], _A4[0]))
+    # Ieraksts iet caur _write_entry: kopējais izmērs tiek uzturēts atmiņā
+    assert lapu_kešs.total_bytes == sum(f.stat().st_size for f in Path(lapu_kešs.cache_dir).rglob("*.zip"))
+
+
+def test_diska_kesa_izmet_vecakos_ierakstus(lapu_kešs):
+    for i in range(4):
+        lapu_kešs.put_pages(f"{i:02d}" * 16, [os.urandom(4000)])
+        os.utime(lapu_kešs._entry_path(f"{i:02d}" * 16), (1000 + i, 1000 + i))
+
+    assert lapu_kešs.total_bytes <= lapu_kešs.max_bytes
+    assert lapu_kešs.get_pages("03" * 16) is not None and lapu_kešs.get_pages("00" * 16) is None
+
+
+def test_vecs_ieraksts_bez_dpi(lapu_kešs):
+    ceļš = lapu_kešs._entry_path("cd" * 16)
+    os.makedirs(os.path.dirname(ceļš))
+    with zipfile.ZipFile(ceļš, "w") as zf:
+        zf.writestr("0.png", b"png0")
+
+    assert lapu_kešs.get_pages("cd" * 16) == [{"png": b"png0", "dpi": 0, "size_pt": None}]
+
+
+@pytest.fixture
+def vide(qapp, tmp_path, monkeypatch):
+    """Diska kešs tmp mapē, viena A4 lapa un pdftoppm aizstājējs, kas piezīmē DPI."""
+    kešs = ak._PreviewPageCache(str(tmp_path / "preview_cache"))
+    monkeypatch.setattr(gui, "_preview_page_cache", kešs)
+    pdf = tmp_path / "akts.pdf"
+    c = canvas.Canvas(str(pdf), pagesize=_A4)
+    c.showPage()
+    c.save()
+    ģenerēti = []
+
+    def ģenerēt(*_a, **_k):
+        ģenerēti.append(1)
+        kopija = tmp_path / f"kopija{len(ģenerēti)}.pdf"
+        kopija.write_bytes(pdf.read_bytes())
+        return str(kopija)
+
+    monkeypatch.setattr(gui, "ģenerēt_pdf", ģenerēt)
+    return types.SimpleNamespace(kešs=kešs, ģenerēti=ģenerēti, renderētās=aizstāt_pdftoppm(monkeypatch, gui))
+
+
+def _palaist(target_px) -> list:
+    worker = gui._PreviewBuildWorker(ak.AktaDati(), "h1", 0, target_px=target_px, disk_cache=True)
+    lapas = []
+    worker.page_ready.connect(lambda _h, i, img: lapas.append((i, img.width())))
+    worker.run()
+    return lapas
+
+
+def test_worker_izmanto_diska_kesu_tikai_ja_dpi_pietiek(vide):
+    mazs, liels = (400, 566), (1600, 2264)
+    mazais_dpi = gui._priekšskatījuma_dpi(_A4, mazs)
+
+    assert _palaist(mazs) == [(0, mazais_dpi)]
+    assert len(vide.ģenerēti) == 1
+    assert [l["dpi"] for l in vide.kešs.get_pages("h1")] == [mazais_dpi]
+
+    assert _palaist(mazs) == [(0, mazais_dpi)]  # no diska keša, PDF netiek ģenerēts
+    assert len(vide.ģenerēti) == 1
+
+    lielais_dpi = gui._priekšskatījuma_dpi(_A4, liels)
+    assert _palaist(liels) == [(0, lielais_dpi)]  # kešā par zemu izšķirtspēja -> renderē no jauna
+    assert len(vide.ģenerēti) == 2
+    assert [l["dpi"] for l in vide.kešs.get_pages("h1")] == [lielais_dpi]
+
+    assert _palaist(mazs) == [(0, lielais_dpi)]  # asāks kešs der arī mazākam skatlaukam
+    assert vide.renderētās == [(1, mazais_dpi), (1, lielais_dpi)]
+
+
+def test_logs_parbuve_kesotu_dokumentu_kad_zoom_prasa_vairak(qapp, monkeypatch):
+    w = gui.AktaLogs()
+    try:
+        palaisti = []
+        monkeypatch.setattr(w, "_start_preview_worker", lambda d, h, lapa: palaisti.append((h, lapa)))
+        w.preview_scroll_area.viewport().resize(400, 566)
+        data_hash = w._hash_koks.atjaunot(w.savākt_datus())
+        w.preview_cache.put(data_hash, [_pixmap(300), _pixmap(300)])
+        w._do_update_preview()  # atmiņas keša trāpījums: lapas bez PDF
+        assert palaisti == [] and w.preview_images[0].width() == 300
+
+        w.zoom_factor = 4.0
+        w._show_current_page()
+        assert w._zoom_render_timer.isActive()
+        w._zoom_render_timer.stop()
+        w._rerender_visible_page()
+        assert palaisti == [(data_hash, 0)]
+        w._rerender_visible_page()  # tas pats mērķis netiek pieprasīts atkārtoti
+        assert palaisti == [(data_hash, 0)]
+
+        # Pārbūvētā dokumenta sākums nenomet esošās lapas; asākā lapa tās aizstāj
+        w._on_preview_pages_started(data_hash, 2, 0, "")
+        assert w.preview_images[0].width() == 300
+        lapa = _pixmap(1200).toImage()
+        w._on_preview_page_ready(data_hash, 0, lapa)
+        assert w.preview_images[0].width() == 1200
+    finally:
+        w._zoom_render_timer.stop()
+        w.deleteLater()
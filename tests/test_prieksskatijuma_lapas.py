@@ -0,0 +1,105 @@
+"""Priekšskatījums lapu pa lapai: skatītā lapa pirmā, pārējās tiek piegādātas, tiklīdz gatavas."""
+import shutil
+
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage
+from reportlab.pdfgen import canvas
+
+from conftest import aizstāt_pdftoppm, ielādēt_gui
+
+import akta_kodols as ak
+
+gui = ielādēt_gui()
+
+
+@pytest.fixture
+def pdf3(tmp_path):
+    """Trīs lapu PDF; ģenerēt_pdf aizstājējs katrā izsaukumā atdod jaunu kopiju."""
+    avots = tmp_path / "avots.pdf"
+    c = canvas.Canvas(str(avots))
+    for i in range(3):
+        c.drawString(100, 700, f"Lapa {i + 1}")
+        c.showPage()
+    c.save()
+    kopijas = []
+
+    def ģenerēt(*_a, **_k):
+        kopija = tmp_path / f"kopija{len(kopijas)}.pdf"
+        shutil.copy(avots, kopija)
+        kopijas.append(kopija)
+        return str(kopija)
+
+    return ģenerēt
+
+
+@pytest.fixture
+def renderētās(monkeypatch):
+    """pdftoppm aizstājējs: piezīmē renderētās lapas (1-bāzētas, ar DPI) un atdod mazu attēlu."""
+    return aizstāt_pdftoppm(monkeypatch, gui, izmērs=lambda lapa, _dpi: (20 + lapa, 30))
+
+
+def _palaist(worker) -> list:
+    notikumi = []
+    worker.pages_started.connect(lambda h, n, first, _pdf: notikumi.append(("sākums", h, n, first)))
+    worker.page_ready.connect(lambda h, i, img: notikumi.append(("lapa", h, i, (img.width(), img.height()))))
+    worker.finished.connect(lambda h, n: notikumi.append(("beigas", h, n)))
+    worker.failed.connect(lambda h, e: notikumi.append(("kļūda", h, e)))
+    worker.run()
+    return notikumi
+
+
+def test_lapu_seciba():
+    assert gui._PreviewBuildWorker._lapu_secība(5, 2) == [2, 3, 4, 1, 0]
+    assert gui._PreviewBuildWorker._lapu_secība(3, 0) == [0, 1, 2]
+    assert gui._PreviewBuildWorker._lapu_secība(0, 0) == []
+
+
+def test_skatita_lapa_tiek_renderta_pirma(qapp, pdf3, renderētās, monkeypatch):
+    monkeypatch.setattr(gui, "ģenerēt_pdf", pdf3)
+    worker = gui._PreviewBuildWorker(ak.AktaDati(), "h1", 1)
+
+    notikumi = _palaist(worker)
+
+    assert notikumi == [("sākums", "h1", 3, 1),
+                        ("lapa", "h1", 1, (22, 30)), ("lapa", "h1", 2, (23, 30)), ("lapa", "h1", 0, (21, 30)),
+                        ("beigas", "h1", 3)]
+    assert [lapa for lapa, _dpi in renderētās] == [2, 3, 1]
+
+
+def test_partraukts_worker_nerenderē_atlikušās_lapas(qapp, pdf3, renderētās, monkeypatch):
+    monkeypatch.setattr(gui, "ģenerēt_pdf", pdf3)
+    worker = gui._PreviewBuildWorker(ak.AktaDati(), "h1", 7)  # ārpus diapazona -> pēdējā lapa
+    worker.page_ready.connect(lambda *_a: worker.pārtraukt())
+
+    notikumi = _palaist(worker)
+
+    assert notikumi[0] == ("sākums", "h1", 3, 2)
+    assert [n[0] for n in notikumi] == ["sākums", "lapa", "beigas"] and notikumi[-1] == ("beigas", "h1", 1)
+    assert [lapa for lapa, _dpi in renderētās] == [3]
+
+
+def test_logs_rada_lapas_pec_kartas_un_kese_tikai_pilnu_dokumentu(qapp):
+    w = gui.AktaLogs()
+    try:
+        w._requested_preview_hash = "h1"
+        w._on_preview_pages_started("h1", 3, 1, "")
+        assert w.preview_images == [None, None, None]
+        assert w.preview_label.text() == "Ģenerē lapu 2..." and w.page_number_label.text() == "Lapa 2/3"
+
+        lapa = QImage(40, 60, QImage.Format_RGB32)
+        lapa.fill(Qt.white)
+        w._on_preview_page_ready("vecs", 1, lapa)  # novecojis dokuments tiek ignorēts
+        assert w.preview_images[1] is None
+        w._on_preview_page_ready("h1", 1, lapa)
+        assert w.preview_images[1] is not None and w.preview_label.pixmap() is not None
+
+        w._on_preview_worker_finished("h1", 1)  # pārtraukts: ne visas lapas gatavas
+        assert "h1" not in w.preview_cache
+
+        for i in (0, 2):
+            w._on_preview_page_ready("h1", i, lapa)
+        w._on_preview_worker_finished("h1", 3)
+        assert len(w.preview_cache.get("h1")) == 3
+    finally:
+        w.deleteLater()
@@ -0,0 +1,78 @@
+"""Priekšskatījuma rastrētāji: QtPdf procesā (QImage uz balta fona) un poppler rezerve."""
+import io
+import os
+
+import pytest
+from PIL import Image
+from PySide6.QtGui import QColor
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from conftest import ielādēt_gui
+
+gui = ielādēt_gui()
+
+
+@pytest.fixture
+def pdf(tmp_path):
+    ceļš = tmp_path / "akts.pdf"
+    c = canvas.Canvas(str(ceļš), pagesize=A4)
+    c.setFillColorRGB(0, 0, 0)
+    c.rect(0, A4[1] - 72, 72, 72, fill=1, stroke=0)  # melns kvadrāts augšējā kreisajā stūrī
+    c.showPage()
+    c.save()
+    return str(ceļš)
+
+
+def test_qtpdf_renderē_uz_balta_fona(qapp, pdf):
+    r = gui._QtPdfRastrētājs(pdf)
+    try:
+        assert r.page_count() == 1
+        assert r.page_size_pt(0) == pytest.approx(A4, abs=0.5)
+
+        img = r.render(0, 72)
+    finally:
+        r.close()
+
+    assert (img.width(), img.height()) == (round(A4[0]), round(A4[1]))
+    assert QColor(img.pixel(10, 10)) == QColor("black")
+    # QtPdf fons ir caurspīdīgs; rastrētājs to saliek uz baltas lapas
+    assert QColor(img.pixel(img.width() - 10, img.height() - 10)) == QColor("white")
+
+
+def test_poppler_pdftoppm_ppm_bez_png(qapp, pdf, monkeypatch):
+    izsaukumi = []
+    žetons = gui._AtcelšanasŽetons()
+
+    def apakšprocess(cmd, atcelšana=None, timeout=None, text=False):
+        izsaukumi.append((cmd, atcelšana))
+        buf = io.BytesIO()
+        Image.new("RGB", (30, 40), (255, 0, 0)).save(buf, "PPM")
+        return 0, buf.getvalue(), b""
+
+    monkeypatch.setattr(gui, "_atceļams_apakšprocess", apakšprocess)
+    r = gui._PopplerRastrētājs(pdf, poppler_path="/opt/poppler", atcelšana=žetons)
+
+    img = r.render(0, 96)
+
+    assert izsaukumi == [([os.path.join("/opt/poppler", "pdftoppm"), "-r", "96", "-f", "1", "-l", "1", pdf], žetons)]
+    assert (img.width(), img.height()) == (30, 40)
+    assert QColor(img.pixel(5, 5)) == QColor("red")
+    assert r.page_size_pt(0) == pytest.approx(A4)
+
+
+def test_auto_izmanto_poppler_ja_qtpdf_neatver(qapp, pdf, tmp_path, monkeypatch):
+    assert gui._atvērt_priekšskatījuma_rastrētāju(pdf).nosaukums == "qtpdf"
+
+    def neatver(_path):
+        raise RuntimeError("QtPdf nav")
+
+    monkeypatch.setattr(gui, "_QtPdfRastrētājs", neatver)
+    assert gui._atvērt_priekšskatījuma_rastrētāju(pdf).nosaukums == "poppler"
+
+    monkeypatch.setattr(gui, "PREVIEW_RASTERIZER", "qtpdf")
+    with pytest.raises(RuntimeError):
+        gui._atvērt_priekšskatījuma_rastrētāju(pdf)
+
+    monkeypatch.setattr(gui, "PREVIEW_RASTERIZER", "poppler")
+    assert gui._atvērt_priekšskatījuma_rastrētāju(pdf).nosaukums == "poppler"
@@ -0,0 +1,50 @@
+"""_QrService: memoizēti vektoru un PNG QR kodi ar baltu fonu."""
+import io
+
+from PIL import Image
+from reportlab.graphics.shapes import Rect
+
+import akta_kodols as ak
+
+
+def test_drawing_tiek_memoizets():
+    qr = ak._QrService()
+
+    d = qr.drawing("https://example.com/a", 20 * ak.mm)
+
+    assert qr.drawing("https://example.com/a", 20 * ak.mm) is d
+    assert qr.drawing("https://example.com/a", 25 * ak.mm) is not d
+    assert qr.drawing("https://example.com/b", 20 * ak.mm) is not d
+    assert qr.drawing("https://example.com/a", 20 * ak.mm, color="#FF0000") is not d
+    assert (d.width, d.height) == (20 * ak.mm, 20 * ak.mm)
+
+
+def test_drawing_ir_balts_fons_un_gatavas_figuras():
+    d = ak._QrService().drawing("AKTS-1", 50.0)
+
+    fons, moduļi = d.contents
+    assert isinstance(fons, Rect)
+    assert fons.fillColor == ak.colors.white
+    # Kešā glabājas jau uzzīmētas figūras, nevis QrCodeWidget, kas kodē no jauna katrā renderēšanā
+    assert not isinstance(moduļi, ak.rl_qr.QrCodeWidget)
+
+
+def test_lru_robeza():
+    qr = ak._QrService(max_entries=2)
+    pirmais = qr.drawing("1", 30.0)
+    qr.drawing("2", 30.0)
+    qr.drawing("1", 30.0)  # "1" kļūst par jaunāko
+    qr.drawing("3", 30.0)
+
+    assert qr.drawing("1", 30.0) is pirmais
+    assert len(qr._items) == 2
+
+
+def test_png_atmina():
+    qr = ak._QrService()
+
+    dati = qr.png("AKTS-1", color="#112233")
+
+    assert qr.png("AKTS-1", color="#112233") is dati
+    with Image.open(io.BytesIO(dati)) as im:
+        assert im.format == "PNG" and im.size[0] == im.size[1]
@@ -0,0 +1,150 @@
+"""Lokālā renderēšanas servisa aizsardzība: Host galvene, Content-Type un failu ceļu robeža."""
+import http.client
+import json
+import os
+import threading
+
+import pytest
+
+import akta_kodols as ak
+
+
+@pytest.fixture
+def serviss_ar(tmp_path):
+    """Palaiž tikai servisa HTTP daļu (bez darbinieku pūla); render aizstāts ar ierakstītāju."""
+    palaisti = []
+
+    def palaist(files_root=""):
+        svc = ak._AktaRenderService("127.0.0.1", 0, workers=1, files_root=files_root)
+        svc.renderēti = []
+
+        def render(data, fmt):
+            svc.renderēti.append((data, fmt))
+            return {"body": b"%PDF-test", "akta_nr": data.get("akta_nr", ""), "queue_s": 0.0, "render_s": 0.0, "stages": {}}
+
+        svc.render = render
+        svc._atvērt_http()
+        threading.Thread(target=svc._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+        palaisti.append(svc)
+        return svc
+
+    yield palaist
+    for svc in palaisti:
+        svc.shutdown()
+        svc.close()
+
+
+def _pieprasīt(svc, method="POST", path="/pdf", body=None, host=None, content_type="application/json"):
+    conn = http.client.HTTPConnection("127.0.0.1", svc.port, timeout=10)
+    headers = {"Host": host or f"127.0.0.1:{svc.port}"}
+    data = None
+    if body is not None:
+        data = json.dumps(body).encode("utf-8")
+        if content_type:
+            headers["Content-Type"] = content_type
+    try:
+        conn.request(method, path, body=data, headers=headers)
+        resp = conn.getresponse()
+        return resp.status, resp.read()
+    finally:
+        conn.close()
+
+
+def _projekts(**lauki) -> dict:
+    dati = {"akta_nr": "S-1", "datums": "2024-05-01", "pozīcijas": []}
+    dati.update(lauki)
+    return dati
+
+
+@pytest.mark.parametrize("host", ["evil.example:{port}", "127.0.0.1:1", "localhost"])
+def test_svešs_host_tiek_noraidīts(serviss_ar, host):
+    svc = serviss_ar()
+    host = host.format(port=svc.port)
+
+    assert _pieprasīt(svc, "GET", "/health", host=host)[0] == 403
+    assert _pieprasīt(svc, body=_projekts(), host=host)[0] == 403
+    assert svc.renderēti == []
+
+
+@pytest.mark.parametrize("host", ["127.0.0.1:{port}", "localhost:{port}", "LOCALHOST:{port}"])
+def test_localhost_host_tiek_pieņemts(serviss_ar, host):
+    svc = serviss_ar()
+    host = host.format(port=svc.port)
+
+    assert _pieprasīt(svc, "GET", "/health", host=host)[0] == 200
+    status, body = _pieprasīt(svc, body=_projekts(), host=host)
+    assert (status, body) == (200, b"%PDF-test")
+
+
+@pytest.mark.parametrize("content_type", [None, "text/plain", "application/x-www-form-urlencoded", "multipart/form-data"])
+def test_post_bez_json_content_type_tiek_noraidīts(serviss_ar, content_type):
+    svc = serviss_ar()
+
+    assert _pieprasīt(svc, body=_projekts(), content_type=content_type)[0] == 415
+    assert svc.renderēti == []
+
+
+def test_json_content_type_ar_charset_tiek_pieņemts(serviss_ar):
+    svc = serviss_ar()
+
+    assert _pieprasīt(svc, body=_projekts(), content_type="application/json; charset=utf-8")[0] == 200
+
+
+@pytest.mark.parametrize("lauki", [
+    {"logotipa_ceļš": "/etc/hostname"},
+    {"fonts_ceļš": "fonts.ttf"},
+    {"paraksts_nodevējs_ceļš": "/tmp/paraksts.png"},
+    {"attēli": [{"ceļš": "/tmp/foto.jpg", "paraksts": ""}]},
+])
+def test_bez_files_root_failu_ceļi_netiek_pieņemti(serviss_ar, lauki):
+    svc = serviss_ar()
+
+    status, body = _pieprasīt(svc, body=_projekts(**lauki))
+    assert status == 403
+    assert json.loads(body)["lauki"]
+    assert svc.renderēti == []
+
+
+def test_files_root_robeža(serviss_ar, tmp_path):
+    sakne = tmp_path / "faili"
+    sakne.mkdir()
+    (sakne / "logo.png").write_bytes(b"x")
+    ārpusē = tmp_path / "slepens.png"
+    ārpusē.write_bytes(b"x")
+    svc = serviss_ar(files_root=str(sakne))
+
+    assert _pieprasīt(svc, body=_projekts(logotipa_ceļš=str(sakne / "logo.png")))[0] == 200
+    for ceļš in (str(ārpusē), str(sakne / ".." / "slepens.png"), "logo.png"):
+        status, body = _pieprasīt(svc, body=_projekts(logotipa_ceļš=ceļš))
+        assert status == 403, ceļš
+        assert json.loads(body)["lauki"] == ["logotipa_ceļš"]
+    assert len(svc.renderēti) == 1
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="nav simlinku")
+def test_files_root_simlinks_ārpus_saknes_tiek_noraidīts(serviss_ar, tmp_path):
+    sakne = tmp_path / "faili"
+    sakne.mkdir()
+    ārpusē = tmp_path / "slepens.png"
+    ārpusē.write_bytes(b"x")
+    os.symlink(ārpusē, sakne / "saite.png")
+    svc = serviss_ar(files_root=str(sakne))
+
+    status, body = _pieprasīt(svc, body=_projekts(attēli=[{"ceļš": str(sakne / "saite.png"), "paraksts": ""}]))
+    assert status == 403
+    assert json.loads(body)["lauki"] == ["attēli[0]"]
+
+
+def test_akta_failu_ceļi_ietver_pielikumus_un_pozīciju_attēlus():
+    d = ak.AktaDati(logotipa_ceļš="/a/logo.png")
+    d.atsauces_dokumenti_faili = [ak.AtsaucesDokuments("/a/pielikums.pdf", "A"), {"ceļš": "/a/b.docx"}]
+    d.pozīcijas = [ak.Pozīcija("x", 1, "gab.", 1, attēla_ceļš="/a/p.png")]
+
+    assert ak._akta_failu_ceļi(d) == [
+        ("logotipa_ceļš", "/a/logo.png"),
+        ("atsauces_dokumenti_faili[0]", "/a/pielikums.pdf"),
+        ("atsauces_dokumenti_faili[1]", "/a/b.docx"),
+        ("pozīcijas[0].attēla_ceļš", "/a/p.png"),
+    ]
+    assert ak._servisa_neatļautie_ceļi(d, "/a") == []
+    assert len(ak._servisa_neatļautie_ceļi(d, "")) == 4
@@ -0,0 +1,130 @@
+"""LibreOffice konvertētājs: silts soffice + UNO palīgprocess un CLI rezerves ceļš.
+
+Īsta LibreOffice vietā tiek izmantots viltots soffice (Python skripts, kas piezīmē savus
+palaišanas veidus) un viltots `uno` modulis, ko palīgprocess ielādē no PYTHONPATH.
+"""
+import os
+import stat
+import sys
+import textwrap
+
+import pytest
+
+import akta_kodols as ak
+
+pytestmark = pytest.mark.skipif(os.name == "nt", reason="viltotais soffice ir shebang skripts")
+
+_SOFFICE = """\
+#!{python}
+import os, sys, time
+args = sys.argv[1:]
+with open({žurnāls!r}, "a") as f:
+    f.write(("listener" if any(a.startswith("--accept") for a in args) else "cli") + "\\n")
+if "--convert-to" in args:
+    out_dir = args[args.index("--outdir") + 1]
+    for src in args[args.index("--outdir") + 2:]:
+        stem = os.path.splitext(os.path.basename(src))[0]
+        with open(os.path.join(out_dir, stem + ".pdf"), "wb") as f:
+            f.write(b"%PDF-cli " + open(src, "rb").read())
+else:
+    time.sleep(600)
+"""
+
+_UNO = """\
+def systemPathToFileUrl(p):
+    return p
+
+
+class _Doc:
+    def __init__(self, src):
+        self.src = src
+
+    def storeToURL(self, url, props):
+        with open(url, "wb") as f:
+            f.write(b"%PDF-uno " + open(self.src, "rb").read())
+
+    def close(self, deliver):
+        pass
+
+
+class _Desktop:
+    def loadComponentFromURL(self, url, frame, flags, props):
+        return _Doc(url)
+
+
+class _Resolver:
+    def resolve(self, url):
+        return _Ctx()
+
+
+class _ServiceManager:
+    def createInstanceWithContext(self, name, ctx):
+        return _Resolver() if name.endswith("UnoUrlResolver") else _Desktop()
+
+
+class _Ctx:
+    ServiceManager = _ServiceManager()
+
+
+def getComponentContext():
+    return _Ctx()
+"""
+
+
+@pytest.fixture
+def vide(tmp_path, monkeypatch):
+    žurnāls = tmp_path / "palaišanas.txt"
+    soffice = tmp_path / "soffice"
+    soffice.write_text(_SOFFICE.format(python=sys.executable, žurnāls=str(žurnāls)))
+    soffice.chmod(soffice.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setattr(ak, "_uno_pythons", {})
+    faili = []
+    for nosaukums in ("a.docx", "b.xlsx"):
+        ceļš = tmp_path / nosaukums
+        ceļš.write_bytes(nosaukums.encode())
+        faili.append(str(ceļš))
+    conv = ak._SofficeConverter(str(soffice), str(tmp_path / "profils"), timeout_per_file=10)
+    yield conv, žurnāls, faili, tmp_path
+    conv.stop()
+
+
+def _palaišanas(žurnāls) -> list:
+    return žurnāls.read_text().split() if žurnāls.exists() else []
+
+
+def test_silts_process_tiek_palaists_vienreiz(vide, monkeypatch):
+    conv, žurnāls, faili, tmp_path = vide
+    uno_dir = tmp_path / "uno_viltots"
+    (uno_dir / "com" / "sun" / "star" / "beans").mkdir(parents=True)
+    (uno_dir / "uno.py").write_text(_UNO)
+    for pak in ("com", "com/sun", "com/sun/star"):
+        (uno_dir / pak / "__init__.py").write_text("")
+    (uno_dir / "com" / "sun" / "star" / "beans" / "__init__.py").write_text(textwrap.dedent("""\
+        class PropertyValue:
+            pass
+    """))
+    monkeypatch.setenv("PYTHONPATH", str(uno_dir))
+
+    pirmais = conv.convert_batch([(faili[0], "pdf:writer_pdf_Export")], str(tmp_path / "o1"))
+    otrais = conv.convert_batch([(faili[1], "pdf:calc_pdf_Export")], str(tmp_path / "o2"))
+
+    assert open(pirmais[faili[0]], "rb").read() == b"%PDF-uno a.docx"
+    assert open(otrais[faili[1]], "rb").read() == b"%PDF-uno b.xlsx"
+    assert _palaišanas(žurnāls) == ["listener"]
+    assert ak._uno_pythons[conv.soffice] == sys.executable
+
+
+def test_bez_uno_izmanto_cli(vide, monkeypatch):
+    conv, žurnāls, faili, tmp_path = vide
+    monkeypatch.setattr(ak, "_find_uno_python", lambda soffice: None)
+    # Vienāds faila nosaukums (stem) vienā izsaukumā pārrakstītu izvadi -> atsevišķa pakete
+    cits_a = tmp_path / "cits" / "a.docx"
+    cits_a.parent.mkdir()
+    cits_a.write_bytes(b"cits")
+    items = [(faili[0], "pdf:writer_pdf_Export"), (str(cits_a), "pdf:writer_pdf_Export")]
+
+    rezultāts = conv.convert_batch(items, str(tmp_path / "o"))
+
+    assert open(rezultāts[faili[0]], "rb").read() == b"%PDF-cli a.docx"
+    assert open(rezultāts[str(cits_a)], "rb").read() == b"%PDF-cli cits"
+    assert _palaišanas(žurnāls) == ["cli", "cli"]
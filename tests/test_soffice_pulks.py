@@ -0,0 +1,80 @@
+"""Pielikumu konvertēšana LibreOffice pūlā: darba sadale un papildu instanču dīkstāves apturēšana."""
+import os
+import time
+
+import pytest
+
+import akta_kodols as ak
+
+
+class _Konvertētājs:
+    """convert_batch aizstājējs: katram failam uzraksta PDF un piezīmē saņemtās paketes."""
+
+    def __init__(self):
+        self.paketes = []
+        self.dīkstāve = []
+        self.apturēts = False
+
+    def convert_batch(self, items, out_dir, atcelšana=None):
+        self.paketes.append([os.path.basename(src) for src, _f in items])
+        os.makedirs(out_dir, exist_ok=True)
+        rezultāts = {}
+        for src, _filtrs in items:
+            pdf = os.path.join(out_dir, os.path.basename(src) + ".pdf")
+            with open(pdf, "wb") as f:
+                f.write(b"%PDF " + os.path.basename(src).encode())
+            rezultāts[src] = pdf
+        return rezultāts
+
+    def stop_after_idle(self, sekundes):
+        self.dīkstāve.append(sekundes)
+
+    def stop(self):
+        self.apturēts = True
+
+
+@pytest.fixture
+def pielikumi(tmp_path, monkeypatch):
+    monkeypatch.setattr(ak, "_conversion_cache", ak._ConversionCache(str(tmp_path / "kešs")))
+    faili = []
+    for i in range(5):
+        ceļš = tmp_path / f"p{i}.docx"
+        ceļš.write_bytes(f"saturs {i}".encode())
+        faili.append(str(ceļš))
+    return faili
+
+
+def test_sadala_starp_darbiniekiem_un_saglaba_papildu_siltus(pielikumi, tmp_path, monkeypatch):
+    pūls = [_Konvertētājs() for _ in range(3)]
+    monkeypatch.setattr(ak, "_get_soffice_converters", lambda count=1: pūls[:count])
+
+    rezultāts = ak._convert_attachments_to_pdf(pielikumi, str(tmp_path / "izvade"), max_workers=3)
+
+    assert [k.paketes for k in pūls] == [[["p0.docx", "p3.docx"]], [["p1.docx", "p4.docx"]], [["p2.docx"]]]
+    for i, ceļš in enumerate(pielikumi):
+        assert open(rezultāts[ceļš], "rb").read() == f"%PDF p{i}.docx".encode()
+    assert not any(k.apturēts for k in pūls)
+    assert pūls[0].dīkstāve == []
+    assert pūls[1].dīkstāve == pūls[2].dīkstāve == [ak.ATTACHMENT_CONVERSION_IDLE_S]
+
+    # Otrajā reizē viss nāk no keša, LibreOffice netiek aiztikts
+    ak._convert_attachments_to_pdf(pielikumi, str(tmp_path / "izvade2"), max_workers=3)
+    assert [len(k.paketes) for k in pūls] == [1, 1, 1]
+
+
+def test_dikstave_aptur_tikai_neizmantotu_konvertetaju(tmp_path, monkeypatch):
+    conv = ak._SofficeConverter("soffice", str(tmp_path / "profils"))
+    apturēšanas = []
+    monkeypatch.setattr(conv, "stop", lambda: apturēšanas.append(time.monotonic()))
+    monkeypatch.setattr(conv, "_uno_available", lambda: False)
+    monkeypatch.setattr(conv, "_convert_cli", lambda items, out_dir, atcelšana=None: {})
+
+    conv.stop_after_idle(0.2)
+    time.sleep(0.1)
+    conv.convert_batch([("x.docx", "pdf:writer_pdf_Export")], str(tmp_path / "o"))  # atceļ taimeri
+    time.sleep(0.3)
+    assert apturēšanas == []
+
+    conv.stop_after_idle(0.05)
+    time.sleep(0.3)
+    assert len(apturēšanas) == 1
@@ -0,0 +1,64 @@
+"""Starts: smagie moduļi tiek ielādēti pirmajā lietošanas reizē, starta laiks tiek mērīts pret budžetu."""
+import json
+import os
+import subprocess
+import sys
+
+from conftest import SAKNE, ielādēt_gui
+
+import akta_kodols as ak
+
+_SMAGIE = ("reportlab", "PIL", "docx", "pdf2image", "requests", "http.server",
+           "PySide6.QtWebEngineWidgets", "PySide6.QtWebEngineCore", "PySide6.QtWebChannel", "PySide6.QtPrintSupport")
+
+
+def _ielādētie_smagie(kods: str) -> list:
+    """Palaiž `kods` tīrā procesā un atgriež, kuri no _SMAGIE moduļiem pēc tam ir sys.modules."""
+    pārbaude = f"import json, sys\n{kods}\nprint(json.dumps(sorted(m for m in {_SMAGIE!r} if m in sys.modules)))"
+    vide = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    rez = subprocess.run([sys.executable, "-c", pārbaude], cwd=SAKNE, env=vide,
+                         capture_output=True, text=True, timeout=120)
+    assert rez.returncode == 0, rez.stderr
+    return json.loads(rez.stdout.strip().splitlines()[-1])
+
+
+def test_kodola_imports_neielade_smagos_modulus():
+    assert _ielādētie_smagie("import akta_kodols") == []
+
+
+def test_gui_imports_neielade_smagos_modulus():
+    kods = ("import importlib.util\n"
+            "spec = importlib.util.spec_from_file_location('akti_gui', 'Pienemsanas-Nodosanas akti.py')\n"
+            "m = importlib.util.module_from_spec(spec)\n"
+            "sys.modules['akti_gui'] = m\n"
+            "spec.loader.exec_module(m)")
+    assert _ielādētie_smagie(kods) == []
+
+
+def test_reportlab_apakšklases_izveido_vienreiz():
+    ak._ielādēt_reportlab()
+    klase = ak.DecoratedCanvas
+
+    ak._ielādēt_reportlab()
+
+    assert ak.DecoratedCanvas is klase
+    assert issubclass(klase, ak.canvas.Canvas) and issubclass(klase, ak._DecoratedCanvasMixin)
+    assert issubclass(ak._ChunkedPositionsTable, ak.Flowable)
+
+
+def test_starta_laiks_tiek_drukats_tikai_parsniedzot_budzetu(monkeypatch, capsys):
+    gui = ielādēt_gui()
+    monkeypatch.setattr(gui, "_STARTUP_T0", 100.0)
+    monkeypatch.delenv("AKTA_STARTUP_PROFILE", raising=False)
+    ātri = {"imports": 100.1, "lietojams": 100.2}
+
+    gui._pieraksti_starta_laiku(ātri)
+    assert capsys.readouterr().out == ""
+
+    gui._pieraksti_starta_laiku({"imports": 100.5, "lietojams": 100.0 + gui.STARTUP_BUDGET_S + 0.1})
+    assert "pārsniegts" in capsys.readouterr().out
+
+    monkeypatch.setenv("AKTA_STARTUP_PROFILE", "1")
+    gui._pieraksti_starta_laiku(ātri)
+    izvade = capsys.readouterr().out
+    assert "Starts: 200 ms" in izvade and "imports 100 ms, lietojams 100 ms" in izvade and "ok" in izvade
@@ -0,0 +1,247 @@
+"""Undo/redo: UndoRedoManager apvienošana un apgriešana, snapshot kopīgošana un atjaunošana."""
+import copy
+from decimal import Decimal
+
+from conftest import ielādēt_gui
+
+from akta_kodols import AktaDati, Pozīcija
+
+akti = ielādēt_gui()
+
+
+def _lauks(lauks, vecā, jaunā, laiks):
+    return {"label": "FIELD_CHANGE", "lauks": lauks, "vecā": vecā, "jaunā": jaunā, "_laiks": laiks}
+
+
+def _šūnas(šūnas, laiks):
+    return {"label": "POZ_CHANGE", "šūnas": list(šūnas), "_laiks": laiks}
+
+
+def _poz(apraksts, daudzums="1"):
+    return Pozīcija(apraksts=apraksts, daudzums=Decimal(daudzums), vienība="gab", cena=Decimal("2.50"))
+
+
+# --- UndoRedoManager._apvienot ---
+
+def test_viena_lauka_izmaiņas_logā_apvieno_vienā_solī():
+    mgr = akti.UndoRedoManager(coalesce_s=2.0)
+    mgr.push_undo(_lauks("vieta", "", "R", 10.0))
+    mgr.push_undo(_lauks("vieta", "R", "Rī", 11.0))
+    mgr.push_undo(_lauks("vieta", "Rī", "Rīga", 12.5))
+    assert len(mgr.entries()) == 1
+    solis = mgr.peek_undo()
+    assert (solis["vecā"], solis["jaunā"], solis["_laiks"]) == ("", "Rīga", 12.5)
+    assert mgr.memory_bytes() == solis["_izmērs"]
+
+
+def test_daudzas_apvienotas_izmaiņas_neizspiež_iepriekšējos_soļus():
+    viens = akti._aptuvenais_izmērs(_lauks("vieta", "v000", "v001", 10.0))
+    mgr = akti.UndoRedoManager(max_bytes=4 * viens, coalesce_s=2.0)
+    mgr.push_undo(_lauks("akta_nr", "", "A-1", 1.0))
+    mgr.push_undo(_lauks("datums", "", "2024-05-01", 4.0))
+
+    for i in range(500):  # ilga rakstīšana vienā laukā: katra izmaiņa apvienojas ar iepriekšējo
+        mgr.push_undo(_lauks("vieta", f"v{i:03d}" if i else "", f"v{i + 1:03d}", 10.0 + i * 0.1))
+
+    assert [st["lauks"] for st in mgr.entries()] == ["akta_nr", "datums", "vieta"]
+    solis = mgr.peek_undo()
+    assert (solis["vecā"], solis["jaunā"]) == ("", "v500")
+    # Apvienotā soļa izmērs ir pārrēķināts, nevis 500 izmaiņu summa
+    assert solis["_izmērs"] < 2 * viens
+    assert mgr.memory_bytes() == sum(st["_izmērs"] for st in mgr.entries()) <= mgr.max_bytes
+
+
+def test_apvienots_solis_pāri_budžetam_apgriež_vecākos():
+    mgr = akti.UndoRedoManager(max_bytes=2000, coalesce_s=2.0)
+    mgr.push_undo(_lauks("akta_nr", "", "A-1", 1.0))
+    mgr.push_undo(_lauks("piezīmes", "", "x", 10.0))
+
+    mgr.push_undo(_lauks("piezīmes", "x", "x" * 5000, 10.5))
+
+    assert [st["lauks"] for st in mgr.entries()] == ["piezīmes"]
+    assert mgr.memory_bytes() == mgr.peek_undo()["_izmērs"]
+
+
+def test_izmaiņas_ārpus_loga_vai_citā_laukā_netiek_apvienotas():
+    mgr = akti.UndoRedoManager(coalesce_s=2.0)
+    mgr.push_undo(_lauks("vieta", "", "R", 10.0))
+    mgr.push_undo(_lauks("vieta", "R", "Rīga", 12.5))  # 2,5 s pēc pēdējās izmaiņas
+    mgr.push_undo(_lauks("akta_nr", "", "7", 13.0))
+    assert [(s["lauks"], s["jaunā"]) for s in mgr.entries()] == [("vieta", "R"), ("vieta", "Rīga"), ("akta_nr", "7")]
+
+
+def test_apvienots_solis_atpakaļ_uz_sākotnējo_vērtību_tiek_izmests():
+    mgr = akti.UndoRedoManager(coalesce_s=2.0)
+    mgr.push_undo(_lauks("akta_nr", "", "1", 5.0))
+    mgr.push_undo(_lauks("vieta", "Rīga", "Rīgaa", 10.0))
+    mgr.push_undo(_lauks("vieta", "Rīgaa", "Rīga", 11.0))
+    assert [s["lauks"] for s in mgr.entries()] == ["akta_nr"]
+    assert mgr.memory_bytes() == mgr.peek_undo()["_izmērs"]
+
+
+def test_šūnu_izmaiņas_apvieno_un_atgrieztās_šūnas_izmet():
+    mgr = akti.UndoRedoManager(coalesce_s=2.0)
+    mgr.push_undo(_šūnas([(0, 1, "1", "2"), (1, 0, "a", "b")], 10.0))
+    mgr.push_undo(_šūnas([(0, 1, "2", "3"), (1, 0, "b", "a")], 11.0))
+    assert len(mgr.entries()) == 1
+    assert mgr.peek_undo()["šūnas"] == [(0, 1, "1", "3")]
+
+    mgr.push_undo(_šūnas([(0, 1, "3", "1")], 12.0))
+    assert mgr.entries() == []
+    assert mgr.memory_bytes() == 0
+
+
+def test_jauna_izmaiņa_notīra_redo_bet_redo_solis_netiek_apvienots():
+    mgr = akti.UndoRedoManager(coalesce_s=2.0)
+    mgr.push_undo(_lauks("vieta", "", "Rīga", 10.0))
+    mgr.push_redo(mgr.pop_undo())
+    mgr.push_undo(_lauks("vieta", "", "R", 10.5))
+    # redo atkārtots solis (clear_redo=False) paliek atsevišķs, pat ja tas ir tajā pašā logā
+    mgr.push_undo(_lauks("vieta", "R", "Rī", 10.6), clear_redo=False)
+    assert not mgr.can_redo()
+    assert len(mgr.entries()) == 2
+
+
+# --- UndoRedoManager._apgriezt ---
+
+def test_apgriešana_pēc_soļu_skaita():
+    mgr = akti.UndoRedoManager(max_steps=3, coalesce_s=0)
+    for i in range(5):
+        mgr.push_undo({"label": f"S{i}", "_laiks": float(i * 10)})
+    assert [s["label"] for s in mgr.entries()] == ["S2", "S3", "S4"]
+
+
+def test_apgriešana_pēc_baitu_budžeta_atstāj_vismaz_pēdējo_soli():
+    mgr = akti.UndoRedoManager(max_steps=50, max_bytes=2500, coalesce_s=0)
+    for i in range(6):
+        mgr.push_undo({"label": f"S{i}", "_laiks": float(i * 10), "_izmērs": 1000})
+    assert [s["label"] for s in mgr.entries()] == ["S4", "S5"]
+    assert mgr.memory_bytes() == 2000
+
+    mgr.push_undo({"label": "LIELS", "_laiks": 100.0, "_izmērs": 10_000})
+    assert [s["label"] for s in mgr.entries()] == ["LIELS"]
+    assert mgr.memory_bytes() == 10_000
+
+    for i in range(4):
+        mgr.push_redo({"label": f"R{i}", "_izmērs": 1000})
+    assert [s["label"] for s in mgr._redo] == ["R2", "R3"]
+    assert mgr.memory_bytes() == 12_000
+
+
+# --- AktaLogs snapshots ---
+
+class _Izmaiņas:
+    def pabeigt_visus(self):
+        pass
+
+
+class _Logs:
+    """Minimāls AktaLogs aizstājējs: tikai undo snapshot metodes bez logrīkiem."""
+    _undo_kopīgot = staticmethod(akti.AktaLogs._undo_kopīgot)
+    _snapshot_state = akti.AktaLogs._snapshot_state
+    _restore_state = akti.AktaLogs._restore_state
+    undo_action = akti.AktaLogs.undo_action
+    redo_action = akti.AktaLogs.redo_action
+
+    def __init__(self, dati: AktaDati):
+        self.dati = dati
+        self.address_book = {"SIA A": {"nosaukums": "SIA A"}, "SIA B": {"nosaukums": "SIA B"}}
+        self._undo_ab_daļas = {}
+        self._undo_projekta_daļas = {}
+        self._undo_mgr = akti.UndoRedoManager(coalesce_s=0)
+        self._izmaiņas = _Izmaiņas()
+        self.ievietots = 0
+
+    def savākt_datus(self):
+        return copy.deepcopy(self.dati)
+
+    def ieviest_datus(self, d):
+        self.dati = d
+        self.ievietots += 1
+
+    def _save_address_book(self):
+        pass
+
+    def _update_address_book_list(self):
+        pass
+
+    def _update_undo_redo_indicators(self):
+        pass
+
+    def _audit(self, event, details=None):
+        pass
+
+
+def _logs():
+    return _Logs(AktaDati(akta_nr="1", vieta="Rīga", pozīcijas=[_poz("A"), _poz("B"), _poz("C")]))
+
+
+def test_snapshots_kopīgo_nemainītās_daļas():
+    logs = _logs()
+    s1 = logs._snapshot_state("S1")
+    logs.dati.pozīcijas[1].daudzums = Decimal("5")
+    logs.dati.vieta = "Cēsis"
+    s2 = logs._snapshot_state("S2")
+
+    p1, p2 = s1["project"], s2["project"]
+    assert p2["akta_nr"] is p1["akta_nr"]
+    assert p2["pieņēmējs"] is p1["pieņēmējs"]
+    assert p2["pozīcijas"][0] is p1["pozīcijas"][0]
+    assert p2["pozīcijas"][2] is p1["pozīcijas"][2]
+    assert p2["pozīcijas"][1] is not p1["pozīcijas"][1]
+    assert p2["pozīcijas"][1].daudzums == Decimal("5")
+    assert p1["pozīcijas"][1].daudzums == Decimal("1")
+    assert all(s2["address_book"][k] is s1["address_book"][k] for k in s1["address_book"])
+    # jaunā snapshot "_izmērs" ir tikai mainītā daļa
+    assert s2["_izmērs"] < s1["_izmērs"]
+
+    s3 = logs._snapshot_state("S3")
+    assert s3["project"]["pozīcijas"] is p2["pozīcijas"]
+
+
+def test_mainītās_rindas_ir_dziļas_kopijas():
+    iepriekš = {"pozīcijas": (_poz("A"),)}
+    rinda = _poz("A", "2")
+    rinda.piezīmes_pozīcijai = ["saraksts"]  # maināms lauks: seklā kopija to kopīgotu
+    izmērs = [0]
+    jauns = akti.AktaLogs._undo_kopīgot(iepriekš, {"pozīcijas": [rinda]}, izmērs)
+
+    kopija = jauns["pozīcijas"][0]
+    assert kopija == rinda and kopija is not rinda
+    assert kopija.piezīmes_pozīcijai is not rinda.piezīmes_pozīcijai
+    rinda.piezīmes_pozīcijai.append("vēlāk")
+    assert kopija.piezīmes_pozīcijai == ["saraksts"]
+    assert izmērs[0] > 0
+
+
+def test_snapshot_undo_un_redo_atjauno_stāvokli():
+    logs = _logs()
+    logs._undo_mgr.push_undo(logs._snapshot_state("PROJECT_SAVE"))
+    logs.dati.vieta = "Cēsis"
+    logs.dati.pozīcijas[0].apraksts = "A2"
+
+    logs.undo_action()
+    assert logs.dati.vieta == "Rīga"
+    assert [p.apraksts for p in logs.dati.pozīcijas] == ["A", "B", "C"]
+    assert logs._undo_mgr.can_redo() and not logs._undo_mgr.can_undo()
+
+    logs.redo_action()
+    assert logs.dati.vieta == "Cēsis"
+    assert [p.apraksts for p in logs.dati.pozīcijas] == ["A2", "B", "C"]
+    assert logs._undo_mgr.can_undo() and not logs._undo_mgr.can_redo()
+    assert logs._undo_mgr.peek_undo()["label"] == "undo"
+
+    # atjaunotās rindas nedrīkst būt snapshot objekti (rediģēšana nedrīkst mainīt vēsturi)
+    logs.dati.pozīcijas[0].apraksts = "X"
+    logs.undo_action()
+    assert [p.apraksts for p in logs.dati.pozīcijas] == ["A", "B", "C"]
+
+
+def test_undo_bez_izmaiņām_projektu_neievieto():
+    logs = _logs()
+    logs._undo_mgr.push_undo(logs._snapshot_state("AB_EDIT"))
+    logs.address_book["SIA C"] = {"nosaukums": "SIA C"}
+
+    logs.undo_action()
+    assert sorted(logs.address_book) == ["SIA A", "SIA B"]
+    assert logs.ievietots == 0